@@ -4,6 +4,7 @@ from flask_cors import CORS
 import os
 
 from config import config
+from utils.compression import init_compression
 from utils.json_handler import ensure_data_directory
 
 def create_app(config_name='default'):
@@ -28,6 +29,9 @@ def create_app(config_name='default'):
         response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
         return response
     
+    # gzip/brotli for JSON and text responses
+    init_compression(app)
+    
     # Ensure data directory exists
     ensure_data_directory()
     
@@ -41,6 +45,7 @@ def create_app(config_name='default'):
     from routes.assets import assets_bp
     from routes.analysis import analysis_bp
     from routes.ai_routes import ai_bp
+    from routes.changes import changes_bp
     
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix='/api/auth')
@@ -52,6 +57,7 @@ def create_app(config_name='default'):
     app.register_blueprint(assets_bp, url_prefix='/api/assets')
     app.register_blueprint(analysis_bp, url_prefix='/api/analysis')
     app.register_blueprint(ai_bp, url_prefix='/api/ai')
+    app.register_blueprint(changes_bp, url_prefix='/api/changes')
     
     # Error handlers
     @app.errorhandler(404)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark the local shooting schedule solver on synthetic projects
+Usage: python benchmark_local_scheduler.py [scene_count ...]
+"""
+
+import random
+import sys
+import time
+from utils.local_scheduler import LocalScheduleSolver
+
+TIMES_OF_DAY = ['DAY', 'DAY', 'DAY', 'DUSK', 'NIGHT']
+
+def generate_scenes(scene_count: int, seed: int = 7):
+    """Generate a synthetic season: shared sets, a core cast and guest actors"""
+    rng = random.Random(seed)
+    location_count = max(3, scene_count // 6)
+    locations = [f"Set {i // 4} - Area {i % 4}" for i in range(location_count)]
+    core_cast = [f"Lead {i}" for i in range(6)]
+    guest_cast = [f"Guest {i}" for i in range(max(4, scene_count // 10))]
+
+    scenes = []
+    for number in range(1, scene_count + 1):
+        actors = rng.sample(core_cast, rng.randint(1, 3)) + rng.sample(guest_cast, rng.randint(0, 2))
+        scenes.append({
+            'scene_number': number,
+            'scene_title': f"Scene {number}",
+            'location': rng.choice(locations),
+            'time_of_day': rng.choice(TIMES_OF_DAY),
+            'estimated_duration_minutes': rng.choice([30, 45, 60, 90, 120]),
+            'actors': [{'name': name, 'character': name} for name in actors],
+            'extras': []
+        })
+    return scenes
+
+def run_benchmark(scene_count: int):
+    """Solve one synthetic project and print cost and timing"""
+    scenes = generate_scenes(scene_count)
+    solver = LocalScheduleSolver()
+
+    start = time.time()
+    schedule = solver.solve(scenes)
+    elapsed = time.time() - start
+
+    stats = schedule['solver_stats']
+    initial, final = stats['initial_cost'], stats['final_cost']
+    improvement = (1 - final['total_cost'] / initial['total_cost']) * 100 if initial['total_cost'] else 0
+
+    print(f"{scene_count:>6} scenes | {elapsed:7.2f}s | {stats['iterations']:>6} iterations | "
+          f"days {initial['shooting_days']:>4} → {final['shooting_days']:<4} | "
+          f"moves {initial['company_moves']:>4} → {final['company_moves']:<4} | "
+          f"hold days {initial['hold_days']:>5} → {final['hold_days']:<5} | "
+          f"overtime {initial['overtime_minutes']:>5} → {final['overtime_minutes']:<5} | "
+          f"cost -{improvement:.1f}%")
+
+def main():
+    """Run benchmarks at the requested sizes"""
+    sizes = [int(arg) for arg in sys.argv[1:]] or [50, 500, 2000]
+
+    print("🎬 Local Schedule Solver Benchmark")
+    print("="*60)
+    for size in sizes:
+        run_benchmark(size)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark GET /api/script: payload size per projection and per-request cost
+Usage: python benchmark_script.py [scene_count]
+"""
+
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from flask import Flask
+from routes.script import load_transformed_script, script_bp
+from utils.data_transformer import transform_script_data
+from utils.json_handler import json_handler
+
+LOCATIONS = ['Abandoned Radio Station', 'Harbor Warehouse', 'Police Precinct', 'Rooftop', 'Diner', 'Subway Platform']
+TIMES = ['DAY', 'NIGHT', 'DUSK', 'DAWN']
+CAST = [f'Character {i}' for i in range(24)]
+
+def generate_script(scene_count: int, seed: int = 5):
+    """Synthetic script.json in the stored analysis format, with full breakdown arrays"""
+    rng = random.Random(seed)
+
+    def some(prefix, most):
+        return [f'{prefix} {rng.randint(1, 90)}' for _ in range(rng.randint(0, most))]
+
+    scenes = []
+    for number in range(1, scene_count + 1):
+        location = rng.choice(LOCATIONS)
+        time_of_day = rng.choice(TIMES)
+        int_ext = rng.choice(['INT', 'EXT'])
+        vfx = rng.random() < 0.3
+        scenes.append({
+            'id': str(number),
+            'scene_number': number,
+            'title': f'{int_ext}. {location.upper()} - {time_of_day}',
+            'int_ext': int_ext,
+            'location': location,
+            'day_night': time_of_day,
+            'scene_description': ' '.join(rng.choice(['The', 'storm', 'breaks', 'over', 'a', 'quiet', 'street',
+                                                      'as', 'sirens', 'close', 'in']) for _ in range(28)),
+            'characters': rng.sample(CAST, rng.randint(1, 5)),
+            'extras': some('Extra group', 2),
+            'props': some('Prop', 8),
+            'wardrobe': some('Costume', 5),
+            'makeup_hair': some('Makeup look', 3),
+            'set_dressing': some('Dressing', 6),
+            'sound_requirements': some('Sound cue', 4),
+            'special_equipment': some('Rig', 3),
+            'stunts_vfx': some('Gag', 2) if vfx else [],
+            'vehicles_animals_fx': some('Vehicle', 2),
+            'vfx_required': vfx,
+            'vfx_details': 'Sky replacement and lightning passes with interactive light on cast.' if vfx else '',
+            'mood_tone': rng.choice(['Ominous', 'Tense', 'Warm', 'Bleak']),
+            'scene_complexity': rng.choice(['Low', 'Medium', 'High']),
+            'estimated_runtime_minutes': rng.choice([1, 2, 3, 5]),
+            'scene_status': 'Not Shot',
+        })
+    return {
+        'title': 'Synthetic Feature',
+        'total_scenes': scene_count,
+        'total_runtime_minutes': sum(scene['estimated_runtime_minutes'] for scene in scenes),
+        'total_vfx_scenes': sum(1 for scene in scenes if scene['vfx_required']),
+        'scenes': scenes,
+    }
+
+def time_per_call(function, iterations):
+    """Average milliseconds per call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1000
+
+def run_benchmark(scene_count: int, iterations: int = 20):
+    original_data_dir = json_handler.data_dir
+    with tempfile.TemporaryDirectory() as data_dir:
+        with open(os.path.join(data_dir, 'script.json'), 'w', encoding='utf-8') as f:
+            json.dump(generate_script(scene_count), f)
+        json_handler.data_dir = data_dir
+        try:
+            app = Flask(__name__)
+            app.register_blueprint(script_bp, url_prefix='/api/script')
+            client = app.test_client()
+
+            full = len(client.get('/api/script').data)
+            print(f"{scene_count} scenes")
+            for label, url in [
+                ('full document', '/api/script'),
+                ('view=summary', '/api/script?view=summary'),
+                ('Script list fields', '/api/script?fields=id,number,description,location,estimatedDuration,vfx,status'),
+                ('exclude breakdown arrays', '/api/script?exclude=props,wardrobe,set_dressing,sound_requirements,'
+                                             'makeup_hair,special_equipment,stunts_vfx,vehicles_animals_fx,extras'),
+            ]:
+                size = len(client.get(url).data)
+                print(f"{label:<28} {size / 1024:9.1f} KB ({size / full:6.1%})")
+
+            print()
+            per_request_transform = time_per_call(
+                lambda: json.dumps(transform_script_data(json_handler.read_json('script.json', {}))), iterations)
+            serialize_only = time_per_call(lambda: json.dumps(load_transformed_script()), iterations)
+            cached_get = time_per_call(lambda: client.get('/api/script'), iterations)
+            summary_get = time_per_call(lambda: client.get('/api/script?view=summary'), iterations)
+            print(f"{'read + transform + serialize':<28} {per_request_transform:9.2f} ms/request (before caching)")
+            print(f"{'GET /api/script (cached)':<28} {cached_get:9.2f} ms/request")
+            print(f"{'serialization alone':<28} {serialize_only:9.2f} ms/request")
+            print(f"{'GET ?view=summary (cached)':<28} {summary_get:9.2f} ms/request")
+        finally:
+            json_handler.data_dir = original_data_dir
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 400)
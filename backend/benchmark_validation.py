@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request payload validation cost
+Usage: python benchmark_validation.py [iterations]
+"""
+
+import sys
+import time
+import jsonschema
+from utils.schemas import SCHEMAS, compile_schemas, validate_many, validate_payload
+
+TASK = {
+    'title': 'Rig lights', 'description': 'Pre-rig stage 2 for the night shoot', 'assigneeId': '4',
+    'dueDate': '2024-10-15', 'priority': 'high', 'status': 'todo', 'category': 'Equipment',
+    'estimatedHours': 4,
+}
+REQUIRED = SCHEMAS['task']['required']
+
+def inline_checks(data):
+    """The required-field loop and enum checks the routes used to repeat inline"""
+    for field in REQUIRED:
+        if not data.get(field):
+            return f'{field} is required'
+    if 'status' in data and data['status'] not in ['todo', 'in_progress', 'done']:
+        return 'bad status'
+    if data['priority'] not in ['low', 'medium', 'high']:
+        return 'bad priority'
+    return None
+
+def time_per_call(function, iterations):
+    """Average microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def run_benchmark(iterations: int):
+    start = time.perf_counter()
+    compile_schemas()
+    print(f"Compiling all schemas once: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    results = [
+        ('inline required/enum checks', time_per_call(lambda: inline_checks(TASK), iterations)),
+        ('precompiled validate_payload', time_per_call(lambda: validate_payload('task', TASK), iterations)),
+        ('jsonschema.validate per call', time_per_call(lambda: jsonschema.validate(TASK, SCHEMAS['task']),
+                                                       max(1, iterations // 10))),
+    ]
+    for label, micros in results:
+        print(f"{label:<32} {micros:9.1f} µs/request")
+
+    batch = [dict(TASK, title=f'Task {i}') for i in range(40)]
+    one_pass = time_per_call(lambda: validate_many('task', batch), max(1, iterations // 40))
+    per_item = time_per_call(lambda: [validate_payload('task', item) for item in batch], max(1, iterations // 40))
+    print(f"{'40 tasks, validate_many':<32} {one_pass:9.1f} µs/request ({one_pass / 40:.1f} µs/item)")
+    print(f"{'40 tasks, 40 validate_payload':<32} {per_item:9.1f} µs/request")
+
+if __name__ == "__main__":
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -15,6 +15,79 @@ class Config:
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
     ALLOWED_EXTENSIONS = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'mp4', 'mov', 'avi'}
+    
+    # Gemini response cache settings
+    GEMINI_CACHE_DIR = os.environ.get('GEMINI_CACHE_DIR') or os.path.join(DATA_DIR, 'cache', 'gemini')
+    GEMINI_CACHE_TTL_SECONDS = int(os.environ.get('GEMINI_CACHE_TTL_SECONDS', 24 * 60 * 60))
+    GEMINI_CACHE_MAX_ENTRIES = int(os.environ.get('GEMINI_CACHE_MAX_ENTRIES', 50))
+    
+    # Estimated prompt tokens above which a project is split into several Gemini calls
+    GEMINI_MAX_PROMPT_TOKENS = int(os.environ.get('GEMINI_MAX_PROMPT_TOKENS', 8000))
+    
+    # Hierarchical scheduling: projects this large are split into location blocks
+    # scheduled concurrently (one model call or local solve each) and stitched
+    GEMINI_HIERARCHICAL_MIN_SCENES = int(os.environ.get('GEMINI_HIERARCHICAL_MIN_SCENES', 150))
+    GEMINI_BLOCK_MAX_SCENES = int(os.environ.get('GEMINI_BLOCK_MAX_SCENES', 60))
+    GEMINI_BLOCK_WORKERS = int(os.environ.get('GEMINI_BLOCK_WORKERS', 4))
+    
+    # Model client transport: 'sdk' (google-generativeai) or 'http' (pooled keep-alive REST sessions)
+    GEMINI_TRANSPORT = os.environ.get('GEMINI_TRANSPORT', 'sdk')
+    GEMINI_API_BASE_URL = os.environ.get('GEMINI_API_BASE_URL', 'https://generativelanguage.googleapis.com/v1beta')
+    GEMINI_HTTP_POOL_SIZE = int(os.environ.get('GEMINI_HTTP_POOL_SIZE', 8))
+    GEMINI_HTTP_TIMEOUT_SECONDS = float(os.environ.get('GEMINI_HTTP_TIMEOUT_SECONDS', 120))
+    
+    # Rate limiting ('memory' is per process, 'sqlite' is shared across worker processes)
+    RATE_LIMIT_BACKEND = os.environ.get('RATE_LIMIT_BACKEND', 'memory')
+    RATE_LIMIT_DB = os.environ.get('RATE_LIMIT_DB') or os.path.join(DATA_DIR, 'cache', 'rate_limits.sqlite3')
+    GEMINI_RATE_LIMIT_MAX_CALLS = int(os.environ.get('GEMINI_RATE_LIMIT_MAX_CALLS', 1))
+    GEMINI_RATE_LIMIT_PERIOD_SECONDS = float(os.environ.get('GEMINI_RATE_LIMIT_PERIOD_SECONDS', 4))
+    
+    # Most operations accepted by one POST /api/tasks/bulk request
+    TASKS_BULK_MAX_OPERATIONS = int(os.environ.get('TASKS_BULK_MAX_OPERATIONS', 500))
+    
+    # Largest page a list endpoint returns when a limit is requested
+    QUERY_MAX_LIMIT = int(os.environ.get('QUERY_MAX_LIMIT', 500))
+    
+    # Response compression: bodies smaller than this are sent as-is, and
+    # compressed bodies of ETag-tagged responses are kept for reuse
+    COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', 1024))
+    COMPRESSION_GZIP_LEVEL = int(os.environ.get('COMPRESSION_GZIP_LEVEL', 6))
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 5))
+    COMPRESSION_CACHE_MAX_BYTES = int(os.environ.get('COMPRESSION_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    
+    # Change feed: changes kept for GET /api/changes, and the longest a
+    # request may wait for a new change (long-poll). 'memory' is per process;
+    # 'sqlite' shares one log across worker processes (the default whenever
+    # the message bus is shared) and is checked every CHANGE_FEED_POLL_MS
+    # by waiting long-polls
+    CHANGE_FEED_BACKEND = os.environ.get('CHANGE_FEED_BACKEND', os.environ.get('MESSAGE_BUS_BACKEND', 'memory'))
+    CHANGE_FEED_DB = os.environ.get('CHANGE_FEED_DB') or os.path.join(DATA_DIR, 'cache', 'change_feed.sqlite3')
+    CHANGE_FEED_POLL_MS = int(os.environ.get('CHANGE_FEED_POLL_MS', 100))
+    CHANGE_FEED_MAX_ENTRIES = int(os.environ.get('CHANGE_FEED_MAX_ENTRIES', 10000))
+    CHANGE_FEED_MAX_LIMIT = int(os.environ.get('CHANGE_FEED_MAX_LIMIT', 500))
+    CHANGE_FEED_MAX_WAIT_SECONDS = float(os.environ.get('CHANGE_FEED_MAX_WAIT_SECONDS', 25))
+    
+    # Websocket broadcasts: changes within this window are merged and sent
+    # as one message per connected session
+    WEBSOCKET_DEBOUNCE_MS = int(os.environ.get('WEBSOCKET_DEBOUNCE_MS', 100))
+    
+    # Websocket backpressure: messages a client may leave unacknowledged, and
+    # changes queued per session before the queue is collapsed to the latest
+    # change per entity (a client still over the limit is told to resync)
+    WEBSOCKET_MAX_IN_FLIGHT = int(os.environ.get('WEBSOCKET_MAX_IN_FLIGHT', 4))
+    WEBSOCKET_SEND_QUEUE_MAX_CHANGES = int(os.environ.get('WEBSOCKET_SEND_QUEUE_MAX_CHANGES', 500))
+    
+    # Realtime message bus ('memory' is per process, 'sqlite' fans broadcasts
+    # out and tracks connections across worker processes on one host)
+    MESSAGE_BUS_BACKEND = os.environ.get('MESSAGE_BUS_BACKEND', 'memory')
+    MESSAGE_BUS_DB = os.environ.get('MESSAGE_BUS_DB') or os.path.join(DATA_DIR, 'cache', 'message_bus.sqlite3')
+    MESSAGE_BUS_POLL_MS = int(os.environ.get('MESSAGE_BUS_POLL_MS', 50))
+    MESSAGE_BUS_PRESENCE_TTL_SECONDS = float(os.environ.get('MESSAGE_BUS_PRESENCE_TTL_SECONDS', 30))
+    MESSAGE_BUS_RETENTION_SECONDS = float(os.environ.get('MESSAGE_BUS_RETENTION_SECONDS', 60))
+    
+    # Parallel schedule search (worker processes shared by all requests)
+    SCHEDULE_SEARCH_MAX_WORKERS = int(os.environ.get('SCHEDULE_SEARCH_MAX_WORKERS', os.cpu_count() or 1))
+    SCHEDULE_SEARCH_MAX_BUDGET_MS = int(os.environ.get('SCHEDULE_SEARCH_MAX_BUDGET_MS', 60000))
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -1,10 +1,19 @@
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 import os
 import json
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 import re
+import threading
 from collections import defaultdict
+from datetime import datetime
+import numpy as np
 from utils.gemini_scheduler import GeminiScheduler
+from utils.rate_limiter import RateLimitExceeded
+from utils.local_scheduler import LocalScheduleSolver
+from utils.schedule_state import ScheduleState
+from utils.derived_cache import DerivedDataCache
+from utils.parallel_search import MultiStartSearch
+from config import Config
 # from utils.schedule_sync import ensure_scene_titles_updated  # Temporarily disabled
 
 # Create blueprint
@@ -16,25 +25,37 @@ DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data')
 class ScheduleOptimizer:
     """AI-assisted schedule optimization logic"""
     
+    # Bump when optimization output changes so cached results are recomputed
+    VERSION = '3'
+    
+    COMMON_WORDS = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', '-'}
+    NON_WORD_PATTERN = re.compile(r'[^\w\s]')
+    
     def __init__(self):
         self.time_priority = {'DAY': 1, 'DUSK': 2, 'NIGHT': 3}
+        self._keyword_cache: Dict[str, frozenset] = {}
     
     def extract_location_keywords(self, location: str) -> List[str]:
         """Extract main keywords from location for clustering"""
         # Remove common words and extract meaningful keywords
-        common_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', '-'}
-        
-        # Clean and split location
-        cleaned = re.sub(r'[^\w\s]', ' ', location.lower())
-        words = [word.strip() for word in cleaned.split() if word.strip() and word not in common_words]
+        cleaned = self.NON_WORD_PATTERN.sub(' ', location.lower())
+        words = [word.strip() for word in cleaned.split() if word.strip() and word not in self.COMMON_WORDS]
         
         # Return meaningful keywords
         return words[:3]  # Take first 3 meaningful words
     
+    def get_location_keywords(self, location: str) -> frozenset:
+        """Keyword set for a location, tokenized once per optimizer"""
+        keywords = self._keyword_cache.get(location)
+        if keywords is None:
+            keywords = frozenset(self.extract_location_keywords(location))
+            self._keyword_cache[location] = keywords
+        return keywords
+    
     def calculate_location_similarity(self, loc1: str, loc2: str) -> float:
         """Calculate similarity score between two locations"""
-        keywords1 = set(self.extract_location_keywords(loc1))
-        keywords2 = set(self.extract_location_keywords(loc2))
+        keywords1 = self.get_location_keywords(loc1)
+        keywords2 = self.get_location_keywords(loc2)
         
         if not keywords1 or not keywords2:
             return 0.0
@@ -46,38 +67,78 @@ class ScheduleOptimizer:
         return len(intersection) / len(union) if union else 0.0
     
     def cluster_locations(self, scenes: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-        """Group scenes by location similarity"""
-        clusters = defaultdict(list)
-        processed_scenes = set()
-        
-        for i, scene in enumerate(scenes):
-            if i in processed_scenes:
+        """
+        Group scenes by location similarity
+        
+        Each cluster is seeded by the first unclustered scene and takes every
+        unclustered scene whose location is more than 0.3 similar to the seed.
+        Work is done per distinct location string, and only locations sharing
+        a keyword with the seed (via an inverted index) are compared.
+        """
+        # Dedup identical location strings, keeping first-appearance order
+        location_ids: Dict[str, int] = {}
+        location_scenes: List[List[int]] = []
+        for index, scene in enumerate(scenes):
+            location = scene.get('location', '')
+            if location not in location_ids:
+                location_ids[location] = len(location_scenes)
+                location_scenes.append([])
+            location_scenes[location_ids[location]].append(index)
+        locations = list(location_ids)
+        
+        # Inverted index: keyword -> distinct locations containing it
+        keyword_index = defaultdict(list)
+        for location_id, location in enumerate(locations):
+            for keyword in self.get_location_keywords(location):
+                keyword_index[keyword].append(location_id)
+        
+        clusters = {}
+        claimed = [False] * len(locations)
+        
+        for seed_id, seed_location in enumerate(locations):
+            seed_keywords = self.get_location_keywords(seed_location)
+            
+            if not seed_keywords:
+                # Without keywords nothing is similar, so every scene stands alone
+                for index in location_scenes[seed_id]:
+                    clusters.setdefault(seed_location, []).append(scenes[index])
+                claimed[seed_id] = True
                 continue
             
-            location = scene.get('location', '')
-            cluster_key = location
-            cluster_scenes = [scene]
-            processed_scenes.add(i)
+            if claimed[seed_id]:
+                continue
+            claimed[seed_id] = True
             
-            # Find similar locations
-            for j, other_scene in enumerate(scenes):
-                if j in processed_scenes or i == j:
-                    continue
-                
-                other_location = other_scene.get('location', '')
-                similarity = self.calculate_location_similarity(location, other_location)
-                
+            candidates = {
+                location_id
+                for keyword in seed_keywords
+                for location_id in keyword_index[keyword]
+                if not claimed[location_id]
+            }
+            member_ids = [seed_id]
+            strongly_similar = {seed_id} if len(location_scenes[seed_id]) > 1 else set()
+            for location_id in candidates:
+                similarity = self.calculate_location_similarity(seed_location, locations[location_id])
                 # If similarity > 0.3, consider them related
                 if similarity > 0.3:
-                    cluster_scenes.append(other_scene)
-                    processed_scenes.add(j)
-                    # Update cluster key to represent the group
+                    claimed[location_id] = True
+                    member_ids.append(location_id)
                     if similarity > 0.5:
-                        cluster_key = f"{location} & {other_location}"
+                        strongly_similar.add(location_id)
+            
+            member_indexes = sorted(index for location_id in member_ids for index in location_scenes[location_id])
+            
+            # Cluster key names the seed and the last strongly similar scene, in scene order
+            cluster_key = seed_location
+            seed_index = member_indexes[0]
+            for index in reversed(member_indexes):
+                if index != seed_index and location_ids[scenes[index].get('location', '')] in strongly_similar:
+                    cluster_key = f"{seed_location} & {scenes[index].get('location', '')}"
+                    break
             
-            clusters[cluster_key] = cluster_scenes
+            clusters[cluster_key] = [scenes[index] for index in member_indexes]
         
-        return dict(clusters)
+        return clusters
     
     def sort_scenes_within_cluster(self, scenes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Sort scenes within a location cluster by time of day"""
@@ -98,6 +159,44 @@ class ScheduleOptimizer:
             optimized_scenes.extend(sorted_cluster)
         
         return optimized_scenes
+    
+    def score_orderings(self, scenes: List[Dict[str, Any]],
+                        orderings: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        Estimate the cost of scene orderings with the vectorized schedule model
+        
+        Orderings are cut into standard-length days, so costs compare orderings
+        against each other rather than predict the final shooting days.
+        
+        Args:
+            scenes: Scene dicts the orderings are permutations of
+            orderings: Lists of the same scene objects in shooting order
+        """
+        solver, prepared, orders = self._prepare_orderings(scenes, orderings)
+        model = solver.build_model(prepared)
+        return model.breakdowns(model.evaluate_orderings(orders))
+    
+    def build_schedule_state(self, scenes: List[Dict[str, Any]],
+                             ordering: List[Dict[str, Any]]) -> ScheduleState:
+        """
+        Cut an ordering into standard-length days (as score_orderings does) and
+        wrap it in an incremental ScheduleState for what-if moves
+        """
+        solver, prepared, orders = self._prepare_orderings(scenes, [ordering])
+        assignment = solver.build_model(prepared).assignments_from_orderings(orders)[0]
+        days = defaultdict(list)
+        for index in orders[0]:
+            days[int(assignment[index])].append(int(index))
+        return solver.build_state(prepared, [days[day] for day in sorted(days)])
+    
+    def _prepare_orderings(self, scenes: List[Dict[str, Any]], orderings: List[List[Dict[str, Any]]]
+                           ) -> Tuple[LocalScheduleSolver, List[Dict[str, Any]], np.ndarray]:
+        """Normalise scenes for the solver and map orderings to scene indexes"""
+        solver = LocalScheduleSolver()
+        positions = {id(scene): index for index, scene in enumerate(scenes)}
+        orders = np.array([[positions[id(scene)] for scene in ordering] for ordering in orderings],
+                          dtype=np.int64).reshape(len(orderings), len(scenes))
+        return solver, solver.prepare_scenes(scenes), orders
 
 def load_json_file(filename: str) -> Dict[str, Any]:
     """Load JSON file with error handling"""
@@ -124,47 +223,195 @@ def save_json_file(data: Dict[str, Any], filename: str) -> None:
     except Exception as e:
         raise Exception(f"Error saving {filename}: {str(e)}")
 
+def analyze_scenes(scenes: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Analyze shooting_schedule.json scenes and estimate optimization potential"""
+    # Analyze current schedule
+    locations = {}
+    time_distribution = {'DAY': 0, 'DUSK': 0, 'NIGHT': 0}
+    actor_workload = defaultdict(int)
+    
+    for scene in scenes:
+        # Location analysis
+        location = scene.get('location', 'Unknown')
+        if location not in locations:
+            locations[location] = []
+        locations[location].append(scene.get('scene_number'))
+        
+        # Time distribution
+        time_of_day = scene.get('time_of_day', 'DAY')
+        time_distribution[time_of_day] += 1
+        
+        # Actor workload
+        for actor in scene.get('actors', []):
+            actor_name = actor.get('name')  # Note: different structure in shooting_schedule.json
+            if actor_name:
+                actor_workload[actor_name] += 1
+    
+    # Calculate optimization potential
+    optimizer = ScheduleOptimizer()
+    # Convert shooting_schedule format to production_schedule format for analysis
+    converted_scenes = []
+    for scene in scenes:
+        converted_scene = {
+            'scene_number': scene.get('scene_number'),
+            'location': scene.get('location'),
+            'time_of_day': scene.get('time_of_day'),
+            'actors': [{'actor_name': actor.get('name')} for actor in scene.get('actors', [])]
+        }
+        converted_scenes.append(converted_scene)
+    
+    location_clusters = optimizer.cluster_locations(converted_scenes)
+    
+    analysis = {
+        'total_scenes': len(scenes),
+        'unique_locations': len(locations),
+        'location_clusters_identified': len(location_clusters),
+        'time_distribution': time_distribution,
+        'busiest_actors': dict(sorted(actor_workload.items(), key=lambda x: x[1], reverse=True)[:5]),
+        'locations_breakdown': {loc: len(scene_nums) for loc, scene_nums in locations.items()},
+        'optimization_potential': {
+            'can_group_locations': len(location_clusters) < len(locations),
+            'location_savings': len(locations) - len(location_clusters)
+        }
+    }
+    
+    return analysis
+
+# Upper bound on independent runs per multi-start search request
+MAX_SEARCH_RUNS = 64
+
+# Incremental state of the optimized production schedule for schedule_move_cost,
+# rebuilt whenever the cached optimization changes
+_move_state_lock = threading.Lock()
+_move_state: Dict[str, Any] = {'key': None, 'state': None, 'scene_index': {}}
+
+# Optimization results shared by sort_schedule, preview_schedule and schedule_analysis,
+# recomputed only when the source files or the optimizer version change
+optimization_cache = DerivedDataCache(DATA_DIR)
+_saved_optimization_key = None
+
+def get_optimized_production_schedule() -> Dict[str, Any]:
+    """Load and optimize production_schedule.json once per file version"""
+    def compute():
+        production_data = load_json_file('production_schedule.json')
+        scenes = production_data.get('shooting_schedule', [])
+        if not scenes:
+            return {'production_data': production_data, 'optimized_scenes': [], 'schedule_cost': None}
+        
+        optimizer = ScheduleOptimizer()
+        optimized_scenes = optimizer.optimize_schedule(scenes)
+        original_cost, optimized_cost = optimizer.score_orderings(scenes, [scenes, optimized_scenes])
+        return {
+            'production_data': production_data,
+            'optimized_scenes': optimized_scenes,
+            'schedule_cost': {'original': original_cost, 'optimized': optimized_cost}
+        }
+    
+    return optimization_cache.get_or_compute(
+        'optimized_production_schedule', ['production_schedule.json'], compute, ScheduleOptimizer.VERSION
+    )
+
+def get_shooting_schedule_analysis() -> Dict[str, Any]:
+    """Analyze shooting_schedule.json once per file version (None when it has no scenes)"""
+    def compute():
+        shooting_data = load_json_file('shooting_schedule.json')
+        scenes = shooting_data.get('shooting_schedule', {}).get('scenes', [])
+        return analyze_scenes(scenes) if scenes else None
+    
+    return optimization_cache.get_or_compute(
+        'shooting_schedule_analysis', ['shooting_schedule.json'], compute, ScheduleOptimizer.VERSION
+    )
+
+def bool_option(options: Dict[str, Any], name: str, default: Optional[bool] = False) -> Optional[bool]:
+    """A JSON boolean body option; strings such as "false" are rejected rather than read as true"""
+    value = options.get(name)
+    if value is None:
+        return default
+    if not isinstance(value, bool):
+        raise ValueError(f'{name} must be true or false')
+    return value
+
+def int_option(options: Dict[str, Any], name: str, default: Optional[int] = None) -> Optional[int]:
+    """A JSON integer body option; 2.5, true and "2" are rejected rather than converted"""
+    value = options.get(name)
+    if value is None:
+        return default
+    if not isinstance(value, int) or isinstance(value, bool):
+        raise ValueError(f'{name} must be an integer')
+    return value
+
+def run_multi_start_search(scenes: List[Dict[str, Any]], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate workers/time_budget_ms and run a parallel multi-start search"""
+    workers = int_option(options, 'workers', default=1)
+    time_budget_ms = int_option(options, 'time_budget_ms')
+    if not 1 <= workers <= MAX_SEARCH_RUNS:
+        raise ValueError(f'workers must be between 1 and {MAX_SEARCH_RUNS}')
+    if time_budget_ms is not None and not 1 <= time_budget_ms <= Config.SCHEDULE_SEARCH_MAX_BUDGET_MS:
+        raise ValueError(f'time_budget_ms must be between 1 and {Config.SCHEDULE_SEARCH_MAX_BUDGET_MS}')
+    
+    return MultiStartSearch(workers=workers, time_budget_ms=time_budget_ms).run(scenes)
+
 @ai_bp.route('/sort_schedule', methods=['POST'])
 def sort_schedule():
     """
     AI-assisted schedule sorting endpoint
-    Loads production_schedule.json and shooting_schedule.json, optimizes the order,
+    Optimizes the production_schedule.json order (cached per file version)
     and returns/saves the optimized schedule
+    
+    Optional body: {"workers": 8, "time_budget_ms": 2000} runs a parallel
+    multi-start local search instead and returns its convergence statistics
     """
     try:
-        # Load both JSON files
-        production_data = load_json_file('production_schedule.json')
-        shooting_data = load_json_file('shooting_schedule.json')
+        global _saved_optimization_key
         
-        # Extract scenes from production_schedule (primary source)
-        scenes = production_data.get('shooting_schedule', [])
+        # Optimized scenes come from the shared cache (production_schedule.json is the primary source)
+        optimization = get_optimized_production_schedule()
+        production_data = optimization['production_data']
+        optimized_scenes = optimization['optimized_scenes']
         
-        if not scenes:
+        if not optimized_scenes:
             return jsonify({
                 'status': 'error',
                 'message': 'No scenes found in production_schedule.json'
             }), 400
         
-        # Initialize optimizer and optimize
-        optimizer = ScheduleOptimizer()
-        optimized_scenes = optimizer.optimize_schedule(scenes)
-        
-        # Create optimized schedule structure
-        optimized_data = {
-            'project_info': production_data.get('project_info', {}),
-            'optimization_info': {
-                'optimized_at': '2025-10-05T14:20:13+05:30',
-                'optimization_method': 'AI-assisted location clustering and time sorting',
-                'total_scenes': len(optimized_scenes)
-            },
-            'optimized_schedule': optimized_scenes,
-            'actor_schedule_summary': production_data.get('actor_schedule_summary', {}),
-            'location_summary': production_data.get('location_summary', {}),
-            'extras_summary': production_data.get('extras_summary', {})
-        }
+        request_data = request.get_json(silent=True) or {}
+        search = None
+        schedule_cost = optimization['schedule_cost']
+        if request_data.get('workers') is not None or request_data.get('time_budget_ms') is not None:
+            search = run_multi_start_search(production_data.get('shooting_schedule', []), request_data)
+            scenes = production_data['shooting_schedule']
+            optimized_scenes = [scenes[index] for index in search['ordering']]
+            # Same model as the cached original cost, so the two are comparable
+            schedule_cost = {
+                'original': schedule_cost['original'],
+                'optimized': ScheduleOptimizer().score_orderings(scenes, [optimized_scenes])[0]
+            }
         
-        # Save optimized schedule
-        save_json_file(optimized_data, 'optimized_schedule.json')
+        # Only rewrite optimized_schedule.json when the optimization result changed
+        cache_key = optimization_cache.peek_key('optimized_production_schedule')
+        output_path = os.path.join(DATA_DIR, 'optimized_schedule.json')
+        if search or cache_key != _saved_optimization_key or not os.path.exists(output_path):
+            # Create optimized schedule structure
+            optimized_data = {
+                'project_info': production_data.get('project_info', {}),
+                'optimization_info': {
+                    'optimized_at': datetime.now().astimezone().isoformat(timespec='seconds'),
+                    'optimization_method': (
+                        'Parallel multi-start local search' if search
+                        else 'AI-assisted location clustering and time sorting'
+                    ),
+                    'total_scenes': len(optimized_scenes)
+                },
+                'optimized_schedule': optimized_scenes,
+                'actor_schedule_summary': production_data.get('actor_schedule_summary', {}),
+                'location_summary': production_data.get('location_summary', {}),
+                'extras_summary': production_data.get('extras_summary', {})
+            }
+            
+            # Save optimized schedule (a search result is never the cached default)
+            save_json_file(optimized_data, 'optimized_schedule.json')
+            _saved_optimization_key = None if search else cache_key
         
         # Prepare response with simplified scene info
         sorted_scenes = [
@@ -179,13 +426,18 @@ def sort_schedule():
             for scene in optimized_scenes
         ]
         
-        return jsonify({
+        response = {
             'status': 'success',
             'message': 'Schedule optimized successfully',
             'total_scenes': len(sorted_scenes),
             'sorted_scenes': sorted_scenes,
+            'schedule_cost': schedule_cost,
             'saved_file': 'optimized_schedule.json'
-        })
+        }
+        if search:
+            response['total_shooting_days'] = search['schedule']['total_shooting_days']
+            response['search_stats'] = search['search_stats']
+        return jsonify(response)
     
     except FileNotFoundError as e:
         return jsonify({
@@ -211,20 +463,15 @@ def preview_schedule():
     Preview endpoint - returns top 5 optimized scenes for UI preview
     """
     try:
-        # Load production schedule
-        production_data = load_json_file('production_schedule.json')
-        scenes = production_data.get('shooting_schedule', [])
+        # Optimized scenes come from the shared cache
+        optimized_scenes = get_optimized_production_schedule()['optimized_scenes']
         
-        if not scenes:
+        if not optimized_scenes:
             return jsonify({
                 'status': 'error',
                 'message': 'No scenes found in production_schedule.json'
             }), 400
         
-        # Initialize optimizer and optimize
-        optimizer = ScheduleOptimizer()
-        optimized_scenes = optimizer.optimize_schedule(scenes)
-        
         # Get top 5 scenes for preview
         preview_scenes = optimized_scenes[:5]
         
@@ -288,12 +535,22 @@ def generate_gemini_schedule():
         request_data = request.get_json() or {}
         actor_constraints = request_data.get('actor_constraints', {})
         location_preferences = request_data.get('location_preferences', {})
+        bypass_cache = bool_option(request_data, 'bypass_cache')
+        scenes = shooting_data['shooting_schedule']['scenes']
+        hierarchical = bool_option(request_data, 'hierarchical', default=None)
+        if hierarchical is None:
+            hierarchical = len(scenes) >= Config.GEMINI_HIERARCHICAL_MIN_SCENES
         
         # Initialize Gemini scheduler
         gemini_scheduler = GeminiScheduler()
         
-        # Generate schedule using Gemini AI
-        result = gemini_scheduler.generate_schedule(shooting_data)
+        # Generate schedule using Gemini AI (cached responses are reused unless bypassed)
+        if hierarchical:
+            # Large projects: location blocks scheduled concurrently, then stitched
+            clusters = ScheduleOptimizer().cluster_locations(scenes)
+            result = gemini_scheduler.generate_block_schedule(shooting_data, clusters, use_cache=not bypass_cache)
+        else:
+            result = gemini_scheduler.generate_schedule(shooting_data, use_cache=not bypass_cache)
         
         # Check if there was an error
         if 'error' in result:
@@ -319,6 +576,15 @@ def generate_gemini_schedule():
             'total_shooting_days': result.get('optimized_schedule', {}).get('total_shooting_days', 0)
         })
     
+    except RateLimitExceeded as e:
+        response = jsonify({
+            'status': 'error',
+            'message': 'Gemini API rate limit reached, please retry shortly',
+            'retry_after_seconds': float(e.retry_after_header)
+        })
+        response.headers['Retry-After'] = e.retry_after_header
+        return response, 429
+    
     except FileNotFoundError as e:
         return jsonify({
             'status': 'error',
@@ -337,13 +603,100 @@ def generate_gemini_schedule():
             'message': f'Schedule generation failed: {str(e)}'
         }), 500
 
-@ai_bp.route('/schedule_analysis', methods=['GET'])
-def schedule_analysis():
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Encode one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@ai_bp.route('/generate_gemini_schedule/stream', methods=['POST'])
+def stream_gemini_schedule():
     """
-    Additional endpoint to analyze current schedule and provide insights
+    Streaming variant of generate_gemini_schedule using server-sent events
+    
+    Events: start, day (one daily_schedules entry, in day order), reset (drop
+    the days received so far; fallback days follow), complete (same body as
+    generate_gemini_schedule) and error
+    """
+    try:
+        shooting_data = load_json_file('shooting_schedule.json')
+        
+        if not shooting_data.get('shooting_schedule', {}).get('scenes'):
+            return jsonify({
+                'status': 'error',
+                'message': 'No scenes found in shooting_schedule.json'
+            }), 400
+        
+        request_data = request.get_json(silent=True) or {}
+        bypass_cache = bool_option(request_data, 'bypass_cache')
+        events = GeminiScheduler().stream_schedule(shooting_data, use_cache=not bypass_cache)
+    
+    except FileNotFoundError as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Required file not found: {str(e)}'
+        }), 404
+    
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Invalid data format: {str(e)}'
+        }), 400
+    
+    def generate():
+        try:
+            for event, data in events:
+                if event != 'complete':
+                    yield format_sse(event, data)
+                    continue
+                
+                schedule = data.get('optimized_schedule', {})
+                if 'error' in data:
+                    body = {
+                        'status': 'warning',
+                        'message': f'Gemini AI unavailable, using fallback algorithm: {data["error"]}',
+                        'is_mock': data.get('is_mock', False)
+                    }
+                else:
+                    output_filename = 'gemini_optimized_schedule.json'
+                    save_json_file(data, output_filename)
+                    body = {
+                        'status': 'success',
+                        'message': 'AI schedule generated successfully using Gemini',
+                        'saved_file': output_filename
+                    }
+                body.update({
+                    'schedule_data': schedule,
+                    'generation_info': data.get('generation_info', {}),
+                    'total_shooting_days': schedule.get('total_shooting_days', 0)
+                })
+                yield format_sse('complete', body)
+        
+        except RateLimitExceeded as e:
+            yield format_sse('error', {
+                'status': 'error',
+                'message': 'Gemini API rate limit reached, please retry shortly',
+                'retry_after_seconds': float(e.retry_after_header)
+            })
+        
+        except Exception as e:
+            yield format_sse('error', {
+                'status': 'error',
+                'message': f'Schedule generation failed: {str(e)}'
+            })
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        # Disable proxy buffering so each day reaches the client when it is sent
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@ai_bp.route('/generate_local_schedule', methods=['POST'])
+def generate_local_schedule():
+    """
+    Generate a schedule offline with the local constraint solver
+    Deterministic for a given seed and does not use Gemini quota
     """
     try:
-        # Use shooting_schedule.json as primary source
         shooting_data = load_json_file('shooting_schedule.json')
         scenes = shooting_data.get('shooting_schedule', {}).get('scenes', [])
         
@@ -353,55 +706,167 @@ def schedule_analysis():
                 'message': 'No scenes found in shooting_schedule.json'
             }), 400
         
-        # Analyze current schedule
-        locations = {}
-        time_distribution = {'DAY': 0, 'DUSK': 0, 'NIGHT': 0}
-        actor_workload = defaultdict(int)
-        
-        for scene in scenes:
-            # Location analysis
-            location = scene.get('location', 'Unknown')
-            if location not in locations:
-                locations[location] = []
-            locations[location].append(scene.get('scene_number'))
+        # Optional solver parameters from request
+        request_data = request.get_json(silent=True) or {}
+        solver_options = {
+            key: int(request_data[key])
+            for key in ('max_day_minutes', 'standard_day_minutes', 'seed', 'max_iterations')
+            if request_data.get(key) is not None
+        }
+        
+        solver = LocalScheduleSolver(**solver_options)
+        schedule = solver.solve(scenes)
+        
+        return jsonify({
+            'status': 'success',
+            'message': 'Schedule generated with local solver',
+            'schedule_data': schedule,
+            'solver_stats': schedule.get('solver_stats', {}),
+            'total_shooting_days': schedule.get('total_shooting_days', 0)
+        })
+    
+    except FileNotFoundError as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Required file not found: {str(e)}'
+        }), 404
+    
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Invalid data format: {str(e)}'
+        }), 400
+    
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Schedule generation failed: {str(e)}'
+        }), 500
+
+@ai_bp.route('/schedule_move_cost', methods=['POST'])
+def schedule_move_cost():
+    """
+    What-if cost of moving strips on the optimized production schedule
+    The move is evaluated incrementally and undone; nothing is saved.
+    
+    Body: {"move": "relocate", "scene_number": 3, "target_day": 2}
+          {"move": "swap", "scene_number": 3, "other_scene_number": 7}
+          {"move": "shift_day", "source_day": 1, "target_day": 4}
+    Days are 1-based; relocating to one past the last day opens a new day.
+    """
+    try:
+        optimization = get_optimized_production_schedule()
+        if not optimization['optimized_scenes']:
+            return jsonify({
+                'status': 'error',
+                'message': 'No scenes found in production_schedule.json'
+            }), 400
+        
+        request_data = request.get_json(silent=True) or {}
+        move = request_data.get('move')
+        if move not in ('relocate', 'swap', 'shift_day'):
+            raise ValueError("move must be 'relocate', 'swap' or 'shift_day'")
+        
+        with _move_state_lock:
+            cache_key = optimization_cache.peek_key('optimized_production_schedule')
+            if _move_state['key'] != cache_key or _move_state['state'] is None:
+                scenes = optimization['production_data'].get('shooting_schedule', [])
+                _move_state['state'] = ScheduleOptimizer().build_schedule_state(
+                    scenes, optimization['optimized_scenes']
+                )
+                scene_index = {}
+                for index, scene in enumerate(scenes):
+                    scene_index.setdefault(scene.get('scene_number'), index)
+                _move_state['scene_index'] = scene_index
+                _move_state['key'] = cache_key
+            
+            state = _move_state['state']
+            scene_index = _move_state['scene_index']
+            day_count = len(state.order)
+            
+            def scene_arg(field):
+                if request_data.get(field) not in scene_index:
+                    raise ValueError(f"Unknown {field}: {request_data.get(field)}")
+                return scene_index[request_data[field]]
             
-            # Time distribution
-            time_of_day = scene.get('time_of_day', 'DAY')
-            time_distribution[time_of_day] += 1
+            def day_arg(field, allow_new=False):
+                limit = day_count + 1 if allow_new else day_count
+                day = int(request_data.get(field, 0))
+                if not 1 <= day <= limit:
+                    raise ValueError(f"{field} must be between 1 and {limit}")
+                return day - 1
             
-            # Actor workload
-            for actor in scene.get('actors', []):
-                actor_name = actor.get('name')  # Note: different structure in shooting_schedule.json
-                if actor_name:
-                    actor_workload[actor_name] += 1
+            cost_before = state.breakdown()
+            if move == 'relocate':
+                scene = scene_arg('scene_number')
+                position = day_arg('target_day', allow_new=True)
+                # The new day is removed again below, so the shared state keeps its calendar
+                added_day = position == day_count and not state.is_empty(state.order[-1])
+                if added_day:
+                    state.add_day()
+                position = min(position, len(state.order) - 1)
+                source, target = state.scene_day[scene], state.order[position]
+                delta = state.relocate(scene, target)
+                feasible = state.fits(target)
+                cost_after = state.breakdown()
+                state.relocate(scene, source)
+                if added_day:
+                    state.remove_day()
+            elif move == 'swap':
+                first, second = scene_arg('scene_number'), scene_arg('other_scene_number')
+                day_a, day_b = state.scene_day[first], state.scene_day[second]
+                delta = state.swap(first, second)
+                feasible = state.fits(day_a) and state.fits(day_b)
+                cost_after = state.breakdown()
+                state.swap(first, second)
+            else:
+                source, target = day_arg('source_day'), day_arg('target_day')
+                delta = state.shift_day(source, target)
+                feasible = True
+                cost_after = state.breakdown()
+                state.shift_day(target, source)
         
-        # Calculate optimization potential
-        optimizer = ScheduleOptimizer()
-        # Convert shooting_schedule format to production_schedule format for analysis
-        converted_scenes = []
-        for scene in scenes:
-            converted_scene = {
-                'scene_number': scene.get('scene_number'),
-                'location': scene.get('location'),
-                'time_of_day': scene.get('time_of_day'),
-                'actors': [{'actor_name': actor.get('name')} for actor in scene.get('actors', [])]
-            }
-            converted_scenes.append(converted_scene)
-        
-        location_clusters = optimizer.cluster_locations(converted_scenes)
-        
-        analysis = {
-            'total_scenes': len(scenes),
-            'unique_locations': len(locations),
-            'location_clusters_identified': len(location_clusters),
-            'time_distribution': time_distribution,
-            'busiest_actors': dict(sorted(actor_workload.items(), key=lambda x: x[1], reverse=True)[:5]),
-            'locations_breakdown': {loc: len(scene_nums) for loc, scene_nums in locations.items()},
-            'optimization_potential': {
-                'can_group_locations': len(location_clusters) < len(locations),
-                'location_savings': len(locations) - len(location_clusters)
-            }
-        }
+        return jsonify({
+            'status': 'success',
+            'move': move,
+            'feasible': feasible,
+            'delta': delta,
+            'cost_before': cost_before,
+            'cost_after': cost_after
+        })
+    
+    except FileNotFoundError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 404
+    
+    except (TypeError, ValueError) as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': f'Internal server error: {str(e)}'
+        }), 500
+
+@ai_bp.route('/schedule_analysis', methods=['GET'])
+def schedule_analysis():
+    """
+    Additional endpoint to analyze current schedule and provide insights
+    """
+    try:
+        # Analysis is shared across requests until shooting_schedule.json changes
+        analysis = get_shooting_schedule_analysis()
+        
+        if analysis is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'No scenes found in shooting_schedule.json'
+            }), 400
         
         return jsonify({
             'status': 'success',
@@ -1,6 +1,9 @@
 from flask import Blueprint, request, jsonify, send_file
 from werkzeug.utils import secure_filename
 from utils.json_handler import json_handler
+from utils.query_engine import Collection, page_response, parse_query
+from utils.validators import ValidationError
+from utils.http_cache import conditional
 from config import Config
 import os
 import uuid
@@ -8,6 +11,25 @@ from datetime import datetime
 
 assets_bp = Blueprint('assets', __name__)
 
+def public_asset(asset):
+    """Asset record without internal file paths"""
+    return {
+        'id': asset.get('id'),
+        'name': asset.get('name'),
+        'size': asset.get('size'),
+        'type': asset.get('type'),
+        'uploadDate': asset.get('uploadDate'),
+        'url': asset.get('url')
+    }
+
+ASSETS = Collection(
+    'assets', 'assets.json',
+    fields=['id', 'name', 'size', 'type', 'uploadDate', 'url'],
+    indexes=['type'],
+    range_indexes=['uploadDate', 'size'],
+    public=public_asset
+)
+
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and \
@@ -101,29 +123,20 @@ def upload_asset():
         }), 500
 
 @assets_bp.route('', methods=['GET'])
+@conditional('assets.json')
 def get_assets():
-    """Get all assets"""
+    """Get assets, optionally filtered, sorted and paginated (see utils.query_engine)"""
     try:
-        assets = json_handler.read_json('assets.json', [])
+        # Internal file paths are removed when the collection is loaded
+        query = parse_query(request.args, ASSETS, Config.QUERY_MAX_LIMIT)
         
-        # Return assets without internal file paths
-        public_assets = []
-        for asset in assets:
-            public_asset = {
-                'id': asset.get('id'),
-                'name': asset.get('name'),
-                'size': asset.get('size'),
-                'type': asset.get('type'),
-                'uploadDate': asset.get('uploadDate'),
-                'url': asset.get('url')
-            }
-            public_assets.append(public_asset)
+        return jsonify(page_response(ASSETS.query(query), query)), 200
         
+    except ValidationError as e:
         return jsonify({
-            'success': True,
-            'data': public_assets
-        }), 200
-        
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -131,6 +144,7 @@ def get_assets():
         }), 500
 
 @assets_bp.route('/<asset_id>', methods=['GET'])
+@conditional('assets.json')
 def get_asset(asset_id):
     """Get asset by ID"""
     try:
@@ -237,40 +251,24 @@ def delete_asset(asset_id):
         }), 500
 
 @assets_bp.route('/search', methods=['GET'])
+@conditional('assets.json')
 def search_assets():
     """Search assets by name or type"""
     try:
-        query = request.args.get('q', '').lower()
-        asset_type = request.args.get('type', '').lower()
+        query = parse_query(request.args, ASSETS, Config.QUERY_MAX_LIMIT, ignore=['q', 'type'])
         
-        assets = json_handler.read_json('assets.json', [])
-        filtered_assets = []
+        # q and type match anywhere in the name and type, ignoring case
+        for field, param in [('name', 'q'), ('type', 'type')]:
+            if request.args.get(param):
+                query.filters.append((field, 'contains', request.args[param]))
         
-        for asset in assets:
-            # Filter by query
-            if query and query not in asset.get('name', '').lower():
-                continue
-            
-            # Filter by type
-            if asset_type and asset_type not in asset.get('type', '').lower():
-                continue
-            
-            # Return public asset data
-            public_asset = {
-                'id': asset.get('id'),
-                'name': asset.get('name'),
-                'size': asset.get('size'),
-                'type': asset.get('type'),
-                'uploadDate': asset.get('uploadDate'),
-                'url': asset.get('url')
-            }
-            filtered_assets.append(public_asset)
+        return jsonify(page_response(ASSETS.query(query), query)), 200
         
+    except ValidationError as e:
         return jsonify({
-            'success': True,
-            'data': filtered_assets
-        }), 200
-        
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
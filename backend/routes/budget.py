@@ -1,10 +1,24 @@
 from flask import Blueprint, request, jsonify
 from utils.json_handler import json_handler
+from utils.query_engine import Collection, page_response, parse_query
+from utils.schemas import validate_payload
+from utils.validators import ValidationError
+from utils.http_cache import conditional
+from config import Config
 from datetime import datetime
 
 budget_bp = Blueprint('budget', __name__)
 
+BUDGET_HISTORY = Collection(
+    'budget history', 'budget.json', items_key='history',
+    fields=['date', 'amount', 'category', 'description'],
+    indexes=['category'],
+    range_indexes=['date', 'amount'],
+    default_sort='-date'
+)
+
 @budget_bp.route('', methods=['GET'])
+@conditional('budget.json')
 def get_budget():
     """Get budget overview (requires budget-related permissions)"""
     try:
@@ -39,6 +53,9 @@ def update_budget_category(category_name):
                 'message': 'No data provided'
             }), 400
         
+        # Validate the fields being changed
+        validate_payload('budget_category', data, partial=True)
+        
         budget = json_handler.read_json('budget.json', {})
         
         if not budget:
@@ -93,6 +110,11 @@ def update_budget_category(category_name):
                 'message': 'Failed to update budget category'
             }), 500
             
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -111,14 +133,8 @@ def add_budget_entry():
                 'message': 'No data provided'
             }), 400
         
-        # Validate required fields
-        required_fields = ['amount', 'category', 'description']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({
-                    'success': False,
-                    'message': f'{field} is required'
-                }), 400
+        # Validate fields, amount and date
+        validate_payload('budget_entry', data)
         
         budget = json_handler.read_json('budget.json', {})
         
@@ -187,6 +203,11 @@ def add_budget_entry():
                 'message': 'Failed to add budget entry'
             }), 500
             
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -194,6 +215,7 @@ def add_budget_entry():
         }), 500
 
 @budget_bp.route('/categories', methods=['GET'])
+@conditional('budget.json')
 def get_budget_categories():
     """Get budget categories"""
     try:
@@ -219,27 +241,26 @@ def get_budget_categories():
         }), 500
 
 @budget_bp.route('/history', methods=['GET'])
+@conditional('budget.json')
 def get_budget_history():
-    """Get budget history"""
+    """Get budget history, newest first unless another sort is requested"""
     try:
-        budget = json_handler.read_json('budget.json', {})
+        query = parse_query(request.args, BUDGET_HISTORY, Config.QUERY_MAX_LIMIT)
+        history = BUDGET_HISTORY.load()
         
-        if not budget:
+        if not history.found:
             return jsonify({
                 'success': False,
                 'message': 'Budget data not found'
             }), 404
         
-        history = budget.get('history', [])
-        
-        # Sort by date (newest first)
-        history.sort(key=lambda x: x.get('date', ''), reverse=True)
+        return jsonify(page_response(history.query(query), query)), 200
         
+    except ValidationError as e:
         return jsonify({
-            'success': True,
-            'data': history
-        }), 200
-        
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -247,6 +268,7 @@ def get_budget_history():
         }), 500
 
 @budget_bp.route('/forecast', methods=['GET'])
+@conditional('budget.json')
 def get_budget_forecast():
     """Get budget forecast"""
     try:
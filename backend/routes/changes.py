@@ -0,0 +1,65 @@
+from flask import Blueprint, request, jsonify
+from utils.change_feed import FEED_SOURCES, change_feed
+from utils.validators import ValidationError
+from config import Config
+
+changes_bp = Blueprint('changes', __name__)
+
+FEED_COLLECTIONS = sorted({source.collection for source in FEED_SOURCES.values()} |
+                          {source.item_collection for source in FEED_SOURCES.values() if source.items_key})
+
+def _number_param(name, convert, default, low, high):
+    """Numeric query parameter within [low, high]"""
+    value = request.args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        value = convert(value)
+    except ValueError:
+        raise ValidationError(f'{name} must be a number', name)
+    if not low <= value <= high:
+        raise ValidationError(f'{name} must be between {low} and {high}', name)
+    return value
+
+@changes_bp.route('', methods=['GET'])
+def get_changes():
+    """
+    Changes recorded after a sequence number, for delta sync
+
+    Query: since (last seq applied, default 0), wait (seconds to long-poll when
+    nothing is new yet), limit, collections (comma-separated, e.g. tasks,scenes)
+    and epoch (from the previous response; a different epoch means the server
+    restarted and the client must resync)
+    """
+    try:
+        since = _number_param('since', int, 0, 0, 2 ** 63)
+        wait = _number_param('wait', float, 0, 0, Config.CHANGE_FEED_MAX_WAIT_SECONDS)
+        limit = _number_param('limit', int, Config.CHANGE_FEED_MAX_LIMIT, 1, Config.CHANGE_FEED_MAX_LIMIT)
+        collections = [name for name in request.args.get('collections', '').split(',') if name]
+        unknown = [name for name in collections if name not in FEED_COLLECTIONS]
+        if unknown:
+            raise ValidationError(f'Unknown collection "{unknown[0]}" (allowed: {", ".join(FEED_COLLECTIONS)})',
+                                  'collections')
+
+        epoch = request.args.get('epoch')
+        if epoch and epoch != change_feed.epoch:
+            result = change_feed.changes_since(change_feed.latest_seq, limit)
+            result['resync'] = True
+        else:
+            result = change_feed.changes_since(since, limit, collections, wait)
+
+        return jsonify({
+            'success': True,
+            'data': result
+        }), 200
+
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': f'Failed to get changes: {str(e)}'
+        }), 500
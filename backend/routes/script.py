@@ -1,25 +1,75 @@
 from flask import Blueprint, request, jsonify, current_app
 from utils.json_handler import json_handler
+from utils.query_engine import Collection, page_response, parse_query
+from utils.schemas import validate_many, validate_payload
+from utils.validators import ValidationError
+from config import Config
 from datetime import datetime
 import os
 
 script_bp = Blueprint('script', __name__)
 
-from utils.data_transformer import transform_script_data
+# Scenes carry many breakdown fields, so any of them may be queried
+SCENES = Collection(
+    'scenes', 'script.json', items_key='scenes',
+    indexes=['location', 'status', 'int_ext', 'timeOfDay', 'characters', 'vfx_required'],
+    range_indexes=['scene_number', 'estimatedDuration']
+)
+
+from utils.data_transformer import SCENE_SUMMARY_FIELDS, project_script, transform_script_data
+from utils.derived_cache import derived_cache
+from utils.http_cache import conditional
+
+SCRIPT_VIEWS = ['full', 'summary']
+
+# Bump when transform_script_data changes shape so cached output is rebuilt
+TRANSFORM_VERSION = '1'
+
+def load_transformed_script():
+    """
+    transform_script_data output for the current script.json, built once per
+    file version and shared by every request until the file changes.
+    The returned dict is shared and must not be mutated.
+    """
+    def transform():
+        script_data = json_handler.read_json('script.json', {})
+        return transform_script_data(script_data) if script_data else None
+    
+    script_path = os.path.join(json_handler.data_dir, 'script.json')
+    return derived_cache.get_or_compute('transformed_script', [script_path], transform, TRANSFORM_VERSION)
+
+def _field_list(value):
+    """Comma-separated query parameter as a list"""
+    return [field.strip() for field in (value or '').split(',') if field.strip()]
 
 @script_bp.route('', methods=['GET'])
+@conditional('script.json', version=TRANSFORM_VERSION)
 def get_script():
-    """Get and transform script data"""
+    """
+    Get and transform script data
+
+    Query: view=summary for scene headers only, fields=a,b to return only
+    those scene fields, exclude=a,b to drop scene fields
+    """
     try:
-        script_data = json_handler.read_json('script.json', {})
+        view = request.args.get('view', 'full')
+        if view not in SCRIPT_VIEWS:
+            return jsonify({
+                'success': False,
+                'message': f'view must be one of: {", ".join(SCRIPT_VIEWS)}'
+            }), 400
+        fields = _field_list(request.args.get('fields')) or (SCENE_SUMMARY_FIELDS if view == 'summary' else None)
+        exclude = _field_list(request.args.get('exclude'))
+        
+        transformed_script = load_transformed_script()
         
-        if not script_data:
+        if not transformed_script:
             return jsonify({
                 'success': False,
                 'message': 'Script data not found'
             }), 404
         
-        transformed_script = transform_script_data(script_data)
+        transformed_script = project_script(transformed_script, fields, exclude)
         
         return jsonify({
             'success': True,
@@ -65,6 +115,11 @@ def update_script():
         # Recalculate totals if scenes are updated
         if 'scenes' in data:
             scenes = data['scenes']
+            # Check every scene in one pass; report the first bad one
+            scene_errors = validate_many('scene', scenes, partial=True)
+            if scene_errors:
+                index, error = next(iter(scene_errors.items()))
+                raise ValidationError(f'Scene {index + 1}: {error.message}', error.field)
             script['scenes'] = scenes
             script['totalScenes'] = len(scenes)
             script['totalEstimatedDuration'] = sum(scene.get('estimatedDuration', 0) for scene in scenes)
@@ -96,6 +151,11 @@ def update_script():
                 'message': 'Failed to update script'
             }), 500
             
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -114,6 +174,9 @@ def update_scene(scene_id):
                 'message': 'No data provided'
             }), 400
         
+        # Validate the fields being changed
+        validate_payload('scene', data, partial=True)
+        
         script = json_handler.read_json('script.json', {})
         
         if not script:
@@ -171,6 +234,11 @@ def update_scene(scene_id):
                 'message': 'Failed to update scene'
             }), 500
             
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -246,7 +314,6 @@ def add_scene():
             }), 400
         
         # Validate required fields (support both old and new format)
-        required_fields = ['scene_number', 'title', 'location', 'day_night', 'estimated_runtime_minutes']
         # Check for legacy field names if new ones not present
         if not data.get('scene_number') and data.get('number'):
             data['scene_number'] = data['number']
@@ -257,12 +324,7 @@ def add_scene():
         if not data.get('estimated_runtime_minutes') and data.get('estimatedDuration'):
             data['estimated_runtime_minutes'] = data['estimatedDuration']
             
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({
-                    'success': False,
-                    'message': f'{field} is required'
-                }), 400
+        validate_payload('scene', data)
         
         script = json_handler.read_json('script.json', {})
         
@@ -344,6 +406,11 @@ def add_scene():
                 'message': 'Failed to add scene'
             }), 500
             
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -351,24 +418,26 @@ def add_scene():
         }), 500
 
 @script_bp.route('/scenes', methods=['GET'])
+@conditional('script.json')
 def get_scenes():
-    """Get all scenes"""
+    """Get scenes, optionally filtered, sorted and paginated (see utils.query_engine)"""
     try:
-        script = json_handler.read_json('script.json', {})
+        query = parse_query(request.args, SCENES, Config.QUERY_MAX_LIMIT)
+        scenes = SCENES.load()
         
-        if not script:
+        if not scenes.found:
             return jsonify({
                 'success': False,
                 'message': 'Script data not found'
             }), 404
         
-        scenes = script.get('scenes', [])
+        return jsonify(page_response(scenes.query(query), query)), 200
         
+    except ValidationError as e:
         return jsonify({
-            'success': True,
-            'data': scenes
-        }), 200
-        
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -376,6 +445,7 @@ def get_scenes():
         }), 500
 
 @script_bp.route('/scene/<scene_id>', methods=['GET'])
+@conditional('script.json')
 def get_scene(scene_id):
     """Get specific scene by ID"""
     try:
@@ -1,20 +1,61 @@
 from flask import Blueprint, request, jsonify
 from utils.json_handler import json_handler
 from utils.auth import get_user_by_id
+from utils.query_engine import Collection, Query, page_response, parse_query
+from utils.schemas import SCHEMAS, validate_many, validate_payload
+from utils.validators import ValidationError
+from utils.http_cache import conditional
+from config import Config
 
 tasks_bp = Blueprint('tasks', __name__)
 
+BULK_OPERATIONS = ['create', 'update', 'delete']
+
+TASKS = Collection(
+    'tasks', 'tasks.json',
+    fields=['id', 'title', 'description', 'status', 'assignee', 'assigneeId', 'dueDate', 'priority',
+            'category', 'estimatedHours'],
+    indexes=['status', 'priority', 'category', 'assigneeId'],
+    range_indexes=['dueDate'],
+    default_sort='id',
+    ranked={field: SCHEMAS['task']['properties'][field]['enum'] for field in ['status', 'priority']}
+)
+
+def build_task(task_id, data, assignee_name):
+    """New task record from validated request data"""
+    return {
+        'id': task_id,
+        'title': data['title'],
+        'description': data['description'],
+        'status': data.get('status', 'todo'),
+        'assignee': assignee_name,
+        'assigneeId': data['assigneeId'],
+        'dueDate': data['dueDate'],
+        'priority': data['priority'],
+        'category': data['category'],
+        'estimatedHours': data.get('estimatedHours', 0)
+    }
+
 @tasks_bp.route('', methods=['GET'])
+@conditional('tasks.json')
 def get_tasks():
-    """Get all tasks"""
+    """
+    Get tasks, optionally filtered, sorted and paginated
+
+    Query: any task field as a filter (status=todo,in_progress,
+    dueDate=2024-10-01..2024-10-31, title=~rig), sort (e.g. dueDate,-priority),
+    fields, limit, cursor (nextCursor from the previous page) and explain
+    """
     try:
-        tasks = json_handler.read_json('tasks.json', [])
+        query = parse_query(request.args, TASKS, Config.QUERY_MAX_LIMIT)
         
-        return jsonify({
-            'success': True,
-            'data': tasks
-        }), 200
+        return jsonify(page_response(TASKS.query(query), query)), 200
         
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -22,6 +63,7 @@ def get_tasks():
         }), 500
 
 @tasks_bp.route('/<task_id>', methods=['GET'])
+@conditional('tasks.json')
 def get_task(task_id):
     """Get task by ID"""
     try:
@@ -56,14 +98,8 @@ def create_task():
                 'message': 'No data provided'
             }), 400
         
-        # Validate required fields
-        required_fields = ['title', 'description', 'assigneeId', 'dueDate', 'priority', 'category']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({
-                    'success': False,
-                    'message': f'{field} is required'
-                }), 400
+        # Validate fields, status and priority
+        validate_payload('task', data)
         
         # Validate assignee exists
         assignee = get_user_by_id(data['assigneeId'])
@@ -73,35 +109,8 @@ def create_task():
                 'message': 'Assignee not found'
             }), 400
         
-        # Validate status
-        valid_statuses = ['todo', 'in_progress', 'done']
-        if 'status' in data and data['status'] not in valid_statuses:
-            return jsonify({
-                'success': False,
-                'message': f'Status must be one of: {", ".join(valid_statuses)}'
-            }), 400
-        
-        # Validate priority
-        valid_priorities = ['low', 'medium', 'high']
-        if data['priority'] not in valid_priorities:
-            return jsonify({
-                'success': False,
-                'message': f'Priority must be one of: {", ".join(valid_priorities)}'
-            }), 400
-        
         # Create new task
-        new_task = {
-            'id': json_handler.get_next_id('tasks.json'),
-            'title': data['title'],
-            'description': data['description'],
-            'status': data.get('status', 'todo'),
-            'assignee': assignee['name'],
-            'assigneeId': data['assigneeId'],
-            'dueDate': data['dueDate'],
-            'priority': data['priority'],
-            'category': data['category'],
-            'estimatedHours': data.get('estimatedHours', 0)
-        }
+        new_task = build_task(json_handler.get_next_id('tasks.json'), data, assignee['name'])
         
         # Add to tasks list
         tasks = json_handler.read_json('tasks.json', [])
@@ -120,12 +129,188 @@ def create_task():
                 'message': 'Failed to create task'
             }), 500
             
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
             'message': 'Failed to create task'
         }), 500
 
+def _operation_result(index, operation, status, message=None, task_id=None, data=None):
+    """Per-item entry in a bulk response"""
+    result = {
+        'index': index,
+        'op': operation.get('op') if isinstance(operation, dict) else None,
+        'id': task_id if task_id is not None else (operation.get('id') if isinstance(operation, dict) else None),
+        'status': status,
+        'success': status < 400
+    }
+    if message:
+        result['message'] = message
+    if data is not None:
+        result['data'] = data
+    return result
+
+def _check_operations(operations, results):
+    """Shape, field and assignee checks for every operation; failures go into results"""
+    by_kind = {'create': [], 'update': []}
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict) or operation.get('op') not in BULK_OPERATIONS:
+            results[index] = _operation_result(index, operation, 400, f'op must be one of: {", ".join(BULK_OPERATIONS)}')
+        elif operation['op'] != 'create' and not operation.get('id'):
+            results[index] = _operation_result(index, operation, 400, 'id is required')
+        elif operation['op'] != 'delete' and (not isinstance(operation.get('data'), dict) or not operation['data']):
+            results[index] = _operation_result(index, operation, 400, 'data is required')
+        elif operation['op'] != 'delete':
+            by_kind[operation['op']].append(index)
+
+    # One validation pass per kind: creates need every field, updates only the ones sent
+    for kind, indices in by_kind.items():
+        errors = validate_many('task', [operations[i]['data'] for i in indices], partial=(kind == 'update'))
+        for position, error in errors.items():
+            index = indices[position]
+            results[index] = _operation_result(index, operations[index], 400, error.message)
+
+    # Assignees are looked up in one read of users.json
+    assignee_names = {user.get('id'): user.get('name') for user in json_handler.read_json('users.json', [])}
+    for index, operation in enumerate(operations):
+        if results[index] is None and operation['op'] != 'delete' and 'assigneeId' in operation['data'] \
+                and operation['data']['assigneeId'] not in assignee_names:
+            results[index] = _operation_result(index, operation, 400, 'Assignee not found')
+    return assignee_names
+
+def _apply_operations(tasks, operations, results, assignee_names, atomic):
+    """Run the checked operations in order against the loaded task list"""
+    positions = {task.get('id'): i for i, task in enumerate(tasks) if isinstance(task, dict)}
+    next_id = int(json_handler.next_id_for(tasks))
+    deleted = set()
+
+    for index, operation in enumerate(operations):
+        if results[index] is not None:
+            continue
+        if operation['op'] == 'create':
+            data = operation['data']
+            task = build_task(str(next_id), data, assignee_names[data['assigneeId']])
+            next_id += 1
+            positions[task['id']] = len(tasks)
+            tasks.append(task)
+            results[index] = _operation_result(index, operation, 201, task_id=task['id'], data=task)
+            continue
+
+        task_id = str(operation['id'])
+        position = positions.get(task_id)
+        if position is None or position in deleted:
+            results[index] = _operation_result(index, operation, 404, 'Task not found', task_id)
+        elif operation['op'] == 'update':
+            updates = {key: value for key, value in operation['data'].items() if key != 'id'}
+            if 'assigneeId' in updates:
+                updates['assignee'] = assignee_names[updates['assigneeId']]
+            tasks[position] = {**tasks[position], **updates}
+            results[index] = _operation_result(index, operation, 200, task_id=task_id, data=tasks[position])
+        else:
+            deleted.add(position)
+            results[index] = _operation_result(index, operation, 200, task_id=task_id)
+
+    failed = any(not result['success'] for result in results)
+    if atomic and failed:
+        return False
+    if deleted:
+        tasks[:] = [task for i, task in enumerate(tasks) if i not in deleted]
+    return any(result['success'] for result in results)
+
+@tasks_bp.route('/bulk', methods=['POST'])
+def bulk_tasks():
+    """
+    Apply many task operations with one write to tasks.json
+
+    Body: {"operations": [{"op": "create", "data": {...}},
+                          {"op": "update", "id": "3", "data": {"status": "done"}},
+                          {"op": "delete", "id": "4"}],
+           "atomic": false}
+
+    Operations run in order. Each gets its own result; with atomic, nothing is
+    saved unless every operation succeeds.
+    """
+    try:
+        # A malformed body is treated like a missing one
+        data = request.get_json(silent=True)
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'message': 'No data provided'
+            }), 400
+        
+        operations = data.get('operations') if isinstance(data, dict) else data
+        atomic = data.get('atomic', False) if isinstance(data, dict) else False
+        if not isinstance(atomic, bool):
+            return jsonify({
+                'success': False,
+                'message': 'atomic must be true or false'
+            }), 400
+        if not isinstance(operations, list) or not operations:
+            return jsonify({
+                'success': False,
+                'message': 'operations must be a non-empty list'
+            }), 400
+        if len(operations) > Config.TASKS_BULK_MAX_OPERATIONS:
+            return jsonify({
+                'success': False,
+                'message': f'At most {Config.TASKS_BULK_MAX_OPERATIONS} operations per request'
+            }), 400
+        
+        results = [None] * len(operations)
+        assignee_names = _check_operations(operations, results)
+        
+        if atomic and any(result is not None for result in results):
+            changed, saved = False, True
+        else:
+            # Read, apply and write under the tasks.json lock: one write for the whole batch
+            def apply(tasks):
+                changed = _apply_operations(tasks, operations, results, assignee_names, atomic)
+                return changed, changed
+            changed, saved = json_handler.modify_json('tasks.json', apply, [])
+        
+        if not saved:
+            return jsonify({
+                'success': False,
+                'message': 'Failed to apply task operations'
+            }), 500
+        
+        for index, result in enumerate(results):
+            if result is None or (result['success'] and not changed):
+                results[index] = _operation_result(index, operations[index], 424,
+                                                   'Not applied because another operation failed')
+        
+        failed = sum(1 for result in results if not result['success'])
+        applied = len(results) - failed
+        if failed == 0:
+            status, message = 200, f'{applied} task operations applied'
+        elif applied:
+            status, message = 207, f'{applied} task operations applied, {failed} failed'
+        else:
+            status, message = 400, 'No task operations applied'
+        
+        return jsonify({
+            'success': failed == 0,
+            'data': {
+                'results': results,
+                'applied': applied,
+                'failed': failed
+            },
+            'message': message
+        }), status
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'message': 'Failed to apply task operations'
+        }), 500
+
 @tasks_bp.route('/<task_id>', methods=['PUT'])
 def update_task(task_id):
     """Update task"""
@@ -138,6 +323,9 @@ def update_task(task_id):
                 'message': 'No data provided'
             }), 400
         
+        # Validate the fields being changed
+        validate_payload('task', data, partial=True)
+        
         # Get existing task
         task = json_handler.find_by_id('tasks.json', task_id)
         if not task:
@@ -158,24 +346,6 @@ def update_task(task_id):
                 }), 400
             data['assignee'] = assignee['name']
         
-        # Validate status
-        if 'status' in data:
-            valid_statuses = ['todo', 'in_progress', 'done']
-            if data['status'] not in valid_statuses:
-                return jsonify({
-                    'success': False,
-                    'message': f'Status must be one of: {", ".join(valid_statuses)}'
-                }), 400
-        
-        # Validate priority
-        if 'priority' in data:
-            valid_priorities = ['low', 'medium', 'high']
-            if data['priority'] not in valid_priorities:
-                return jsonify({
-                    'success': False,
-                    'message': f'Priority must be one of: {", ".join(valid_priorities)}'
-                }), 400
-        
         # Update task
         success = json_handler.update_by_id('tasks.json', task_id, data)
         
@@ -194,6 +364,11 @@ def update_task(task_id):
                 'message': 'Failed to update task'
             }), 500
             
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -233,13 +408,13 @@ def delete_task(task_id):
         }), 500
 
 @tasks_bp.route('/assignee/<assignee_id>', methods=['GET'])
+@conditional('tasks.json')
 def get_tasks_by_assignee(assignee_id):
     """Get tasks by assignee ID"""
     try:
         # Note: Permission checks removed for public access
         
-        tasks = json_handler.read_json('tasks.json', [])
-        assignee_tasks = [task for task in tasks if task.get('assigneeId') == assignee_id]
+        assignee_tasks = TASKS.query(Query(filters=[('assigneeId', 'eq', assignee_id)]))['items']
         
         return jsonify({
             'success': True,
@@ -1,27 +1,38 @@
 from flask import Blueprint, request, jsonify
 from utils.json_handler import json_handler
 from utils.auth import hash_password, get_user_by_id
+from utils.query_engine import Collection, page_response, parse_query
+from utils.schemas import validate_payload
+from utils.validators import ValidationError
+from config import Config
 
 users_bp = Blueprint('users', __name__)
 
+def public_user(user):
+    """User record without the password"""
+    return {key: value for key, value in user.items() if key != 'password'}
+
+USERS = Collection(
+    'users', 'users.json',
+    fields=['id', 'name', 'role', 'email', 'avatar', 'username', 'permissions'],
+    indexes=['role', 'permissions', 'username'],
+    public=public_user
+)
+
 @users_bp.route('', methods=['GET'])
 def get_users():
     """Get all users (requires view_all or manage_crew permission)"""
     try:
-        users = json_handler.read_json('users.json', [])
+        # Passwords are removed when the collection is loaded
+        query = parse_query(request.args, USERS, Config.QUERY_MAX_LIMIT)
         
-        # Remove passwords from response
-        users_without_passwords = []
-        for user in users:
-            user_copy = user.copy()
-            user_copy.pop('password', None)
-            users_without_passwords.append(user_copy)
+        return jsonify(page_response(USERS.query(query), query)), 200
         
+    except ValidationError as e:
         return jsonify({
-            'success': True,
-            'data': users_without_passwords
-        }), 200
-        
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -63,14 +74,8 @@ def create_user():
                 'message': 'No data provided'
             }), 400
         
-        # Validate required fields
-        required_fields = ['name', 'role', 'email', 'username', 'password']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({
-                    'success': False,
-                    'message': f'{field} is required'
-                }), 400
+        # Validate fields, role, email, username and password
+        validate_payload('user', data)
         
         # Check if username already exists
         users = json_handler.read_json('users.json', [])
@@ -122,6 +127,11 @@ def create_user():
                 'message': 'Failed to create user'
             }), 500
             
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -140,6 +150,9 @@ def update_user(user_id):
                 'message': 'No data provided'
             }), 400
         
+        # Validate the fields being changed
+        validate_payload('user', data, partial=True)
+        
         # Get existing user
         user = json_handler.find_by_id('users.json', user_id)
         if not user:
@@ -190,6 +203,11 @@ def update_user(user_id):
                 'message': 'Failed to update user'
             }), 500
             
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -1,21 +1,38 @@
 from flask import Blueprint, request, jsonify
 from utils.json_handler import json_handler
 from utils.auth import get_user_by_id
+from utils.query_engine import Collection, Query, page_response, parse_query
+from utils.schemas import SCHEMAS, validate_payload
+from utils.validators import ValidationError
+from utils.http_cache import conditional
+from config import Config
 from datetime import datetime
 
 vfx_bp = Blueprint('vfx', __name__)
 
+VFX_SHOTS = Collection(
+    'vfx shots', 'vfx.json',
+    fields=['id', 'shotName', 'sceneId', 'description', 'status', 'priority', 'assignee', 'dueDate',
+            'versions', 'estimatedHours', 'complexity'],
+    indexes=['status', 'priority', 'assignee', 'sceneId', 'complexity'],
+    range_indexes=['dueDate', 'estimatedHours'],
+    ranked={field: SCHEMAS['vfx_shot']['properties'][field]['enum'] for field in ['status', 'priority', 'complexity']}
+)
+
 @vfx_bp.route('', methods=['GET'])
+@conditional('vfx.json')
 def get_vfx_shots():
-    """Get all VFX shots (requires VFX-related permissions)"""
+    """Get VFX shots, optionally filtered, sorted and paginated (see utils.query_engine)"""
     try:
-        vfx_shots = json_handler.read_json('vfx.json', [])
+        query = parse_query(request.args, VFX_SHOTS, Config.QUERY_MAX_LIMIT)
         
-        return jsonify({
-            'success': True,
-            'data': vfx_shots
-        }), 200
+        return jsonify(page_response(VFX_SHOTS.query(query), query)), 200
         
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -23,6 +40,7 @@ def get_vfx_shots():
         }), 500
 
 @vfx_bp.route('/<shot_id>', methods=['GET'])
+@conditional('vfx.json')
 def get_vfx_shot(shot_id):
     """Get VFX shot by ID"""
     try:
@@ -57,14 +75,8 @@ def create_vfx_shot():
                 'message': 'No data provided'
             }), 400
         
-        # Validate required fields
-        required_fields = ['shotName', 'sceneId', 'description', 'assignee', 'dueDate']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({
-                    'success': False,
-                    'message': f'{field} is required'
-                }), 400
+        # Validate fields, status, priority and complexity
+        validate_payload('vfx_shot', data)
         
         # Validate assignee exists
         assignee = get_user_by_id(data['assignee'])
@@ -74,30 +86,6 @@ def create_vfx_shot():
                 'message': 'Assignee not found'
             }), 400
         
-        # Validate status
-        valid_statuses = ['todo', 'in_progress', 'in_review', 'done']
-        if 'status' in data and data['status'] not in valid_statuses:
-            return jsonify({
-                'success': False,
-                'message': f'Status must be one of: {", ".join(valid_statuses)}'
-            }), 400
-        
-        # Validate priority
-        valid_priorities = ['low', 'medium', 'high']
-        if 'priority' in data and data['priority'] not in valid_priorities:
-            return jsonify({
-                'success': False,
-                'message': f'Priority must be one of: {", ".join(valid_priorities)}'
-            }), 400
-        
-        # Validate complexity
-        valid_complexities = ['low', 'medium', 'high']
-        if 'complexity' in data and data['complexity'] not in valid_complexities:
-            return jsonify({
-                'success': False,
-                'message': f'Complexity must be one of: {", ".join(valid_complexities)}'
-            }), 400
-        
         # Create new VFX shot
         new_shot = {
             'id': json_handler.get_next_id('vfx.json'),
@@ -130,6 +118,11 @@ def create_vfx_shot():
                 'message': 'Failed to create VFX shot'
             }), 500
             
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -148,6 +141,9 @@ def update_vfx_shot(shot_id):
                 'message': 'No data provided'
             }), 400
         
+        # Validate the fields being changed
+        validate_payload('vfx_shot', data, partial=True)
+        
         # Get existing shot
         shot = json_handler.find_by_id('vfx.json', shot_id)
         if not shot:
@@ -158,33 +154,6 @@ def update_vfx_shot(shot_id):
         
         # Note: Permission checks removed for public access
         
-        # Validate status
-        if 'status' in data:
-            valid_statuses = ['todo', 'in_progress', 'in_review', 'done']
-            if data['status'] not in valid_statuses:
-                return jsonify({
-                    'success': False,
-                    'message': f'Status must be one of: {", ".join(valid_statuses)}'
-                }), 400
-        
-        # Validate priority
-        if 'priority' in data:
-            valid_priorities = ['low', 'medium', 'high']
-            if data['priority'] not in valid_priorities:
-                return jsonify({
-                    'success': False,
-                    'message': f'Priority must be one of: {", ".join(valid_priorities)}'
-                }), 400
-        
-        # Validate complexity
-        if 'complexity' in data:
-            valid_complexities = ['low', 'medium', 'high']
-            if data['complexity'] not in valid_complexities:
-                return jsonify({
-                    'success': False,
-                    'message': f'Complexity must be one of: {", ".join(valid_complexities)}'
-                }), 400
-        
         # Update shot
         success = json_handler.update_by_id('vfx.json', shot_id, data)
         
@@ -203,6 +172,11 @@ def update_vfx_shot(shot_id):
                 'message': 'Failed to update VFX shot'
             }), 500
             
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -221,14 +195,8 @@ def add_vfx_version(shot_id):
                 'message': 'No data provided'
             }), 400
         
-        # Validate required fields
-        required_fields = ['version', 'status', 'notes', 'fileSize']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({
-                    'success': False,
-                    'message': f'{field} is required'
-                }), 400
+        # Validate fields and version status
+        validate_payload('vfx_version', data)
         
         # Get existing shot
         shot = json_handler.find_by_id('vfx.json', shot_id)
@@ -240,14 +208,6 @@ def add_vfx_version(shot_id):
         
         # Note: Permission checks removed for public access
         
-        # Validate status
-        valid_statuses = ['draft', 'review', 'approved', 'rejected']
-        if data['status'] not in valid_statuses:
-            return jsonify({
-                'success': False,
-                'message': f'Status must be one of: {", ".join(valid_statuses)}'
-            }), 400
-        
         # Create new version
         new_version = {
             'version': data['version'],
@@ -279,6 +239,11 @@ def add_vfx_version(shot_id):
                 'message': 'Failed to add VFX version'
             }), 500
             
+    except ValidationError as e:
+        return jsonify({
+            'success': False,
+            'message': e.message
+        }), 400
     except Exception as e:
         return jsonify({
             'success': False,
@@ -318,13 +283,13 @@ def delete_vfx_shot(shot_id):
         }), 500
 
 @vfx_bp.route('/assignee/<assignee_id>', methods=['GET'])
+@conditional('vfx.json')
 def get_vfx_shots_by_assignee(assignee_id):
     """Get VFX shots by assignee ID"""
     try:
         # Note: Permission checks removed for public access
         
-        vfx_shots = json_handler.read_json('vfx.json', [])
-        assignee_shots = [shot for shot in vfx_shots if shot.get('assignee') == assignee_id]
+        assignee_shots = VFX_SHOTS.query(Query(filters=[('assignee', 'eq', assignee_id)]))['items']
         
         return jsonify({
             'success': True,
@@ -5,7 +5,9 @@ Test the AI scheduling logic directly without Flask server
 
 import json
 import os
+import random
 import sys
+import time
 from routes.ai_routes import ScheduleOptimizer, load_json_file
 
 def test_location_clustering():
@@ -81,6 +83,73 @@ def test_schedule_optimization():
         print(f"❌ Error during optimization: {e}")
         return False
 
+def reference_cluster_locations(optimizer, scenes):
+    """Original pairwise clustering, kept as the reference for the indexed version"""
+    clusters = {}
+    processed_scenes = set()
+    
+    for i, scene in enumerate(scenes):
+        if i in processed_scenes:
+            continue
+        
+        location = scene.get('location', '')
+        cluster_key = location
+        cluster_scenes = [scene]
+        processed_scenes.add(i)
+        
+        for j, other_scene in enumerate(scenes):
+            if j in processed_scenes or i == j:
+                continue
+            
+            other_location = other_scene.get('location', '')
+            similarity = optimizer.calculate_location_similarity(location, other_location)
+            
+            if similarity > 0.3:
+                cluster_scenes.append(other_scene)
+                processed_scenes.add(j)
+                if similarity > 0.5:
+                    cluster_key = f"{location} & {other_location}"
+        
+        clusters[cluster_key] = cluster_scenes
+    
+    return clusters
+
+def test_clustering_matches_reference():
+    """Test that indexed clustering matches the original pairwise algorithm"""
+    print("🔁 Testing Indexed Clustering Against Reference")
+    print("="*50)
+    
+    optimizer = ScheduleOptimizer()
+    
+    # Sample data
+    production_data = load_json_file('production_schedule.json')
+    scenes = production_data.get('shooting_schedule', [])
+    assert optimizer.cluster_locations(scenes) == reference_cluster_locations(optimizer, scenes)
+    print(f"✅ Matches reference on production_schedule.json ({len(scenes)} scenes)")
+    
+    # Synthetic episodic season with shared set names
+    rng = random.Random(5)
+    words = ['radio', 'station', 'control', 'room', 'parking', 'apartment', 'living', 'office',
+             'campus', 'quad', 'desert', 'highway', 'facility', 'briefing', 'hospital', 'ward']
+    locations = [' - '.join(' '.join(rng.sample(words, rng.randint(1, 3))) for _ in range(rng.randint(1, 2)))
+                 for _ in range(150)]
+    season = [{'scene_number': n, 'location': rng.choice(locations), 'time_of_day': 'DAY'}
+              for n in range(1, 2001)]
+    
+    start = time.time()
+    indexed = optimizer.cluster_locations(season)
+    indexed_time = time.time() - start
+    
+    start = time.time()
+    reference = reference_cluster_locations(optimizer, season)
+    reference_time = time.time() - start
+    
+    assert indexed == reference
+    print(f"✅ Matches reference on 2000 synthetic scenes ({len(indexed)} clusters)")
+    print(f"   Indexed: {indexed_time * 1000:.1f}ms, pairwise: {reference_time * 1000:.1f}ms")
+    
+    return True
+
 def test_json_operations():
     """Test JSON file operations"""
     print("📁 Testing JSON File Operations")
@@ -110,6 +179,7 @@ def main():
     
     tests = [
         ("Location Clustering", test_location_clustering),
+        ("Clustering Matches Reference", test_clustering_matches_reference),
         ("JSON Operations", test_json_operations),
         ("Schedule Optimization", test_schedule_optimization)
     ]
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Test coalesced, deduplicated websocket broadcasts of change deltas
+"""
+
+import copy
+import json
+import os
+import re
+import time
+from benchmark_script import generate_script
+from utils.broadcast import EVENT, BroadcastPipeline, change_rooms
+from utils.change_feed import ChangeFeed
+
+# session id -> rooms it joined on connect
+SESSIONS = {
+    'producer-assignee': ['user_5', 'role_producer'],
+    'producer': ['user_1', 'role_producer'],
+    'director': ['user_2', 'role_director'],
+    'crew': ['user_3', 'role_crew'],
+    'distribution': ['user_4', 'role_distribution manager'],
+}
+
+class FakeServer:
+    """Records emits and resolves rooms like MessageBus.local_session_ids"""
+
+    def __init__(self):
+        self.sent = []
+
+    def emit(self, event, payload, session_id):
+        self.sent.append((event, payload, session_id))
+
+    def session_ids(self, rooms=None):
+        if rooms is None:
+            return set(SESSIONS)
+        return {sid for sid, joined in SESSIONS.items() if set(joined) & set(rooms)}
+
+    def by_session(self):
+        sessions = {}
+        for _, payload, session_id in self.sent:
+            sessions.setdefault(session_id, []).append(payload)
+        return sessions
+
+def make_pipeline(debounce_seconds=0.05):
+    server = FakeServer()
+    pipeline = BroadcastPipeline(server.emit, server.session_ids, debounce_seconds=debounce_seconds,
+                                 start_task=lambda task: None)
+    return server, pipeline
+
+def test_one_message_per_session():
+    """Test room dedupe, audiences and coalescing within a window"""
+    print("📡 Testing deduplicated delivery")
+    print("="*50)
+
+    server, pipeline = make_pipeline()
+    task = {'seq': 1, 'collection': 'tasks', 'id': '7', 'op': 'update', 'fields': ['assigneeId', 'status'],
+            'data': {'assigneeId': '5', 'status': 'done'}}
+    pipeline.publish(task, change_rooms(task))
+    for seq, hours in enumerate(range(10, 60), start=2):
+        change = {'seq': seq, 'collection': 'tasks', 'id': '7', 'op': 'update', 'fields': ['estimatedHours'],
+                  'data': {'estimatedHours': hours}}
+        pipeline.publish(change, change_rooms(change))
+    pipeline.publish({'seq': 60, 'collection': 'users', 'id': '1', 'op': 'update', 'fields': ['name'],
+                      'data': {'name': 'x'}}, [])
+    assert pipeline.flush() == 3
+
+    sessions = server.by_session()
+    assert set(sessions) == {'producer-assignee', 'producer', 'director'}
+    assert all(len(payloads) == 1 for payloads in sessions.values())
+    # Changes sent to the assignee's room and to role rooms arrive as one merged delta
+    expected = [{**task, 'seq': 51, 'fields': ['assigneeId', 'estimatedHours', 'status'],
+                 'data': {'assigneeId': '5', 'status': 'done', 'estimatedHours': 59}}]
+    assert sessions['producer-assignee'][0] == sessions['producer'][0] == {'changes': expected, 'latestSeq': 51}
+    print("✅ 51 task changes -> 1 message per session; a user in two rooms gets it once")
+
+    server.sent.clear()
+    created = {'seq': 61, 'collection': 'vfx', 'id': '9', 'op': 'create', 'fields': ['id'], 'data': {'id': '9'}}
+    deleted = {'seq': 62, 'collection': 'vfx', 'id': '9', 'op': 'delete', 'fields': [], 'data': None}
+    for change in [created, deleted]:
+        pipeline.publish(change, change_rooms(change))
+    assert pipeline.flush() == 0 and server.sent == []
+    print("✅ Created and deleted within a window: nothing sent")
+
+    asset = {'seq': 63, 'collection': 'assets', 'id': '1', 'op': 'update', 'fields': ['name'], 'data': {'name': 'a'}}
+    pipeline.publish(asset, change_rooms(asset))
+    assert pipeline.flush() == len(SESSIONS)
+    print("✅ Asset changes reach every session")
+    return True
+
+def test_script_fan_out_scales_with_changes():
+    """Test bytes sent for a scene edit against full-document broadcasts per role"""
+    print("🎬 Testing script broadcast size")
+    print("="*50)
+
+    script = generate_script(400)
+    edited = copy.deepcopy(script)
+    edited['scenes'][42]['location'] = 'Harbour'
+    edited['scenes'][43]['scene_status'] = 'Completed'
+
+    feed = ChangeFeed(max_entries=100)
+    server, pipeline = make_pipeline()
+    feed.subscribe(lambda changes: [pipeline.publish(change, change_rooms(change)) for change in changes])
+    feed.record_write('script.json', script, edited)
+    assert pipeline.flush() == 4
+
+    delta_bytes = sum(len(json.dumps(payload)) for _, payload, _ in server.sent)
+    # Previously: the whole script emitted once to each of the five script roles
+    full_bytes = len(json.dumps({'action': 'updated', 'script': edited})) * 5
+    payload = server.sent[0][1]
+    assert [(c['collection'], c['fields']) for c in payload['changes']] == \
+        [('scenes', ['location']), ('scenes', ['scene_status'])]
+    assert delta_bytes * 100 < full_bytes
+    print(f"✅ Two scene edits: {delta_bytes} bytes to 4 sessions vs {full_bytes / 1024:.0f} KB as full scripts per role")
+    return True
+
+def test_debounce_window():
+    """Test that a burst is delivered by one delayed flush"""
+    print("⏱️ Testing debounce window")
+    print("="*50)
+
+    server = FakeServer()
+    pipeline = BroadcastPipeline(server.emit, server.session_ids, debounce_seconds=0.05)
+    for seq in range(1, 21):
+        change = {'seq': seq, 'collection': 'budget', 'id': None, 'op': 'update', 'fields': ['spent'],
+                  'data': {'spent': seq * 1000}}
+        pipeline.publish(change, change_rooms(change))
+    assert server.sent == []
+    deadline = time.time() + 2
+    while pipeline.flushes == 0 and time.time() < deadline:
+        time.sleep(0.01)
+    assert pipeline.flushes == 1 and len(server.sent) == 2
+    assert server.sent[0][1]['changes'][0]['data'] == {'spent': 20000}
+    assert pipeline.get_status()['pending'] == 0
+
+    immediate_server = FakeServer()
+    immediate = BroadcastPipeline(immediate_server.emit, immediate_server.session_ids, debounce_seconds=0)
+    immediate.publish({'seq': 1, 'collection': 'assets', 'id': '1', 'op': 'delete', 'fields': [], 'data': None})
+    assert len(immediate_server.sent) == len(SESSIONS)
+    print("✅ 20 budget changes -> 1 flush after the window; debounce 0 sends at once")
+    return True
+
+FRONTEND_SRC = os.path.join(os.path.dirname(__file__), '..', 'prodsight', 'src')
+
+def test_client_listens_for_emitted_events():
+    """Test that the frontend handles the events the server emits, and only those"""
+    print("🔌 Testing client websocket listeners")
+    print("="*50)
+
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    with open(os.path.join(backend_dir, 'websocket_manager.py'), encoding='utf-8') as f:
+        emitted = set(re.findall(r"\bemit\('(\w+)'", f.read())) | {EVENT}
+    with open(os.path.join(FRONTEND_SRC, 'services', 'websocketService.ts'), encoding='utf-8') as f:
+        listened = set(re.findall(r"this\.socket\.on\('(\w+)'", f.read()))
+    lifecycle = {'connect', 'connect_error', 'disconnect'}
+    assert listened - lifecycle == emitted, (listened - lifecycle) ^ emitted
+
+    hooks_dir = os.path.join(FRONTEND_SRC, 'hooks')
+    subscribers = []
+    for filename in sorted(os.listdir(hooks_dir)):
+        with open(os.path.join(hooks_dir, filename), encoding='utf-8') as f:
+            if re.search(r"(?:subscribe|websocketService\.on)<ChangesEvent>\('changes'", f.read()):
+                subscribers.append(filename)
+    assert subscribers == ['useScriptMetrics.ts', 'useTasks.ts'], subscribers
+    print(f"✅ Client listens for {sorted(emitted)}; {', '.join(subscribers)} consume the deltas")
+    return True
+
+def main():
+    """Run all tests"""
+    print("🚀 Starting Broadcast Tests")
+    print("="*60)
+
+    tests = [
+        test_one_message_per_session,
+        test_script_fan_out_scales_with_changes,
+        test_debounce_window,
+        test_client_listens_for_emitted_events,
+    ]
+    passed = sum(1 for test in tests if test())
+    print(f"\n🎉 {passed}/{len(tests)} broadcast tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test POST /api/tasks/bulk: many task operations, one write
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from flask import Flask
+from routes.tasks import tasks_bp
+from utils.json_handler import json_handler
+
+NEW_TASK = {
+    'title': 'Scout rooftop', 'description': 'Check access for the night shoot', 'assigneeId': '4',
+    'dueDate': '2024-10-20', 'priority': 'medium', 'category': 'Locations',
+}
+
+class WriteCounter:
+    """Counts tasks.json writes made through the shared json_handler"""
+
+    def __init__(self):
+        self.original = json_handler._write_unlocked
+        self.writes = 0
+
+    def __enter__(self):
+        def counting_write(filename, data):
+            if filename == 'tasks.json':
+                self.writes += 1
+            return self.original(filename, data)
+        json_handler._write_unlocked = counting_write
+        return self
+
+    def __exit__(self, *exc):
+        json_handler._write_unlocked = self.original
+
+def run_with_client(test):
+    """Run test(client, data_dir) against a copy of the data directory"""
+    source_dir = os.path.join(os.path.dirname(__file__), 'data')
+    original_data_dir = json_handler.data_dir
+    with tempfile.TemporaryDirectory() as data_dir:
+        for filename in ['tasks.json', 'users.json']:
+            shutil.copy(os.path.join(source_dir, filename), data_dir)
+        json_handler.data_dir = data_dir
+        try:
+            app = Flask(__name__)
+            app.config['TESTING'] = True
+            app.register_blueprint(tasks_bp, url_prefix='/api/tasks')
+            test(app.test_client(), data_dir)
+        finally:
+            json_handler.data_dir = original_data_dir
+
+def read_tasks(data_dir):
+    with open(os.path.join(data_dir, 'tasks.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def test_bulk_moves_cost_one_write():
+    """Test that a board-wide drag is one write instead of one per card"""
+    print("📦 Testing bulk task moves")
+    print("="*50)
+
+    def check(client, data_dir):
+        task_ids = [task['id'] for task in read_tasks(data_dir)]
+        moves = [{'op': 'update', 'id': task_id, 'data': {'status': 'done'}} for task_id in task_ids] * 4
+
+        with WriteCounter() as single:
+            for move in moves:
+                assert client.put(f"/api/tasks/{move['id']}", json=move['data']).status_code == 200
+        with WriteCounter() as bulk:
+            response = client.post('/api/tasks/bulk', json={'operations': moves})
+
+        body = response.get_json()
+        assert response.status_code == 200, body
+        assert body['data']['applied'] == len(moves) and body['data']['failed'] == 0
+        assert all(task['status'] == 'done' for task in read_tasks(data_dir))
+        assert single.writes == len(moves) and bulk.writes == 1
+        print(f"✅ {len(moves)} moves: {single.writes} writes one by one, {bulk.writes} in bulk")
+
+    run_with_client(check)
+    return True
+
+def test_mixed_operations_and_results():
+    """Test create/update/delete in order with per-item results"""
+    print("🧾 Testing mixed bulk operations")
+    print("="*50)
+
+    def check(client, data_dir):
+        before = read_tasks(data_dir)
+        next_id = str(max(int(task['id']) for task in before) + 1)
+        response = client.post('/api/tasks/bulk', json={'operations': [
+            {'op': 'create', 'data': NEW_TASK},
+            {'op': 'update', 'id': next_id, 'data': {'priority': 'high', 'assigneeId': '3'}},
+            {'op': 'delete', 'id': before[0]['id']},
+            {'op': 'delete', 'id': before[0]['id']},
+            {'op': 'update', 'id': before[1]['id'], 'data': {'priority': 'urgent'}},
+            {'op': 'create', 'data': {**NEW_TASK, 'assigneeId': 'nobody'}},
+            {'op': 'archive', 'id': before[1]['id']},
+        ]})
+        body = response.get_json()
+        results = body['data']['results']
+        assert response.status_code == 207, body
+        assert [result['status'] for result in results] == [201, 200, 200, 404, 400, 400, 400]
+        assert results[0]['id'] == next_id and results[1]['data']['priority'] == 'high'
+        assert results[1]['data']['assignee'] != NEW_TASK['assigneeId']
+        assert results[4]['message'] == 'Priority must be one of: low, medium, high'
+        assert results[5]['message'] == 'Assignee not found'
+        assert results[6]['message'].startswith('op must be one of')
+
+        after = {task['id']: task for task in read_tasks(data_dir)}
+        assert before[0]['id'] not in after and after[next_id]['priority'] == 'high'
+        assert len(after) == len(before)
+        print("✅ Created, updated and deleted in order; failures reported per item")
+
+        response = client.post('/api/tasks/bulk', json={'atomic': True, 'operations': [
+            {'op': 'update', 'id': before[1]['id'], 'data': {'status': 'done'}},
+            {'op': 'delete', 'id': 'missing'},
+        ]})
+        results = response.get_json()['data']['results']
+        assert response.status_code == 400
+        assert [result['status'] for result in results] == [424, 404]
+        assert {task['id']: task for task in read_tasks(data_dir)} == after
+        print("✅ Atomic batch with a failure saves nothing")
+
+        assert client.post('/api/tasks/bulk', json={'operations': []}).status_code == 400
+        not_boolean = client.post('/api/tasks/bulk', json={'atomic': 'false', 'operations': [
+            {'op': 'update', 'id': before[1]['id'], 'data': {'status': 'done'}},
+        ]})
+        assert not_boolean.status_code == 400 and not_boolean.get_json()['message'] == 'atomic must be true or false'
+        malformed = client.post('/api/tasks/bulk', data='{"operations": [', content_type='application/json')
+        assert malformed.status_code == 400 and malformed.get_json()['message'] == 'No data provided'
+        assert {task['id']: task for task in read_tasks(data_dir)} == after
+        too_many = [{'op': 'delete', 'id': '1'}] * 501
+        assert client.post('/api/tasks/bulk', json={'operations': too_many}).status_code == 400
+        print("✅ Empty, oversized, malformed and non-boolean atomic batches rejected")
+
+    run_with_client(check)
+    return True
+
+def main():
+    """Run all tests"""
+    print("🚀 Starting Bulk Task Tests")
+    print("="*60)
+
+    tests = [
+        test_bulk_moves_cost_one_write,
+        test_mixed_operations_and_results,
+    ]
+    passed = sum(1 for test in tests if test())
+    print(f"\n🎉 {passed}/{len(tests)} bulk task tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Test the change feed recorded by the data layer and GET /api/changes
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from flask import Flask
+import routes.changes as changes_routes
+from routes.script import script_bp
+from routes.tasks import tasks_bp
+from routes.users import users_bp
+from utils.change_feed import ChangeFeed, SQLiteChangeFeed, get_change_feed
+from utils.json_handler import json_handler
+
+class FeedFixture:
+    """Temp data dir and a fresh feed wired into json_handler and the route"""
+
+    def __init__(self, max_entries=1000):
+        self.feed = ChangeFeed(max_entries=max_entries)
+
+    def __enter__(self):
+        self.temp = tempfile.TemporaryDirectory()
+        source_dir = os.path.join(os.path.dirname(__file__), 'data')
+        for filename in ['tasks.json', 'users.json', 'script.json']:
+            shutil.copy(os.path.join(source_dir, filename), self.temp.name)
+        self.saved = (json_handler.data_dir, json_handler.change_feed, changes_routes.change_feed)
+        json_handler.data_dir = self.temp.name
+        json_handler.change_feed = changes_routes.change_feed = self.feed
+
+        app = Flask(__name__)
+        app.config['TESTING'] = True
+        for blueprint, prefix in [(tasks_bp, 'tasks'), (users_bp, 'users'), (script_bp, 'script'),
+                                  (changes_routes.changes_bp, 'changes')]:
+            app.register_blueprint(blueprint, url_prefix=f'/api/{prefix}')
+        self.client = app.test_client()
+        return self
+
+    def __exit__(self, *exc):
+        json_handler.data_dir, json_handler.change_feed, changes_routes.change_feed = self.saved
+        self.temp.cleanup()
+
+    def changes(self, query=''):
+        response = self.client.get(f'/api/changes{query}')
+        assert response.status_code == 200, response.get_json()
+        return response.get_json()['data']
+
+def test_mutations_recorded():
+    """Test create/update/delete entries, changed fields and redaction"""
+    print("📜 Testing change recording")
+    print("="*50)
+
+    with FeedFixture() as fx:
+        start = fx.changes()
+        assert start['changes'] == [] and start['latestSeq'] == 0 and not start['resync']
+
+        assert fx.client.put('/api/tasks/1', json={'status': 'done'}).status_code == 200
+        assert fx.client.put('/api/tasks/1', json={'status': 'done'}).status_code == 200
+        assert fx.client.delete('/api/tasks/2').status_code == 200
+        users = json_handler.read_json('users.json')
+        users.append({**users[0], 'id': '99', 'username': 'feedtest', 'password': 'secret-hash'})
+        json_handler.write_json('users.json', users)
+
+        feed = fx.changes()
+        summary = [(c['seq'], c['collection'], c['id'], c['op'], c['fields']) for c in feed['changes']]
+        assert summary[0] == (1, 'tasks', '1', 'update', ['status']) and feed['changes'][0]['data'] == {'status': 'done'}
+        assert summary[1] == (2, 'tasks', '2', 'delete', [])
+        assert summary[2][1:4] == ('users', '99', 'create') and 'password' not in feed['changes'][2]['data']
+        assert len(summary) == 3 and feed['latestSeq'] == feed['nextSince'] == 3
+        print("✅ Update, delete and create recorded once each; no-op write recorded nothing; passwords redacted")
+
+        script = json_handler.read_json('script.json')
+        script['scenes'][0]['location'] = 'Moved'
+        script['title'] = 'Renamed'
+        json_handler.write_json('script.json', script)
+        feed = fx.changes('?since=3')
+        assert [(c['collection'], c['id'], c['fields']) for c in feed['changes']] == \
+            [('script', None, ['title']), ('scenes', str(script['scenes'][0]['id']), ['location'])]
+        assert fx.changes('?since=3&collections=scenes')['changes'][0]['collection'] == 'scenes'
+        assert fx.client.get('/api/changes?collections=nope').status_code == 400
+        print("✅ Script writes split into document fields and per-scene changes")
+
+        page = fx.changes('?since=0&limit=2')
+        assert [c['seq'] for c in page['changes']] == [1, 2] and page['hasMore'] and page['nextSince'] == 2
+        assert [c['seq'] for c in fx.changes(f"?since={page['nextSince']}&limit=2")['changes']] == [3, 4]
+        print("✅ limit pages through the log by nextSince")
+
+    return True
+
+def test_resync_and_long_poll():
+    """Test resync hints and waiting for the next change"""
+    print("⏳ Testing resync and long-poll")
+    print("="*50)
+
+    with FeedFixture(max_entries=3) as fx:
+        for hours in [101, 102, 103, 104]:
+            assert fx.client.put('/api/tasks/1', json={'estimatedHours': hours}).status_code == 200
+        assert fx.feed.latest_seq == 4
+        assert fx.changes('?since=0')['resync'] and not fx.changes('?since=1')['resync']
+        assert fx.changes('?since=10')['resync']
+        restarted = fx.changes('?since=4&epoch=old')
+        assert restarted['resync'] and restarted['epoch'] == fx.feed.epoch
+        print("✅ Clients behind the retained log, ahead of it, or from another epoch are told to resync")
+
+        start = time.perf_counter()
+        idle = fx.changes('?since=4&wait=0.2')
+        assert idle['changes'] == [] and time.perf_counter() - start >= 0.2
+
+        def write_later():
+            time.sleep(0.2)
+            json_handler.update_by_id('tasks.json', '3', {'priority': 'low'})
+        writer = threading.Thread(target=write_later)
+        writer.start()
+        start = time.perf_counter()
+        woken = fx.changes('?since=4&wait=10&collections=tasks')
+        elapsed = time.perf_counter() - start
+        writer.join()
+        assert [(c['id'], c['fields']) for c in woken['changes']] == [('3', ['priority'])]
+        assert elapsed < 5
+        print(f"✅ Long-poll returned {elapsed * 1000:.0f} ms after waiting for a write, empty after its timeout")
+
+        assert fx.client.get('/api/changes?wait=3600').status_code == 400
+    return True
+
+def test_writes_diff_without_rereading():
+    """Test that a tracked write reads its file once, yet still sees other processes' writes"""
+    print("📖 Testing one read per tracked write")
+    print("="*50)
+
+    with FeedFixture() as fx:
+        reads = []
+        read_unlocked = json_handler._read_unlocked
+        json_handler._read_unlocked = lambda filename, default: reads.append(filename) or read_unlocked(filename, default)
+        try:
+            assert json_handler.update_by_id('tasks.json', '1', {'estimatedHours': 101})
+            json_handler.modify_json('tasks.json', lambda tasks: (tasks[1].update(estimatedHours=102), True))
+            tasks = json_handler.read_json('tasks.json')
+            tasks[2]['estimatedHours'] = 103
+            json_handler.write_json('tasks.json', tasks)
+            assert reads == ['tasks.json'] * 3, reads
+            print("✅ update_by_id, modify_json and read+write_json each read tasks.json once")
+
+            # Another worker process rewrites the file behind this handler's back
+            external = json.loads(json.dumps(tasks))
+            external[3]['estimatedHours'] = 555
+            with open(os.path.join(fx.temp.name, 'tasks.json'), 'w', encoding='utf-8') as f:
+                json.dump(external, f, indent=4)
+            tasks[4]['estimatedHours'] = 105
+            json_handler.write_json('tasks.json', tasks)
+            assert reads == ['tasks.json'] * 4
+        finally:
+            json_handler._read_unlocked = read_unlocked
+
+        changes = [(c['id'], c['data']) for c in fx.changes()['changes']]
+        assert changes[:3] == [(tasks[i]['id'], {'estimatedHours': 101 + i}) for i in range(3)]
+        assert sorted(changes[3:]) == sorted([(tasks[3]['id'], {'estimatedHours': tasks[3]['estimatedHours']}),
+                                              (tasks[4]['id'], {'estimatedHours': 105})])
+        print("✅ A file changed elsewhere is re-read, so the diff still matches what was overwritten")
+    return True
+
+def test_shared_feed_across_workers():
+    """Test that every worker answers from the same log with the sqlite backend"""
+    print("🗃️ Testing shared change feed")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, 'feed.sqlite3')
+        # Two worker processes: state lives only in the database file
+        worker_a = get_change_feed('sqlite', max_entries=5, db_path=db_path, poll_seconds=0.02)
+        worker_b = SQLiteChangeFeed(max_entries=5, db_path=db_path, poll_seconds=0.02)
+        assert isinstance(worker_a, SQLiteChangeFeed) and worker_a.epoch == worker_b.epoch
+
+        before = [{'id': '1', 'status': 'todo'}, {'id': '2', 'status': 'todo'}]
+        worker_a.record_write('tasks.json', before, [{'id': '1', 'status': 'done'}, {'id': '2', 'status': 'todo'}])
+        seen = worker_b.changes_since(0)
+        assert not seen['resync'] and seen['epoch'] == worker_a.epoch and worker_b.latest_seq == 1
+        assert [(c['seq'], c['id'], c['data']) for c in seen['changes']] == [(1, '1', {'status': 'done'})]
+        print("✅ A change written through worker A is read from worker B with the same seq and epoch")
+
+        def write_later():
+            time.sleep(0.2)
+            worker_a.record_write('vfx.json', [], [{'id': '7', 'shot': 'A'}])
+        writer = threading.Thread(target=write_later)
+        writer.start()
+        woken = worker_b.changes_since(1, wait=10, collections=['vfx'])
+        writer.join()
+        assert [(c['seq'], c['op']) for c in woken['changes']] == [(2, 'create')]
+        print("✅ Long-poll on worker B woke up for a write on worker A")
+
+        for hours in range(10):
+            worker_b.append([{'collection': 'tasks', 'id': '1', 'op': 'update', 'fields': ['estimatedHours'],
+                              'data': {'estimatedHours': hours}}])
+        page = worker_a.changes_since(8, limit=2)
+        assert [c['seq'] for c in page['changes']] == [9, 10] and page['hasMore'] and page['nextSince'] == 10
+        assert worker_a.changes_since(1)['resync'] and worker_a.get_status()['entries'] == 5
+        restarted = SQLiteChangeFeed(max_entries=5, db_path=db_path)
+        assert restarted.epoch == worker_a.epoch and restarted.latest_seq == 12
+        print("✅ Shared log is bounded, pages by nextSince and keeps its epoch across restarts")
+    return True
+
+def main():
+    """Run all tests"""
+    print("🚀 Starting Change Feed Tests")
+    print("="*60)
+
+    tests = [
+        test_mutations_recorded,
+        test_resync_and_long_poll,
+        test_writes_diff_without_rereading,
+        test_shared_feed_across_workers,
+    ]
+    passed = sum(1 for test in tests if test())
+    print(f"\n🎉 {passed}/{len(tests)} change feed tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test Accept-Encoding negotiated response compression and its body cache
+"""
+
+import gzip
+import json
+import os
+import tempfile
+import time
+from flask import Flask, Response
+from benchmark_script import generate_script
+from routes.script import script_bp
+from routes.tasks import tasks_bp
+from utils.compression import CompressedBodyCache, brotli, init_compression
+from utils.json_handler import json_handler
+
+def make_app(cache):
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.register_blueprint(script_bp, url_prefix='/api/script')
+    app.register_blueprint(tasks_bp, url_prefix='/api/tasks')
+
+    @app.route('/stream')
+    def stream():
+        return Response((f'data: {i}\n\n' for i in range(500)), mimetype='text/event-stream')
+
+    @app.route('/small')
+    def small():
+        return {'ok': True}
+
+    return init_compression(app, cache)
+
+def test_negotiated_compression():
+    """Test encodings, thresholds, skipped responses and ETag variants"""
+    print("🗜️ Testing response compression")
+    print("="*50)
+
+    original_data_dir = json_handler.data_dir
+    with tempfile.TemporaryDirectory() as data_dir:
+        with open(os.path.join(data_dir, 'script.json'), 'w', encoding='utf-8') as f:
+            json.dump(generate_script(400), f)
+        with open(os.path.join(data_dir, 'tasks.json'), 'w', encoding='utf-8') as f:
+            json.dump([], f)
+        json_handler.data_dir = data_dir
+        try:
+            cache = CompressedBodyCache(max_bytes=4 * 1024 * 1024)
+            client = make_app(cache).test_client()
+
+            plain = client.get('/api/script')
+            assert 'Content-Encoding' not in plain.headers and plain.headers['Vary'] == 'Accept-Encoding'
+            packed = client.get('/api/script', headers={'Accept-Encoding': 'gzip, deflate'})
+            assert packed.headers['Content-Encoding'] == 'gzip'
+            assert gzip.decompress(packed.data) == plain.data
+            assert int(packed.headers['Content-Length']) == len(packed.data)
+            assert packed.headers['ETag'] == plain.headers['ETag'][:-1] + '-gzip"'
+            print(f"✅ 400-scene script: {len(plain.data) / 1024:.0f} KB -> {len(packed.data) / 1024:.0f} KB gzip "
+                  f"({len(plain.data) / len(packed.data):.1f}:1)")
+
+            revalidated = client.get('/api/script', headers={'Accept-Encoding': 'gzip',
+                                                             'If-None-Match': packed.headers['ETag']})
+            assert revalidated.status_code == 304 and revalidated.headers['ETag'] == packed.headers['ETag']
+            print("✅ Compressed variant has its own ETag and still revalidates to 304")
+
+            assert 'Content-Encoding' not in client.get('/api/script', headers={'Accept-Encoding': 'gzip;q=0'}).headers
+            assert 'Content-Encoding' not in client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers
+            streamed = client.get('/stream', headers={'Accept-Encoding': 'gzip'})
+            assert 'Content-Encoding' not in streamed.headers and streamed.data.startswith(b'data: 0')
+            print("✅ Refused encodings, small bodies and event streams are sent as-is")
+
+            if brotli is not None:
+                br = client.get('/api/script', headers={'Accept-Encoding': 'gzip, br'})
+                assert br.headers['Content-Encoding'] == 'br' and brotli.decompress(br.data) == plain.data
+                print("✅ brotli preferred when installed")
+            else:
+                print("ℹ️ brotli not installed; gzip only")
+        finally:
+            json_handler.data_dir = original_data_dir
+
+    return True
+
+def test_hot_gets_reuse_compressed_body():
+    """Test that unchanged collections are compressed once per encoding"""
+    print("♻️ Testing compressed body cache")
+    print("="*50)
+
+    original_data_dir = json_handler.data_dir
+    with tempfile.TemporaryDirectory() as data_dir:
+        with open(os.path.join(data_dir, 'script.json'), 'w', encoding='utf-8') as f:
+            json.dump(generate_script(400), f)
+        json_handler.data_dir = data_dir
+        try:
+            cache = CompressedBodyCache(max_bytes=4 * 1024 * 1024)
+            client = make_app(cache).test_client()
+            headers = {'Accept-Encoding': 'gzip'}
+
+            start = time.perf_counter()
+            first = client.get('/api/script', headers=headers)
+            cold = time.perf_counter() - start
+            start = time.perf_counter()
+            for _ in range(10):
+                again = client.get('/api/script', headers=headers)
+            warm = (time.perf_counter() - start) / 10
+            assert again.data == first.data
+            assert cache.misses == 1 and cache.hits == 10
+            print(f"✅ 11 GETs, 1 compression ({cold * 1000:.1f} ms cold, {warm * 1000:.1f} ms warm)")
+
+            client.get('/api/script?view=summary', headers=headers)
+            assert cache.get_status()['entries'] == 2
+            small = CompressedBodyCache(max_bytes=len(first.data) + 10)
+            small.put(('a', 'gzip'), first.data)
+            small.put(('b', 'gzip'), first.data)
+            assert small.get(('a', 'gzip')) is None and small.get(('b', 'gzip')) == first.data
+            print("✅ One entry per ETag; oldest evicted past the byte limit")
+        finally:
+            json_handler.data_dir = original_data_dir
+
+    return True
+
+def main():
+    """Run all tests"""
+    print("🚀 Starting Compression Tests")
+    print("="*60)
+
+    tests = [
+        test_negotiated_compression,
+        test_hot_gets_reuse_compressed_body,
+    ]
+    passed = sum(1 for test in tests if test())
+    print(f"\n🎉 {passed}/{len(tests)} compression tests passed")
+
+if __name__ == "__main__":
+    main()
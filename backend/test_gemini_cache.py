@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test the Gemini response cache without calling the real API
+"""
+
+import json
+import os
+import tempfile
+import time
+from utils.gemini_cache import GeminiResponseCache
+from utils.gemini_scheduler import GeminiScheduler
+
+SAMPLE_RESPONSE = {
+    "optimized_schedule": {
+        "scheduling_strategy": "Cached test strategy",
+        "total_shooting_days": 1,
+        "daily_schedules": []
+    }
+}
+
+class CountingScheduler(GeminiScheduler):
+    """GeminiScheduler that counts model calls instead of hitting the API"""
+
+    def __init__(self, response_cache):
+        super().__init__(api_key="test-key", response_cache=response_cache)
+        self.api_calls = 0
+
+    def call_gemini_api(self, prompt):
+        self.api_calls += 1
+        return json.loads(json.dumps(SAMPLE_RESPONSE))
+
+def load_shooting_data():
+    data_dir = os.path.join(os.path.dirname(__file__), 'data')
+    with open(os.path.join(data_dir, 'shooting_schedule.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def test_cache_key_and_expiry():
+    """Test key derivation, TTL expiry and size-bounded eviction"""
+    print("🗄️  Testing Gemini response cache")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = GeminiResponseCache(cache_dir=cache_dir, ttl_seconds=3600, max_entries=2)
+
+        key = cache.make_key("prompt", "model-a", {"temperature": 0.3})
+        assert key == cache.make_key("prompt", "model-a", {"temperature": 0.3})
+        assert key != cache.make_key("prompt", "model-b", {"temperature": 0.3})
+        assert key != cache.make_key("prompt", "model-a", {"temperature": 0.4})
+        print("✅ Keys depend on prompt, model and generation config")
+
+        assert cache.get(key) is None
+        cache.set(key, SAMPLE_RESPONSE)
+        assert cache.get(key)["response"] == SAMPLE_RESPONSE
+        print("✅ Stored response is returned on lookup")
+
+        # Fill past max_entries; the least recently used entry is evicted
+        other_keys = [cache.make_key(f"prompt {i}", "model-a", {}) for i in range(2)]
+        for i, other_key in enumerate(other_keys):
+            past = time.time() - 100 + i
+            cache.set(other_key, SAMPLE_RESPONSE)
+            os.utime(os.path.join(cache_dir, f"{other_key}.json"), (past, past))
+        cache.set(cache.make_key("newest", "model-a", {}), SAMPLE_RESPONSE)
+        assert len(os.listdir(cache_dir)) == 2
+        assert cache.get(other_keys[0]) is None
+        print("✅ Size-bounded eviction drops least recently used entries")
+
+        expired_cache = GeminiResponseCache(cache_dir=cache_dir, ttl_seconds=1, max_entries=10)
+        expired_cache.set(key, SAMPLE_RESPONSE)
+        entry_path = os.path.join(cache_dir, f"{key}.json")
+        with open(entry_path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+        entry["created_at"] -= 10
+        with open(entry_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        assert expired_cache.get(key) is None
+        print("✅ Entries older than the TTL are treated as misses")
+
+    return True
+
+def test_scheduler_uses_cache():
+    """Test that repeated generation reuses the cached model response"""
+    print("🤖 Testing GeminiScheduler cache integration")
+    print("="*50)
+
+    shooting_data = load_shooting_data()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scheduler = CountingScheduler(GeminiResponseCache(cache_dir=cache_dir))
+
+        first = scheduler.generate_schedule(shooting_data)
+        assert first["generation_info"]["cache_hit"] is False
+        assert scheduler.api_calls == 1
+
+        start = time.time()
+        second = scheduler.generate_schedule(shooting_data)
+        elapsed_ms = (time.time() - start) * 1000
+        assert second["generation_info"]["cache_hit"] is True
+        assert second["optimized_schedule"] == first["optimized_schedule"]
+        assert scheduler.api_calls == 1
+        print(f"✅ Cache hit served in {elapsed_ms:.1f}ms without a model call")
+
+        third = scheduler.generate_schedule(shooting_data, use_cache=False)
+        assert third["generation_info"]["cache_hit"] is False
+        assert third["generation_info"]["cache_bypassed"] is True
+        assert scheduler.api_calls == 2
+        print("✅ Bypass forces a fresh model call")
+
+    return True
+
+def main():
+    """Run all tests"""
+    print("🎬 Gemini Response Cache Tests")
+    print("="*60)
+
+    tests = [
+        ("Cache Key and Expiry", test_cache_key_and_expiry),
+        ("Scheduler Cache Integration", test_scheduler_uses_cache)
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        print(f"\n🧪 Running: {test_name}")
+        try:
+            success = test_func()
+            results.append((test_name, success))
+        except Exception as e:
+            print(f"❌ Test failed with exception: {e}")
+            results.append((test_name, False))
+
+        print("\n" + "-"*50)
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Test streaming Gemini schedule generation and the server-sent events endpoint
+"""
+
+import json
+import os
+import random
+import shutil
+import tempfile
+from flask import Flask
+from routes import ai_routes
+from utils.gemini_cache import GeminiResponseCache
+from utils.gemini_scheduler import GeminiScheduler
+from utils.json_stream import IncrementalArrayParser
+
+def load_shooting_data():
+    data_dir = os.path.join(os.path.dirname(__file__), 'data')
+    with open(os.path.join(data_dir, 'shooting_schedule.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class StreamingScheduler(GeminiScheduler):
+    """GeminiScheduler whose model streams a compact answer in small chunks"""
+
+    cache_dir = None
+
+    def __init__(self, response_cache=None):
+        super().__init__(api_key="test-key",
+                         response_cache=response_cache or GeminiResponseCache(cache_dir=self.cache_dir))
+        self.chunks_sent = 0
+        self.total_chunks = 0
+
+    def stream_gemini_api(self, prompt):
+        rows = prompt.split('SCENES (')[1].split('RULES:')[0].strip().splitlines()[1:]
+        numbers = [int(row.split('|')[0]) for row in rows]
+        answer = json.dumps({
+            'scheduling_strategy': 'Stream test',
+            'days': [numbers[i:i + 2] for i in range(0, len(numbers), 2)],
+            'optimization_benefits': ['Streamed'],
+        })
+        text = '```json\n' + answer + '\n```'
+        chunks = [text[i:i + 5] for i in range(0, len(text), 5)]
+        self.total_chunks = len(chunks)
+        for chunk in chunks:
+            self.chunks_sent += 1
+            yield chunk
+
+def parse_sse(body):
+    """Split a text/event-stream body into (event, data) pairs"""
+    events = []
+    for block in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.splitlines())
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+def test_incremental_parser():
+    """Test that array elements are emitted exactly when they complete"""
+    print("🧩 Testing incremental JSON parser")
+    print("="*50)
+
+    document = {'note': 'a "quoted" [bracket] {brace}', 'days': [[1, 2], [3], ['s"]', 4], []], 'tail': [9]}
+    text = 'Here you go:\n```json\n' + json.dumps(document, indent=2) + '\n```'
+    for seed in range(50):
+        rng = random.Random(seed)
+        parser = IncrementalArrayParser(['days', 'daily_schedules'])
+        elements = []
+        position = 0
+        while position < len(text):
+            size = rng.randint(1, 9)
+            elements += [element for _, element in parser.feed(text[position:position + size])]
+            position += size
+        assert elements == document['days'], elements
+    print("✅ Same elements for 50 random chunkings, strings with brackets handled")
+
+    parser = IncrementalArrayParser(['days'])
+    assert parser.feed('{"days": [[1, 2], [3') == [('days', [1, 2])]
+    assert parser.feed(']') == [('days', [3])]
+    print("✅ Element returned on the chunk that closes it")
+
+    parser = IncrementalArrayParser(['days', 'daily_schedules'])
+    full = {'optimized_schedule': {'daily_schedules': [{'day': 1, 'scenes': []}, {'day': 2, 'scenes': []}]}}
+    assert [key for key, _ in parser.feed(json.dumps(full))] == ['daily_schedules'] * 2
+    print("✅ Nested full-format daily_schedules are followed too")
+
+    return True
+
+def test_days_stream_before_response_ends():
+    """Test that day 1 is yielded while the model is still generating"""
+    print("📡 Testing streamed schedule generation")
+    print("="*50)
+
+    shooting_data = load_shooting_data()
+    scene_count = len(shooting_data['shooting_schedule']['scenes'])
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scheduler = StreamingScheduler(GeminiResponseCache(cache_dir=cache_dir))
+        events = scheduler.stream_schedule(shooting_data)
+
+        assert next(events)[0] == 'start'
+        event, first_day = next(events)
+        assert event == 'day' and first_day['day'] == 1
+        assert scheduler.chunks_sent < scheduler.total_chunks / 2, "day 1 should arrive early"
+        print(f"✅ Day 1 received after {scheduler.chunks_sent}/{scheduler.total_chunks} chunks")
+
+        rest = list(events)
+        days = [first_day] + [data for event, data in rest if event == 'day']
+        event, result = rest[-1]
+        assert event == 'complete' and 'error' not in result
+        schedule = result['optimized_schedule']
+        assert [day['day'] for day in days] == list(range(1, len(days) + 1))
+        assert [[s['scene_number'] for s in day['scenes']] for day in days] == \
+            [[s['scene_number'] for s in day['scenes']] for day in schedule['daily_schedules']]
+        assert sum(len(day['scenes']) for day in days) == scene_count
+        assert result['generation_info']['streamed'] is True
+        print(f"✅ {len(days)} streamed days match the final schedule")
+
+        replay = StreamingScheduler(GeminiResponseCache(cache_dir=cache_dir))
+        replayed = list(replay.stream_schedule(shooting_data))
+        assert replay.chunks_sent == 0
+        assert replayed[-1][1]['generation_info']['cache_hit'] is True
+        assert len([e for e in replayed if e[0] == 'day']) == len(days)
+        print("✅ Cached response replayed without a model call")
+
+    return True
+
+def test_stream_endpoint():
+    """Test the text/event-stream endpoint, including the no-key fallback"""
+    print("🌐 Testing /api/ai/generate_gemini_schedule/stream")
+    print("="*50)
+
+    original_data_dir = ai_routes.DATA_DIR
+    original_scheduler = ai_routes.GeminiScheduler
+    original_api_key = os.environ.get('GEMINI_API_KEY')
+    source_dir = os.path.join(os.path.dirname(__file__), 'data')
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        shutil.copy(os.path.join(source_dir, 'shooting_schedule.json'), data_dir)
+        try:
+            ai_routes.DATA_DIR = data_dir
+            StreamingScheduler.cache_dir = os.path.join(data_dir, 'cache')
+            ai_routes.GeminiScheduler = StreamingScheduler
+            app = Flask(__name__)
+            app.config['TESTING'] = True
+            app.register_blueprint(ai_routes.ai_bp, url_prefix='/api/ai')
+            client = app.test_client()
+
+            response = client.post('/api/ai/generate_gemini_schedule/stream', json={})
+            assert response.status_code == 200
+            assert response.mimetype == 'text/event-stream'
+            events = parse_sse(response.get_data(as_text=True))
+            names = [event for event, _ in events]
+            assert names[0] == 'start' and names[-1] == 'complete' and 'day' in names
+            complete = events[-1][1]
+            assert complete['status'] == 'success'
+            assert complete['total_shooting_days'] == names.count('day')
+            assert os.path.exists(os.path.join(data_dir, 'gemini_optimized_schedule.json'))
+            print(f"✅ {names.count('day')} day events, then complete; schedule saved")
+
+            # Without an API key the local solver's days are streamed instead
+            ai_routes.GeminiScheduler = lambda: GeminiScheduler(
+                api_key=None, response_cache=GeminiResponseCache(cache_dir=os.path.join(data_dir, 'cache'))
+            )
+            os.environ.pop('GEMINI_API_KEY', None)
+            events = parse_sse(client.post('/api/ai/generate_gemini_schedule/stream', json={}).get_data(as_text=True))
+            complete = events[-1][1]
+            assert complete['status'] == 'warning' and complete['is_mock'] is True
+            assert len([e for e in events if e[0] == 'day']) == complete['total_shooting_days'] > 0
+            print("✅ Fallback schedule streamed with a warning")
+        finally:
+            ai_routes.DATA_DIR = original_data_dir
+            ai_routes.GeminiScheduler = original_scheduler
+            if original_api_key is not None:
+                os.environ['GEMINI_API_KEY'] = original_api_key
+
+    return True
+
+def main():
+    """Run all streaming tests"""
+    tests = [test_incremental_parser, test_days_stream_before_response_ends, test_stream_endpoint]
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+    print(f"🎯 {passed}/{len(tests)} streaming tests passed")
+
+if __name__ == "__main__":
+    main()
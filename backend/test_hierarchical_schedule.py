@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Test hierarchical AI scheduling: concurrent location blocks stitched into one calendar
+"""
+
+import random
+import tempfile
+import threading
+import time
+from benchmark_local_scheduler import generate_scenes
+from config import Config
+from routes.ai_routes import ScheduleOptimizer
+from utils.gemini_cache import GeminiResponseCache
+from utils.gemini_scheduler import GeminiScheduler
+from utils.local_scheduler import LocalScheduleSolver
+from utils.rate_limiter import RateLimitExceeded, RateLimiter
+
+class SlowBlockScheduler(GeminiScheduler):
+    """GeminiScheduler whose model takes a fixed time and answers in compact format"""
+
+    def __init__(self, response_cache, rate_limiter, delay=0.3):
+        super().__init__(api_key="test-key", response_cache=response_cache, rate_limiter=rate_limiter)
+        self.delay = delay
+        self.api_calls = 0
+        self._calls_lock = threading.Lock()
+
+    def call_gemini_api(self, prompt):
+        self._respect_rate_limit()
+        with self._calls_lock:
+            self.api_calls += 1
+        time.sleep(self.delay)
+        rows = prompt.split('SCENES (')[1].split('RULES:')[0].strip().splitlines()[1:]
+        numbers = [int(row.split('|')[0]) for row in rows]
+        # Leave the last scene out so the local fill-in is exercised
+        return {'scheduling_strategy': 'Block by block.',
+                'days': [numbers[i:i + 5] for i in range(0, len(numbers) - 1, 5)]}
+
+def test_stitch_blocks():
+    """Test that stitching keeps every day and beats plain concatenation"""
+    print("🧵 Testing block stitching")
+    print("="*50)
+
+    solver = LocalScheduleSolver()
+    scenes = solver.prepare_scenes(generate_scenes(240))
+    days = solver.pack_days(scenes, [[i] for i in range(len(scenes))])
+    random.Random(5).shuffle(days)
+    blocks = [days[i:i + 8] for i in range(0, len(days), 8)]
+
+    naive = [day for block in blocks for day in block]
+    stitched = solver.stitch_blocks(scenes, blocks)
+    assert sorted(map(sorted, stitched)) == sorted(map(sorted, naive)), "days must be kept intact"
+
+    naive_cost = solver.evaluate(scenes, naive)
+    stitched_cost = solver.evaluate(scenes, stitched)
+    assert stitched_cost['shooting_days'] == naive_cost['shooting_days']
+    assert stitched_cost['actor_days'] < naive_cost['actor_days']
+    assert stitched_cost['total_cost'] < naive_cost['total_cost']
+    print(f"✅ Actor days {naive_cost['actor_days']} → {stitched_cost['actor_days']}, "
+          f"cost {naive_cost['total_cost']} → {stitched_cost['total_cost']}")
+
+    return True
+
+def test_group_blocks():
+    """Test that clusters are packed into bounded blocks without splitting locations"""
+    print("📦 Testing block grouping")
+    print("="*50)
+
+    raw = generate_scenes(300)
+    clusters = ScheduleOptimizer().cluster_locations(raw)
+    blocks = GeminiScheduler.group_blocks(clusters, 40)
+
+    assert sum(len(block) for _, block in blocks) == len(raw)
+    homes = {}
+    for b, (_, block) in enumerate(blocks):
+        for scene in block:
+            homes.setdefault(scene['location'], set()).add(b)
+    assert all(len(found) == 1 for found in homes.values()), "a location must not span blocks"
+    single_location = [block for _, block in blocks if len({s['location'] for s in block}) == 1]
+    assert all(len(block) <= 40 for _, block in blocks if block not in single_location)
+    print(f"✅ {len(clusters)} clusters → {len(blocks)} blocks of ≤40 scenes")
+
+    return True
+
+def test_blocks_run_concurrently():
+    """Test that latency tracks the slowest block and every scene is scheduled once"""
+    print("⏱️  Testing concurrent block scheduling")
+    print("="*50)
+
+    raw = generate_scenes(300)
+    scenes_data = {'project_title': 'Season', 'shooting_schedule': {'scenes': raw}}
+    clusters = ScheduleOptimizer().cluster_locations(raw)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scheduler = SlowBlockScheduler(GeminiResponseCache(cache_dir=cache_dir),
+                                       RateLimiter('blocks-test', 100, 1))
+        result = scheduler.generate_block_schedule(scenes_data, clusters)
+        info = result['generation_info']
+
+        assert 'error' not in result
+        assert info['mode'] == 'hierarchical' and len(info['blocks']) > 1
+        assert all(block['source'] == 'gemini' for block in info['blocks'])
+        assert info['blocks_wall_ms'] < info['blocks_total_ms'] / 2, "blocks should overlap in time"
+        numbers = [s['scene_number'] for day in result['optimized_schedule']['daily_schedules'] for s in day['scenes']]
+        assert sorted(numbers) == sorted(s['scene_number'] for s in raw), "every scene exactly once"
+        print(f"✅ {len(info['blocks'])} blocks: {info['blocks_wall_ms']}ms wall vs "
+              f"{info['blocks_total_ms']}ms summed")
+
+        calls = scheduler.api_calls
+        cached = scheduler.generate_block_schedule(scenes_data, clusters)
+        assert scheduler.api_calls == calls
+        assert cached['generation_info']['cache_hit'] is True
+        print("✅ Repeat run served every block from the cache")
+
+    return True
+
+def test_no_quota_raises():
+    """Test that a project with no block reaching the model is left to the route's 429"""
+    print("⛔ Testing hierarchical request with no quota")
+    print("="*50)
+
+    raw = generate_scenes(200)
+    scenes_data = {'project_title': 'Season', 'shooting_schedule': {'scenes': raw}}
+    clusters = ScheduleOptimizer().cluster_locations(raw)
+    limiter = RateLimiter('blocks-empty-test', 1, 60)
+    limiter.acquire()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scheduler = SlowBlockScheduler(GeminiResponseCache(cache_dir=cache_dir), limiter, delay=0)
+        try:
+            scheduler.generate_block_schedule(scenes_data, clusters, use_cache=False)
+            assert False, "expected RateLimitExceeded"
+        except RateLimitExceeded as e:
+            retry_after = e.retry_after
+    assert 0 < retry_after <= 60 and scheduler.api_calls == 0
+    print(f"✅ No slot for any block: RateLimitExceeded (retry after {retry_after:.0f}s), no model calls")
+
+    return True
+
+def test_rate_limited_blocks_fall_back():
+    """Test that blocks over quota are solved locally, concurrently, and reported"""
+    print("🚦 Testing per-block local fallback")
+    print("="*50)
+
+    raw = generate_scenes(200)
+    scenes_data = {'project_title': 'Season', 'shooting_schedule': {'scenes': raw}}
+    clusters = ScheduleOptimizer().cluster_locations(raw)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scheduler = SlowBlockScheduler(GeminiResponseCache(cache_dir=cache_dir),
+                                       RateLimiter('blocks-quota-test', 1, 60), delay=0)
+        result = scheduler.generate_block_schedule(scenes_data, clusters, use_cache=False)
+
+    sources = [block['source'] for block in result['generation_info']['blocks']]
+    assert sources.count('gemini') == 1 and sources.count('local') == len(sources) - 1
+    # Quota does not size the pool: local blocks are solved alongside the model block
+    assert result['generation_info']['block_workers'] == min(Config.GEMINI_BLOCK_WORKERS, len(sources))
+    assert all('fallback_reason' in block for block in result['generation_info']['blocks']
+               if block['source'] == 'local')
+    assert result['generation_info']['local_blocks'] == [block['block'] for block in result['generation_info']['blocks']
+                                                         if block['source'] == 'local']
+    numbers = [s['scene_number'] for day in result['optimized_schedule']['daily_schedules'] for s in day['scenes']]
+    assert sorted(numbers) == sorted(s['scene_number'] for s in raw)
+    print(f"✅ 1 model block, {len(sources) - 1} local blocks, all {len(numbers)} scenes scheduled")
+
+    return True
+
+def main():
+    """Run all hierarchical scheduling tests"""
+    tests = [test_stitch_blocks, test_group_blocks, test_blocks_run_concurrently,
+             test_no_quota_raises, test_rate_limited_blocks_fall_back]
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+    print(f"🎯 {passed}/{len(tests)} hierarchical scheduling tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test ETag / If-None-Match handling on the polled read endpoints
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from flask import Flask
+from routes.assets import assets_bp
+from routes.budget import budget_bp
+from routes.script import script_bp
+from routes.tasks import tasks_bp
+from routes.vfx import vfx_bp
+from utils.json_handler import json_handler
+
+POLLED_URLS = ['/api/script', '/api/script?view=summary', '/api/tasks', '/api/tasks?status=todo',
+               '/api/budget', '/api/budget/history', '/api/vfx', '/api/assets']
+
+class ReadCounter:
+    """Counts data file reads made through the shared json_handler"""
+
+    def __init__(self):
+        self.original = json_handler._read_unlocked
+        self.reads = 0
+
+    def __enter__(self):
+        def counting_read(filename, default):
+            self.reads += 1
+            return self.original(filename, default)
+        json_handler._read_unlocked = counting_read
+        return self
+
+    def __exit__(self, *exc):
+        json_handler._read_unlocked = self.original
+
+def test_conditional_gets():
+    """Test 304s on unchanged data, new tags after writes, and per-URL tags"""
+    print("🏷️ Testing ETag revalidation")
+    print("="*50)
+
+    source_dir = os.path.join(os.path.dirname(__file__), 'data')
+    original_data_dir = json_handler.data_dir
+    with tempfile.TemporaryDirectory() as data_dir:
+        for filename in ['tasks.json', 'users.json', 'vfx.json', 'budget.json', 'script.json']:
+            shutil.copy(os.path.join(source_dir, filename), data_dir)
+        with open(os.path.join(data_dir, 'assets.json'), 'w', encoding='utf-8') as f:
+            json.dump([], f)
+        json_handler.data_dir = data_dir
+        try:
+            app = Flask(__name__)
+            app.config['TESTING'] = True
+            for blueprint, prefix in [(tasks_bp, 'tasks'), (vfx_bp, 'vfx'), (budget_bp, 'budget'),
+                                      (script_bp, 'script'), (assets_bp, 'assets')]:
+                app.register_blueprint(blueprint, url_prefix=f'/api/{prefix}')
+            client = app.test_client()
+
+            tags = {}
+            for url in POLLED_URLS:
+                response = client.get(url)
+                assert response.status_code == 200 and response.headers.get('ETag'), url
+                assert response.headers['Cache-Control'] == 'no-cache'
+                tags[url] = response.headers['ETag']
+            assert len(set(tags.values())) == len(POLLED_URLS)
+
+            with ReadCounter() as counter:
+                for url in POLLED_URLS:
+                    response = client.get(url, headers={'If-None-Match': tags[url]})
+                    assert response.status_code == 304 and response.data == b'', url
+                    assert response.headers['ETag'] == tags[url]
+            assert counter.reads == 0
+            print(f"✅ {len(POLLED_URLS)} unchanged polls answered 304 without reading a data file")
+
+            assert client.put('/api/tasks/1', json={'status': 'done'}).status_code == 200
+            assert client.get('/api/tasks/1', headers={'If-None-Match': '"stale"'}).status_code == 200
+            changed = client.get('/api/tasks', headers={'If-None-Match': tags['/api/tasks']})
+            unchanged = client.get('/api/vfx', headers={'If-None-Match': tags['/api/vfx']})
+            assert changed.status_code == 200 and changed.headers['ETag'] != tags['/api/tasks']
+            assert unchanged.status_code == 304
+            print("✅ A write changes only its own collection's tags")
+
+            with open(os.path.join(data_dir, 'vfx.json'), 'w', encoding='utf-8') as f:
+                json.dump([], f)
+            edited = client.get('/api/vfx', headers={'If-None-Match': tags['/api/vfx']})
+            assert edited.status_code == 200 and edited.get_json()['data'] == []
+            print("✅ Edits made outside the API are detected from the file hash")
+
+            os.remove(os.path.join(data_dir, 'script.json'))
+            missing = client.get('/api/script', headers={'If-None-Match': tags['/api/script']})
+            assert missing.status_code == 404 and 'ETag' not in missing.headers
+            print("✅ Error responses are never tagged")
+        finally:
+            json_handler.data_dir = original_data_dir
+
+    return True
+
+def main():
+    """Run all tests"""
+    print("🚀 Starting HTTP Cache Tests")
+    print("="*60)
+
+    tests = [
+        test_conditional_gets,
+    ]
+    passed = sum(1 for test in tests if test())
+    print(f"\n🎉 {passed}/{len(tests)} HTTP cache tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test app startup import cost with python -X importtime
+"""
+
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# SDKs that must only load on first use, never while the app starts
+LAZY_MODULES = ['google.generativeai', 'PyPDF2', 'requests']
+
+# Cumulative import time allowed for all blueprints (about 1s while they loaded the SDKs)
+STARTUP_BUDGET_MS = float(os.environ.get('IMPORT_TIME_BUDGET_MS', 400))
+
+def measure_startup():
+    """
+    Import the app and register every blueprint in a fresh interpreter
+
+    Returns:
+        {module name: cumulative microseconds} for every module imported
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'from app import create_app; create_app()'],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+def test_sdks_not_imported_at_startup():
+    """Test that heavy SDKs stay out of the startup import graph"""
+    print("🐢 Testing lazy SDK imports")
+    print("="*50)
+
+    timings = measure_startup()
+    loaded = [name for name in timings
+              if any(name == module or name.startswith(module + '.') for module in LAZY_MODULES)]
+    assert not loaded, f"imported at startup: {sorted(loaded)[:10]}"
+    print(f"✅ None of {', '.join(LAZY_MODULES)} imported at startup")
+    return True
+
+def test_startup_import_budget():
+    """Test that blueprint imports fit the budget"""
+    print("⏱️ Testing startup import budget")
+    print("="*50)
+
+    timings = measure_startup()
+    startup = {name: us for name, us in timings.items() if name.startswith('routes.')}
+    assert 'routes.ai_routes' in startup and 'routes.analysis' in startup
+    total_ms = sum(startup.values()) / 1000
+    for name, us in sorted(startup.items(), key=lambda item: -item[1])[:5]:
+        print(f"   {name}: {us / 1000:.1f} ms")
+    assert total_ms <= STARTUP_BUDGET_MS, f"blueprint imports took {total_ms:.0f} ms (budget {STARTUP_BUDGET_MS:.0f} ms)"
+    print(f"✅ Blueprint imports {total_ms:.0f} ms (budget {STARTUP_BUDGET_MS:.0f} ms)")
+    return True
+
+def main():
+    """Run all tests"""
+    print("🚀 Starting Import Time Tests")
+    print("="*60)
+
+    tests = [
+        test_sdks_not_imported_at_startup,
+        test_startup_import_budget,
+    ]
+    passed = sum(1 for test in tests if test())
+    print(f"\n🎉 {passed}/{len(tests)} import time tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Test the local constraint-based schedule solver
+"""
+
+import json
+import os
+from flask import Flask
+from benchmark_local_scheduler import generate_scenes
+from utils.gemini_scheduler import GeminiScheduler
+from utils.local_scheduler import LocalScheduleSolver
+
+def load_shooting_data():
+    data_dir = os.path.join(os.path.dirname(__file__), 'data')
+    with open(os.path.join(data_dir, 'shooting_schedule.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def scheduled_scene_numbers(schedule):
+    return sorted(
+        scene['scene_number']
+        for day in schedule['daily_schedules']
+        for scene in day['scenes']
+    )
+
+def test_solver_constraints():
+    """Test that every scene is scheduled once and no day exceeds the hard limit"""
+    print("📐 Testing solver constraints")
+    print("="*50)
+
+    scenes = generate_scenes(120)
+    solver = LocalScheduleSolver(max_day_minutes=600, standard_day_minutes=480)
+    schedule = solver.solve(scenes)
+
+    assert scheduled_scene_numbers(schedule) == sorted(s['scene_number'] for s in scenes)
+    print(f"✅ All {len(scenes)} scenes scheduled exactly once")
+
+    for day in schedule['daily_schedules']:
+        if len(day['scenes']) > 1:
+            assert day['daily_summary']['total_day_minutes'] <= 600
+    print(f"✅ {schedule['total_shooting_days']} days, none longer than 600 minutes")
+
+    stats = schedule['solver_stats']
+    assert stats['final_cost']['total_cost'] <= stats['initial_cost']['total_cost']
+    print(f"✅ Cost {stats['initial_cost']['total_cost']} → {stats['final_cost']['total_cost']}")
+
+    for actor, info in schedule['actor_schedules'].items():
+        assert info['hold_days'] == info['last_day'] - info['first_day'] + 1 - info['total_working_days']
+
+    return True
+
+def test_solver_is_deterministic():
+    """Test that the same seed gives the same schedule"""
+    print("🎲 Testing solver determinism")
+    print("="*50)
+
+    scenes = generate_scenes(80)
+    first = LocalScheduleSolver(seed=11).solve(scenes)
+    second = LocalScheduleSolver(seed=11).solve(scenes)
+
+    assert first['daily_schedules'] == second['daily_schedules']
+    print("✅ Same seed, same schedule")
+
+    return True
+
+def test_gemini_fallback_uses_solver():
+    """Test that GeminiScheduler falls back to the local solver instead of mock data"""
+    print("🔄 Testing Gemini fallback")
+    print("="*50)
+
+    shooting_data = load_shooting_data()
+    scheduler = GeminiScheduler(api_key=None)
+    scheduler.api_key = None
+    result = scheduler.generate_schedule(shooting_data)
+    schedule = result['optimized_schedule']
+
+    assert schedule['solver_stats']['engine'] == 'local_solver'
+    expected = sorted(s['scene_number'] for s in shooting_data['shooting_schedule']['scenes'])
+    assert scheduled_scene_numbers(schedule) == expected
+    print(f"✅ Fallback produced {schedule['total_shooting_days']} day(s) from real scene data")
+
+    return True
+
+def test_local_schedule_endpoint():
+    """Test /api/ai/generate_local_schedule"""
+    print("🌐 Testing local schedule endpoint")
+    print("="*50)
+
+    from routes.ai_routes import ai_bp
+
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.register_blueprint(ai_bp, url_prefix='/api/ai')
+
+    with app.test_client() as client:
+        response = client.post('/api/ai/generate_local_schedule', json={'seed': 3})
+
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data['solver_stats']['seed'] == 3
+    print(f"✅ {data['total_shooting_days']} shooting day(s) returned")
+
+    return True
+
+def main():
+    """Run all tests"""
+    print("🎬 Local Schedule Solver Tests")
+    print("="*60)
+
+    tests = [
+        ("Solver Constraints", test_solver_constraints),
+        ("Solver Determinism", test_solver_is_deterministic),
+        ("Gemini Fallback", test_gemini_fallback_uses_solver),
+        ("Local Schedule Endpoint", test_local_schedule_endpoint)
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        print(f"\n🧪 Running: {test_name}")
+        try:
+            success = test_func()
+            results.append((test_name, success))
+        except Exception as e:
+            print(f"❌ Test failed with exception: {e}")
+            results.append((test_name, False))
+
+        print("\n" + "-"*50)
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test the realtime message bus: fan-out and presence across workers
+"""
+
+import multiprocessing
+import os
+import tempfile
+import time
+from utils.broadcast import BroadcastPipeline, change_rooms
+from utils.change_feed import ChangeFeed
+from utils.message_bus import MessageBus, SQLiteMessageBus, get_message_bus
+
+def wait_for(condition, bus, timeout=5):
+    """Poll the bus until condition() holds"""
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, 'timed out waiting for the bus'
+        bus.poll()
+        time.sleep(0.02)
+
+def other_worker(db_path, ready, done):
+    """A second server process: one connected producer, one published change, then a crash"""
+    bus = SQLiteMessageBus(worker_id='worker-2', db_path=db_path, presence_ttl_seconds=0.5)
+    bus.add_session('sid-remote', 'user-2', ['user_user-2', 'role_producer'])
+    ready.set()
+    bus.publish('changes', [{'seq': 1, 'collection': 'tasks', 'id': '4', 'op': 'update',
+                             'fields': ['status'], 'data': {'status': 'done'}}])
+    done.wait(10)
+    # Exit without close(): presence must expire with the worker's heartbeat
+    os._exit(0)
+
+def test_memory_bus():
+    """Test the single-process default"""
+    print("🚌 Testing in-memory bus")
+    print("="*50)
+
+    bus = get_message_bus('memory')
+    received = []
+    bus.subscribe('changes', received.append)
+    bus.publish('changes', ['a'])
+    bus.add_session('s1', 'u1', ['user_u1', 'role_crew'])
+    bus.add_session('s2', 'u1', ['user_u1'])
+    assert received == [['a']] and bus.poll() == 0
+    assert bus.local_session_ids(['role_crew', 'user_u1']) == {'s1', 's2'}
+    assert bus.connected_users() == {'u1': {'s1', 's2'}}
+    assert bus.remove_session('s1') == 'u1' and bus.local_session_ids(['role_crew']) == set()
+    bus.close()
+    assert not bus.is_user_connected('u1')
+    print("✅ Local delivery, room lookups and presence")
+    return True
+
+def test_fan_out_across_workers():
+    """Test that a change made on one worker reaches clients on every worker exactly once"""
+    print("🔀 Testing cross-worker fan-out")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, 'bus.sqlite3')
+        workers = []
+        for name, sessions in [('worker-a', {'sid-a1': 'role_producer', 'sid-a2': 'role_crew'}),
+                               ('worker-b', {'sid-b1': 'role_producer', 'sid-b2': 'role_director'})]:
+            bus = SQLiteMessageBus(worker_id=name, db_path=db_path)
+            sent = []
+            # debounce 0: each change is emitted as soon as the bus delivers it
+            pipeline = BroadcastPipeline(lambda event, payload, sid, sent=sent: sent.append(sid),
+                                         bus.local_session_ids, debounce_seconds=0)
+            bus.subscribe('changes', lambda changes, pipeline=pipeline:
+                          [pipeline.publish(change, change_rooms(change)) for change in changes])
+            for sid, room in sessions.items():
+                bus.add_session(sid, sid, [room])
+            workers.append((bus, sent))
+        (bus_a, sent_a), (bus_b, sent_b) = workers
+
+        # A write handled by worker A
+        feed = ChangeFeed(max_entries=10)
+        feed.subscribe(lambda changes: bus_a.publish('changes', changes))
+        feed.record_write('tasks.json', [{'id': '1', 'status': 'todo'}], [{'id': '1', 'status': 'done'}])
+        assert sent_a == ['sid-a1'] and sent_b == []
+        wait_for(lambda: sent_b, bus_b)
+        assert sorted(sent_b) == ['sid-b1', 'sid-b2']
+        assert bus_a.poll() == 0 and bus_b.poll() == 0 and sent_a == ['sid-a1']
+        print("✅ Task change reached producers/directors on both workers, once each")
+
+        assert set(bus_a.connected_users()) == set(bus_b.connected_users()) == {'sid-a1', 'sid-a2', 'sid-b1', 'sid-b2'}
+        bus_b.close()
+        assert set(bus_a.connected_users()) == {'sid-a1', 'sid-a2'}
+        print("✅ Presence is shared, and a cleanly stopped worker's sessions disappear")
+        bus_a.close()
+
+    return True
+
+def test_presence_survives_process_boundaries():
+    """Test a real second process: its messages, its sessions and its crash"""
+    print("🧭 Testing presence across processes")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, 'bus.sqlite3')
+        bus = SQLiteMessageBus(worker_id='worker-1', db_path=db_path, presence_ttl_seconds=0.5)
+        received = []
+        bus.subscribe('changes', received.extend)
+        bus.add_session('sid-local', 'user-1', ['role_crew'])
+
+        context = multiprocessing.get_context('spawn')
+        ready, done = context.Event(), context.Event()
+        process = context.Process(target=other_worker, args=(db_path, ready, done))
+        process.start()
+        try:
+            assert ready.wait(30)
+            wait_for(lambda: received, bus)
+            assert received[0]['id'] == '4'
+            assert bus.is_user_connected('user-2') and bus.local_session_ids(['role_producer']) == set()
+            print("✅ Message and session from another process visible here; its sessions stay its own")
+        finally:
+            done.set()
+            process.join(30)
+
+        wait_for(lambda: not bus.is_user_connected('user-2'), bus)
+        assert bus.is_user_connected('user-1')
+        print("✅ Sessions of a crashed worker expire with its heartbeat")
+        bus.close()
+
+    return True
+
+def main():
+    """Run all tests"""
+    print("🚀 Starting Message Bus Tests")
+    print("="*60)
+
+    tests = [
+        test_memory_bus,
+        test_fan_out_across_workers,
+        test_presence_survives_process_boundaries,
+    ]
+    passed = sum(1 for test in tests if test())
+    print(f"\n🎉 {passed}/{len(tests)} message bus tests passed")
+
+if __name__ == "__main__":
+    main()
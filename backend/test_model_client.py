@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Test the shared model client registry and the pooled HTTP transport against a local fake Gemini server
+"""
+
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.gemini_cache import GeminiResponseCache
+from utils.gemini_scheduler import GeminiScheduler
+from utils.model_client import (
+    HTTPTransport, ModelClientRegistry, ModelResponseError, ModelTransport, model_clients
+)
+from utils.rate_limiter import RateLimiter
+
+def load_shooting_data():
+    data_dir = os.path.join(os.path.dirname(__file__), 'data')
+    with open(os.path.join(data_dir, 'shooting_schedule.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class FakeGeminiHandler(BaseHTTPRequestHandler):
+    """Answers generateContent / streamGenerateContent like the REST API"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive, so connection reuse is observable
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.requests.append({
+            'path': self.path,
+            'client_port': self.client_address[1],
+            'api_key': self.headers.get('x-goog-api-key'),
+            'body': body,
+        })
+        prompt = body['contents'][0]['parts'][0]['text']
+        if 'BLOCK ME' in prompt:
+            payload = json.dumps({'promptFeedback': {'blockReason': 'SAFETY'}})
+            self._send('application/json', payload)
+            return
+
+        text = self.server.answer(prompt)
+        if ':streamGenerateContent' in self.path:
+            chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+            events = ''.join(
+                'data: ' + json.dumps({'candidates': [{'content': {'parts': [{'text': chunk}]}}]}) + '\r\n\r\n'
+                for chunk in chunks
+            )
+            self._send('text/event-stream', events)
+        else:
+            self._send('application/json', json.dumps({'candidates': [{'content': {'parts': [{'text': text}]}}]}))
+
+    def _send(self, content_type, payload):
+        data = payload.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+def compact_answer(prompt):
+    """Two scenes per day, in prompt order"""
+    if 'SCENES (' not in prompt:
+        return 'pong'
+    rows = prompt.split('SCENES (')[1].split('RULES:')[0].strip().splitlines()[1:]
+    numbers = [int(row.split('|')[0]) for row in rows]
+    return json.dumps({
+        'scheduling_strategy': 'Fake server',
+        'days': [numbers[i:i + 2] for i in range(0, len(numbers), 2)],
+    })
+
+def start_fake_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeGeminiHandler)
+    server.daemon_threads = True
+    server.requests = []
+    server.answer = compact_answer
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1beta"
+
+def test_registry_creates_clients_once():
+    """Test that clients and transports are created lazily and then shared"""
+    print("🔁 Testing model client registry")
+    print("="*50)
+
+    created = []
+
+    def factory(api_key):
+        created.append(api_key)
+        return ModelTransport()
+
+    registry = ModelClientRegistry(factory)
+    assert registry.get_status() == {'clients': 0, 'transports': 0}, "nothing is built until first use"
+
+    first = registry.get('model-a', api_key='key-1')
+    assert registry.get('model-a', api_key='key-1') is first
+    other_model = registry.get('model-b', api_key='key-1')
+    assert other_model is not first and other_model.transport is first.transport
+    registry.get('model-a', api_key='key-2')
+    assert created == ['key-1', 'key-2'], "one transport per API key"
+    assert registry.get_status() == {'clients': 3, 'transports': 2}
+    print("✅ One client per model, one transport per key")
+
+    original_key = os.environ.pop('GEMINI_API_KEY', None)
+    try:
+        registry.get('model-a')
+        assert False, "missing key should raise"
+    except ValueError:
+        print("✅ Missing API key raises ValueError")
+    finally:
+        if original_key is not None:
+            os.environ['GEMINI_API_KEY'] = original_key
+
+    registry.reset()
+    assert registry.get_status() == {'clients': 0, 'transports': 0}
+    return True
+
+def test_http_transport_reuses_connection():
+    """Test generate and stream over one keep-alive session"""
+    print("🌐 Testing pooled HTTP transport")
+    print("="*50)
+
+    server, base_url = start_fake_server()
+    registry = ModelClientRegistry(lambda api_key: HTTPTransport(api_key, base_url=base_url, pool_size=2))
+    try:
+        client = registry.get('gemini-test', api_key='test-key')
+        for _ in range(5):
+            assert registry.get('gemini-test', api_key='test-key').generate('ping', {'max_output_tokens': 64}) == 'pong'
+
+        ports = {request['client_port'] for request in server.requests}
+        assert len(server.requests) == 5
+        assert len(ports) == 1, f"expected one reused connection, saw {len(ports)}"
+        first = server.requests[0]
+        assert first['path'] == '/v1beta/models/gemini-test:generateContent'
+        assert first['api_key'] == 'test-key'
+        assert first['body']['generationConfig'] == {'maxOutputTokens': 64}
+        print(f"✅ 5 calls over {len(ports)} connection")
+
+        text = 'x' * 30
+        server.answer = lambda prompt: text
+        chunks = list(client.stream('ping'))
+        assert len(chunks) > 1 and ''.join(chunks) == text
+        assert server.requests[-1]['path'] == '/v1beta/models/gemini-test:streamGenerateContent?alt=sse'
+        print(f"✅ Streamed {len(chunks)} chunks")
+
+        try:
+            client.generate('BLOCK ME')
+            assert False, "blocked prompt should raise"
+        except ModelResponseError:
+            print("✅ Blocked prompt raises ModelResponseError")
+    finally:
+        registry.reset()
+        server.shutdown()
+        server.server_close()
+
+    return True
+
+def test_scheduler_uses_shared_client():
+    """Test GeminiScheduler end to end through the global registry and the fake server"""
+    print("🎬 Testing GeminiScheduler over the shared client")
+    print("="*50)
+
+    server, base_url = start_fake_server()
+    model_clients.set_transport_factory(lambda api_key: HTTPTransport(api_key, base_url=base_url))
+    shooting_data = load_shooting_data()
+    scene_count = len(shooting_data['shooting_schedule']['scenes'])
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            schedulers = [
+                GeminiScheduler(api_key='test-key', response_cache=GeminiResponseCache(cache_dir=cache_dir),
+                                rate_limiter=RateLimiter('test', 100, 60))
+                for _ in range(2)
+            ]
+            first = schedulers[0].generate_schedule(shooting_data, use_cache=False)
+            second = schedulers[1].generate_schedule(shooting_data, use_cache=False)
+            assert schedulers[0].model_client is schedulers[1].model_client, "schedulers share one client"
+            for result in (first, second):
+                assert 'error' not in result and not result.get('is_mock')
+                scheduled = sum(len(day['scenes']) for day in result['optimized_schedule']['daily_schedules'])
+                assert scheduled == scene_count
+
+            ports = {request['client_port'] for request in server.requests}
+            assert len(ports) == 1, "both requests should reuse the pooled connection"
+            print(f"✅ {len(server.requests)} model calls from 2 schedulers over {len(ports)} connection")
+
+            events = list(schedulers[0].stream_schedule(shooting_data, use_cache=False))
+            assert events[-1][0] == 'complete' and 'error' not in events[-1][1]
+            assert len([event for event, _ in events if event == 'day']) == \
+                len(events[-1][1]['optimized_schedule']['daily_schedules'])
+            print("✅ Streaming schedule works over the shared client")
+    finally:
+        model_clients.set_transport_factory(None)
+        server.shutdown()
+        server.server_close()
+
+    return True
+
+def main():
+    """Run all tests"""
+    print("🚀 Starting Model Client Tests")
+    print("="*60)
+
+    tests = [
+        test_registry_creates_clients_once,
+        test_http_transport_reuses_connection,
+        test_scheduler_uses_shared_client,
+    ]
+    passed = sum(1 for test in tests if test())
+    print(f"\n🎉 {passed}/{len(tests)} model client tests passed")
+
+if __name__ == "__main__":
+    main()
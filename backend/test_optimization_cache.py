@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test that the scheduling endpoints share memoized optimization results
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from flask import Flask
+from routes import ai_routes
+from utils.derived_cache import DerivedDataCache
+
+SOURCE_FILES = ['production_schedule.json', 'shooting_schedule.json']
+
+def create_test_client(data_dir):
+    """Point the AI routes at a copy of the data directory"""
+    ai_routes.DATA_DIR = data_dir
+    ai_routes.optimization_cache = DerivedDataCache(data_dir)
+    ai_routes._saved_optimization_key = None
+
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.register_blueprint(ai_routes.ai_bp, url_prefix='/api/ai')
+    return app.test_client()
+
+def test_endpoints_share_cache():
+    """Test that sort, preview and analysis reuse results until the source files change"""
+    print("🧠 Testing shared optimization cache")
+    print("="*50)
+
+    original_data_dir = ai_routes.DATA_DIR
+    original_cache = ai_routes.optimization_cache
+    source_dir = os.path.join(os.path.dirname(__file__), 'data')
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        for filename in SOURCE_FILES:
+            shutil.copy(os.path.join(source_dir, filename), data_dir)
+
+        try:
+            client = create_test_client(data_dir)
+            cache = ai_routes.optimization_cache
+
+            preview = client.get('/api/ai/preview_schedule').get_json()
+            sort_result = client.post('/api/ai/sort_schedule').get_json()
+            client.get('/api/ai/schedule_analysis')
+            client.get('/api/ai/preview_schedule')
+            client.get('/api/ai/schedule_analysis')
+
+            assert cache.misses == 2, cache.misses
+            assert cache.hits == 3, cache.hits
+            assert [s['scene_number'] for s in sort_result['sorted_scenes'][:5]] == \
+                [s['scene_number'] for s in preview['preview_scenes']]
+            assert sort_result['schedule_cost']['optimized']['total_cost'] > 0
+            print(f"✅ 5 requests, {cache.misses} computations, {cache.hits} cache hits")
+
+            output_path = os.path.join(data_dir, 'optimized_schedule.json')
+            with open(output_path, 'r', encoding='utf-8') as f:
+                optimized_at = datetime.fromisoformat(json.load(f)['optimization_info']['optimized_at'])
+            assert abs(datetime.now().astimezone() - optimized_at) < timedelta(minutes=1)
+            first_write = os.stat(output_path).st_mtime_ns
+            client.post('/api/ai/sort_schedule')
+            assert os.stat(output_path).st_mtime_ns == first_write
+            print("✅ optimized_schedule.json not rewritten for an unchanged source")
+
+            # Changing the source invalidates the cached result
+            production_path = os.path.join(data_dir, 'production_schedule.json')
+            with open(production_path, 'r', encoding='utf-8') as f:
+                production_data = json.load(f)
+            production_data['shooting_schedule'] = production_data['shooting_schedule'][:3]
+            with open(production_path, 'w', encoding='utf-8') as f:
+                json.dump(production_data, f)
+
+            preview = client.get('/api/ai/preview_schedule').get_json()
+            assert preview['total_scenes_available'] == 3
+            print("✅ Editing production_schedule.json invalidates the cache")
+        finally:
+            ai_routes.DATA_DIR = original_data_dir
+            ai_routes.optimization_cache = original_cache
+            ai_routes._saved_optimization_key = None
+
+    return True
+
+def main():
+    """Run all tests"""
+    print("🎬 Optimization Cache Tests")
+    print("="*60)
+
+    try:
+        success = test_endpoints_share_cache()
+    except Exception as e:
+        print(f"❌ Test failed with exception: {e}")
+        success = False
+
+    print(f"\nTotal: {1 if success else 0}/1 tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test the parallel multi-start schedule search
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from flask import Flask
+from benchmark_local_scheduler import generate_scenes
+from routes import ai_routes
+from utils.derived_cache import DerivedDataCache
+from utils.local_scheduler import LocalScheduleSolver
+from utils.parallel_search import MultiStartSearch
+
+def test_best_of_runs():
+    """Test that the search keeps the cheapest of its seeded runs"""
+    print("🏁 Testing multi-start search")
+    print("="*50)
+
+    scenes = generate_scenes(60)
+    result = MultiStartSearch(workers=3, max_iterations=1500).run(scenes)
+    stats = result['search_stats']
+
+    assert stats['runs'] == 3
+    assert stats['best_cost'] == min(run['final_cost'] for run in stats['per_run'])
+    assert stats['best_cost'] == result['schedule']['solver_stats']['final_cost']['total_cost']
+    assert sorted(result['ordering']) == list(range(len(scenes)))
+
+    single = LocalScheduleSolver(seed=42, max_iterations=1500).solve(scenes)
+    assert stats['best_cost'] <= single['solver_stats']['final_cost']['total_cost']
+    print(f"✅ Best of {stats['runs']} runs: {stats['best_cost']} "
+          f"(mean {stats['mean_cost']}, {stats['processes']} process(es))")
+
+    again = MultiStartSearch(workers=3, max_iterations=1500).run(scenes)
+    assert again['ordering'] == result['ordering']
+    print("✅ Same seeds and iteration budget, same schedule")
+
+    return True
+
+def test_time_budget():
+    """Test that runs get a ladder of time budgets, each bounding its run"""
+    print("⏱️  Testing time budget")
+    print("="*50)
+
+    result = MultiStartSearch(workers=2, time_budget_ms=200).run(generate_scenes(300))
+    per_run = result['search_stats']['per_run']
+    assert [run['time_budget_ms'] for run in per_run] == [100, 200]
+    for run in per_run:
+        assert run['search_runtime_ms'] < run['time_budget_ms'] + 800
+        assert run['convergence'][-1][2] == run['final_cost']
+    print(f"✅ Runs finished in {[run['search_runtime_ms'] for run in result['search_stats']['per_run']]} ms")
+
+    return True
+
+def test_sort_schedule_with_workers():
+    """Test workers/time_budget_ms on /api/ai/sort_schedule"""
+    print("🌐 Testing /api/ai/sort_schedule with workers")
+    print("="*50)
+
+    original_data_dir = ai_routes.DATA_DIR
+    original_cache = ai_routes.optimization_cache
+    source_dir = os.path.join(os.path.dirname(__file__), 'data')
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        shutil.copy(os.path.join(source_dir, 'production_schedule.json'), data_dir)
+        try:
+            ai_routes.DATA_DIR = data_dir
+            ai_routes.optimization_cache = DerivedDataCache(data_dir)
+            app = Flask(__name__)
+            app.config['TESTING'] = True
+            app.register_blueprint(ai_routes.ai_bp, url_prefix='/api/ai')
+
+            with app.test_client() as client:
+                response = client.post('/api/ai/sort_schedule', json={'workers': 2, 'time_budget_ms': 100})
+                invalid = client.post('/api/ai/sort_schedule', json={'workers': 0})
+                wrong_types = [client.post('/api/ai/sort_schedule', json=body)
+                               for body in [{'workers': [1]}, {'workers': 2.5}, {'workers': True},
+                                            {'workers': '2'}, {'time_budget_ms': {'ms': 5}}]]
+                default = client.post('/api/ai/sort_schedule').get_json()
+        finally:
+            ai_routes.DATA_DIR = original_data_dir
+            ai_routes.optimization_cache = original_cache
+            ai_routes._saved_optimization_key = None
+
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data['search_stats']['runs'] == 2
+    assert data['total_scenes'] == len(data['sorted_scenes'])
+    assert invalid.status_code == 400
+    assert [r.status_code for r in wrong_types] == [400] * 5
+    assert [r.get_json()['message'] for r in wrong_types] == \
+        ['workers must be an integer'] * 4 + ['time_budget_ms must be an integer']
+    # Both costs come from the same model, whichever optimizer produced the order
+    with open(os.path.join(source_dir, 'production_schedule.json'), encoding='utf-8') as f:
+        scenes = json.load(f)['shooting_schedule']
+    by_number = {scene['scene_number']: scene for scene in scenes}
+    ordering = [by_number[scene['scene_number']] for scene in data['sorted_scenes']]
+    original, optimized = ai_routes.ScheduleOptimizer().score_orderings(scenes, [scenes, ordering])
+    assert data['schedule_cost'] == {**default['schedule_cost'], 'optimized': optimized}
+    assert data['schedule_cost']['original'] == original
+    print(f"✅ {data['total_scenes']} scenes on {data['total_shooting_days']} day(s), "
+          f"best seed {data['search_stats']['best_seed']}")
+
+    return True
+
+def main():
+    """Run all tests"""
+    print("🎬 Parallel Search Tests")
+    print("="*60)
+
+    tests = [
+        ("Best Of Runs", test_best_of_runs),
+        ("Time Budget", test_time_budget),
+        ("Sort Schedule With Workers", test_sort_schedule_with_workers)
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        print(f"\n🧪 Running: {test_name}")
+        try:
+            success = test_func()
+            results.append((test_name, success))
+        except Exception as e:
+            print(f"❌ Test failed with exception: {e}")
+            results.append((test_name, False))
+
+        print("\n" + "-"*50)
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
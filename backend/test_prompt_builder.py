@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Test compact Gemini scheduling prompts, token budgeting and chunked merges
+"""
+
+import json
+import os
+import tempfile
+from benchmark_local_scheduler import generate_scenes
+from utils.gemini_cache import GeminiResponseCache
+from utils.gemini_scheduler import GeminiScheduler
+from utils.prompt_builder import SchedulingPromptBuilder, estimate_tokens
+from utils.rate_limiter import RateLimiter, RateLimitExceeded
+
+def load_shooting_data():
+    data_file = os.path.join(os.path.dirname(__file__), 'data', 'shooting_schedule.json')
+    with open(data_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class CompactAnswerScheduler(GeminiScheduler):
+    """GeminiScheduler whose model answers every prompt in compact format"""
+
+    @staticmethod
+    def answer(prompt):
+        rows = prompt.split('SCENES (')[1].split('RULES:')[0].strip().splitlines()[1:]
+        numbers = [int(row.split('|')[0]) for row in rows]
+        return {'scheduling_strategy': 'Part by part.', 'days': [numbers[i:i + 5] for i in range(0, len(numbers), 5)]}
+
+    def call_gemini_api(self, prompt):
+        self._respect_rate_limit()
+        return self.answer(prompt)
+
+    def stream_gemini_api(self, prompt):
+        self._respect_rate_limit()
+        yield json.dumps(self.answer(prompt))
+
+def test_compact_encoding():
+    """Test that scenes are dictionary-coded and nothing is hard-coded"""
+    print("🗜️  Testing compact scene encoding")
+    print("="*50)
+
+    scenes = [
+        {'scene_number': 1, 'scene_title': 'INT. BAKERY - DAY', 'location': 'Bakery',
+         'time_of_day': 'DAY', 'actors': [{'name': 'Ines'}, {'name': 'Otto'}]},
+        {'scene_number': 2, 'scene_title': 'EXT. PIER - NIGHT', 'location': 'Pier',
+         'time_of_day': 'NIGHT', 'actors': [{'name': 'Ines'}], 'extras': [{'role': 'Fishermen'}]},
+        {'scene_number': 3, 'scene_title': 'INT. BAKERY - NIGHT', 'location': 'Bakery',
+         'time_of_day': 'NIGHT', 'actors': [{'name': 'Otto'}]},
+    ]
+    prompt = SchedulingPromptBuilder().build_prompt(scenes, 'Flour')
+
+    assert 'L1|Bakery' in prompt and 'L2|Pier' in prompt
+    assert 'A1|Ines' in prompt and 'A2|Otto' in prompt
+    assert '1|INT. BAKERY - DAY|L1|DAY||A1 A2|' in prompt
+    assert '2|EXT. PIER - NIGHT|L2|NIGHT||A1|Fishermen' in prompt
+    rows = prompt.split('SCENES (')[1].split('RULES:')[0]
+    assert 'Bakery' not in rows and 'Ines' not in rows, "scene rows should use ids, not names"
+    assert 'Recurring actors' in prompt and 'Ines (2 scenes)' in prompt
+    for leaked in ('Maya', 'Radio Station'):
+        assert leaked not in prompt, f"{leaked!r} is not part of this project"
+    print(f"✅ {len(prompt)} chars, ~{estimate_tokens(prompt)} tokens, no hard-coded project names")
+
+    shooting_data = load_shooting_data()
+    scheduler = GeminiScheduler(api_key=None)
+    parts = scheduler.create_scheduling_prompts(shooting_data)
+    assert len(parts) == 1
+    assert parts[0][1] == scheduler.create_scheduling_prompt(shooting_data)
+    print(f"✅ Sample project fits in one prompt (~{estimate_tokens(parts[0][1])} tokens)")
+
+    return True
+
+def test_large_project_chunking():
+    """Test that a large project is split into parts within both budgets"""
+    print("✂️  Testing token-budgeted chunking")
+    print("="*50)
+
+    builder = SchedulingPromptBuilder(max_prompt_tokens=8000, max_output_tokens=4096)
+    scenes = generate_scenes(2000)
+    assert not builder.fits(scenes, 'Epic')
+
+    parts = builder.chunk_scenes(scenes, 'Epic')
+    assert len(parts) > 1
+    assert sorted(s['scene_number'] for part in parts for s in part) == sorted(s['scene_number'] for s in scenes)
+    for number, part in enumerate(parts, 1):
+        prompt = builder.build_prompt(part, 'Epic', number, len(parts))
+        assert estimate_tokens(prompt) <= builder.max_prompt_tokens, f"part {number} over prompt budget"
+        assert builder.estimate_output_tokens(len(part)) <= builder.max_output_tokens
+        assert f"part {number} of {len(parts)}" in prompt
+
+    split_locations = {}
+    for number, part in enumerate(parts):
+        for scene in part:
+            split_locations.setdefault(scene['location'], set()).add(number)
+    assert sum(1 for p in split_locations.values() if len(p) > 1) == 0, "locations should stay in one part"
+    print(f"✅ 2000 scenes → {len(parts)} parts, every part within budget, locations kept together")
+
+    return True
+
+def test_parts_over_quota_fall_back_locally():
+    """Test that a chunked project within a 1-call quota is scheduled, not rejected"""
+    print("🚦 Testing chunked parts over quota")
+    print("="*50)
+
+    scenes = generate_scenes(600)
+    scenes_data = {'project_title': 'Epic', 'shooting_schedule': {'scenes': scenes}}
+    numbers = sorted(s['scene_number'] for s in scenes)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = GeminiResponseCache(cache_dir=cache_dir)
+        scheduler = CompactAnswerScheduler(api_key='test-key', response_cache=cache,
+                                           rate_limiter=RateLimiter('parts-quota-test', 1, 60))
+        scheduler.prompt_builder = SchedulingPromptBuilder(max_prompt_tokens=4000, max_output_tokens=4096)
+        parts = len(scheduler.create_scheduling_prompts(scenes_data))
+        assert parts > 1
+
+        result = scheduler.generate_schedule(scenes_data, use_cache=False)
+        info = result['generation_info']
+        assert 'error' not in result and not result.get('is_mock')
+        assert info['local_parts'] == list(range(2, parts + 1))
+        scheduled = [s['scene_number'] for day in result['optimized_schedule']['daily_schedules'] for s in day['scenes']]
+        assert sorted(scheduled) == numbers, "every scene exactly once"
+        print(f"✅ {parts} parts, 1 call allowed: part 1 from the model, parts 2-{parts} solved locally")
+
+        try:
+            scheduler.generate_schedule(scenes_data, use_cache=False)
+            assert False, "nothing left in the quota should still raise"
+        except RateLimitExceeded:
+            print("✅ Request with no quota at all still raises RateLimitExceeded")
+
+        streamer = CompactAnswerScheduler(api_key='test-key', response_cache=cache,
+                                          rate_limiter=RateLimiter('parts-stream-test', 1, 60))
+        streamer.prompt_builder = scheduler.prompt_builder
+        events = list(streamer.stream_schedule(scenes_data, use_cache=False))
+        kinds = [event for event, _ in events]
+        assert 'reset' not in kinds and kinds[-1] == 'complete'
+        complete = events[-1][1]
+        assert 'error' not in complete and complete['generation_info']['local_parts'] == list(range(2, parts + 1))
+        streamed = [s['scene_number'] for event, day in events if event == 'day' for s in day['scenes']]
+        assert sorted(streamed) == numbers
+        print(f"✅ Streaming: {kinds.count('day')} days, no error after part 1")
+
+    return True
+
+def test_merge_results():
+    """Test that compact day lists expand into a schedule with every scene once"""
+    print("🧩 Testing merge of chunked responses")
+    print("="*50)
+
+    shooting_data = load_shooting_data()
+    scenes = shooting_data['shooting_schedule']['scenes']
+    numbers = [scene['scene_number'] for scene in scenes]
+    builder = SchedulingPromptBuilder()
+
+    # Two parts; the second repeats a scene, names an unknown one and drops the last
+    results = [
+        {'scheduling_strategy': 'Radio first.', 'days': [numbers[:2], [numbers[2]]],
+         'optimization_benefits': ['Fewer moves'], 'potential_risks': ['Weather']},
+        {'scheduling_strategy': 'Then the rest.', 'days': [numbers[2:-1] + [999]],
+         'optimization_benefits': ['Fewer moves'], 'potential_risks': []},
+    ]
+    schedule = builder.merge_results(scenes, results)
+
+    scheduled = [s['scene_number'] for day in schedule['daily_schedules'] for s in day['scenes']]
+    assert sorted(scheduled) == sorted(numbers), "every scene exactly once"
+    assert [s['scene_number'] for s in schedule['daily_schedules'][0]['scenes']] == numbers[:2]
+    assert schedule['unscheduled_by_model'] == [numbers[-1]]
+    assert schedule['scheduling_strategy'] == 'Radio first. Then the rest.'
+    assert schedule['optimization_benefits'] == ['Fewer moves']
+    assert schedule['total_shooting_days'] == len(schedule['daily_schedules']) == 4
+    print(f"✅ {len(scheduled)} scenes over {schedule['total_shooting_days']} days, "
+          f"unplaced scene {numbers[-1]} packed locally")
+
+    return True
+
+def main():
+    """Run all prompt builder tests"""
+    tests = [test_compact_encoding, test_large_project_chunking, test_parts_over_quota_fall_back_locally,
+             test_merge_results]
+    passed = 0
+    for test in tests:
+        try:
+            if test():
+                passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} failed: {e}")
+        print()
+    print(f"🎯 {passed}/{len(tests)} prompt builder tests passed")
+
+if __name__ == "__main__":
+    main()
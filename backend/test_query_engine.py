@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Test the shared query engine: filters, projection, sort, cursor pagination and plans
+"""
+
+import json
+import os
+import random
+import re
+import tempfile
+import time
+from flask import Flask
+from routes.assets import assets_bp
+from routes.budget import budget_bp
+from routes.script import script_bp
+from routes.tasks import TASKS, tasks_bp
+from routes.users import users_bp
+from routes.vfx import vfx_bp
+from utils.json_handler import json_handler
+from utils.query_engine import CollectionIndex, Query, parse_filter
+
+RANKED_VALUES = TASKS.ranked
+
+CATEGORIES = ['Equipment', 'Locations', 'Cast', 'VFX', 'Wardrobe']
+
+def make_tasks(count, seed=7):
+    rng = random.Random(seed)
+    return [{
+        'id': str(i + 1),
+        'title': f'Task {rng.randint(1, 400)}',
+        'description': 'Generated',
+        'status': rng.choice(RANKED_VALUES['status']),
+        'assignee': f'User {i % 9}',
+        'assigneeId': str(i % 9 + 1),
+        'dueDate': f'2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}',
+        'priority': rng.choice(RANKED_VALUES['priority']),
+        'category': rng.choice(CATEGORIES),
+        'estimatedHours': rng.choice([0, 1, 2.5, 4, 8, None]),
+    } for i in range(count)]
+
+def reference_query(tasks, filters, due_from, due_to, sort):
+    """Brute-force scan the index must agree with"""
+    index = CollectionIndex(TASKS, tasks)
+    spec = index.parse_sort(sort)
+    matches = [(position, task) for position, task in enumerate(tasks)
+               if all(task.get(field) in values for field, values in filters.items())
+               and (due_from is None or task['dueDate'] >= due_from)
+               and (due_to is None or task['dueDate'] <= due_to)]
+    return [task for position, task in sorted(matches, key=lambda entry: index.sort_key(entry[1], spec, entry[0]))]
+
+def task_filters(filters, due_from, due_to):
+    """Engine filters for the reference query arguments"""
+    result = [(field, 'in', values) for field, values in filters.items()]
+    if due_from or due_to:
+        result.append(parse_filter(TASKS, 'dueDate', f"{due_from or ''}..{due_to or ''}"))
+    return result
+
+def walk_pages(index, limit, filters=(), sort=None):
+    """Follow nextCursor until the last page"""
+    items, cursor, pages = [], None, 0
+    while True:
+        page = index.query(Query(filters=list(filters), sort=sort, limit=limit, cursor=cursor))
+        items.extend(page['items'])
+        pages += 1
+        cursor = page['nextCursor']
+        if not cursor:
+            return items, pages, page['total']
+
+def test_queries_match_full_scan():
+    """Test random filter/sort/page combinations against a full scan"""
+    print("🔎 Testing indexed task queries")
+    print("="*50)
+
+    tasks = make_tasks(1500)
+    index = CollectionIndex(TASKS, tasks)
+    rng = random.Random(11)
+    sorts = ['id', 'dueDate', '-priority,dueDate', 'status,-estimatedHours', 'title,-id', 'category,assignee']
+    for _ in range(60):
+        filters = {}
+        if rng.random() < 0.5:
+            filters['status'] = rng.sample(RANKED_VALUES['status'], rng.randint(1, 2))
+        if rng.random() < 0.4:
+            filters['category'] = [rng.choice(CATEGORIES)]
+        if rng.random() < 0.3:
+            filters['assigneeId'] = [str(rng.randint(1, 9))]
+        due_from = '2024-03-01' if rng.random() < 0.3 else None
+        due_to = '2024-09-15' if rng.random() < 0.3 else None
+        sort = rng.choice(sorts)
+
+        expected = reference_query(tasks, filters, due_from, due_to, sort)
+        items, pages, total = walk_pages(index, rng.choice([7, 50, 400]),
+                                         task_filters(filters, due_from, due_to), sort)
+        assert [task['id'] for task in items] == [task['id'] for task in expected], (filters, sort)
+        assert total == len(expected)
+    print("✅ 60 random queries paged to the same results as a full scan")
+
+    first = index.query(Query(sort='-priority,dueDate', limit=3))
+    assert [task['priority'] for task in first['items']] == ['high'] * 3
+    assert first['items'][0]['dueDate'] <= first['items'][1]['dueDate']
+    print("✅ Priority sorts by rank, not alphabetically")
+
+    start = time.perf_counter()
+    for _ in range(200):
+        index.query(Query(filters=[('status', 'eq', 'todo'), ('assigneeId', 'eq', '3')], sort='dueDate', limit=20))
+    per_query = (time.perf_counter() - start) / 200 * 1000
+    print(f"✅ Filtered page from {len(tasks)} tasks in {per_query:.2f} ms")
+    return True
+
+def test_tasks_route_pagination():
+    """Test GET /api/tasks parameters, errors and index refresh after writes"""
+    print("🌐 Testing GET /api/tasks query parameters")
+    print("="*50)
+
+    original_data_dir = json_handler.data_dir
+    with tempfile.TemporaryDirectory() as data_dir:
+        tasks = make_tasks(120)
+        with open(os.path.join(data_dir, 'tasks.json'), 'w', encoding='utf-8') as f:
+            json.dump(tasks, f)
+        json_handler.data_dir = data_dir
+        try:
+            app = Flask(__name__)
+            app.config['TESTING'] = True
+            app.register_blueprint(tasks_bp, url_prefix='/api/tasks')
+            client = app.test_client()
+
+            everything = client.get('/api/tasks').get_json()
+            assert len(everything['data']) == 120 and everything['pagination']['nextCursor'] is None
+
+            seen, url = [], '/api/tasks?status=todo,in_progress&sort=dueDate&limit=25'
+            while url:
+                body = client.get(url).get_json()
+                seen.extend(task['id'] for task in body['data'])
+                cursor = body['pagination']['nextCursor']
+                url = f'/api/tasks?status=todo,in_progress&sort=dueDate&limit=25&cursor={cursor}' if cursor else None
+            expected = reference_query(tasks, {'status': ['todo', 'in_progress']}, None, None, 'dueDate')
+            assert seen == [task['id'] for task in expected]
+            print(f"✅ {len(seen)} open tasks paged 25 at a time")
+
+            body = client.get('/api/tasks?assigneeId=3&dueDate=2024-06-01..2024-06-30').get_json()
+            assert all(task['assigneeId'] == '3' and '2024-06' in task['dueDate'] for task in body['data'])
+            by_assignee = client.get('/api/tasks/assignee/3').get_json()['data']
+            assert [task['id'] for task in by_assignee] == [task['id'] for task in tasks if task['assigneeId'] == '3']
+            print("✅ Assignee and due date range filters")
+
+            cursor = client.get('/api/tasks?sort=title&limit=5').get_json()['pagination']['nextCursor']
+            for url, message in [
+                ('/api/tasks?sort=budget', 'Unknown tasks field "budget"'),
+                ('/api/tasks?limit=0', 'limit must be between'),
+                ('/api/tasks?fields=id,owner', 'Unknown tasks field "owner"'),
+                ('/api/tasks?estimatedHours=2..June', 'estimatedHours range bounds must both be'),
+                ('/api/tasks?cursor=nonsense', 'Invalid cursor'),
+                (f'/api/tasks?sort=dueDate&cursor={cursor}', 'cursor does not match sort'),
+            ]:
+                response = client.get(url)
+                assert response.status_code == 400 and response.get_json()['message'].startswith(message), url
+            print("✅ Bad parameters rejected with 400")
+
+            ignored = client.get('/api/tasks?_=1700000000&owner=3&limit=10').get_json()
+            assert ignored['success'] and ignored['pagination']['total'] == 120
+            print("✅ Unknown parameters such as cache busters are ignored")
+
+            returned = TASKS.query(Query(limit=1))['items'][0]
+            returned['title'] = 'Changed by a caller'
+            assert TASKS.query(Query(limit=1))['items'][0]['title'] == tasks[0]['title']
+            print("✅ Returned items are copies of the shared snapshot")
+
+            index = TASKS.load()
+            assert TASKS.load() is index
+            assert client.put('/api/tasks/1', json={'status': 'done', 'priority': 'high'}).status_code == 200
+            assert TASKS.load() is not index
+            done = client.get('/api/tasks?status=done&priority=high').get_json()['data']
+            assert '1' in [task['id'] for task in done]
+            print("✅ Index reused between requests and rebuilt after a write")
+        finally:
+            json_handler.data_dir = original_data_dir
+
+    return True
+
+def test_list_routes_share_engine():
+    """Test filters, projection and plans on the other list endpoints"""
+    print("🧭 Testing list endpoints on the shared engine")
+    print("="*50)
+
+    source_dir = os.path.join(os.path.dirname(__file__), 'data')
+    original_data_dir = json_handler.data_dir
+    with tempfile.TemporaryDirectory() as data_dir:
+        for filename in ['tasks.json', 'users.json', 'vfx.json', 'budget.json', 'script.json']:
+            with open(os.path.join(source_dir, filename), 'r', encoding='utf-8') as src:
+                data = json.load(src)
+            with open(os.path.join(data_dir, filename), 'w', encoding='utf-8') as dst:
+                json.dump(data, dst)
+        with open(os.path.join(data_dir, 'assets.json'), 'w', encoding='utf-8') as f:
+            json.dump([{'id': f'a{i}', 'name': f'Plate {i}.mov', 'filename': f'secret_{i}.mov', 'size': i * 100,
+                        'type': 'video/quicktime' if i % 2 else 'image/png', 'uploadDate': f'2024-10-{i + 1:02d}',
+                        'url': f'/api/assets/download/{i}'} for i in range(10)], f)
+        json_handler.data_dir = data_dir
+        try:
+            app = Flask(__name__)
+            app.config['TESTING'] = True
+            for blueprint, prefix in [(tasks_bp, 'tasks'), (users_bp, 'users'), (vfx_bp, 'vfx'),
+                                      (budget_bp, 'budget'), (script_bp, 'script'), (assets_bp, 'assets')]:
+                app.register_blueprint(blueprint, url_prefix=f'/api/{prefix}')
+            client = app.test_client()
+
+            users = client.get('/api/users?permissions=manage_crew&fields=id,name,permissions').get_json()['data']
+            assert users and all(set(user) <= {'id', 'name', 'permissions'} for user in users)
+            assert all('manage_crew' in user['permissions'] for user in users)
+            assert all('password' not in user for user in client.get('/api/users').get_json()['data'])
+            everyone = client.get('/api/users').get_json()['pagination']['total']
+            assert client.get('/api/users?password=password123').get_json()['pagination']['total'] == everyone
+            print("✅ List fields filter by element; passwords never returned or queryable")
+
+            body = client.get('/api/vfx?priority=high,medium&estimatedHours=10..&sort=-estimatedHours&explain=1').get_json()
+            hours = [shot['estimatedHours'] for shot in body['data']]
+            assert hours == sorted(hours, reverse=True) and all(h >= 10 for h in hours)
+            assert [step['access'] for step in body['plan']['filters']] == ['index', 'index']
+            plan = client.get('/api/vfx?description=~explosion&explain=1').get_json()['plan']
+            assert plan['filters'][0]['access'] == 'scan' and plan['filters'][0]['examined'] == plan['items']
+            print("✅ Indexed filters intersect; explain shows index and scan steps")
+
+            history = client.get('/api/budget/history').get_json()['data']
+            assert [entry['date'] for entry in history] == sorted((entry['date'] for entry in history), reverse=True)
+            cast = client.get('/api/budget/history?category=Cast&amount=100000..').get_json()['data']
+            assert cast and all(entry['category'] == 'Cast' and entry['amount'] >= 100000 for entry in cast)
+
+            scenes = client.get('/api/script/scenes?int_ext=EXT&fields=id,title&limit=2').get_json()
+            assert len(scenes['data']) <= 2 and all(set(scene) <= {'id', 'title'} for scene in scenes['data'])
+            assert client.get('/api/script/scenes?_=1&int_ext=EXT').get_json()['data'] == \
+                client.get('/api/script/scenes?int_ext=EXT').get_json()['data']
+            night = client.get('/api/script/scenes?title=~night').get_json()['data']
+            assert night and all('night' in scene['title'].lower() for scene in night)
+
+            assets = client.get('/api/assets/search?q=PLATE&type=video').get_json()['data']
+            assert [asset['id'] for asset in assets] == ['a1', 'a3', 'a5', 'a7', 'a9']
+            assert all('filename' not in asset for asset in assets)
+            page = client.get('/api/assets?size=200..600&sort=-uploadDate&limit=3').get_json()
+            assert [asset['id'] for asset in page['data']] == ['a6', 'a5', 'a4'] and page['pagination']['total'] == 5
+            print("✅ Budget history, scenes and assets share the same query parameters")
+
+            os.remove(os.path.join(data_dir, 'script.json'))
+            assert client.get('/api/script/scenes').status_code == 404
+        finally:
+            json_handler.data_dir = original_data_dir
+
+    return True
+
+FRONTEND_SRC = os.path.join(os.path.dirname(__file__), '..', 'prodsight', 'src')
+
+def read_source(*parts):
+    with open(os.path.join(FRONTEND_SRC, *parts), encoding='utf-8') as f:
+        return f.read()
+
+def task_fields_read(*sources):
+    return set(re.findall(r'\b(?:task|t)\.(\w+)', ''.join(sources)))
+
+def test_task_views_request_what_they_render():
+    """Test that every task view passes a query, and its field list covers what it reads"""
+    print("🧾 Testing task view queries")
+    print("="*50)
+
+    unqueried = []
+    for folder, _, files in os.walk(FRONTEND_SRC):
+        for name in files:
+            if name.endswith(('.ts', '.tsx')):
+                with open(os.path.join(folder, name), encoding='utf-8') as f:
+                    if 'useTasks()' in f.read():
+                        unqueried.append(name)
+    assert not unqueried, f'useTasks() without a query in {unqueried}'
+
+    def field_list(source):
+        declared = re.search(r'TASK_FIELDS_READ: \(keyof Task\)\[\] = \[(.*?)\];', source, re.S)
+        assert declared, 'TASK_FIELDS_READ not found'
+        return re.findall(r"'(\w+)'", declared.group(1))
+
+    kanban = [read_source('components', 'kanban', name) for name in ['KanbanBoard.tsx', 'KanbanColumn.tsx', 'KanbanCard.tsx']]
+    reports = read_source('pages', 'Reports', 'Reports.tsx')
+    views = {
+        'Tasks board': (field_list(read_source('pages', 'Tasks', 'Tasks.tsx')), task_fields_read(*kanban)),
+        'Reports': (field_list(reports), task_fields_read(reports)),
+    }
+    dashboard = re.search(r'TASK_FIELDS_READ: Record<string, \(keyof Task\)\[\]> = \{(.*?)\n\};',
+                          read_source('pages', 'Dashboard', 'Dashboard.tsx'), re.S)
+    assert dashboard, 'TASK_FIELDS_READ not found in Dashboard.tsx'
+    for role, fields in re.findall(r"'([A-Za-z ]+)': \[(.*?)\]", dashboard.group(1)):
+        component = read_source('pages', 'Dashboard', role.replace(' ', '') + 'Dashboard.tsx')
+        views[f'{role} dashboard'] = (re.findall(r"'(\w+)'", fields), task_fields_read(component))
+    assert len(views) == 8
+
+    original_data_dir = json_handler.data_dir
+    with tempfile.TemporaryDirectory() as data_dir:
+        with open(os.path.join(data_dir, 'tasks.json'), 'w', encoding='utf-8') as f:
+            json.dump(make_tasks(30), f)
+        json_handler.data_dir = data_dir
+        try:
+            app = Flask(__name__)
+            app.config['TESTING'] = True
+            app.register_blueprint(tasks_bp, url_prefix='/api/tasks')
+            client = app.test_client()
+            for view, (requested, read) in views.items():
+                assert read <= set(requested), f'{view} reads task fields it does not request: {read - set(requested)}'
+                response = client.get(f'/api/tasks?fields={",".join(requested)}')
+                assert response.status_code == 200, response.get_json()
+                assert all(set(task) == set(requested) for task in response.get_json()['data'])
+        finally:
+            json_handler.data_dir = original_data_dir
+    print(f"✅ {len(views)} task views pass a query; each projection covers the fields the view reads")
+    return True
+
+def main():
+    """Run all tests"""
+    print("🚀 Starting Query Engine Tests")
+    print("="*60)
+
+    tests = [
+        test_queries_match_full_scan,
+        test_tasks_route_pagination,
+        test_list_routes_share_engine,
+        test_task_views_request_what_they_render,
+    ]
+    passed = sum(1 for test in tests if test())
+    print(f"\n🎉 {passed}/{len(tests)} query engine tests passed")
+
+if __name__ == "__main__":
+    main()
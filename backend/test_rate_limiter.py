@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Test the shared, non-blocking rate limiters
+"""
+
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from flask import Flask
+from utils.gemini_cache import GeminiResponseCache
+from utils.gemini_scheduler import GeminiScheduler
+from utils.rate_limiter import RateLimiter, RateLimitExceeded, SQLiteRateLimiter
+
+def _acquire_from_process(db_path):
+    limiter = SQLiteRateLimiter('test', max_calls=3, period_seconds=60, db_path=db_path)
+    return limiter.try_acquire() == 0
+
+def test_concurrent_quota():
+    """Test that concurrent callers never exceed the quota and never sleep"""
+    print("🚦 Testing in-process rate limiter under concurrency")
+    print("="*50)
+
+    limiter = RateLimiter('test', max_calls=5, period_seconds=60)
+    granted = []
+    barrier = threading.Barrier(20)
+
+    def worker():
+        barrier.wait()
+        granted.append(limiter.try_acquire() == 0)
+
+    start = time.time()
+    threads = [threading.Thread(target=worker) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+
+    assert granted.count(True) == 5
+    assert elapsed < 1
+    print(f"✅ 5/20 concurrent calls granted in {elapsed * 1000:.1f}ms")
+
+    try:
+        limiter.acquire()
+        assert False, "acquire() should raise when over quota"
+    except RateLimitExceeded as e:
+        assert 0 < e.retry_after <= 60
+        assert e.retry_after_header.isdigit()
+        print(f"✅ Over-quota caller told to retry after {e.retry_after_header}s")
+
+    return True
+
+def test_cross_process_quota():
+    """Test that the SQLite limiter shares quota between processes"""
+    print("🗃️  Testing SQLite rate limiter across processes")
+    print("="*50)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, 'rate_limits.sqlite3')
+        SQLiteRateLimiter('test', max_calls=3, period_seconds=60, db_path=db_path)
+
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(_acquire_from_process, [db_path] * 8))
+
+        assert results.count(True) == 3
+        print(f"✅ {results.count(True)}/8 calls granted across worker processes")
+
+    return True
+
+def test_endpoint_returns_429():
+    """Test that the Gemini endpoint answers 429 with Retry-After when over quota"""
+    print("🌐 Testing /api/ai/generate_gemini_schedule rate limiting")
+    print("="*50)
+
+    from routes import ai_routes
+
+    class LimitedScheduler(GeminiScheduler):
+        def __init__(self):
+            super().__init__(
+                api_key="test-key",
+                response_cache=GeminiResponseCache(cache_dir=cache_dir),
+                rate_limiter=limiter
+            )
+
+    limiter = RateLimiter('test', max_calls=1, period_seconds=60)
+    limiter.try_acquire()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        app = Flask(__name__)
+        app.config['TESTING'] = True
+        app.register_blueprint(ai_routes.ai_bp, url_prefix='/api/ai')
+
+        original_scheduler = ai_routes.GeminiScheduler
+        ai_routes.GeminiScheduler = LimitedScheduler
+        try:
+            with app.test_client() as client:
+                response = client.post('/api/ai/generate_gemini_schedule', json={})
+                # A string is not a boolean: rejected before any quota or cache is touched
+                invalid = [client.post(url, json={'bypass_cache': 'false'}) for url in
+                           ['/api/ai/generate_gemini_schedule', '/api/ai/generate_gemini_schedule/stream']]
+                invalid_mode = client.post('/api/ai/generate_gemini_schedule', json={'hierarchical': 'false'})
+        finally:
+            ai_routes.GeminiScheduler = original_scheduler
+
+    assert response.status_code == 429
+    assert int(response.headers['Retry-After']) >= 1
+    print(f"✅ Status {response.status_code}, Retry-After: {response.headers['Retry-After']}")
+    assert [r.status_code for r in invalid] == [400, 400]
+    assert 'bypass_cache must be true or false' in invalid[0].get_json()['message']
+    assert invalid_mode.status_code == 400
+    print("✅ bypass_cache or hierarchical given as a string is rejected with 400")
+
+    return True
+
+def main():
+    """Run all tests"""
+    print("🎬 Rate Limiter Tests")
+    print("="*60)
+
+    tests = [
+        ("Concurrent Quota", test_concurrent_quota),
+        ("Cross-Process Quota", test_cross_process_quota),
+        ("Endpoint 429", test_endpoint_returns_429)
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        print(f"\n🧪 Running: {test_name}")
+        try:
+            success = test_func()
+            results.append((test_name, success))
+        except Exception as e:
+            print(f"❌ Test failed with exception: {e}")
+            results.append((test_name, False))
+
+        print("\n" + "-"*50)
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized schedule cost model
+"""
+
+import random
+import time
+import numpy as np
+from flask import Flask
+from benchmark_local_scheduler import generate_scenes
+from utils.local_scheduler import LocalScheduleSolver
+from utils.schedule_model import ScheduleModel
+
+def random_days(rng, scene_count, day_count):
+    days = [[] for _ in range(day_count)]
+    for i in range(scene_count):
+        days[rng.randrange(day_count)].append(i)
+    return days
+
+def test_matches_solver_evaluate():
+    """Test that batch scores equal LocalScheduleSolver.evaluate, empty days included"""
+    print("🧮 Testing vectorized costs against the solver")
+    print("="*50)
+
+    rng = random.Random(5)
+    solver = LocalScheduleSolver()
+    scenes = solver.prepare_scenes(generate_scenes(150))
+    model = solver.build_model(scenes)
+
+    candidates = [random_days(rng, len(scenes), rng.randint(1, 60)) for _ in range(40)]
+    candidates.append(solver.greedy_construct(scenes))
+    assignments = np.zeros((len(candidates), len(scenes)), dtype=np.int64)
+    for row, days in enumerate(candidates):
+        assignments[row] = model.assignment_from_days(days)
+
+    for days, breakdown in zip(candidates, model.breakdowns(model.evaluate_assignments(assignments))):
+        assert breakdown == solver.evaluate(scenes, days)
+    print(f"✅ {len(candidates)} candidates scored in one batch, all equal to the solver")
+
+    return True
+
+def test_incidence_matrices():
+    """Test the scenes × actors/locations/time-of-day encodings"""
+    print("🧩 Testing incidence matrices")
+    print("="*50)
+
+    solver = LocalScheduleSolver()
+    scenes = solver.prepare_scenes(generate_scenes(30))
+    model = solver.build_model(scenes)
+
+    assert model.scene_actors.shape == (30, len(model.actor_names))
+    assert (model.scene_locations.sum(axis=1) == 1).all()
+    assert (model.scene_times.sum(axis=1) == 1).all()
+    for i, scene in enumerate(scenes):
+        actors = {model.actor_names[a] for a in np.flatnonzero(model.scene_actors[i])}
+        assert actors == set(scene['actors_needed'])
+        assert model.location_names[model.scene_location[i]] == scene['location']
+    print(f"✅ {len(model.actor_names)} actors, {len(model.location_names)} locations encoded")
+
+    return True
+
+def test_orderings():
+    """Test that orderings are cut into days in order and scored in bulk"""
+    print("🔀 Testing ordering scores")
+    print("="*50)
+
+    rng = random.Random(9)
+    solver = LocalScheduleSolver()
+    scenes = solver.prepare_scenes(generate_scenes(200))
+    model = solver.build_model(scenes)
+    orders = np.array([rng.sample(range(len(scenes)), len(scenes)) for _ in range(500)])
+
+    assignments = model.assignments_from_orderings(orders)
+    for order, assignment in zip(orders[:10], assignments[:10]):
+        days_in_order = assignment[order]
+        assert (np.diff(days_in_order) >= 0).all() and days_in_order[0] == 0
+
+    start = time.time()
+    costs = model.evaluate_orderings(orders)['total_cost']
+    elapsed = time.time() - start
+    assert costs.shape == (500,)
+    print(f"✅ 500 orderings of 200 scenes scored in {elapsed * 1000:.1f}ms")
+
+    return True
+
+def test_sort_schedule_reports_cost():
+    """Test that ScheduleOptimizer scores its ordering below a location-hopping one"""
+    print("📊 Testing ScheduleOptimizer ordering scores")
+    print("="*50)
+
+    from routes.ai_routes import ScheduleOptimizer
+
+    scenes = [
+        {'scene_number': 1, 'location': 'Office', 'time_of_day': 'DAY', 'estimated_duration': 300,
+         'actors': [{'actor_name': 'A'}]},
+        {'scene_number': 2, 'location': 'Beach', 'time_of_day': 'DAY', 'estimated_duration': 300,
+         'actors': [{'actor_name': 'B'}]},
+        {'scene_number': 3, 'location': 'Office', 'time_of_day': 'NIGHT', 'estimated_duration': 300,
+         'actors': [{'actor_name': 'A'}]},
+        {'scene_number': 4, 'location': 'Beach', 'time_of_day': 'DAY', 'estimated_duration': 300,
+         'actors': [{'actor_name': 'B'}]},
+    ]
+    optimizer = ScheduleOptimizer()
+    original, optimized = optimizer.score_orderings(scenes, [scenes, optimizer.optimize_schedule(scenes)])
+    assert optimized['company_moves'] < original['company_moves']
+    print(f"✅ Company moves {original['company_moves']} → {optimized['company_moves']}")
+
+    return True
+
+def main():
+    """Run all tests"""
+    print("🎬 Schedule Model Tests")
+    print("="*60)
+
+    tests = [
+        ("Matches Solver Evaluate", test_matches_solver_evaluate),
+        ("Incidence Matrices", test_incidence_matrices),
+        ("Ordering Scores", test_orderings),
+        ("Sort Schedule Cost", test_sort_schedule_reports_cost)
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        print(f"\n🧪 Running: {test_name}")
+        try:
+            success = test_func()
+            results.append((test_name, success))
+        except Exception as e:
+            print(f"❌ Test failed with exception: {e}")
+            results.append((test_name, False))
+
+        print("\n" + "-"*50)
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
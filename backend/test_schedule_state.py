@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test incremental delta evaluation of schedule moves
+"""
+
+import random
+from flask import Flask
+from benchmark_local_scheduler import generate_scenes
+from utils.local_scheduler import LocalScheduleSolver
+
+def test_deltas_match_full_evaluation():
+    """Test that costs stay equal to LocalScheduleSolver.evaluate through moves and undos"""
+    print("🧮 Testing incremental costs against full evaluation")
+    print("="*50)
+
+    rng = random.Random(3)
+    solver = LocalScheduleSolver()
+    scenes = solver.prepare_scenes(generate_scenes(120))
+    days = solver.greedy_construct(scenes)
+    days.insert(2, [])
+    state = solver.build_state(scenes, days)
+    state.add_day()
+    state.add_day()
+    state.remove_day()
+    assert state.breakdown() == solver.evaluate(scenes, state.days())
+    assert len(state.order) == len(days) + 1
+
+    for _ in range(600):
+        before = state.breakdown()
+        move = rng.random()
+        if move < 0.4:
+            scene = rng.randrange(len(scenes))
+            source = state.scene_day[scene]
+            delta = state.relocate(scene, rng.choice(state.order))
+            undo = lambda: state.relocate(scene, source)
+        elif move < 0.75:
+            first, second = rng.randrange(len(scenes)), rng.randrange(len(scenes))
+            delta = state.swap(first, second)
+            undo = lambda: state.swap(first, second)
+        else:
+            source, target = rng.randrange(len(state.order)), rng.randrange(len(state.order))
+            delta = state.shift_day(source, target)
+            undo = lambda: state.shift_day(target, source)
+
+        after = solver.evaluate(scenes, state.days())
+        assert state.breakdown() == after
+        assert delta == after['total_cost'] - before['total_cost']
+        if rng.random() < 0.5:
+            undo()
+            assert state.breakdown() == before
+    print("✅ 600 random moves, every delta and undo matched a full re-score")
+
+    return True
+
+def test_move_cost_endpoint():
+    """Test /api/ai/schedule_move_cost what-if moves"""
+    print("🌐 Testing schedule move cost endpoint")
+    print("="*50)
+
+    from routes.ai_routes import ai_bp
+
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.register_blueprint(ai_bp, url_prefix='/api/ai')
+
+    with app.test_client() as client:
+        first = client.post('/api/ai/schedule_move_cost', json={
+            'move': 'relocate', 'scene_number': 1, 'target_day': 2
+        }).get_json()
+        again = client.post('/api/ai/schedule_move_cost', json={
+            'move': 'relocate', 'scene_number': 1, 'target_day': 2
+        }).get_json()
+        invalid = client.post('/api/ai/schedule_move_cost', json={'move': 'teleport'})
+        out_of_range = {'move': 'relocate', 'scene_number': 1, 'target_day': 10 ** 6}
+        limit = client.post('/api/ai/schedule_move_cost', json=out_of_range).get_json()['message']
+        new_day = int(limit.rsplit(' ', 1)[1])
+        opened = client.post('/api/ai/schedule_move_cost', json={
+            'move': 'relocate', 'scene_number': 1, 'target_day': new_day
+        }).get_json()
+        after_new_day = client.post('/api/ai/schedule_move_cost', json=out_of_range).get_json()['message']
+
+    assert first['status'] == 'success'
+    assert first['delta'] == first['cost_after']['total_cost'] - first['cost_before']['total_cost']
+    assert again['cost_before'] == first['cost_before']
+    assert invalid.status_code == 400
+    assert opened['status'] == 'success' and opened['cost_after']['shooting_days'] >= first['cost_before']['shooting_days']
+    assert after_new_day == limit, "the day opened for a what-if move must not stay on the board"
+    print(f"✅ Relocating scene 1 to day 2 changes cost by {first['delta']}; board left unchanged")
+    print(f"✅ Relocating to a new day {new_day} leaves the calendar at {new_day - 1} days")
+
+    return True
+
+def main():
+    """Run all tests"""
+    print("🎬 Schedule State Tests")
+    print("="*60)
+
+    tests = [
+        ("Deltas Match Full Evaluation", test_deltas_match_full_evaluation),
+        ("Move Cost Endpoint", test_move_cost_endpoint)
+    ]
+
+    results = []
+
+    for test_name, test_func in tests:
+        print(f"\n🧪 Running: {test_name}")
+        try:
+            success = test_func()
+            results.append((test_name, success))
+        except Exception as e:
+            print(f"❌ Test failed with exception: {e}")
+            results.append((test_name, False))
+
+        print("\n" + "-"*50)
+
+    passed = sum(1 for _, success in results if success)
+    print(f"\nTotal: {passed}/{len(results)} tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test the precompiled request schemas and the routes that use them
+"""
+
+import os
+import random
+import shutil
+import tempfile
+from flask import Flask
+from routes.budget import budget_bp
+from routes.script import script_bp
+from routes.tasks import tasks_bp
+from routes.users import users_bp
+from routes.vfx import vfx_bp
+from utils.json_handler import json_handler
+from utils.schemas import SCHEMAS, compile_schemas, get_schema, get_validator, validate_many, validate_payload
+from utils.validators import ValidationError
+
+VALID_TASK = {
+    'title': 'Rig lights', 'description': 'Pre-rig stage 2', 'assigneeId': '4',
+    'dueDate': '2024-10-15', 'priority': 'high', 'category': 'Equipment', 'estimatedHours': 4,
+}
+
+def error_message(name, data, partial=False):
+    try:
+        validate_payload(name, data, partial)
+    except ValidationError as e:
+        return e.message
+    return None
+
+def test_validators_compiled_once():
+    """Test that every schema compiles and validators are reused"""
+    print("🧱 Testing schema compilation")
+    print("="*50)
+
+    count = compile_schemas()
+    assert count == len(SCHEMAS) * 4
+    assert get_validator('task') is get_validator('task')
+    assert get_validator('task', partial=True) is not get_validator('task')
+    print(f"✅ {count} validators compiled and cached")
+    return True
+
+def test_fast_check_matches_jsonschema():
+    """Test that the generated fast check accepts exactly what jsonschema accepts"""
+    print("⚡ Testing generated fast checks against jsonschema")
+    print("="*50)
+
+    rng = random.Random(3)
+    values = [None, True, False, 0, 1, -5, 2.5, 1001, '', 'x', 'low', 'done', '2024-10-15', '12', '1.5',
+              'not-a-date', 'a' * 250, [], ['a'], [1], {}, {'a': 1}]
+    samples = 0
+    for name, schema in SCHEMAS.items():
+        fields = list(schema['properties'])
+        for _ in range(150):
+            payload = {field: rng.choice(values) for field in rng.sample(fields, rng.randint(0, len(fields)))}
+            for partial in (False, True):
+                compiled = get_schema(name, partial)
+                assert compiled.check is not None
+                assert compiled.check(payload) == compiled.validator.is_valid(payload), (name, partial, payload)
+                samples += 1
+        batch = [{field: rng.choice(values) for field in fields} for _ in range(5)]
+        compiled = get_schema(name, many=True)
+        assert compiled.check(batch) == compiled.validator.is_valid(batch)
+    print(f"✅ {samples} random payloads judged the same by both")
+    return True
+
+def test_error_messages():
+    """Test that messages keep the wording and order the routes used"""
+    print("💬 Testing validation messages")
+    print("="*50)
+
+    assert error_message('task', VALID_TASK) is None
+    assert error_message('task', {}) == 'title is required'
+    assert error_message('task', {**VALID_TASK, 'description': ''}) == 'description is required'
+    assert error_message('task', {**VALID_TASK, 'priority': 'urgent'}) == 'Priority must be one of: low, medium, high'
+    assert error_message('task', {**VALID_TASK, 'dueDate': 'soon'}) == 'Invalid date format. Use YYYY-MM-DD'
+    assert error_message('task', {'status': 'blocked'}, partial=True) == 'Status must be one of: todo, in_progress, done'
+    assert error_message('task', {'status': 'done'}, partial=True) is None
+    assert error_message('budget_entry', {'amount': 0, 'category': 'Cast', 'description': 'Fee'}) == 'amount is required'
+    assert error_message('user', {'name': 'A', 'role': 'Crew', 'email': 'nope', 'username': 'abc',
+                                  'password': 'long enough'}) == 'Invalid email format'
+    assert error_message('task', ['not', 'an', 'object']) == 'Request body must be a JSON object'
+    print("✅ Required, enum, format and type messages")
+
+    errors = validate_many('task', [VALID_TASK, {**VALID_TASK, 'priority': 'x'}, {}, 'task'])
+    assert sorted(errors) == [1, 2, 3]
+    assert errors[1].message.startswith('Priority must be one of')
+    assert errors[2].message == 'title is required'
+    assert errors[3].message == 'Item must be a JSON object'
+    assert validate_many('task', [VALID_TASK] * 50) == {}
+    print("✅ Bulk arrays validated in one pass with per-item errors")
+    return True
+
+def test_routes_reject_invalid_payloads():
+    """Test that the CRUD routes answer 400 with the schema message and never write"""
+    print("🌐 Testing routes with schema validation")
+    print("="*50)
+
+    source_dir = os.path.join(os.path.dirname(__file__), 'data')
+    original_data_dir = json_handler.data_dir
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        for filename in ['tasks.json', 'users.json', 'vfx.json', 'budget.json', 'script.json']:
+            shutil.copy(os.path.join(source_dir, filename), data_dir)
+        json_handler.data_dir = data_dir
+        try:
+            app = Flask(__name__)
+            app.config['TESTING'] = True
+            for blueprint, prefix in [(tasks_bp, 'tasks'), (users_bp, 'users'), (vfx_bp, 'vfx'),
+                                      (budget_bp, 'budget'), (script_bp, 'script')]:
+                app.register_blueprint(blueprint, url_prefix=f'/api/{prefix}')
+            client = app.test_client()
+            tasks_before = os.path.getmtime(os.path.join(data_dir, 'tasks.json'))
+
+            cases = [
+                ('post', '/api/tasks', {**VALID_TASK, 'title': ''}, 'title is required'),
+                ('put', '/api/tasks/1', {'priority': 'urgent'}, 'Priority must be one of: low, medium, high'),
+                ('post', '/api/vfx', {'shotName': 'S1'}, 'sceneId is required'),
+                ('put', '/api/vfx/1', {'complexity': 'extreme'}, 'Complexity must be one of: low, medium, high'),
+                ('post', '/api/budget/history', {'amount': 'lots', 'category': 'Cast', 'description': 'Fee'},
+                 'amount must be a positive number'),
+                ('post', '/api/users', {'name': 'New'}, 'role is required'),
+                ('post', '/api/script/scenes', {'title': 'EXT. PIER'}, 'scene_number is required'),
+                ('put', '/api/script', {'scenes': [{'title': 'ok'}, {'characters': 'Bruce'}]},
+                 'Scene 2: characters must be of type array'),
+            ]
+            for method, url, body, message in cases:
+                response = getattr(client, method)(url, json=body)
+                assert response.status_code == 400, (url, response.status_code)
+                assert response.get_json()['message'] == message, (url, response.get_json())
+            assert os.path.getmtime(os.path.join(data_dir, 'tasks.json')) == tasks_before
+            print(f"✅ {len(cases)} invalid payloads rejected with 400")
+
+            created = client.post('/api/tasks', json=VALID_TASK)
+            assert created.status_code == 201, created.get_json()
+            updated = client.put('/api/tasks/1', json={'status': 'done'})
+            assert updated.status_code == 200 and updated.get_json()['data']['status'] == 'done'
+            print("✅ Valid create and update still succeed")
+        finally:
+            json_handler.data_dir = original_data_dir
+
+    return True
+
+def main():
+    """Run all tests"""
+    print("🚀 Starting Schema Validation Tests")
+    print("="*60)
+
+    tests = [
+        test_validators_compiled_once,
+        test_fast_check_matches_jsonschema,
+        test_error_messages,
+        test_routes_reject_invalid_payloads,
+    ]
+    passed = sum(1 for test in tests if test())
+    print(f"\n🎉 {passed}/{len(tests)} schema validation tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test that GET /api/script transforms each version of script.json once
+"""
+
+import copy
+import json
+import os
+import tempfile
+from flask import Flask
+import routes.script as script_routes
+from benchmark_script import generate_script
+from utils.data_transformer import transform_script_data
+from utils.json_handler import json_handler
+
+def test_transform_cached_per_version():
+    """Test reuse across GETs and rebuilds after writes"""
+    print("🗃️ Testing cached script transform")
+    print("="*50)
+
+    original_data_dir = json_handler.data_dir
+    original_transform = script_routes.transform_script_data
+    calls = []
+
+    def counting_transform(script):
+        calls.append(len(script.get('scenes', [])))
+        return original_transform(script)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        source = generate_script(120)
+        with open(os.path.join(data_dir, 'script.json'), 'w', encoding='utf-8') as f:
+            json.dump(source, f)
+        json_handler.data_dir = data_dir
+        script_routes.transform_script_data = counting_transform
+        try:
+            app = Flask(__name__)
+            app.config['TESTING'] = True
+            app.register_blueprint(script_routes.script_bp, url_prefix='/api/script')
+            client = app.test_client()
+
+            first = client.get('/api/script').get_json()['data']
+            for url in ['/api/script', '/api/script?view=summary', '/api/script?exclude=props', '/api/script']:
+                assert client.get(url).status_code == 200
+            assert len(calls) == 1
+            expected = transform_script_data(copy.deepcopy(source))
+            expected['lastModified'] = first['lastModified']
+            assert first == expected
+            assert 'props' in script_routes.load_transformed_script()['scenes'][0]
+            print("✅ Five GETs, one transform; projections leave the cached copy intact")
+
+            response = client.put('/api/script/scene/3', json={'scene_status': 'Completed'})
+            assert response.status_code == 200, response.get_json()
+            scenes = client.get('/api/script').get_json()['data']['scenes']
+            assert len(calls) == 2
+            assert next(scene for scene in scenes if scene['id'] == '3')['status'] == 'Completed'
+            print("✅ Rebuilt after a scene update")
+
+            os.remove(os.path.join(data_dir, 'script.json'))
+            assert client.get('/api/script').status_code == 404
+            print("✅ Missing script still returns 404")
+        finally:
+            script_routes.transform_script_data = original_transform
+            json_handler.data_dir = original_data_dir
+
+    return True
+
+def main():
+    """Run all tests"""
+    print("🚀 Starting Script Cache Tests")
+    print("="*60)
+
+    tests = [
+        test_transform_cached_per_version,
+    ]
+    passed = sum(1 for test in tests if test())
+    print(f"\n🎉 {passed}/{len(tests)} script cache tests passed")
+
+if __name__ == "__main__":
+    main()
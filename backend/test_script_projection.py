@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test GET /api/script projections: fields, exclude and the summary view
+"""
+
+import copy
+import json
+import os
+import re
+import tempfile
+from flask import Flask
+from benchmark_script import generate_script
+from routes.script import script_bp
+from utils.data_transformer import SCENE_SUMMARY_FIELDS, project_script, transform_script_data
+from utils.json_handler import json_handler
+
+def test_project_script_shares_values():
+    """Test that projection builds small scenes without copying or changing the input"""
+    print("✂️ Testing script projection")
+    print("="*50)
+
+    script = transform_script_data(generate_script(40))
+    before = copy.deepcopy(script)
+
+    summary = project_script(script, SCENE_SUMMARY_FIELDS)
+    assert all(list(scene) == SCENE_SUMMARY_FIELDS for scene in summary['scenes'])
+    assert summary['locations'] is script['locations']
+    assert summary['scenes'][0]['title'] is script['scenes'][0]['title']
+
+    trimmed = project_script(script, exclude=['props', 'wardrobe'])
+    assert all('props' not in scene and 'wardrobe' not in scene and 'characters' in scene for scene in trimmed['scenes'])
+    assert trimmed['scenes'][0]['characters'] is script['scenes'][0]['characters']
+
+    both = project_script(script, ['id', 'title', 'props'], exclude=['props'])
+    assert all(list(scene) == ['id', 'title'] for scene in both['scenes'])
+    assert project_script(script) is script
+    assert script == before
+    print("✅ Scenes projected by reference; source document unchanged")
+    return True
+
+def test_script_route_views():
+    """Test the query parameters on GET /api/script and the bytes they save"""
+    print("🌐 Testing GET /api/script views")
+    print("="*50)
+
+    original_data_dir = json_handler.data_dir
+    with tempfile.TemporaryDirectory() as data_dir:
+        with open(os.path.join(data_dir, 'script.json'), 'w', encoding='utf-8') as f:
+            json.dump(generate_script(400), f)
+        json_handler.data_dir = data_dir
+        try:
+            app = Flask(__name__)
+            app.config['TESTING'] = True
+            app.register_blueprint(script_bp, url_prefix='/api/script')
+            client = app.test_client()
+
+            full = client.get('/api/script')
+            summary = client.get('/api/script?view=summary')
+            assert full.status_code == 200 and summary.status_code == 200
+            full_data, summary_data = full.get_json()['data'], summary.get_json()['data']
+            assert len(summary_data['scenes']) == len(full_data['scenes']) == 400
+            assert set(summary_data['scenes'][0]) == set(SCENE_SUMMARY_FIELDS)
+            assert summary_data['locations'] == full_data['locations']
+            assert len(summary.data) < len(full.data) * 0.25
+            print(f"✅ Summary is {len(summary.data) / len(full.data):.0%} of the full document")
+
+            fields = client.get('/api/script?fields=id,description&view=summary').get_json()['data']
+            assert set(fields['scenes'][0]) == {'id', 'description'}
+            excluded = client.get('/api/script?exclude=props,set_dressing').get_json()['data']
+            assert 'props' not in excluded['scenes'][0] and 'wardrobe' in excluded['scenes'][0]
+            print("✅ fields overrides the view; exclude drops fields")
+
+            response = client.get('/api/script?view=compact')
+            assert response.status_code == 400 and 'view must be one of' in response.get_json()['message']
+            print("✅ Unknown view rejected")
+        finally:
+            json_handler.data_dir = original_data_dir
+
+    return True
+
+def test_script_page_projection_covers_rendered_fields():
+    """Test that the Script page asks for every scene field it reads"""
+    print("🧾 Testing Script page field list")
+    print("="*50)
+
+    page_path = os.path.join(os.path.dirname(__file__), '..', 'prodsight', 'src', 'pages', 'Script', 'Script.tsx')
+    with open(page_path, encoding='utf-8') as f:
+        page = f.read()
+    declared = re.search(r'SCENE_FIELDS_READ: \(keyof Scene\)\[\] = \[(.*?)\];', page, re.S)
+    assert declared, 'SCENE_FIELDS_READ not found in Script.tsx'
+    requested = re.findall(r"'(\w+)'", declared.group(1))
+    read = set(re.findall(r'\bscene\.(\w+)', page))
+    assert read <= set(requested), f'Script.tsx reads scene fields it does not request: {read - set(requested)}'
+
+    original_data_dir = json_handler.data_dir
+    with tempfile.TemporaryDirectory() as data_dir:
+        with open(os.path.join(data_dir, 'script.json'), 'w', encoding='utf-8') as f:
+            json.dump(generate_script(40), f)
+        json_handler.data_dir = data_dir
+        try:
+            app = Flask(__name__)
+            app.config['TESTING'] = True
+            app.register_blueprint(script_bp, url_prefix='/api/script')
+            scenes = app.test_client().get(f'/api/script?fields={",".join(requested)}').get_json()['data']['scenes']
+            # What the page renders from each projected scene, e.g. scene.characters.length
+            for scene in scenes:
+                assert set(scene) == set(requested)
+                assert isinstance(scene['characters'], list) and isinstance(scene['timeOfDay'], str)
+        finally:
+            json_handler.data_dir = original_data_dir
+    print(f"✅ Page reads {len(read)} scene fields, all present in the projected payload")
+    return True
+
+def main():
+    """Run all tests"""
+    print("🚀 Starting Script Projection Tests")
+    print("="*60)
+
+    tests = [
+        test_project_script_shares_values,
+        test_script_route_views,
+        test_script_page_projection_covers_rendered_fields,
+    ]
+    passed = sum(1 for test in tests if test())
+    print(f"\n🎉 {passed}/{len(tests)} script projection tests passed")
+
+if __name__ == "__main__":
+    main()
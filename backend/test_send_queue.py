@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test bounded per-session websocket send queues
+"""
+
+from utils.broadcast import BroadcastPipeline, change_rooms
+from utils.send_queue import SendQueues
+
+class Clients:
+    """Transport double: 'fast' sessions acknowledge at once, others hold their acks"""
+
+    def __init__(self, fast=()):
+        self.fast = set(fast)
+        self.received = {}
+        self.pending_acks = {}
+        self.disconnected = {}
+
+    def transmit(self, event, payload, session_id, ack):
+        self.received.setdefault(session_id, []).append((event, payload))
+        if session_id in self.fast:
+            ack()
+        else:
+            self.pending_acks.setdefault(session_id, []).append(ack)
+
+    def disconnect(self, session_id, hint):
+        self.disconnected[session_id] = hint
+
+    def ack_one(self, session_id):
+        self.pending_acks[session_id].pop(0)()
+
+def task_change(seq, task_id, hours):
+    return {'seq': seq, 'collection': 'tasks', 'id': str(task_id), 'op': 'update', 'fields': ['estimatedHours'],
+            'data': {'estimatedHours': hours}}
+
+def test_slow_client_is_collapsed():
+    """Test in-flight pacing and collapsing to the latest change per entity"""
+    print("🐢 Testing slow client collapse")
+    print("="*50)
+
+    clients = Clients(fast=['fast'])
+    queues = SendQueues(clients.transmit, clients.disconnect, max_in_flight=2, max_queued_changes=50)
+    for seq in range(1, 601):
+        change = task_change(seq, seq % 10, seq)
+        for session_id in ['fast', 'slow']:
+            queues.send('changes', {'changes': [change], 'latestSeq': seq}, session_id)
+
+    assert len(clients.received['fast']) == 600 and queues.depth('fast') == 0
+    assert len(clients.received['slow']) == 2 and queues.depth('slow') <= 50
+    status = queues.get_status()
+    assert status['collapses'] > 0 and status['disconnects'] == 0 and status['maxDepth'] <= 50
+    print(f"✅ 600 updates: fast client got all 600, slow client holds {queues.depth('slow')} queued changes")
+
+    while clients.pending_acks.get('slow'):
+        clients.ack_one('slow')
+    latest = {}
+    for _, payload in clients.received['slow']:
+        for change in payload['changes']:
+            latest[change['id']] = change['data']['estimatedHours']
+    assert latest == {str(task_id): 590 + task_id if task_id else 600 for task_id in range(10)}
+    assert queues.depth('slow') == 0 and queues.get_status()['inFlight'] == 0
+    print(f"✅ Once it caught up it saw the latest value of all 10 tasks in {len(clients.received['slow'])} messages")
+    return True
+
+def test_client_still_behind_is_disconnected():
+    """Test the resync hint when collapsing is not enough"""
+    print("🔌 Testing disconnect with resync hint")
+    print("="*50)
+
+    clients = Clients(fast=['fast'])
+    queues = SendQueues(clients.transmit, clients.disconnect, max_in_flight=1, max_queued_changes=100)
+    for seq in range(1, 301):
+        for session_id in ['fast', 'stalled']:
+            queues.send('changes', {'changes': [task_change(seq, seq, 1)], 'latestSeq': seq}, session_id)
+
+    assert clients.disconnected == {'stalled': {'reason': 'slow_consumer', 'latestSeq': 102}}
+    assert len(clients.received['stalled']) == 1 and queues.depth('stalled') == 0
+    assert len(clients.received['fast']) == 300
+    assert queues.get_status()['disconnects'] == 1
+    queues.remove('stalled')
+    assert queues.get_status()['sessions'] == 1
+    print("✅ 300 distinct tasks to a stalled client: one resync hint, queue freed, other client unaffected")
+    return True
+
+def test_pipeline_through_queues():
+    """Test broadcasts paced per session behind the coalescing pipeline"""
+    print("📶 Testing pipeline with send queues")
+    print("="*50)
+
+    clients = Clients(fast=['producer'])
+    queues = SendQueues(clients.transmit, clients.disconnect, max_in_flight=1, max_queued_changes=20)
+    rooms = {'producer': {'role_producer'}, 'tablet': {'role_producer'}}
+    pipeline = BroadcastPipeline(queues.send, lambda audience: {sid for sid, joined in rooms.items()
+                                                                if audience is None or joined & set(audience)},
+                                 debounce_seconds=0)
+    for seq in range(1, 201):
+        change = task_change(seq, seq % 5, seq)
+        pipeline.publish(change, change_rooms(change))
+
+    assert len(clients.received['producer']) == 200
+    assert len(clients.received['tablet']) == 1 and queues.depth('tablet') <= 20
+    assert queues.get_status()['backloggedSessions'] == 1
+    print(f"✅ Tablet without acks: 1 message in flight, {queues.depth('tablet')} changes queued; producer unaffected")
+    return True
+
+def main():
+    """Run all tests"""
+    print("🚀 Starting Send Queue Tests")
+    print("="*60)
+
+    tests = [
+        test_slow_client_is_collapsed,
+        test_client_still_behind_is_disconnected,
+        test_pipeline_through_queues,
+    ]
+    passed = sum(1 for test in tests if test())
+    print(f"\n🎉 {passed}/{len(tests)} send queue tests passed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Coalesced websocket broadcasts
+Changes are queued per audience (the rooms that should see them) and
+flushed once per debounce window. Repeated changes to the same item within
+a window are merged into one field-level delta, and every connected session
+receives a single message holding all deltas addressed to any of its rooms,
+so a user who is in several rooms never gets the same change twice and
+fan-out grows with the number of changes, not document size times rooms.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from config import Config
+
+# Socket.IO event carrying a batch of deltas
+EVENT = 'changes'
+
+# Roles told about changes to each collection (None for every connected
+# user; collections not listed, such as users, are not broadcast)
+SCRIPT_ROLES = ['producer', 'director', 'production manager', 'crew', 'vfx']
+CHANGE_AUDIENCES = {
+    'tasks': ['producer', 'director', 'production manager'],
+    'budget': ['producer', 'production manager'],
+    'script': SCRIPT_ROLES,
+    'scenes': SCRIPT_ROLES,
+    'vfx': ['vfx', 'director', 'producer'],
+    'assets': None,
+}
+
+# Legacy broadcast actions as change feed operations
+ACTION_OPS = {'created': 'create', 'updated': 'update', 'deleted': 'delete'}
+
+
+def change_rooms(change: Dict) -> Optional[List[str]]:
+    """Rooms that should receive a change (None for everyone, [] for no one)"""
+    roles = CHANGE_AUDIENCES.get(change['collection'], [])
+    if roles is None:
+        return None
+    rooms = [f"role_{role}" for role in roles]
+    # Task assignees see their own tasks whatever their role
+    assignee_id = (change.get('data') or {}).get('assigneeId')
+    if change['collection'] == 'tasks' and assignee_id:
+        rooms.append(f"user_{assignee_id}")
+    return rooms
+
+
+def merge_change(pending: Dict, change: Dict) -> Optional[Dict]:
+    """
+    Fold a newer change to an item into the pending one
+
+    Returns:
+        The combined change, or None when the item was created and deleted
+        within the same window and nothing needs to be sent
+    """
+    if change['op'] == 'delete':
+        return None if pending['op'] == 'create' else dict(change)
+    if pending['op'] == 'delete':
+        # Deleted and recreated: the new version replaces the old one
+        return dict(change)
+    return {
+        **change,
+        'op': 'create' if pending['op'] == 'create' else change['op'],
+        'fields': sorted(set(pending['fields']) | set(change['fields'])),
+        'data': {**(pending['data'] or {}), **(change['data'] or {})},
+    }
+
+
+def coalesce(changes: Iterable[Dict]) -> List[Dict]:
+    """Merge changes to the same item, keeping first-seen item order"""
+    merged: 'OrderedDict[Tuple, Optional[Dict]]' = OrderedDict()
+    for change in changes:
+        key = (change['collection'], change['id'])
+        if key in merged and merged[key] is not None:
+            merged[key] = merge_change(merged[key], change)
+        else:
+            merged[key] = dict(change)
+    return [change for change in merged.values() if change is not None]
+
+
+def build_payload(changes: List[Dict]) -> Dict[str, Any]:
+    """Message body for one session: its deltas in seq order"""
+    ordered = coalesce(sorted(changes, key=lambda change: change.get('seq') or 0))
+    return {
+        'changes': ordered,
+        'latestSeq': max((change.get('seq') or 0 for change in ordered), default=0),
+    }
+
+
+def _start_thread(target: Callable[[], None]) -> None:
+    threading.Thread(target=target, daemon=True).start()
+
+
+class BroadcastPipeline:
+    """Debounced, per-session deduplicated delivery of change deltas"""
+
+    def __init__(self, emit: Callable[[str, Dict, str], None],
+                 recipients: Callable[[Optional[Tuple[str, ...]]], Set[str]],
+                 debounce_seconds: float = None,
+                 start_task: Callable[[Callable[[], None]], Any] = None,
+                 sleep: Callable[[float], None] = None):
+        """
+        Args:
+            emit: Sends (event, payload) to one session id
+            recipients: Session ids in any of the given rooms (all sessions for None)
+            debounce_seconds: Window over which changes are collected; 0 sends
+                every change immediately
+            start_task: Runs the delayed flush in the background (the Socket.IO
+                server's start_background_task under eventlet/gevent)
+            sleep: Sleep matching start_task
+        """
+        self.emit = emit
+        self.recipients = recipients
+        self.debounce_seconds = Config.WEBSOCKET_DEBOUNCE_MS / 1000 if debounce_seconds is None \
+            else debounce_seconds
+        self._start_task = start_task or _start_thread
+        self._sleep = sleep or time.sleep
+        self._pending: Dict[Optional[Tuple[str, ...]], List[Dict]] = {}
+        self._scheduled = False
+        self._lock = threading.Lock()
+        self.published = 0
+        self.flushes = 0
+        self.messages = 0
+
+    def publish(self, change: Dict, rooms: Optional[Iterable[str]] = None) -> None:
+        """Queue a change for the sessions in any of the rooms (every session for None)"""
+        audience = tuple(sorted(set(rooms))) if rooms is not None else None
+        with self._lock:
+            self._pending.setdefault(audience, []).append(change)
+            self.published += 1
+            start = not self._scheduled and self.debounce_seconds > 0
+            if start:
+                self._scheduled = True
+        if self.debounce_seconds <= 0:
+            self.flush()
+        elif start:
+            self._start_task(self._flush_later)
+
+    def _flush_later(self) -> None:
+        self._sleep(self.debounce_seconds)
+        self.flush()
+
+    def flush(self) -> int:
+        """
+        Send everything queued: one message per session
+
+        Returns:
+            Number of messages emitted
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._scheduled = False
+        if not pending:
+            return 0
+
+        per_session: Dict[str, List[Dict]] = {}
+        for audience, changes in pending.items():
+            for session_id in self.recipients(audience):
+                per_session.setdefault(session_id, []).extend(changes)
+
+        # Sessions in the same rooms get the same deltas; build their payload once
+        payloads: Dict[Tuple[int, ...], Dict] = {}
+        sent = 0
+        for session_id, changes in per_session.items():
+            signature = tuple(id(change) for change in changes)
+            payload = payloads.get(signature)
+            if payload is None:
+                payload = payloads[signature] = build_payload(changes)
+            if not payload['changes']:
+                continue
+            try:
+                self.emit(EVENT, payload, session_id)
+                sent += 1
+            except Exception as e:
+                print(f"Broadcast to {session_id} failed: {e}")
+
+        with self._lock:
+            self.flushes += 1
+            self.messages += sent
+        return sent
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'pending': sum(len(changes) for changes in self._pending.values()),
+                    'published': self.published, 'flushes': self.flushes, 'messages': self.messages,
+                    'debounceMs': self.debounce_seconds * 1000}
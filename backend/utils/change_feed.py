@@ -0,0 +1,352 @@
+"""
+Change feed for delta sync
+Every write of a tracked data file is diffed against the file's previous
+content and recorded as numbered changes (seq, collection, id, op, fields),
+so clients can ask for what changed since the last seq they saw instead of
+re-reading whole collections. The log is bounded; a client whose seq is
+older than the log, or from another epoch, is told to resync with full reads.
+The 'memory' log belongs to one process (a restart starts a new epoch), the
+'sqlite' log is shared by worker processes on one host, so seqs and the
+epoch are the same whichever worker answers.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from config import Config
+
+OPERATIONS = ['create', 'update', 'delete']
+
+
+class FeedSource:
+    """How a data file maps onto feed collections"""
+
+    def __init__(self, collection: str, items_key: str = None, item_collection: str = None,
+                 redact: Tuple[str, ...] = ()):
+        """
+        Args:
+            collection: Feed name for the file (a list of items with ids, or a document)
+            items_key: For documents, the key holding a list of items with ids
+                that are diffed one by one under item_collection
+            redact: Fields never copied into the feed
+        """
+        self.collection = collection
+        self.items_key = items_key
+        self.item_collection = item_collection or items_key
+        self.redact = set(redact)
+
+
+# Data files recorded in the feed; others (schedules, caches, metrics) are not
+FEED_SOURCES = {
+    'tasks.json': FeedSource('tasks'),
+    'vfx.json': FeedSource('vfx'),
+    'users.json': FeedSource('users', redact=('password',)),
+    'assets.json': FeedSource('assets'),
+    'budget.json': FeedSource('budget'),
+    'script.json': FeedSource('script', items_key='scenes'),
+}
+
+
+def _visible(item: Dict, redact) -> Dict:
+    return {key: value for key, value in item.items() if key not in redact}
+
+
+def diff_item(before: Dict, after: Dict, redact=()) -> Dict[str, Any]:
+    """Fields whose value differs, with their new value (None for removed fields)"""
+    changed = {}
+    for key in before.keys() | after.keys():
+        if key in redact:
+            continue
+        if before.get(key, None) != after.get(key, None) or (key in before) != (key in after):
+            changed[key] = after.get(key)
+    return changed
+
+
+def diff_items(collection: str, before: Any, after: Any, redact=()) -> List[Dict]:
+    """Create, update and delete changes between two lists of items with ids"""
+    def by_id(items):
+        if not isinstance(items, list):
+            return {}
+        return {str(item['id']): item for item in items if isinstance(item, dict) and 'id' in item}
+
+    old, new = by_id(before), by_id(after)
+    changes = []
+    for item_id, item in new.items():
+        if item_id not in old:
+            changes.append({'collection': collection, 'id': item_id, 'op': 'create',
+                            'fields': sorted(_visible(item, redact)), 'data': _visible(item, redact)})
+        else:
+            changed = diff_item(old[item_id], item, redact)
+            if changed:
+                changes.append({'collection': collection, 'id': item_id, 'op': 'update',
+                                'fields': sorted(changed), 'data': changed})
+    for item_id in old:
+        if item_id not in new:
+            changes.append({'collection': collection, 'id': item_id, 'op': 'delete', 'fields': [], 'data': None})
+    return changes
+
+
+def diff_document(source: FeedSource, before: Any, after: Any) -> List[Dict]:
+    """Changes between two versions of a data file"""
+    if source.items_key is None and (isinstance(after, list) or isinstance(before, list)):
+        return diff_items(source.collection, before, after, source.redact)
+
+    before = before if isinstance(before, dict) else {}
+    after = after if isinstance(after, dict) else {}
+    changes = []
+    skip = set(source.redact)
+    if source.items_key is not None:
+        changes.extend(diff_items(source.item_collection, before.get(source.items_key),
+                                  after.get(source.items_key), source.redact))
+        skip.add(source.items_key)
+    changed = diff_item(before, after, skip)
+    if changed:
+        changes.insert(0, {'collection': source.collection, 'id': None, 'op': 'update',
+                           'fields': sorted(changed), 'data': changed})
+    return changes
+
+
+class ChangeFeed:
+    """Bounded, thread-safe log of numbered changes with long-poll waits"""
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or Config.CHANGE_FEED_MAX_ENTRIES
+        self.epoch = uuid.uuid4().hex[:12]
+        self._entries: deque = deque(maxlen=self.max_entries)
+        self._seq = 0
+        self._condition = threading.Condition()
+        self._subscribers: List[Callable[[List[Dict]], None]] = []
+
+    @property
+    def latest_seq(self) -> int:
+        with self._condition:
+            return self._seq
+
+    def tracks(self, filename: str) -> bool:
+        return filename in FEED_SOURCES
+
+    def subscribe(self, callback: Callable[[List[Dict]], None]) -> None:
+        """Call callback with each batch of newly recorded changes"""
+        with self._condition:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[List[Dict]], None]) -> None:
+        with self._condition:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def record_write(self, filename: str, before: Any, after: Any) -> List[Dict]:
+        """Diff a tracked file's old and new content and append the changes"""
+        source = FEED_SOURCES.get(filename)
+        if source is None:
+            return []
+        return self.append(diff_document(source, before, after))
+
+    def append(self, changes: List[Dict]) -> List[Dict]:
+        """Number and store changes, wake long-polls and notify subscribers"""
+        if not changes:
+            return []
+        timestamp = time.time()
+        with self._condition:
+            for change in changes:
+                self._seq += 1
+                change['seq'] = self._seq
+                change['timestamp'] = timestamp
+                self._entries.append(change)
+            self._condition.notify_all()
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(changes)
+            except Exception as e:
+                print(f"Change feed subscriber failed: {e}")
+        return changes
+
+    def _read_unlocked(self, since: int, limit: int, collections) -> Dict[str, Any]:
+        oldest = self._entries[0]['seq'] if self._entries else self._seq + 1
+        if since > self._seq or since < oldest - 1:
+            return {'changes': [], 'latestSeq': self._seq, 'nextSince': self._seq, 'hasMore': False,
+                    'resync': True}
+
+        changes, next_since, has_more = [], self._seq, False
+        # Entries are contiguous, so the first wanted one is at a known offset
+        for index in range(since - oldest + 1, len(self._entries)):
+            change = self._entries[index]
+            if collections and change['collection'] not in collections:
+                continue
+            if len(changes) == limit:
+                next_since, has_more = changes[-1]['seq'], True
+                break
+            changes.append(change)
+        return {'changes': changes, 'latestSeq': self._seq, 'nextSince': next_since, 'hasMore': has_more,
+                'resync': False}
+
+    def changes_since(self, since: int, limit: int = None, collections=None, wait: float = 0) -> Dict[str, Any]:
+        """
+        Changes after seq `since`, waiting up to `wait` seconds for one to arrive
+
+        Args:
+            since: Last seq the client has applied (0 for the start of the log)
+            limit: Most changes returned; hasMore is set when more are pending
+            collections: Only changes to these collections (None for all)
+            wait: Seconds to block when there is nothing new yet (long-poll)
+
+        Returns:
+            {changes, latestSeq, nextSince, hasMore, resync, epoch}; nextSince
+            is the seq to pass next time, and resync means the client has
+            missed changes and must reload with full reads
+        """
+        limit = limit or Config.CHANGE_FEED_MAX_LIMIT
+        collections = set(collections) if collections else None
+        deadline = time.monotonic() + max(wait, 0)
+        with self._condition:
+            while True:
+                result = self._read_unlocked(since, limit, collections)
+                remaining = deadline - time.monotonic()
+                if result['changes'] or result['resync'] or remaining <= 0:
+                    break
+                # Skip past changes to other collections so the wait is for new ones
+                since = result['nextSince']
+                self._condition.wait(self._wait_slice(remaining))
+        result['epoch'] = self.epoch
+        return result
+
+    def _wait_slice(self, remaining: float) -> float:
+        """How long to sleep before looking again; local writes wake waiters early"""
+        return remaining
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._condition:
+            return {'backend': 'memory', 'epoch': self.epoch, 'latestSeq': self._seq, 'entries': len(self._entries),
+                    'oldestSeq': self._entries[0]['seq'] if self._entries else None,
+                    'maxEntries': self.max_entries}
+
+
+class SQLiteChangeFeed(ChangeFeed):
+    """Change log shared by worker processes on one host through a SQLite file"""
+
+    def __init__(self, max_entries: int = None, db_path: str = None, poll_seconds: float = None):
+        super().__init__(max_entries)
+        self.db_path = db_path or Config.CHANGE_FEED_DB
+        self.poll_seconds = poll_seconds if poll_seconds is not None else Config.CHANGE_FEED_POLL_MS / 1000
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS feed_changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT, collection TEXT NOT NULL, item_id TEXT,
+                    op TEXT NOT NULL, fields TEXT NOT NULL, data TEXT, timestamp REAL NOT NULL);
+                CREATE TABLE IF NOT EXISTS feed_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            ''')
+            # The first worker picks the epoch; the others and later restarts keep it
+            conn.execute("INSERT OR IGNORE INTO feed_meta (key, value) VALUES ('epoch', ?)", (self.epoch,))
+            self.epoch = conn.execute("SELECT value FROM feed_meta WHERE key = 'epoch'").fetchone()[0]
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection that waits briefly on other processes' write locks"""
+        return sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+
+    @property
+    def latest_seq(self) -> int:
+        conn = self._connect()
+        try:
+            return conn.execute('SELECT COALESCE(MAX(seq), 0) FROM feed_changes').fetchone()[0]
+        finally:
+            conn.close()
+
+    def append(self, changes: List[Dict]) -> List[Dict]:
+        """Number changes in the shared log, wake local long-polls and notify local subscribers"""
+        if not changes:
+            return []
+        timestamp = time.time()
+        conn = self._connect()
+        try:
+            # BEGIN IMMEDIATE so concurrent workers get consecutive, non-interleaved seqs
+            conn.execute('BEGIN IMMEDIATE')
+            for change in changes:
+                cursor = conn.execute(
+                    'INSERT INTO feed_changes (collection, item_id, op, fields, data, timestamp) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (change['collection'], change['id'], change['op'], json.dumps(change['fields']),
+                     json.dumps(change['data']), timestamp))
+                change['seq'] = cursor.lastrowid
+                change['timestamp'] = timestamp
+            conn.execute('DELETE FROM feed_changes WHERE seq <= ?', (changes[-1]['seq'] - self.max_entries,))
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+        with self._condition:
+            self._condition.notify_all()
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(changes)
+            except Exception as e:
+                print(f"Change feed subscriber failed: {e}")
+        return changes
+
+    def _read_unlocked(self, since: int, limit: int, collections) -> Dict[str, Any]:
+        conn = self._connect()
+        try:
+            oldest, latest = conn.execute('SELECT MIN(seq), COALESCE(MAX(seq), 0) FROM feed_changes').fetchone()
+            if oldest is None:
+                oldest = latest + 1
+            if since > latest or since < oldest - 1:
+                return {'changes': [], 'latestSeq': latest, 'nextSince': latest, 'hasMore': False,
+                        'resync': True}
+
+            sql = 'SELECT seq, collection, item_id, op, fields, data, timestamp FROM feed_changes WHERE seq > ? AND seq <= ?'
+            params = [since, latest]
+            if collections:
+                sql += f' AND collection IN ({", ".join("?" * len(collections))})'
+                params.extend(sorted(collections))
+            rows = conn.execute(sql + ' ORDER BY seq LIMIT ?', params + [limit + 1]).fetchall()
+        finally:
+            conn.close()
+
+        changes = [
+            {'collection': collection, 'id': item_id, 'op': op, 'fields': json.loads(fields),
+             'data': json.loads(data), 'seq': seq, 'timestamp': timestamp}
+            for seq, collection, item_id, op, fields, data, timestamp in rows[:limit]
+        ]
+        has_more = len(rows) > limit
+        return {'changes': changes, 'latestSeq': latest, 'nextSince': changes[-1]['seq'] if has_more else latest,
+                'hasMore': has_more, 'resync': False}
+
+    def _wait_slice(self, remaining: float) -> float:
+        # Writes by other workers do not wake this process, so look again every poll interval
+        return min(remaining, self.poll_seconds)
+
+    def get_status(self) -> Dict[str, Any]:
+        conn = self._connect()
+        try:
+            entries, oldest, latest = conn.execute(
+                'SELECT COUNT(*), MIN(seq), COALESCE(MAX(seq), 0) FROM feed_changes').fetchone()
+        finally:
+            conn.close()
+        return {'backend': 'sqlite', 'epoch': self.epoch, 'latestSeq': latest, 'entries': entries,
+                'oldestSeq': oldest, 'maxEntries': self.max_entries}
+
+
+def get_change_feed(backend: str = None, **kwargs) -> ChangeFeed:
+    """Create the change feed for this worker process"""
+    backend = backend or Config.CHANGE_FEED_BACKEND
+    if backend == 'sqlite':
+        return SQLiteChangeFeed(**kwargs)
+    return ChangeFeed(**kwargs)
+
+
+# Global instance
+change_feed = get_change_feed()
@@ -0,0 +1,148 @@
+"""
+Response compression negotiated on Accept-Encoding
+JSON and text responses above a size threshold are sent with brotli (when
+the brotli package is installed) or gzip. Bodies of ETag-tagged responses
+are compressed once per ETag and encoding and reused, so repeated GETs of
+an unchanged collection skip recompression.
+"""
+
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+from flask import request
+from config import Config
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Preferred first when the client accepts both equally
+ENCODINGS = ['br', 'gzip']
+
+COMPRESSIBLE_MIMETYPES = ['application/json', 'application/javascript', 'image/svg+xml']
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by (ETag, encoding), bounded by total size"""
+
+    def __init__(self, max_bytes: int = None):
+        self.max_bytes = max_bytes if max_bytes is not None else Config.COMPRESSION_CACHE_MAX_BYTES
+        self._entries: 'OrderedDict[Tuple[str, str], bytes]' = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key: Tuple[str, str], body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = body
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def get_status(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'bytes': self._size, 'max_bytes': self.max_bytes,
+                    'hits': self.hits, 'misses': self.misses, 'brotli': brotli is not None}
+
+
+# Global instance
+compressed_bodies = CompressedBodyCache()
+
+
+def available_encodings():
+    return [encoding for encoding in ENCODINGS if encoding != 'br' or brotli is not None]
+
+
+def choose_encoding(accept_encodings) -> Optional[str]:
+    """Best supported encoding the client accepts, or None for identity"""
+    best, best_quality = None, 0
+    for encoding in available_encodings():
+        quality = accept_encodings.quality(encoding)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """Strong ETags must differ per encoding, so compressed bodies get a suffix"""
+    return f'{etag}-{encoding}'
+
+
+def etag_variants(etag: str):
+    """Every tag a client may hold for the same content"""
+    return [etag] + [encoded_etag(etag, encoding) for encoding in ENCODINGS]
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=Config.COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=Config.COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def _compressible(response) -> bool:
+    if not 200 <= response.status_code < 300 or response.status_code == 204:
+        return False
+    # Streams (server-sent events) and files are sent as they are produced
+    if response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers:
+        return False
+    return response.mimetype.startswith('text/') and response.mimetype != 'text/event-stream' \
+        or response.mimetype in COMPRESSIBLE_MIMETYPES
+
+
+def compress_response(response, cache: CompressedBodyCache = None):
+    """after_request hook: compress the body if the client and the response allow it"""
+    if not _compressible(response):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+    body = response.get_data()
+    if len(body) < Config.COMPRESSION_MIN_BYTES:
+        return response
+
+    cache = cache or compressed_bodies
+    etag, weak = response.get_etag()
+    key = (etag, encoding) if etag and not weak else None
+    compressed = cache.get(key) if key else None
+    if compressed is None:
+        compressed = compress(body, encoding)
+        if key:
+            cache.put(key, compressed)
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    if key:
+        response.set_etag(encoded_etag(etag, encoding))
+    return response
+
+
+def init_compression(app, cache: CompressedBodyCache = None):
+    """Register response compression on a Flask app"""
+    app.after_request(lambda response: compress_response(response, cache))
+    return app
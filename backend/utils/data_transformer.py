@@ -40,3 +40,27 @@ def transform_script_data(script):
     script['characters'] = sorted(list(characters))
 
     return script
+
+# Scene header fields returned by GET /api/script?view=summary
+SCENE_SUMMARY_FIELDS = [
+    'id', 'number', 'title', 'int_ext', 'location', 'timeOfDay', 'estimatedDuration', 'status', 'vfx'
+]
+
+def project_script(script, fields=None, exclude=None):
+    """
+    Cuts every scene down to the requested fields, minus any excluded ones.
+    Builds new scene dicts that share their values with the input, so the
+    full document is never copied and the input is left untouched.
+    """
+    if not fields and not exclude:
+        return script
+
+    drop = set(exclude or ())
+    scenes = script.get('scenes', [])
+    if fields:
+        keep = [field for field in dict.fromkeys(fields) if field not in drop]
+        projected = [{field: scene[field] for field in keep if field in scene} for scene in scenes]
+    else:
+        projected = [{key: value for key, value in scene.items() if key not in drop} for scene in scenes]
+
+    return {**script, 'scenes': projected}
@@ -0,0 +1,106 @@
+"""
+In-memory cache for values derived from JSON data files
+Entries are keyed by the content hash of their source files plus a version
+string, so they are recomputed as soon as any source file changes
+"""
+
+import hashlib
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+from config import Config
+
+
+class DerivedDataCache:
+    """Thread-safe memo of computed results keyed by source file content"""
+
+    def __init__(self, data_dir: str = None):
+        self.data_dir = data_dir or Config.DATA_DIR
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}  # path -> (mtime_ns, size, sha256)
+        self._entries: Dict[str, Tuple[Tuple, Any]] = {}    # name -> (key, value)
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get_lock(self, name: str) -> threading.Lock:
+        """Get or create the lock guarding one cache entry"""
+        with self._lock:
+            if name not in self._locks:
+                self._locks[name] = threading.Lock()
+            return self._locks[name]
+
+    def content_hash(self, filename: str) -> Optional[str]:
+        """
+        SHA-256 of a data file, re-hashed only when its mtime or size changes
+
+        Returns:
+            Hex digest, or None if the file does not exist
+        """
+        file_path = os.path.join(self.data_dir, filename)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            cached = self._hashes.get(file_path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+
+        with open(file_path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+
+        with self._lock:
+            self._hashes[file_path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def source_key(self, filenames: Iterable[str], version: str = '') -> Tuple:
+        """Cache key for a set of source files and a version string"""
+        return (version,) + tuple((filename, self.content_hash(filename)) for filename in filenames)
+
+    def get_or_compute(self, name: str, filenames: Iterable[str], compute: Callable[[], Any],
+                       version: str = '') -> Any:
+        """
+        Return the cached value for name, recomputing it if any source file changed
+
+        Concurrent callers for the same name wait for a single computation.
+        Cached values are shared between requests and must not be mutated.
+
+        Args:
+            name: Cache entry name
+            filenames: Data files the value is derived from
+            compute: Function producing the value
+            version: Bump to invalidate entries when the computation changes
+        """
+        filenames = list(filenames)
+        with self._get_lock(name):
+            key = self.source_key(filenames, version)
+            entry = self._entries.get(name)
+            if entry and entry[0] == key:
+                self.hits += 1
+                return entry[1]
+
+            self.misses += 1
+            value = compute()
+            # Files may have changed while computing; key on the state seen before computing
+            self._entries[name] = (key, value)
+            return value
+
+    def peek_key(self, name: str) -> Optional[Tuple]:
+        """Key of the currently cached value for name, if any"""
+        entry = self._entries.get(name)
+        return entry[0] if entry else None
+
+    def invalidate(self, name: str = None) -> None:
+        """Drop one entry, or everything when name is None"""
+        with self._lock:
+            if name is None:
+                self._entries.clear()
+                self._hashes.clear()
+            else:
+                self._entries.pop(name, None)
+
+
+# Global instance
+derived_cache = DerivedDataCache()
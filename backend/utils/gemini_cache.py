@@ -0,0 +1,147 @@
+"""
+Disk-backed response cache for Gemini scheduling calls
+Keeps model responses keyed by prompt hash, model and generation config so
+repeated "Generate AI Schedule" clicks don't consume API quota
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from config import Config
+
+
+class GeminiResponseCache:
+    """Thread-safe file cache with TTL expiry and size-bounded LRU eviction"""
+
+    def __init__(self, cache_dir: str = None, ttl_seconds: int = None, max_entries: int = None):
+        self.cache_dir = cache_dir or Config.GEMINI_CACHE_DIR
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else Config.GEMINI_CACHE_TTL_SECONDS
+        self.max_entries = max_entries if max_entries is not None else Config.GEMINI_CACHE_MAX_ENTRIES
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(prompt: str, model: str, generation_config: Dict[str, Any]) -> str:
+        """Build a cache key from the prompt hash, model name and generation config"""
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        key_material = json.dumps({
+            'prompt_sha256': prompt_hash,
+            'model': model,
+            'generation_config': generation_config or {}
+        }, sort_keys=True)
+        return hashlib.sha256(key_material.encode('utf-8')).hexdigest()
+
+    def _get_entry_path(self, key: str) -> str:
+        """Get full path for a cache entry"""
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _is_expired(self, created_at: float) -> bool:
+        """Check whether an entry created at the given timestamp has outlived the TTL"""
+        return self.ttl_seconds > 0 and time.time() - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Cache key from make_key()
+
+        Returns:
+            Dictionary with 'response' and 'created_at', or None on miss/expiry
+        """
+        entry_path = self._get_entry_path(key)
+
+        with self._lock:
+            try:
+                with open(entry_path, 'r', encoding='utf-8') as f:
+                    entry = json.load(f)
+            except (IOError, OSError, json.JSONDecodeError):
+                return None
+
+            if self._is_expired(entry.get('created_at', 0)):
+                self._remove(entry_path)
+                return None
+
+            # Touch the entry so eviction keeps recently used responses
+            try:
+                os.utime(entry_path, None)
+            except OSError:
+                pass
+
+            return entry
+
+    def set(self, key: str, response: Dict[str, Any], metadata: Dict[str, Any] = None) -> bool:
+        """Store a response and evict expired or least recently used entries"""
+        entry = {
+            'created_at': time.time(),
+            'metadata': metadata or {},
+            'response': response
+        }
+        entry_path = self._get_entry_path(key)
+
+        with self._lock:
+            temp_path = entry_path + '.tmp'
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f, ensure_ascii=False)
+                os.replace(temp_path, entry_path)
+            except (IOError, OSError, TypeError, ValueError) as e:
+                print(f"Error writing Gemini cache entry {key}: {e}")
+                self._remove(temp_path)
+                return False
+
+            self._evict()
+            return True
+
+    def clear(self) -> int:
+        """Remove all cache entries and return the number removed"""
+        with self._lock:
+            removed = 0
+            for entry_path in self._list_entries():
+                if self._remove(entry_path):
+                    removed += 1
+            return removed
+
+    def _list_entries(self):
+        """List cache entry paths"""
+        if not os.path.isdir(self.cache_dir):
+            return []
+        return [
+            os.path.join(self.cache_dir, name)
+            for name in os.listdir(self.cache_dir)
+            if name.endswith('.json')
+        ]
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest-used ones beyond max_entries"""
+        entries = []
+        for entry_path in self._list_entries():
+            try:
+                mtime = os.path.getmtime(entry_path)
+            except OSError:
+                continue
+            if self._is_expired(mtime):
+                self._remove(entry_path)
+            else:
+                entries.append((mtime, entry_path))
+
+        if self.max_entries > 0 and len(entries) > self.max_entries:
+            entries.sort()
+            for _, entry_path in entries[:len(entries) - self.max_entries]:
+                self._remove(entry_path)
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        """Remove a file, ignoring races with concurrent eviction"""
+        try:
+            os.remove(path)
+            return True
+        except OSError:
+            return False
+
+
+# Global instance
+gemini_response_cache = GeminiResponseCache()
@@ -6,110 +6,87 @@ Gemini AI Integration for Film Production Scheduling (Google Generative AI SDK v
 import json as json_module
 import os
 import time
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from datetime import datetime
 from dotenv import load_dotenv
-import google.generativeai as genai
+from utils.model_client import get_model_client
+from utils.gemini_cache import gemini_response_cache
+from utils.rate_limiter import RateLimitExceeded, get_gemini_rate_limiter
+from utils.local_scheduler import LocalScheduleSolver
+from utils.prompt_builder import SchedulingPromptBuilder, estimate_tokens
+from utils.json_stream import IncrementalArrayParser
+from config import Config
 
 # Load environment variables
 load_dotenv()
 
+# Model and generation settings used for scheduling calls (also part of the cache key)
+GEMINI_MODEL_NAME = "gemini-2.5-flash-lite"
+GEMINI_GENERATION_CONFIG = {
+    "temperature": 0.3,
+    "top_k": 40,
+    "top_p": 0.95,
+    "max_output_tokens": 4096,
+}
+
 
 class GeminiScheduler:
     """
     Integrates with Google Gemini AI for intelligent film production scheduling
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, response_cache=None, rate_limiter=None, model_client=None):
         """Initialize Gemini scheduler with API key"""
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
+        # Shared client from the process-wide registry, resolved on first call
+        self._model_client = model_client
+        self.response_cache = response_cache or gemini_response_cache
+        # Process-wide limiter, so quota is shared by every request rather than per instance
+        self.rate_limiter = rate_limiter or get_gemini_rate_limiter()
+        self.prompt_builder = SchedulingPromptBuilder(
+            max_prompt_tokens=Config.GEMINI_MAX_PROMPT_TOKENS,
+            max_output_tokens=GEMINI_GENERATION_CONFIG["max_output_tokens"]
+        )
         self.base_url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent"
 
         if not self.api_key:
             print("Warning: No GEMINI_API_KEY found in environment. Using mock responses.")
-        else:
-            genai.configure(api_key=self.api_key)
 
-        # Rate limit control — 4 seconds between each API call
-        self.last_call_time = 0
+    @property
+    def model_client(self):
+        """Pooled model client shared with every other scheduler using the same key"""
+        if self._model_client is None:
+            self._model_client = get_model_client(GEMINI_MODEL_NAME, self.api_key)
+        return self._model_client
 
     def _respect_rate_limit(self):
-        """Ensure at least 4 seconds gap between calls"""
-        elapsed = time.time() - self.last_call_time
-        if elapsed < 4:
-            time.sleep(4 - elapsed)
-        self.last_call_time = time.time()
+        """Reserve a slot in the shared quota; raises RateLimitExceeded instead of sleeping"""
+        self.rate_limiter.acquire()
 
     def create_scheduling_prompt(self, scenes_data: Dict[str, Any]) -> str:
-        """Create a comprehensive prompt for Gemini AI to generate optimal shooting schedule"""
+        """Create a compact prompt for Gemini AI covering every scene in one request"""
         scenes = scenes_data.get("shooting_schedule", {}).get("scenes", [])
         project_title = scenes_data.get("project_title", "Film Project")
+        return self.prompt_builder.build_prompt(scenes, project_title)
 
-        locations = list(set(scene.get("location", "") for scene in scenes))
-        actors = []
-        for scene in scenes:
-            for actor in scene.get("actors", []):
-                actor_name = actor.get("name", "")
-                if actor_name and actor_name not in actors:
-                    actors.append(actor_name)
+    def create_scheduling_prompts(self, scenes_data: Dict[str, Any]) -> List[Tuple[List[Dict[str, Any]], str]]:
+        """
+        Split the project into prompts that fit the token budgets
 
-        prompt = f"""
-You are an expert film production scheduler. Create an optimal shooting schedule for "{project_title}" based on the following constraints and data:
-
-## PROJECT DATA:
-Total Scenes: {len(scenes)}
-Locations: {', '.join(locations)}
-Main Actors: {', '.join(actors)}
-
-## SCENES TO SCHEDULE:
-"""
-        for scene in scenes:
-            scene_actors = [actor.get("name", "") for actor in scene.get("actors", [])]
-            scene_extras = scene.get("extras", [])
-            prompt += f"""
-Scene {scene.get("scene_number")}: {scene.get("scene_title", "")}
-- Location: {scene.get("location", "")}
-- Time of Day: {scene.get("time_of_day", "")}
-- Duration: {scene.get("estimated_duration_minutes", 0)} minutes
-- Actors: {', '.join(scene_actors) if scene_actors else 'None'}
-- Extras: {', '.join(scene_extras) if scene_extras else 'None'}
-"""
+        Returns:
+            (scenes, prompt) per part; a single part unless the project is too large
+        """
+        scenes = scenes_data.get("shooting_schedule", {}).get("scenes", [])
+        project_title = scenes_data.get("project_title", "Film Project")
+        parts = self.prompt_builder.chunk_scenes(scenes, project_title)
+        if len(parts) == 1:
+            return [(parts[0], self.create_scheduling_prompt(scenes_data))]
+        return [
+            (part, self.prompt_builder.build_prompt(part, project_title, number, len(parts)))
+            for number, part in enumerate(parts, 1)
+        ]
 
-        prompt += """
-
-## SCHEDULING CONSTRAINTS:
-1. **Location Efficiency**: Group scenes by location to minimize setup/teardown time and costs
-2. **Actor Availability**: Consider actor scheduling conflicts and minimize their total working days
-3. **Time of Day Logic**: Schedule DAY scenes first, then DUSK, then NIGHT within each location
-4. **Equipment Sharing**: Consider shared equipment needs between similar scenes
-5. **Weather Dependencies**: Outdoor scenes should be grouped and have backup indoor options
-6. **Crew Efficiency**: Minimize crew overtime by balancing daily workloads
-
-## ADDITIONAL CONSIDERATIONS:
-- Radio Station scenes (Control Room, Parking Area, Abandoned) should be scheduled together
-- Maya appears in multiple scenes - optimize her schedule to minimize her working days
-- Government facility scenes may require special permissions/security clearance
-- Desert highway scenes are weather-dependent
-
-## REQUIRED OUTPUT FORMAT:
-Please provide a JSON response with the following structure:
-
-```json
-{
-  "optimized_schedule": {
-    "scheduling_strategy": "Brief explanation of the optimization strategy used",
-    "total_shooting_days": number,
-    "daily_schedules": [...],
-    "actor_schedules": {...},
-    "location_schedule": {...},
-    "optimization_benefits": [...],
-    "potential_risks": [...]
-  }
-}
-```
-Generate the most efficient shooting schedule considering all constraints and provide detailed reasoning for your scheduling decisions.
-"""
-        return prompt
     def call_gemini_api(self, prompt: str) -> Dict[str, Any]:
         """Make API call to Google Generative AI (Gemini)"""
         if not self.api_key:
@@ -122,191 +99,68 @@ Generate the most efficient shooting schedule considering all constraints and pr
         self._respect_rate_limit()
 
         try:
-            model = genai.GenerativeModel("gemini-2.5-flash-lite")
-
-            response = model.generate_content(
-                prompt,
-                generation_config={
-                    "temperature": 0.3,
-                    "top_k": 40,
-                    "top_p": 0.95,
-                    "max_output_tokens": 4096,
-                },
-            )
+            text_response = self.model_client.generate(prompt, GEMINI_GENERATION_CONFIG)
 
-            if not response.text:
+            if not text_response:
                 return {
                     "error": "Empty response from Gemini API",
                     "optimized_schedule": None,  # Will be set in generate_schedule method
                 }
 
-            text_response = response.text
+            return self._parse_response_text(text_response)
 
-            try:
-                json_start = text_response.find("{")
-                json_end = text_response.rfind("}") + 1
-                if json_start != -1 and json_end > json_start:
-                    json_str = text_response[json_start:json_end]
-                    return json_module.loads(json_str)
-                else:
-                    return {
-                        "error": "No valid JSON found in Gemini response",
-                        "raw_response": text_response,
-                        "optimized_schedule": None,  # Will be set in generate_schedule method
-                    }
+        except Exception as e:
+            return {
+                "error": f"Error calling Gemini API: {str(e)}",
+                "optimized_schedule": None,  # Will be set in generate_schedule method
+            }
+
+    def stream_gemini_api(self, prompt: str) -> Iterator[str]:
+        """
+        Stream response text from Gemini chunk by chunk
+
+        Raises:
+            ValueError: No API key configured
+            RateLimitExceeded: Shared quota is used up
+        """
+        if not self.api_key:
+            raise ValueError("Gemini API key not provided. Set GEMINI_API_KEY environment variable.")
+
+        self._respect_rate_limit()
+        yield from self.model_client.stream(prompt, GEMINI_GENERATION_CONFIG)
 
-            except json_module.JSONDecodeError:
+    @staticmethod
+    def _parse_response_text(text_response: str) -> Dict[str, Any]:
+        """Extract the JSON object from a model response"""
+        try:
+            json_start = text_response.find("{")
+            json_end = text_response.rfind("}") + 1
+            if json_start != -1 and json_end > json_start:
+                json_str = text_response[json_start:json_end]
+                return json_module.loads(json_str)
+            else:
                 return {
-                    "error": "Failed to parse JSON from Gemini response",
+                    "error": "No valid JSON found in Gemini response",
                     "raw_response": text_response,
                     "optimized_schedule": None,  # Will be set in generate_schedule method
                 }
 
-        except Exception as e:
+        except json_module.JSONDecodeError:
             return {
-                "error": f"Error calling Gemini API: {str(e)}",
+                "error": "Failed to parse JSON from Gemini response",
+                "raw_response": text_response,
                 "optimized_schedule": None,  # Will be set in generate_schedule method
             }
 
-    def _generate_mock_schedule(self, scenes_data: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Generate a mock schedule for testing when Gemini API is not available"""
-        
-        # Extract real scene data if provided
-        real_scenes = []
-        if scenes_data:
-            shooting_scenes = scenes_data.get('shooting_schedule', {}).get('scenes', [])
-            for scene in shooting_scenes:
-                real_scenes.append({
-                    'scene_number': scene.get('scene_number', 1),
-                    'scene_title': scene.get('scene_title', 'Untitled Scene'),
-                    'location': scene.get('location', 'Unknown Location'),
-                    'time_of_day': scene.get('time_of_day', 'DAY'),
-                    'estimated_duration_minutes': scene.get('estimated_duration_minutes', 60),
-                    'actors_needed': [actor.get('name', '') for actor in scene.get('actors', [])],
-                    'extras_needed': scene.get('extras', [])
-                })
-        
-        # Use real scenes if available, otherwise use default mock data
-        if real_scenes:
-            # Group scenes by location for realistic scheduling
-            location_groups = {}
-            for scene in real_scenes:
-                location = scene['location']
-                if location not in location_groups:
-                    location_groups[location] = []
-                location_groups[location].append(scene)
-            
-            # Create daily schedules from real data
-            daily_schedules = []
-            day_num = 1
-            
-            for location, scenes in location_groups.items():
-                # Sort scenes by time of day
-                time_priority = {'DAY': 1, 'DUSK': 2, 'NIGHT': 3}
-                scenes.sort(key=lambda x: time_priority.get(x['time_of_day'], 1))
-                
-                # Create a day for this location
-                daily_schedule = {
-                    "day": day_num,
-                    "date": "TBD",
-                    "location_focus": location,
-                    "scenes": []
-                }
-                
-                call_time = "09:00"
-                current_time = 9 * 60  # 9 AM in minutes
-                
-                for scene in scenes:
-                    duration = scene['estimated_duration_minutes']
-                    wrap_time_minutes = current_time + duration
-                    wrap_hour = wrap_time_minutes // 60
-                    wrap_min = wrap_time_minutes % 60
-                    
-                    scene_schedule = {
-                        "scene_number": scene['scene_number'],
-                        "scene_title": scene['scene_title'],
-                        "location": scene['location'],
-                        "time_of_day": scene['time_of_day'],
-                        "estimated_duration_minutes": duration,
-                        "actors_needed": scene['actors_needed'],
-                        "extras_needed": scene['extras_needed'],
-                        "call_time": call_time,
-                        "estimated_wrap": f"{wrap_hour:02d}:{wrap_min:02d}",
-                        "setup_notes": f"Setup for {scene['location']} - {scene['time_of_day']} scene"
-                    }
-                    
-                    daily_schedule["scenes"].append(scene_schedule)
-                    current_time = wrap_time_minutes + 30  # 30 min break between scenes
-                    call_time = f"{(current_time // 60):02d}:{(current_time % 60):02d}"
-                
-                # Add daily summary
-                daily_schedule["daily_summary"] = {
-                    "total_scenes": len(scenes),
-                    "total_duration_minutes": sum(s['estimated_duration_minutes'] for s in scenes),
-                    "primary_actors": list(set([actor for scene in scenes for actor in scene['actors_needed'] if actor])),
-                    "location_changes": 1,
-                    "special_requirements": [f"{scene['time_of_day']} lighting setup" for scene in scenes]
-                }
-                
-                daily_schedules.append(daily_schedule)
-                day_num += 1
-            
-            # Create actor schedules
-            actor_schedules = {}
-            for day in daily_schedules:
-                for scene in day["scenes"]:
-                    for actor in scene["actors_needed"]:
-                        if actor and actor not in actor_schedules:
-                            actor_schedules[actor] = {
-                                "total_working_days": 0,
-                                "scenes": [],
-                                "schedule_notes": f"Character appears in multiple scenes"
-                            }
-                        if actor:
-                            if scene["scene_number"] not in actor_schedules[actor]["scenes"]:
-                                actor_schedules[actor]["scenes"].append(scene["scene_number"])
-            
-            # Update working days count
-            for actor in actor_schedules:
-                actor_schedules[actor]["total_working_days"] = len(set(
-                    day["day"] for day in daily_schedules 
-                    for scene in day["scenes"] 
-                    if actor in scene["actors_needed"]
-                ))
-            
-            # Create location schedule
-            location_schedule = {}
-            for day in daily_schedules:
-                location = day["location_focus"]
-                if location not in location_schedule:
-                    location_schedule[location] = {
-                        "days_needed": [],
-                        "total_scenes": 0,
-                        "setup_requirements": f"Standard setup for {location}"
-                    }
-                location_schedule[location]["days_needed"].append(day["day"])
-                location_schedule[location]["total_scenes"] += len(day["scenes"])
-            
-            return {
-                "scheduling_strategy": "AI-optimized schedule using real scene data with location clustering and time sorting",
-                "total_shooting_days": len(daily_schedules),
-                "daily_schedules": daily_schedules,
-                "actor_schedules": actor_schedules,
-                "location_schedule": location_schedule,
-                "optimization_benefits": [
-                    "Grouped scenes by location to minimize setup time",
-                    "Sorted scenes by time of day for natural progression",
-                    "Optimized actor schedules to minimize working days",
-                    "Used real scene titles and data from script"
-                ],
-                "potential_risks": [
-                    "Weather dependency for outdoor scenes",
-                    "Actor availability conflicts",
-                    "Equipment scheduling conflicts"
-                ]
-            }
-        
-        # Fallback to original mock data if no real scenes available
+    def _generate_local_schedule(self, scenes_data: Dict[str, Any] = None) -> Dict[str, Any]:
+        """Generate a schedule with the local constraint solver when Gemini is not available"""
+        scenes = (scenes_data or {}).get('shooting_schedule', {}).get('scenes', [])
+        if scenes:
+            return LocalScheduleSolver().solve(scenes)
+        return self._generate_mock_schedule()
+
+    def _generate_mock_schedule(self) -> Dict[str, Any]:
+        """Generate a sample schedule for testing when there are no scenes to schedule"""
         return {
             "scheduling_strategy": "Mock AI-optimized schedule - Location clustering with time-of-day optimization",
             "total_shooting_days": 3,
@@ -394,32 +248,456 @@ Generate the most efficient shooting schedule considering all constraints and pr
             ],
         }
 
-    def generate_schedule(self, scenes_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Main method to generate optimized schedule using Gemini AI"""
+    def _request_part(self, prompt: str, use_cache: bool) -> Tuple[Dict[str, Any], str, Optional[float]]:
+        """
+        Get the model response for one prompt, through the cache when allowed
+
+        Returns:
+            (response, cache_key, cached created_at timestamp or None on a miss)
+        """
+        cache_key = self.response_cache.make_key(prompt, GEMINI_MODEL_NAME, GEMINI_GENERATION_CONFIG)
+        cached_entry = self.response_cache.get(cache_key) if use_cache and self.api_key else None
+        if cached_entry:
+            return cached_entry["response"], cache_key, cached_entry["created_at"]
+
+        response = self.call_gemini_api(prompt)
+        # Only real model output is worth caching; errors and mock fallbacks are not
+        if use_cache and "error" not in response and (response.get("days") or response.get("optimized_schedule")):
+            self.response_cache.set(cache_key, response, {"model": GEMINI_MODEL_NAME})
+        return response, cache_key, None
+
+    @staticmethod
+    def _local_part_response(scenes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Compact response for one part scheduled by the local solver (used when the part is over quota)"""
+        days = LocalScheduleSolver().search(scenes)["days"]
+        return {"days": [[scenes[i].get("scene_number") for i in day] for day in days]}
+
+    def generate_schedule(self, scenes_data: Dict[str, Any], use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Main method to generate optimized schedule using Gemini AI
+
+        Large projects are split into location-clustered parts, one model call
+        each, and the compact day lists are merged into one schedule. A part
+        after the first that is over quota is scheduled by the local solver
+        (listed in generation_info.local_parts) rather than failing the request.
+
+        Args:
+            scenes_data: Contents of shooting_schedule.json
+            use_cache: Serve and store responses through the disk cache; pass False to force a fresh model call
+
+        Returns:
+            Model response with optimized_schedule and generation_info
+        """
         try:
-            prompt = self.create_scheduling_prompt(scenes_data)
-            result = self.call_gemini_api(prompt)
+            scenes = scenes_data.get("shooting_schedule", {}).get("scenes", [])
+            parts = self.create_scheduling_prompts(scenes_data)
+            responses = []
+            cache_keys = []
+            cached_times = []
+            local_parts = []
+            for number, (part, prompt) in enumerate(parts, 1):
+                try:
+                    response, cache_key, cached_time = self._request_part(prompt, use_cache)
+                except RateLimitExceeded:
+                    # Over quota before anything was used: let the caller answer 429
+                    if not responses:
+                        raise
+                    # Later parts must not waste the parts already generated
+                    response = self._local_part_response(part)
+                    cache_key = self.response_cache.make_key(prompt, GEMINI_MODEL_NAME, GEMINI_GENERATION_CONFIG)
+                    cached_time = None
+                    local_parts.append(number)
+                responses.append(response)
+                cache_keys.append(cache_key)
+                if cached_time is not None:
+                    cached_times.append(cached_time)
+
+            errors = [response for response in responses if "error" in response]
+            if errors:
+                result = dict(errors[0])
+            elif len(responses) == 1 and responses[0].get("optimized_schedule") and not responses[0].get("days"):
+                # Full-format answer (model ignored the compact format); use it as is
+                result = responses[0]
+            elif all(response.get("days") or response.get("optimized_schedule") for response in responses):
+                compact = [self._compact_days(response) for response in responses]
+                result = {"optimized_schedule": self.prompt_builder.merge_results(scenes, compact)}
+            else:
+                result = {"error": "Gemini response did not contain a schedule", "optimized_schedule": None}
             
-            # If result doesn't have optimized_schedule or it's None, generate mock schedule
+            # If result doesn't have optimized_schedule or it's None, fall back to the local solver
             if not result.get("optimized_schedule"):
-                result["optimized_schedule"] = self._generate_mock_schedule(scenes_data)
+                result["optimized_schedule"] = self._generate_local_schedule(scenes_data)
                 result["is_mock"] = True
             
+            prompts = [prompt for _, prompt in parts]
             result["generation_info"] = {
                 "generated_at": datetime.now().isoformat(),
-                "input_scenes": len(scenes_data.get("shooting_schedule", {}).get("scenes", [])),
-                "ai_model": "gemini-pro (via google-generativeai SDK)",
-                "prompt_length": len(prompt),
+                "input_scenes": len(scenes),
+                "ai_model": f"{GEMINI_MODEL_NAME} (via {Config.GEMINI_TRANSPORT} transport)",
+                "prompt_length": sum(len(prompt) for prompt in prompts),
+                "prompt_tokens_estimate": sum(estimate_tokens(prompt) for prompt in prompts),
+                "prompt_parts": len(prompts),
+                "local_parts": local_parts,
+                "cache_key": cache_keys[0],
+                "cache_hit": len(cached_times) == len(prompts),
+                "cache_bypassed": not use_cache,
+                "cached_at": datetime.fromtimestamp(min(cached_times)).isoformat() if cached_times else None,
             }
             return result
 
+        except RateLimitExceeded:
+            raise
+
         except Exception as e:
             return {
                 "error": f"Schedule generation failed: {str(e)}",
-                "optimized_schedule": self._generate_mock_schedule(scenes_data),
+                "optimized_schedule": self._generate_local_schedule(scenes_data),
                 "generation_info": {
                     "generated_at": datetime.now().isoformat(),
                     "error": str(e),
                     "fallback_used": True,
+                    "cache_hit": False,
                 },
             }
+
+    def stream_schedule(self, scenes_data: Dict[str, Any],
+                        use_cache: bool = True) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Generate a schedule, yielding each day as soon as the model finishes it
+
+        Model output is consumed through IncrementalArrayParser, so day 1 is
+        available while later days are still being generated. Cached parts are
+        replayed at once. If the model fails, a "reset" event (when days were
+        already sent) is followed by the local solver's days.
+
+        Yields:
+            ("start", {...}), ("day", daily_schedules entry) per day, optionally
+            ("reset", {...}), then ("complete", result shaped like generate_schedule)
+
+        Raises:
+            RateLimitExceeded: Shared quota is used up before the first part; later
+                parts over quota are scheduled by the local solver instead
+        """
+        scenes = scenes_data.get("shooting_schedule", {}).get("scenes", [])
+        parts = self.create_scheduling_prompts(scenes_data)
+        prompts = [prompt for _, prompt in parts]
+        yield "start", {"input_scenes": len(scenes), "prompt_parts": len(prompts)}
+
+        solver = LocalScheduleSolver()
+        prepared = solver.prepare_scenes(scenes)
+        index_by_number = {}
+        for index, scene in enumerate(prepared):
+            index_by_number.setdefault(str(scene["scene_number"]), index)
+        placed = set()
+        streamed = []
+
+        def expand(scene_numbers):
+            """daily_schedules entry for the next day, or None if it adds no new scene"""
+            indexes = []
+            for scene_number in scene_numbers if isinstance(scene_numbers, list) else []:
+                index = index_by_number.get(str(scene_number))
+                if index is not None and index not in placed:
+                    placed.add(index)
+                    indexes.append(index)
+            if not indexes:
+                return None
+            streamed.append(indexes)
+            entry = solver.build_schedule(prepared, [indexes])["daily_schedules"][0]
+            entry["day"] = len(streamed)
+            return entry
+
+        responses = []
+        cache_keys = []
+        cached_times = []
+        local_parts = []
+        error = None
+        try:
+            for number, (part, prompt) in enumerate(parts, 1):
+                cache_key = self.response_cache.make_key(prompt, GEMINI_MODEL_NAME, GEMINI_GENERATION_CONFIG)
+                cache_keys.append(cache_key)
+                cached_entry = self.response_cache.get(cache_key) if use_cache and self.api_key else None
+                if cached_entry:
+                    response = cached_entry["response"]
+                    cached_times.append(cached_entry["created_at"])
+                    for day in self._compact_days(response)["days"]:
+                        entry = expand(day)
+                        if entry:
+                            yield "day", entry
+                else:
+                    parser = IncrementalArrayParser(["days", "daily_schedules"])
+                    try:
+                        for chunk in self.stream_gemini_api(prompt):
+                            for key, element in parser.feed(chunk):
+                                if key == "daily_schedules":
+                                    element = [scene.get("scene_number") for scene in element.get("scenes", [])
+                                               if isinstance(scene, dict)] if isinstance(element, dict) else []
+                                entry = expand(element)
+                                if entry:
+                                    yield "day", entry
+                    except RateLimitExceeded:
+                        # Quota is checked before the first chunk, so nothing of this part was sent
+                        if not responses:
+                            raise
+                        response = self._local_part_response(part)
+                        local_parts.append(number)
+                        for day in response["days"]:
+                            entry = expand(day)
+                            if entry:
+                                yield "day", entry
+                    else:
+                        response = self._parse_response_text(parser.text)
+                        if use_cache and "error" not in response and (response.get("days") or response.get("optimized_schedule")):
+                            self.response_cache.set(cache_key, response, {"model": GEMINI_MODEL_NAME})
+
+                if "error" in response or not (response.get("days") or response.get("optimized_schedule")):
+                    raise ValueError(response.get("error", "Gemini response did not contain a schedule"))
+                responses.append(response)
+
+        except RateLimitExceeded:
+            raise
+
+        except Exception as e:
+            error = str(e)
+
+        if error is None:
+            compact = [self._compact_days(response) for response in responses]
+            result = {"optimized_schedule": self.prompt_builder.merge_results(scenes, compact)}
+            # Scenes the model left out were packed into extra days at the end
+            remaining = result["optimized_schedule"]["daily_schedules"][len(streamed):]
+        else:
+            result = {"error": error, "optimized_schedule": self._generate_local_schedule(scenes_data), "is_mock": True}
+            if streamed:
+                yield "reset", {"reason": error}
+            remaining = result["optimized_schedule"].get("daily_schedules", [])
+        for entry in remaining:
+            yield "day", entry
+
+        result["generation_info"] = {
+            "generated_at": datetime.now().isoformat(),
+            "input_scenes": len(scenes),
+            "ai_model": f"{GEMINI_MODEL_NAME} (via {Config.GEMINI_TRANSPORT} transport)",
+            "prompt_length": sum(len(prompt) for prompt in prompts),
+            "prompt_tokens_estimate": sum(estimate_tokens(prompt) for prompt in prompts),
+            "prompt_parts": len(prompts),
+            "local_parts": local_parts,
+            "streamed": True,
+            "cache_key": cache_keys[0] if cache_keys else None,
+            "cache_hit": bool(cache_keys) and len(cached_times) == len(prompts),
+            "cache_bypassed": not use_cache,
+            "cached_at": datetime.fromtimestamp(min(cached_times)).isoformat() if cached_times else None,
+        }
+        yield "complete", result
+
+    @staticmethod
+    def _compact_days(response: Dict[str, Any]) -> Dict[str, Any]:
+        """Compact view of a response, deriving day lists from a full-format schedule if needed"""
+        if response.get("days"):
+            return response
+        schedule = response.get("optimized_schedule") or {}
+        return {
+            "scheduling_strategy": schedule.get("scheduling_strategy"),
+            "days": [
+                [scene.get("scene_number") for scene in day.get("scenes", [])]
+                for day in schedule.get("daily_schedules", [])
+            ],
+            "optimization_benefits": schedule.get("optimization_benefits"),
+            "potential_risks": schedule.get("potential_risks"),
+        }
+
+    # ------------------------------------------------------------------
+    # Hierarchical mode
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def group_blocks(clusters: Dict[str, List[Dict[str, Any]]], max_scenes: int) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Pack location clusters into blocks of up to max_scenes scenes
+
+        Small clusters are merged in the given order. A cluster over the limit
+        is broken into its individual locations first; only a single location
+        larger than max_scenes makes an oversized block.
+        """
+        units = []
+        for name, cluster in clusters.items():
+            if len(cluster) <= max_scenes:
+                units.append((name, list(cluster)))
+                continue
+            by_location: Dict[str, List[Dict[str, Any]]] = {}
+            for scene in cluster:
+                by_location.setdefault(scene.get("location", ""), []).append(scene)
+            units.extend(by_location.items())
+
+        blocks = []
+        names: List[str] = []
+        current: List[Dict[str, Any]] = []
+        for name, unit in units:
+            if current and len(current) + len(unit) > max_scenes:
+                blocks.append((" | ".join(names), current))
+                names, current = [], []
+            names.append(name)
+            current = current + unit
+        if current:
+            blocks.append((" | ".join(names), current))
+        return blocks
+
+    def _schedule_block(self, block: List[Dict[str, Any]], project_title: str, number: int,
+                        count: int, use_cache: bool) -> Dict[str, Any]:
+        """
+        Schedule one block with the model, or the local solver when the model is
+        unavailable, over quota or returns no usable schedule. Parts of the block
+        that find no free quota slot are solved locally at once; nothing waits.
+
+        Returns:
+            days (block scene indexes per day), source, elapsed_ms, local_parts,
+            the model's notes and, when a part was over quota, retry_after
+        """
+        started = time.time()
+        index_by_number = {}
+        for index, scene in enumerate(block):
+            index_by_number.setdefault(str(scene.get("scene_number")), index)
+
+        outcome = {"days": [], "source": "local", "cache_hits": 0, "calls": 0, "local_parts": 0}
+        if self.api_key:
+            try:
+                answered = []   # (part, compact response or None when over quota)
+                for part in self.prompt_builder.chunk_scenes(block, project_title):
+                    prompt = self.prompt_builder.build_prompt(part, project_title, number, count)
+                    try:
+                        response, _, cached_time = self._request_part(prompt, use_cache)
+                    except RateLimitExceeded as e:
+                        outcome["retry_after"] = e.retry_after
+                        answered.append((part, None))
+                        continue
+                    outcome["calls"] += 1
+                    outcome["cache_hits"] += cached_time is not None
+                    if "error" in response or not (response.get("days") or response.get("optimized_schedule")):
+                        raise ValueError(response.get("error", "no schedule in response"))
+                    answered.append((part, self._compact_days(response)))
+                if not outcome["calls"]:
+                    raise RateLimitExceeded(outcome["retry_after"], self.rate_limiter.name)
+                outcome["local_parts"] = sum(1 for _, response in answered if response is None)
+                responses = [response if response is not None else self._local_part_response(part)
+                             for part, response in answered]
+            except (RateLimitExceeded, ValueError) as e:
+                outcome["fallback_reason"] = str(e) or type(e).__name__
+            else:
+                placed = set()
+                for response in responses:
+                    for day in response.get("days") or []:
+                        indexes = []
+                        for scene_number in day if isinstance(day, list) else []:
+                            index = index_by_number.get(str(scene_number))
+                            if index is not None and index not in placed:
+                                placed.add(index)
+                                indexes.append(index)
+                        if indexes:
+                            outcome["days"].append(indexes)
+                # Scenes the model left out are scheduled locally below
+                outcome["missing"] = [i for i in range(len(block)) if i not in placed]
+                outcome["source"] = "cache" if outcome["cache_hits"] == outcome["calls"] else "gemini"
+                for field in ("scheduling_strategy", "optimization_benefits", "potential_risks"):
+                    outcome[field] = [r.get(field) for r in responses if r.get(field)]
+
+        if outcome["source"] == "local":
+            outcome["days"] = LocalScheduleSolver().search(block)["days"]
+        elif outcome["missing"]:
+            missing = outcome["missing"]
+            extra_days = LocalScheduleSolver().search([block[i] for i in missing])["days"]
+            outcome["days"] += [[missing[i] for i in day] for day in extra_days]
+        outcome["elapsed_ms"] = round((time.time() - started) * 1000, 2)
+        return outcome
+
+    def generate_block_schedule(self, scenes_data: Dict[str, Any], clusters: Dict[str, List[Dict[str, Any]]],
+                                use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Hierarchical scheduling for large projects
+
+        Location clusters are merged into blocks of up to GEMINI_BLOCK_MAX_SCENES
+        scenes and every block is scheduled concurrently, so latency is roughly
+        that of the slowest block rather than the sum. Blocks that find no free
+        quota slot are solved locally in the same pool (listed in
+        generation_info.local_blocks); only when no block got a slot is
+        RateLimitExceeded raised, as generate_schedule does. The block schedules
+        are then stitched by LocalScheduleSolver.stitch_blocks for actor continuity.
+
+        Args:
+            scenes_data: Contents of shooting_schedule.json
+            clusters: Location clusters (e.g. ScheduleOptimizer.cluster_locations) covering every scene
+            use_cache: Serve and store block responses through the disk cache
+
+        Returns:
+            Same shape as generate_schedule, with per-block timings in generation_info
+        """
+        scenes = scenes_data.get("shooting_schedule", {}).get("scenes", [])
+        project_title = scenes_data.get("project_title", "Film Project")
+        blocks = self.group_blocks(clusters, Config.GEMINI_BLOCK_MAX_SCENES)
+
+        started = time.time()
+        workers = max(1, min(Config.GEMINI_BLOCK_WORKERS, len(blocks)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(self._schedule_block, block, project_title, number, len(blocks), use_cache)
+                for number, (_, block) in enumerate(blocks, 1)
+            ]
+            outcomes = [future.result() for future in futures]
+        blocks_ms = round((time.time() - started) * 1000, 2)
+
+        over_quota = [outcome["retry_after"] for outcome in outcomes if "retry_after" in outcome]
+        if over_quota and not any(outcome["calls"] for outcome in outcomes):
+            # Not one block reached the model: let the caller answer 429 instead of a fully local schedule
+            raise RateLimitExceeded(min(over_quota), self.rate_limiter.name)
+
+        # Block indexes -> project indexes; clusters hold the scene dicts themselves
+        position = {id(scene): index for index, scene in enumerate(scenes)}
+        block_days = [
+            [[position[id(block[i])] for i in day] for day in outcome["days"]]
+            for (_, block), outcome in zip(blocks, outcomes)
+        ]
+
+        stitch_started = time.time()
+        solver = LocalScheduleSolver()
+        prepared = solver.prepare_scenes(scenes)
+        days = solver.stitch_blocks(prepared, block_days)
+        schedule = solver.build_schedule(prepared, days)
+        stitch_ms = round((time.time() - stitch_started) * 1000, 2)
+
+        strategies = [text for outcome in outcomes for text in outcome.get("scheduling_strategy", [])]
+        schedule["scheduling_strategy"] = " ".join(strategies) if strategies else (
+            f"{len(blocks)} location blocks scheduled independently and stitched for actor continuity"
+        )
+        for field in ("optimization_benefits", "potential_risks"):
+            merged = [item for outcome in outcomes for items in outcome.get(field, []) for item in items]
+            if merged:
+                schedule[field] = list(dict.fromkeys(merged))
+
+        result = {"optimized_schedule": schedule}
+        if not self.api_key:
+            result["error"] = "Gemini API key not provided. Set GEMINI_API_KEY environment variable."
+            result["is_mock"] = True
+        calls = sum(outcome["calls"] for outcome in outcomes)
+        result["generation_info"] = {
+            "generated_at": datetime.now().isoformat(),
+            "input_scenes": len(scenes),
+            "ai_model": f"{GEMINI_MODEL_NAME} (via {Config.GEMINI_TRANSPORT} transport)",
+            "mode": "hierarchical",
+            "blocks": [
+                {
+                    "block": name,
+                    "scenes": len(block),
+                    "source": outcome["source"],
+                    "elapsed_ms": outcome["elapsed_ms"],
+                    **({"local_parts": outcome["local_parts"]} if outcome["local_parts"] else {}),
+                    **({"fallback_reason": outcome["fallback_reason"]} if "fallback_reason" in outcome else {}),
+                }
+                for (name, block), outcome in zip(blocks, outcomes)
+            ],
+            "local_blocks": [name for (name, _), outcome in zip(blocks, outcomes) if outcome["source"] == "local"],
+            "block_workers": workers,
+            "blocks_wall_ms": blocks_ms,
+            "blocks_total_ms": round(sum(outcome["elapsed_ms"] for outcome in outcomes), 2),
+            "stitch_ms": stitch_ms,
+            "model_calls": calls,
+            "cache_hit": calls > 0 and all(outcome["cache_hits"] == outcome["calls"] for outcome in outcomes),
+            "cache_bypassed": not use_cache,
+        }
+        return result
@@ -0,0 +1,64 @@
+"""
+Conditional GET support for read endpoints
+Responses carry a strong ETag derived from the content hashes of the data
+files they are built from, so a poll with a matching If-None-Match gets a
+304 without the data file being read or parsed
+"""
+
+import hashlib
+from functools import wraps
+from typing import Optional
+from flask import make_response, request
+from utils.compression import etag_variants
+from utils.json_handler import json_handler
+
+
+def compute_etag(filenames, version: str = '') -> Optional[str]:
+    """
+    ETag for the current request: data file hashes plus the path, query string
+    and a version string for the route's response format
+
+    Returns:
+        Hex tag, or None if any source file is missing
+    """
+    digest = hashlib.sha256(f'{version}\0{request.path}\0{request.query_string.decode("latin-1")}'.encode('utf-8'))
+    for filename in filenames:
+        content_hash = json_handler.content_hash(filename)
+        if content_hash is None:
+            return None
+        digest.update(f'\0{filename}:{content_hash}'.encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def conditional(*filenames: str, version: str = ''):
+    """
+    Decorator for GET views whose response depends only on the given data files
+    and the request URL. Answers 304 Not Modified when If-None-Match matches and
+    tags 200 responses with the ETag otherwise.
+
+    Args:
+        filenames: Data files the response is derived from
+        version: Change when the view's response format changes
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = compute_etag(filenames, version)
+            # Clients hold the suffixed tag when the body they cached was compressed
+            matched = next((tag for tag in etag_variants(etag) if tag in request.if_none_match), None) \
+                if etag is not None else None
+            if matched is not None:
+                response = make_response('', 304)
+                response.set_etag(matched)
+                response.headers['Cache-Control'] = 'no-cache'
+                response.vary.add('Accept-Encoding')
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if etag is not None and response.status_code == 200:
+                response.set_etag(etag)
+                # Let browsers keep the body but revalidate on every poll
+                response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
@@ -1,16 +1,22 @@
+import hashlib
 import json
 import os
 import threading
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from config import Config
+from utils.change_feed import ChangeFeed, change_feed
 
 class JSONDataHandler:
     """Thread-safe JSON data handler for file operations"""
     
-    def __init__(self, data_dir: str = None):
+    def __init__(self, data_dir: str = None, feed: ChangeFeed = None):
         self.data_dir = data_dir or Config.DATA_DIR
+        self.change_feed = feed or change_feed
         self._locks = {}
         self._lock = threading.Lock()
+        self._hashes: Dict[str, Tuple[int, int, str]] = {}  # path -> (mtime_ns, size, sha256)
+        # Change feed files: path -> (mtime_ns, size, content) as last read or written here
+        self._snapshots: Dict[str, Tuple[int, int, bytes]] = {}
     
     def _get_lock(self, filename: str):
         """Get or create a lock for a specific file"""
@@ -23,46 +29,147 @@ class JSONDataHandler:
         """Get full path for a JSON file"""
         return os.path.join(self.data_dir, filename)
     
-    def read_json(self, filename: str, default: Any = None) -> Any:
-        """Read JSON data from file with thread safety"""
+    def _read_unlocked(self, filename: str, default: Any) -> Any:
+        """Read a file; the caller holds its lock"""
+        file_path = self._get_file_path(filename)
+        try:
+            if os.path.exists(file_path):
+                with open(file_path, 'rb') as f:
+                    content = f.read()
+                    stat = os.fstat(f.fileno())
+                if self.change_feed.tracks(filename):
+                    with self._lock:
+                        self._snapshots[file_path] = (stat.st_mtime_ns, stat.st_size, content)
+                return json.loads(content.decode('utf-8'))
+            return default
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Error reading {filename}: {e}")
+            return default
+    
+    def _previous_unlocked(self, filename: str) -> Any:
+        """
+        Content of a change feed file before a write, to diff against: parsed
+        from the last read or write here when the file has not changed since,
+        so only a file changed by another process is read again
+        """
+        file_path = self._get_file_path(filename)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        with self._lock:
+            snapshot = self._snapshots.get(file_path)
+        if snapshot and snapshot[0] == stat.st_mtime_ns and snapshot[1] == stat.st_size:
+            return json.loads(snapshot[2].decode('utf-8'))
+        return self._read_unlocked(filename, None)
+    
+    def _write_unlocked(self, filename: str, data: Any) -> bool:
+        """Write a file atomically; the caller holds its lock"""
+        file_path = self._get_file_path(filename)
+        tracked = self.change_feed.tracks(filename)
+        # Previous content of files in the change feed, to diff against
+        before = self._previous_unlocked(filename) if tracked else None
+        try:
+            # Write to temporary file first, then rename (atomic operation)
+            temp_path = file_path + '.tmp'
+            content = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+            with open(temp_path, 'wb') as f:
+                f.write(content)
+            
+            # Atomic rename
+            os.replace(temp_path, file_path)
+            self._remember_hash(file_path, hashlib.sha256(content).hexdigest(), content if tracked else None)
+            if tracked:
+                self.change_feed.record_write(filename, before, data)
+            return True
+        except (IOError, OSError) as e:
+            print(f"Error writing {filename}: {e}")
+            # Clean up temp file if it exists
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+    
+    def _remember_hash(self, file_path: str, digest: str, content: bytes = None) -> None:
+        """Record the hash (and for change feed files the content) just written so it is not re-read"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return
+        with self._lock:
+            self._hashes[file_path] = (stat.st_mtime_ns, stat.st_size, digest)
+            if content is not None:
+                self._snapshots[file_path] = (stat.st_mtime_ns, stat.st_size, content)
+    
+    def content_hash(self, filename: str) -> Optional[str]:
+        """
+        SHA-256 of a data file's content, known without reading the file when
+        it was last written through this handler or has not changed since
+        it was last hashed (same mtime and size)
+        
+        Returns:
+            Hex digest, or None if the file does not exist
+        """
         file_path = self._get_file_path(filename)
-        lock = self._get_lock(filename)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        
+        with self._lock:
+            cached = self._hashes.get(file_path)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
         
-        with lock:
+        with self._get_lock(filename):
             try:
-                if os.path.exists(file_path):
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        return json.load(f)
-                return default
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Error reading {filename}: {e}")
-                return default
+                with open(file_path, 'rb') as f:
+                    digest = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                return None
+        with self._lock:
+            self._hashes[file_path] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+    
+    def read_json(self, filename: str, default: Any = None) -> Any:
+        """Read JSON data from file with thread safety"""
+        with self._get_lock(filename):
+            return self._read_unlocked(filename, default)
     
     def write_json(self, filename: str, data: Any) -> bool:
         """Write JSON data to file with atomic operation"""
-        file_path = self._get_file_path(filename)
-        lock = self._get_lock(filename)
+        with self._get_lock(filename):
+            return self._write_unlocked(filename, data)
+    
+    def modify_json(self, filename: str, modify: Callable[[Any], Tuple[Any, bool]],
+                    default: Any = None) -> Tuple[Any, bool]:
+        """
+        Read, change and write a file while holding its lock, so a batch of
+        changes costs one read and one write and no other writer interleaves
         
-        with lock:
-            try:
-                # Write to temporary file first, then rename (atomic operation)
-                temp_path = file_path + '.tmp'
-                with open(temp_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2, ensure_ascii=False)
-                
-                # Atomic rename
-                os.replace(temp_path, file_path)
-                return True
-            except (IOError, OSError) as e:
-                print(f"Error writing {filename}: {e}")
-                # Clean up temp file if it exists
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-                return False
+        Args:
+            filename: JSON file in the data directory
+            modify: Called with the current data (changed in place); returns
+                (result, changed). Nothing is written when changed is False.
+            default: Data to start from when the file does not exist
+            
+        Returns:
+            (result from modify, whether the write succeeded or was not needed)
+        """
+        with self._get_lock(filename):
+            data = self._read_unlocked(filename, default)
+            # modify changes data in place; the read above kept the original content for the feed diff
+            result, changed = modify(data)
+            if not changed:
+                return result, True
+            return result, self._write_unlocked(filename, data)
     
     def get_next_id(self, filename: str) -> str:
         """Generate next available ID for a collection"""
-        data = self.read_json(filename, [])
+        return self.next_id_for(self.read_json(filename, []))
+    
+    @staticmethod
+    def next_id_for(data: Any) -> str:
+        """Next available ID for already-loaded collection data"""
         if not isinstance(data, list):
             return "1"
         
@@ -94,28 +201,30 @@ class JSONDataHandler:
     
     def update_by_id(self, filename: str, item_id: str, updates: Dict) -> bool:
         """Update item by ID in a JSON array"""
-        data = self.read_json(filename, [])
-        if not isinstance(data, list):
-            return False
+        def apply(data):
+            if not isinstance(data, list):
+                return False, False
+            for i, item in enumerate(data):
+                if isinstance(item, dict) and item.get('id') == item_id:
+                    data[i] = {**item, **updates}
+                    return True, True
+            return False, False
         
-        for i, item in enumerate(data):
-            if isinstance(item, dict) and item.get('id') == item_id:
-                data[i] = {**item, **updates}
-                return self.write_json(filename, data)
-        return False
+        updated, saved = self.modify_json(filename, apply, [])
+        return updated and saved
     
     def delete_by_id(self, filename: str, item_id: str) -> bool:
         """Delete item by ID from a JSON array"""
-        data = self.read_json(filename, [])
-        if not isinstance(data, list):
-            return False
-        
-        original_length = len(data)
-        data = [item for item in data if not (isinstance(item, dict) and item.get('id') == item_id)]
+        def apply(data):
+            if not isinstance(data, list):
+                return False, False
+            original_length = len(data)
+            data[:] = [item for item in data if not (isinstance(item, dict) and item.get('id') == item_id)]
+            deleted = len(data) < original_length
+            return deleted, deleted
         
-        if len(data) < original_length:
-            return self.write_json(filename, data)
-        return False
+        deleted, saved = self.modify_json(filename, apply, [])
+        return deleted and saved
     
     def append_item(self, filename: str, item: Dict) -> bool:
         """Append new item to a JSON array"""
@@ -0,0 +1,117 @@
+"""
+Incremental JSON Parsing for Streamed Model Output
+Scans a JSON document chunk by chunk and hands back each element of selected
+arrays (e.g. "days", "daily_schedules") as soon as that element is complete
+"""
+
+import json
+from typing import Any, Iterable, List, Optional, Tuple
+
+
+class IncrementalArrayParser:
+    """
+    Streaming scanner that yields completed elements of arrays stored under given keys
+
+    Only the first array found under one of the keys is followed. Text before
+    the first "{" (e.g. a ```json fence) is ignored. Each character is scanned
+    once, however the response is split into chunks.
+    """
+
+    def __init__(self, array_keys: Iterable[str]):
+        """
+        Args:
+            array_keys: Object keys whose array elements should be emitted
+        """
+        self.array_keys = set(array_keys)
+        self.text = ''
+        self.array_key: Optional[str] = None
+        self._pos = 0
+        self._started = False
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self._target_depth: Optional[int] = None
+        self._finished = False
+        self._element_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """
+        Add a chunk of model output
+
+        Returns:
+            (array key, parsed element) for every element completed by this chunk
+        """
+        self.text += chunk
+        completed = []
+        text = self.text
+        stack = self._stack
+
+        for i in range(self._pos, len(text)):
+            c = text[i]
+            if not self._started:
+                if c != '{':
+                    continue
+                self._started = True
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+                    self._last_string = text[self._string_start + 1:i]
+                continue
+
+            in_target = self._target_depth is not None and len(stack) == self._target_depth
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+                if in_target and self._element_start is None:
+                    self._element_start = i
+            elif c == ':':
+                if stack and stack[-1] == '{':
+                    self._pending_key = self._last_string
+            elif c in '{[':
+                if in_target and self._element_start is None:
+                    self._element_start = i
+                if (c == '[' and self._target_depth is None and not self._finished
+                        and self._pending_key in self.array_keys):
+                    self.array_key = self._pending_key
+                    self._target_depth = len(stack) + 1
+                stack.append(c)
+                self._pending_key = None
+            elif c in '}]':
+                if stack:
+                    stack.pop()
+                if self._target_depth is not None:
+                    if len(stack) == self._target_depth and self._element_start is not None:
+                        # A container element just closed
+                        self._emit(completed, self._element_start, i + 1)
+                    elif len(stack) == self._target_depth - 1:
+                        # The array itself closed; flush a trailing scalar element
+                        if self._element_start is not None:
+                            self._emit(completed, self._element_start, i)
+                        self._target_depth = None
+                        self._finished = True
+            elif c == ',':
+                if in_target and self._element_start is not None:
+                    self._emit(completed, self._element_start, i)
+                self._pending_key = None
+            elif not c.isspace():
+                if in_target and self._element_start is None:
+                    self._element_start = i
+
+        self._pos = len(text)
+        return completed
+
+    def _emit(self, completed: List[Tuple[str, Any]], start: int, end: int) -> None:
+        """Parse one element; malformed elements are skipped"""
+        self._element_start = None
+        try:
+            completed.append((self.array_key, json.loads(self.text[start:end])))
+        except json.JSONDecodeError:
+            pass
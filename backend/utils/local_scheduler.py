@@ -0,0 +1,723 @@
+"""
+Local Constraint-Based Shooting Schedule Solver
+Builds shooting days offline with a greedy construction followed by simulated
+annealing, so scheduling works without Gemini and gives the same answer for
+the same input and seed
+"""
+
+import math
+import random
+import re
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+import numpy as np
+from utils.schedule_model import ScheduleModel
+from utils.schedule_state import ScheduleState
+
+DEFAULT_WEIGHTS = {
+    'shooting_day': 1000,      # cost of each shooting day on the calendar
+    'actor_day': 300,          # each day an actor is on payroll (working or hold)
+    'company_move': 200,       # each location change within a shooting day
+    'location_change': 50,     # each change of location between consecutive days
+    'overtime_minute': 5,      # each minute past the standard day
+    'split_day': 100,          # day that mixes DAY and NIGHT work
+}
+
+TIME_PRIORITY = {'DAWN': 0, 'DAY': 1, 'MORNING': 1, 'AFTERNOON': 1, 'DUSK': 2, 'EVENING': 2, 'NIGHT': 3}
+
+
+class LocalScheduleSolver:
+    """Greedy + simulated annealing solver for stripboard-style shooting schedules"""
+
+    def __init__(self, max_day_minutes: int = 720, standard_day_minutes: int = 600,
+                 setup_minutes: int = 30, company_move_minutes: int = 60,
+                 day_start_minutes: int = 9 * 60, weights: Optional[Dict[str, float]] = None,
+                 seed: int = 42, max_iterations: Optional[int] = None,
+                 time_limit_seconds: Optional[float] = None, construction_starts: int = 16):
+        """
+        Args:
+            max_day_minutes: Hard limit on a shooting day (setup, shooting and company moves)
+            standard_day_minutes: Day length after which overtime accrues
+            setup_minutes: Lighting/camera setup before each scene
+            company_move_minutes: Travel time when the unit changes location within a day
+            day_start_minutes: First call time, in minutes after midnight
+            weights: Overrides for DEFAULT_WEIGHTS
+            seed: Random seed; the same seed and input always give the same schedule
+            max_iterations: Local search iterations (defaults scale with scene count)
+            time_limit_seconds: Optional wall-clock cap on the local search
+            construction_starts: Greedy chains to build and score before the local search
+        """
+        self.max_day_minutes = max_day_minutes
+        self.standard_day_minutes = min(standard_day_minutes, max_day_minutes)
+        self.setup_minutes = setup_minutes
+        self.company_move_minutes = company_move_minutes
+        self.day_start_minutes = day_start_minutes
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.seed = seed
+        self.max_iterations = max_iterations
+        self.time_limit_seconds = time_limit_seconds
+        self.construction_starts = max(1, construction_starts)
+        self._day_cache = {}
+
+    # ------------------------------------------------------------------
+    # Input normalisation
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _parse_duration(scene: Dict[str, Any]) -> int:
+        """Read scene duration in minutes from either schedule format"""
+        duration = scene.get('estimated_duration_minutes')
+        if duration is None:
+            duration = scene.get('estimated_duration', 60)
+        if isinstance(duration, str):
+            match = re.search(r'\d+', duration)
+            duration = int(match.group()) if match else 60
+        try:
+            return max(0, int(duration))
+        except (TypeError, ValueError):
+            return 60
+
+    def prepare_scenes(self, raw_scenes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Normalise shooting_schedule.json or production_schedule.json scenes for the solver"""
+        scenes = []
+        for index, scene in enumerate(raw_scenes):
+            actors = []
+            for actor in scene.get('actors', []):
+                name = (actor.get('name') or actor.get('actor_name')) if isinstance(actor, dict) else actor
+                if name and name not in actors:
+                    actors.append(name)
+            extras = [
+                extra.get('role', '') if isinstance(extra, dict) else extra
+                for extra in scene.get('extras', [])
+            ]
+            time_of_day = (scene.get('time_of_day') or 'DAY').upper()
+            duration = self._parse_duration(scene)
+            scenes.append({
+                'scene_number': scene.get('scene_number', index + 1),
+                'scene_title': scene.get('scene_title', 'Untitled Scene'),
+                'location': scene.get('location') or 'Unknown Location',
+                'time_of_day': time_of_day,
+                'time_priority': TIME_PRIORITY.get(time_of_day, 1),
+                'estimated_duration_minutes': duration,
+                'work_minutes': duration + self.setup_minutes,
+                'actors_needed': actors,
+                'extras_needed': extras,
+            })
+        return scenes
+
+    # ------------------------------------------------------------------
+    # Cost model
+    # ------------------------------------------------------------------
+
+    def day_minutes(self, scenes: List[Dict[str, Any]], day: List[int]) -> int:
+        """Total minutes of a day including setups and company moves"""
+        if not day:
+            return 0
+        locations = {scenes[i]['location'] for i in day}
+        return sum(scenes[i]['work_minutes'] for i in day) + self.company_move_minutes * (len(locations) - 1)
+
+    def fits_in_day(self, scenes: List[Dict[str, Any]], day: List[int]) -> bool:
+        """Check the hard day-length limit (a lone over-long scene is always allowed)"""
+        return len(day) <= 1 or self.day_minutes(scenes, day) <= self.max_day_minutes
+
+    def _day_summary(self, scenes: List[Dict[str, Any]], day: List[int]) -> Dict[str, Any]:
+        """Per-day cost inputs, memoized on the set of scenes in the day"""
+        key = frozenset(day)
+        summary = self._day_cache.get(key)
+        if summary is not None:
+            return summary
+
+        locations = set()
+        minutes = 0
+        has_day = has_night = False
+        actors = set()
+        for i in day:
+            scene = scenes[i]
+            locations.add(scene['location'])
+            minutes += scene['work_minutes']
+            if scene['time_priority'] <= 1:
+                has_day = True
+            elif scene['time_priority'] == 3:
+                has_night = True
+            actors.update(scene['actors_needed'])
+
+        moves = len(locations) - 1
+        minutes += self.company_move_minutes * moves
+        ordered = self.order_day(scenes, day)
+        summary = {
+            'moves': moves,
+            'overtime': max(0, minutes - self.standard_day_minutes),
+            'split': has_day and has_night,
+            'first_location': scenes[ordered[0]]['location'],
+            'last_location': scenes[ordered[-1]]['location'],
+            'actors': actors,
+        }
+
+        if len(self._day_cache) > 100000:
+            self._day_cache.clear()
+        self._day_cache[key] = summary
+        return summary
+
+    def evaluate(self, scenes: List[Dict[str, Any]], days: List[List[int]]) -> Dict[str, float]:
+        """
+        Score a schedule
+
+        Returns:
+            Breakdown with shooting_days, company_moves, location_changes, actor_days,
+            hold_days, overtime_minutes, split_days and the weighted total cost
+        """
+        shooting_days = 0
+        company_moves = 0
+        location_changes = 0
+        overtime_minutes = 0
+        split_days = 0
+        actor_first = {}
+        actor_last = {}
+        actor_work = 0
+        previous_location = None
+
+        for day in days:
+            if not day:
+                continue
+            summary = self._day_summary(scenes, day)
+            company_moves += summary['moves']
+            overtime_minutes += summary['overtime']
+            if summary['split']:
+                split_days += 1
+            if previous_location is not None and summary['first_location'] != previous_location:
+                location_changes += 1
+            previous_location = summary['last_location']
+
+            # Spans count shooting days only, so empty days in the list are skipped
+            for actor in summary['actors']:
+                actor_first.setdefault(actor, shooting_days)
+                actor_last[actor] = shooting_days
+            actor_work += len(summary['actors'])
+            shooting_days += 1
+
+        actor_days = sum(actor_last[actor] - actor_first[actor] + 1 for actor in actor_first)
+        hold_days = actor_days - actor_work
+
+        total = (
+            self.weights['shooting_day'] * shooting_days
+            + self.weights['company_move'] * company_moves
+            + self.weights['location_change'] * location_changes
+            + self.weights['actor_day'] * actor_days
+            + self.weights['overtime_minute'] * overtime_minutes
+            + self.weights['split_day'] * split_days
+        )
+
+        return {
+            'total_cost': total,
+            'shooting_days': shooting_days,
+            'company_moves': company_moves,
+            'location_changes': location_changes,
+            'actor_days': actor_days,
+            'hold_days': hold_days,
+            'overtime_minutes': overtime_minutes,
+            'split_days': split_days,
+        }
+
+    def order_day(self, scenes: List[Dict[str, Any]], day: List[int]) -> List[int]:
+        """Order a day's scenes: location blocks by earliest time of day, then DAY → DUSK → NIGHT"""
+        location_priority = {}
+        for i in day:
+            scene = scenes[i]
+            location_priority[scene['location']] = min(
+                location_priority.get(scene['location'], 99), scene['time_priority']
+            )
+        return sorted(day, key=lambda i: (
+            location_priority[scenes[i]['location']],
+            scenes[i]['location'],
+            scenes[i]['time_priority'],
+            str(scenes[i]['scene_number'])
+        ))
+
+    # ------------------------------------------------------------------
+    # Construction and local search
+    # ------------------------------------------------------------------
+
+    def build_model(self, scenes: List[Dict[str, Any]]) -> ScheduleModel:
+        """Vectorized cost model over prepared scenes, scoring the same way as evaluate"""
+        return ScheduleModel(scenes, self.weights, self.standard_day_minutes, self.company_move_minutes)
+
+    def _chain_locations(self, overlap: np.ndarray, start: int) -> List[int]:
+        """Nearest-neighbour chain over location groups so consecutive blocks share actors"""
+        remaining = np.ones(len(overlap), dtype=bool)
+        remaining[start] = False
+        chain = [start]
+        for _ in range(len(overlap) - 1):
+            scores = np.where(remaining, overlap[chain[-1]], -1.0)
+            # argmax takes the first maximum, i.e. the earliest group in the base order
+            best = int(np.argmax(scores))
+            remaining[best] = False
+            chain.append(best)
+        return chain
+
+    def pack_days(self, scenes: List[Dict[str, Any]], groups: List[List[int]]) -> List[List[int]]:
+        """Fill days group by group, starting a new day before overtime"""
+        days = []
+        current_day = []
+        for members in groups:
+            for i in members:
+                candidate = current_day + [i]
+                if current_day and self.day_minutes(scenes, candidate) > self.standard_day_minutes:
+                    days.append(current_day)
+                    current_day = [i]
+                else:
+                    current_day = candidate
+        if current_day:
+            days.append(current_day)
+        return days
+
+    def greedy_construct(self, scenes: List[Dict[str, Any]],
+                         model: Optional[ScheduleModel] = None) -> List[List[int]]:
+        """
+        Build an initial schedule: location blocks chained by shared cast,
+        packed into days without overtime
+
+        With a model, chains are started from up to construction_starts
+        different locations and the cheapest resulting schedule is kept.
+        """
+        location_groups = defaultdict(list)
+        for i, scene in enumerate(scenes):
+            location_groups[scene['location']].append(i)
+        if not location_groups:
+            return []
+
+        group_actors = {
+            location: {actor for i in members for actor in scenes[i]['actors_needed']}
+            for location, members in location_groups.items()
+        }
+        # Base order: most varied cast first, then by name
+        locations = sorted(location_groups, key=lambda loc: (-len(group_actors[loc]), loc))
+        groups = [
+            sorted(location_groups[location], key=lambda i: (
+                scenes[i]['time_priority'], str(scenes[i]['scene_number'])
+            ))
+            for location in locations
+        ]
+
+        # Jaccard overlap of group casts from a groups × actors incidence matrix
+        actor_ids = {actor: a for a, actor in enumerate(sorted(set().union(*group_actors.values())))}
+        incidence = np.zeros((len(locations), len(actor_ids)), dtype=np.int64)
+        for g, location in enumerate(locations):
+            incidence[g, [actor_ids[actor] for actor in group_actors[location]]] = 1
+        shared = incidence @ incidence.T
+        sizes = incidence.sum(axis=1)
+        union = sizes[:, None] + sizes[None, :] - shared
+        overlap = np.divide(shared, union, out=np.zeros(shared.shape), where=union > 0)
+
+        if model is None or len(locations) == 1:
+            starts = [0]
+        else:
+            count = min(self.construction_starts, len(locations))
+            starts = sorted({round(j * len(locations) / count) for j in range(count)})
+
+        candidates = [
+            self.pack_days(scenes, [groups[g] for g in self._chain_locations(overlap, start)])
+            for start in starts
+        ]
+        if len(candidates) == 1:
+            return candidates[0]
+
+        assignments = np.array([model.assignment_from_days(days) for days in candidates])
+        costs = model.evaluate_assignments(assignments)['total_cost']
+        # Ties keep the earliest start, so the base chain wins when nothing beats it
+        return candidates[int(np.argmin(costs))]
+
+    def stitch_blocks(self, scenes: List[Dict[str, Any]], blocks: List[List[List[int]]],
+                      max_passes: int = 3) -> List[List[int]]:
+        """
+        Join independently scheduled blocks into one calendar
+
+        Blocks are chained by cast overlap and each is kept in the orientation
+        whose first day shares most cast with the previous day. A day-order pass
+        then moves whole days while that lowers the cost (shorter actor spans,
+        fewer location changes). The days themselves are never changed.
+
+        Args:
+            scenes: Prepared scenes for the whole project
+            blocks: Per block, its day list of scene indexes in shooting order
+            max_passes: Day-order passes over the calendar
+
+        Returns:
+            Day list for the whole project
+        """
+        blocks = [[day for day in block if day] for block in blocks]
+        blocks = [block for block in blocks if block]
+        if not blocks:
+            return []
+
+        def cast(day):
+            return {actor for i in day for actor in scenes[i]['actors_needed']}
+
+        block_casts = [set().union(*(cast(day) for day in block)) for block in blocks]
+        # Largest cast first, as in greedy_construct, so the chain starts where continuity matters most
+        base = sorted(range(len(blocks)), key=lambda b: -len(block_casts[b]))
+        actor_ids = {actor: a for a, actor in enumerate(sorted(set().union(*block_casts)))}
+        incidence = np.zeros((len(blocks), len(actor_ids)), dtype=np.int64)
+        for g, b in enumerate(base):
+            incidence[g, [actor_ids[actor] for actor in block_casts[b]]] = 1
+        shared = incidence @ incidence.T
+        sizes = incidence.sum(axis=1)
+        union = sizes[:, None] + sizes[None, :] - shared
+        overlap = np.divide(shared, union, out=np.zeros(shared.shape), where=union > 0)
+
+        days: List[List[int]] = []
+        for g in self._chain_locations(overlap, 0):
+            block = blocks[base[g]]
+            if days and len(block) > 1:
+                previous = cast(days[-1])
+                if len(previous & cast(block[-1])) > len(previous & cast(block[0])):
+                    block = block[::-1]
+            days.extend(block)
+
+        return self.order_days(scenes, days, max_passes)
+
+    def order_days(self, scenes: List[Dict[str, Any]], days: List[List[int]],
+                   max_passes: int = 3) -> List[List[int]]:
+        """
+        Reorder whole days to shorten actor spans and cut location changes
+
+        Each day in turn is moved to the calendar position that lowers the cost
+        most. Day contents are fixed, so only actor_days and location_changes
+        can change; every target position is scored at once from a days × actors
+        incidence matrix.
+        """
+        days = [day for day in days if day]
+        count = len(days)
+        if count < 3:
+            return days
+
+        summaries = [self._day_summary(scenes, day) for day in days]
+        actor_ids = {actor: a for a, actor in enumerate(sorted({a for s in summaries for a in s['actors']}))}
+        location_ids = {loc: l for l, loc in enumerate(sorted({s[key] for s in summaries
+                                                               for key in ('first_location', 'last_location')}))}
+        cast = np.zeros((count, len(actor_ids)), dtype=bool)
+        for d, summary in enumerate(summaries):
+            cast[d, [actor_ids[actor] for actor in summary['actors']]] = True
+        first_location = np.array([location_ids[s['first_location']] for s in summaries])
+        last_location = np.array([location_ids[s['last_location']] for s in summaries])
+
+        targets = np.arange(count)
+        slots = np.arange(count - 1)[:, None]
+        none = count + 1
+        order = list(range(count))
+        for _ in range(max_passes):
+            improved = False
+            for d in range(count):
+                source = order.index(d)
+                others = np.array(order[:source] + order[source + 1:])
+
+                # Actor spans with day d removed, then with d inserted at every position
+                other_cast = cast[others]
+                first = np.where(other_cast, slots, none).min(axis=0)
+                last = np.where(other_cast, slots, -1).max(axis=0)
+                first = first + (first >= targets[:, None])
+                last = np.where(last >= 0, last + (last >= targets[:, None]), -1)
+                first = np.where(cast[d], np.minimum(first, targets[:, None]), first)
+                last = np.where(cast[d], np.maximum(last, targets[:, None]), last)
+                actor_days = np.where(last >= 0, last - first + 1, 0).sum(axis=1)
+
+                # Location changes: inserting at t breaks edge (t-1, t) and adds (t-1, d), (d, t)
+                edges = last_location[others[:-1]] != first_location[others[1:]]
+                changes = np.full(count, edges.sum())
+                changes[1:-1] -= edges
+                changes[1:] += last_location[others] != first_location[d]
+                changes[:-1] += last_location[d] != first_location[others]
+
+                cost = self.weights['actor_day'] * actor_days + self.weights['location_change'] * changes
+                target = int(np.argmin(cost))
+                if cost[target] < cost[source]:
+                    order = order[:source] + order[source + 1:]
+                    order.insert(target, d)
+                    improved = True
+            if not improved:
+                break
+        return [days[d] for d in order]
+
+    def _default_iterations(self, scene_count: int) -> int:
+        """Iteration budget that scales with problem size"""
+        return min(10000, 2000 + 20 * scene_count)
+
+    def build_state(self, scenes: List[Dict[str, Any]], days: List[List[int]]) -> ScheduleState:
+        """Incremental schedule state over prepared scenes, scoring the same way as evaluate"""
+        return ScheduleState(scenes, days, self.weights, self.standard_day_minutes,
+                             self.company_move_minutes, self.max_day_minutes)
+
+    def local_search(self, scenes: List[Dict[str, Any]], days: List[List[int]],
+                     rng: random.Random) -> Dict[str, Any]:
+        """Improve a schedule with simulated annealing over relocate, swap and day-shift moves"""
+        state = self.build_state(scenes, days)
+        # One spare empty day lets the search open a new day when that pays off
+        state.add_day()
+
+        current_cost = state.cost()
+        best_cost = current_cost
+        best = (list(state.scene_day), list(state.order))
+
+        iterations = self.max_iterations or self._default_iterations(len(scenes))
+        start_temperature = max(1.0, self.weights['company_move'])
+        end_temperature = 1.0
+        cooling = (end_temperature / start_temperature) ** (1.0 / max(1, iterations))
+        temperature = start_temperature
+        started = time.time()
+        accepted = 0
+        performed = 0
+        # Best cost over time, sampled about 50 times per run
+        trace = [[0, 0.0, best_cost]]
+        trace_every = max(1, iterations // 50)
+        trace_every_ms = self.time_limit_seconds * 1000 / 50 if self.time_limit_seconds else float('inf')
+
+        for _ in range(iterations):
+            if self.time_limit_seconds is not None:
+                elapsed = time.time() - started
+                if elapsed > self.time_limit_seconds:
+                    break
+                # Under a time limit, cool by elapsed time too so the run ends cold
+                time_progress = elapsed / self.time_limit_seconds if self.time_limit_seconds else 1.0
+                temperature = min(temperature, start_temperature * (end_temperature / start_temperature) ** time_progress)
+            performed += 1
+            temperature *= cooling
+            move = rng.random()
+
+            if move < 0.5 and len(scenes) > 0:
+                # Relocate one scene to another day
+                scene = rng.randrange(len(scenes))
+                source = state.scene_day[scene]
+                target = state.order[rng.randrange(len(state.order))]
+                if target == source:
+                    continue
+                delta = state.relocate(scene, target)
+                if not state.fits(target):
+                    state.relocate(scene, source)
+                    continue
+
+                def undo(scene=scene, source=source):
+                    state.relocate(scene, source)
+
+            elif move < 0.85 and len(scenes) > 1:
+                # Swap two scenes on different days
+                first = rng.randrange(len(scenes))
+                second = rng.randrange(len(scenes))
+                day_a, day_b = state.scene_day[first], state.scene_day[second]
+                if day_a == day_b:
+                    continue
+                delta = state.swap(first, second)
+                if not (state.fits(day_a) and state.fits(day_b)):
+                    state.swap(first, second)
+                    continue
+
+                def undo(first=first, second=second):
+                    state.swap(first, second)
+
+            else:
+                # Shift a whole day to another position on the calendar
+                if len(state.order) < 2:
+                    continue
+                source = rng.randrange(len(state.order))
+                target = rng.randrange(len(state.order))
+                if source == target:
+                    continue
+                delta = state.shift_day(source, target)
+
+                def undo(source=source, target=target):
+                    state.shift_day(target, source)
+
+            if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+                current_cost += delta
+                accepted += 1
+                if current_cost < best_cost:
+                    best_cost = current_cost
+                    best = (list(state.scene_day), list(state.order))
+                    elapsed_ms = round((time.time() - started) * 1000, 2)
+                    if performed - trace[-1][0] >= trace_every or elapsed_ms - trace[-1][1] >= trace_every_ms:
+                        trace.append([performed, elapsed_ms, best_cost])
+                # Keep exactly one spare empty day available
+                if not state.is_empty(state.order[-1]):
+                    state.add_day()
+            else:
+                undo()
+
+        if trace[-1][2] != best_cost:
+            trace.append([performed, round((time.time() - started) * 1000, 2), best_cost])
+        scene_day, order = best
+        best_days = {day_id: [] for day_id in order}
+        for scene, day_id in enumerate(scene_day):
+            best_days[day_id].append(scene)
+
+        return {
+            'days': [best_days[day_id] for day_id in order if best_days[day_id]],
+            'iterations': performed,
+            'accepted_moves': accepted,
+            'runtime_ms': round((time.time() - started) * 1000, 2),
+            'trace': trace,
+        }
+
+    def search(self, raw_scenes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run construction and local search without rendering the schedule
+
+        Returns:
+            Prepared scenes, the best day list (scene indexes) and solver_stats
+        """
+        started = time.time()
+        scenes = self.prepare_scenes(raw_scenes)
+        self._day_cache = {}
+        rng = random.Random(self.seed)
+
+        initial_days = self.greedy_construct(scenes, self.build_model(scenes))
+        initial_cost = self.evaluate(scenes, initial_days)
+        search = self.local_search(scenes, initial_days, rng)
+        final_cost = self.evaluate(scenes, search['days'])
+
+        return {
+            'scenes': scenes,
+            'days': search['days'],
+            'solver_stats': {
+                'engine': 'local_solver',
+                'seed': self.seed,
+                'iterations': search['iterations'],
+                'accepted_moves': search['accepted_moves'],
+                'search_runtime_ms': search['runtime_ms'],
+                'total_runtime_ms': round((time.time() - started) * 1000, 2),
+                'initial_cost': initial_cost,
+                'final_cost': final_cost,
+                'convergence': search['trace'],
+                'max_day_minutes': self.max_day_minutes,
+                'standard_day_minutes': self.standard_day_minutes,
+            }
+        }
+
+    def solve(self, raw_scenes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Build an optimized schedule for the given scenes
+
+        Args:
+            raw_scenes: Scenes in shooting_schedule.json or production_schedule.json format
+
+        Returns:
+            Schedule in the same structure as Gemini's optimized_schedule, plus solver_stats
+        """
+        result = self.search(raw_scenes)
+        schedule = self.build_schedule(result['scenes'], result['days'])
+        schedule['solver_stats'] = result['solver_stats']
+        return schedule
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _format_time(minutes: int) -> str:
+        """Format minutes after midnight as HH:MM (past midnight wraps)"""
+        minutes %= 24 * 60
+        return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+    def build_schedule(self, scenes: List[Dict[str, Any]], days: List[List[int]]) -> Dict[str, Any]:
+        """Render solver days in the optimized_schedule response format"""
+        daily_schedules = []
+        actor_days = defaultdict(list)
+        actor_scenes = defaultdict(list)
+        location_schedule = {}
+
+        for day_number, day in enumerate(days, 1):
+            current_time = self.day_start_minutes
+            previous_location = None
+            scene_schedules = []
+            location_minutes = defaultdict(int)
+            moves = 0
+
+            for i in self.order_day(scenes, day):
+                scene = scenes[i]
+                notes = f"Setup for {scene['location']} - {scene['time_of_day']} scene"
+                if previous_location is not None and scene['location'] != previous_location:
+                    current_time += self.company_move_minutes
+                    moves += 1
+                    notes = f"Company move from {previous_location}. {notes}"
+                call_time = current_time
+                current_time += scene['work_minutes']
+                previous_location = scene['location']
+                location_minutes[scene['location']] += scene['work_minutes']
+
+                scene_schedules.append({
+                    "scene_number": scene['scene_number'],
+                    "scene_title": scene['scene_title'],
+                    "location": scene['location'],
+                    "time_of_day": scene['time_of_day'],
+                    "estimated_duration_minutes": scene['estimated_duration_minutes'],
+                    "actors_needed": scene['actors_needed'],
+                    "extras_needed": scene['extras_needed'],
+                    "call_time": self._format_time(call_time),
+                    "estimated_wrap": self._format_time(current_time),
+                    "setup_notes": notes
+                })
+
+                for actor in scene['actors_needed']:
+                    if not actor_days[actor] or actor_days[actor][-1] != day_number:
+                        actor_days[actor].append(day_number)
+                    actor_scenes[actor].append(scene['scene_number'])
+
+                entry = location_schedule.setdefault(scene['location'], {
+                    "days_needed": [],
+                    "total_scenes": 0,
+                    "setup_requirements": f"Standard setup for {scene['location']}"
+                })
+                if day_number not in entry["days_needed"]:
+                    entry["days_needed"].append(day_number)
+                entry["total_scenes"] += 1
+
+            day_length = current_time - self.day_start_minutes
+            daily_schedules.append({
+                "day": day_number,
+                "date": "TBD",
+                "location_focus": max(location_minutes, key=lambda loc: (location_minutes[loc], loc)),
+                "scenes": scene_schedules,
+                "daily_summary": {
+                    "total_scenes": len(scene_schedules),
+                    "total_duration_minutes": sum(s['estimated_duration_minutes'] for s in scene_schedules),
+                    "total_day_minutes": day_length,
+                    "overtime_minutes": max(0, day_length - self.standard_day_minutes),
+                    "primary_actors": sorted({a for s in scene_schedules for a in s['actors_needed'] if a}),
+                    "location_changes": moves,
+                    "special_requirements": sorted({f"{s['time_of_day']} lighting setup" for s in scene_schedules})
+                }
+            })
+
+        actor_schedules = {}
+        for actor in sorted(actor_days):
+            worked = actor_days[actor]
+            span = worked[-1] - worked[0] + 1
+            actor_schedules[actor] = {
+                "total_working_days": len(worked),
+                "scenes": actor_scenes[actor],
+                "first_day": worked[0],
+                "last_day": worked[-1],
+                "hold_days": span - len(worked),
+                "schedule_notes": f"Works days {', '.join(map(str, worked))}"
+            }
+
+        return {
+            "scheduling_strategy": (
+                "Local constraint solver: greedy location blocks chained by shared cast, "
+                "refined with simulated annealing to minimize shooting days, company moves, "
+                "actor hold days and overtime within the maximum day length"
+            ),
+            "total_shooting_days": len(daily_schedules),
+            "daily_schedules": daily_schedules,
+            "actor_schedules": actor_schedules,
+            "location_schedule": location_schedule,
+            "optimization_benefits": [
+                "Grouped scenes by location to minimize company moves",
+                "Kept each actor's working days contiguous to minimize hold days",
+                f"Kept every shooting day within {self.max_day_minutes // 60} hours",
+                "Sorted scenes by time of day within each location"
+            ],
+            "potential_risks": [
+                "Weather dependency for outdoor scenes",
+                "Actor availability conflicts",
+                "Equipment scheduling conflicts"
+            ]
+        }
@@ -0,0 +1,298 @@
+"""
+Pub/sub and presence for realtime workers
+Each server process attaches its own websocket clients, so broadcasts and
+connection tracking go through a message bus: 'memory' serves a single
+process, 'sqlite' shares messages and presence between worker processes on
+one host through a SQLite file (the same approach as the sqlite rate limiter).
+Every worker delivers bus messages to its own sessions only, so a client is
+reached exactly once whichever worker it is attached to.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+from config import Config
+
+
+def default_worker_id() -> str:
+    return f'{os.getpid()}-{uuid.uuid4().hex[:8]}'
+
+
+class MessageBus:
+    """In-process bus: messages go to local handlers, presence is this worker's sessions"""
+
+    def __init__(self, worker_id: str = None):
+        self.worker_id = worker_id or default_worker_id()
+        self._handlers: Dict[str, List[Callable[[Any], None]]] = {}
+        self._session_users: Dict[str, str] = {}        # session_id -> user_id
+        self._session_rooms: Dict[str, Set[str]] = {}   # session_id -> rooms
+        self._room_members: Dict[str, Set[str]] = {}    # room -> session_ids
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+
+    # Pub/sub
+
+    def subscribe(self, channel: str, handler: Callable[[Any], None]) -> None:
+        """Call handler with every message published on channel by any worker"""
+        with self._lock:
+            self._handlers.setdefault(channel, []).append(handler)
+
+    def publish(self, channel: str, message: Any) -> None:
+        """Send a JSON-serializable message to every worker's handlers"""
+        with self._lock:
+            self.published += 1
+        self._dispatch(channel, message)
+
+    def _dispatch(self, channel: str, message: Any) -> None:
+        with self._lock:
+            handlers = list(self._handlers.get(channel, []))
+            self.delivered += 1
+        for handler in handlers:
+            try:
+                handler(message)
+            except Exception as e:
+                print(f"Message bus handler for {channel} failed: {e}")
+
+    def poll(self) -> int:
+        """Deliver messages from other workers; returns how many (none in memory)"""
+        return 0
+
+    def start(self, start_task: Callable[[Callable[[], None]], Any] = None,
+              sleep: Callable[[float], None] = None) -> None:
+        """Start background delivery from other workers (nothing to do in memory)"""
+
+    def close(self) -> None:
+        """Stop delivery and drop this worker's sessions"""
+        with self._lock:
+            sessions = list(self._session_users)
+        for session_id in sessions:
+            self.remove_session(session_id)
+
+    # Presence
+
+    def add_session(self, session_id: str, user_id: str, rooms: Iterable[str] = ()) -> None:
+        """Register a connected session of this worker and the rooms it joined"""
+        with self._lock:
+            self._session_users[session_id] = user_id
+            self._session_rooms.setdefault(session_id, set())
+        for room in rooms:
+            self.join(session_id, room)
+
+    def join(self, session_id: str, room: str) -> None:
+        with self._lock:
+            self._session_rooms.setdefault(session_id, set()).add(room)
+            self._room_members.setdefault(room, set()).add(session_id)
+
+    def leave(self, session_id: str, room: str) -> None:
+        with self._lock:
+            self._forget_unlocked(session_id, room)
+
+    def _forget_unlocked(self, session_id: str, room: str) -> None:
+        members = self._room_members.get(room)
+        if members is not None:
+            members.discard(session_id)
+            if not members:
+                del self._room_members[room]
+        rooms = self._session_rooms.get(session_id)
+        if rooms is not None:
+            rooms.discard(room)
+
+    def remove_session(self, session_id: str) -> Optional[str]:
+        """Forget a disconnected session; returns its user id"""
+        with self._lock:
+            for room in list(self._session_rooms.get(session_id, ())):
+                self._forget_unlocked(session_id, room)
+            self._session_rooms.pop(session_id, None)
+            return self._session_users.pop(session_id, None)
+
+    def session_user(self, session_id: str) -> Optional[str]:
+        with self._lock:
+            return self._session_users.get(session_id)
+
+    def local_session_ids(self, rooms: Optional[Iterable[str]] = None) -> Set[str]:
+        """This worker's sessions in any of the rooms, each once (all of them for None)"""
+        with self._lock:
+            if rooms is None:
+                return set(self._session_users)
+            sessions = set()
+            for room in rooms:
+                sessions |= self._room_members.get(room, set())
+            return sessions
+
+    def connected_users(self) -> Dict[str, Set[str]]:
+        """user_id -> session ids, across every live worker"""
+        with self._lock:
+            users: Dict[str, Set[str]] = {}
+            for session_id, user_id in self._session_users.items():
+                users.setdefault(user_id, set()).add(session_id)
+            return users
+
+    def is_user_connected(self, user_id: str) -> bool:
+        return user_id in self.connected_users()
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            local_sessions = len(self._session_users)
+            published, delivered = self.published, self.delivered
+        return {'backend': 'memory', 'workerId': self.worker_id, 'localSessions': local_sessions,
+                'connectedUsers': len(self.connected_users()), 'published': published, 'delivered': delivered}
+
+
+class SQLiteMessageBus(MessageBus):
+    """Bus shared by worker processes on one host through a SQLite file"""
+
+    def __init__(self, worker_id: str = None, db_path: str = None, poll_seconds: float = None,
+                 presence_ttl_seconds: float = None, retention_seconds: float = None):
+        super().__init__(worker_id)
+        self.db_path = db_path or Config.MESSAGE_BUS_DB
+        self.poll_seconds = poll_seconds if poll_seconds is not None else Config.MESSAGE_BUS_POLL_MS / 1000
+        self.presence_ttl_seconds = presence_ttl_seconds if presence_ttl_seconds is not None \
+            else Config.MESSAGE_BUS_PRESENCE_TTL_SECONDS
+        self.retention_seconds = retention_seconds if retention_seconds is not None \
+            else Config.MESSAGE_BUS_RETENTION_SECONDS
+        self._running = False
+        self._last_heartbeat = 0.0
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS bus_messages (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, channel TEXT NOT NULL, origin TEXT NOT NULL,
+                    payload TEXT NOT NULL, created_at REAL NOT NULL);
+                CREATE TABLE IF NOT EXISTS bus_workers (worker_id TEXT PRIMARY KEY, heartbeat REAL NOT NULL);
+                CREATE TABLE IF NOT EXISTS bus_sessions (
+                    session_id TEXT PRIMARY KEY, worker_id TEXT NOT NULL, user_id TEXT NOT NULL);
+                CREATE INDEX IF NOT EXISTS idx_bus_sessions_worker ON bus_sessions (worker_id);
+            ''')
+            # Only messages published from now on are for this worker
+            self._last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM bus_messages').fetchone()[0]
+        finally:
+            conn.close()
+        self._heartbeat()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection that waits briefly on other processes' write locks"""
+        return sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+
+    def _execute(self, sql: str, params=()) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(sql, params)
+        finally:
+            conn.close()
+
+    def publish(self, channel: str, message: Any) -> None:
+        """Store the message for other workers and deliver it here straight away"""
+        self._execute('INSERT INTO bus_messages (channel, origin, payload, created_at) VALUES (?, ?, ?, ?)',
+                      (channel, self.worker_id, json.dumps(message), time.time()))
+        super().publish(channel, message)
+
+    def poll(self) -> int:
+        """Deliver messages other workers published since the last poll"""
+        conn = self._connect()
+        try:
+            rows = conn.execute('SELECT id, channel, origin, payload FROM bus_messages WHERE id > ? ORDER BY id',
+                                (self._last_id,)).fetchall()
+        finally:
+            conn.close()
+        delivered = 0
+        for message_id, channel, origin, payload in rows:
+            self._last_id = message_id
+            if origin == self.worker_id:
+                continue
+            self._dispatch(channel, json.loads(payload))
+            delivered += 1
+        if time.time() - self._last_heartbeat >= self.presence_ttl_seconds / 3:
+            self._heartbeat()
+        return delivered
+
+    def _heartbeat(self) -> None:
+        """Mark this worker live and clear out dead workers and old messages"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('INSERT OR REPLACE INTO bus_workers (worker_id, heartbeat) VALUES (?, ?)',
+                         (self.worker_id, now))
+            # Sessions of a worker that stopped heartbeating (crashed or killed) are gone
+            conn.execute('DELETE FROM bus_sessions WHERE worker_id IN '
+                         '(SELECT worker_id FROM bus_workers WHERE heartbeat < ?)', (now - self.presence_ttl_seconds,))
+            conn.execute('DELETE FROM bus_workers WHERE heartbeat < ?', (now - self.presence_ttl_seconds,))
+            conn.execute('DELETE FROM bus_messages WHERE created_at < ?', (now - self.retention_seconds,))
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        self._last_heartbeat = now
+
+    def start(self, start_task: Callable[[Callable[[], None]], Any] = None,
+              sleep: Callable[[float], None] = None) -> None:
+        """Poll for other workers' messages in the background until close()"""
+        if self._running:
+            return
+        self._running = True
+        sleep = sleep or time.sleep
+
+        def run():
+            while self._running:
+                try:
+                    self.poll()
+                except sqlite3.Error as e:
+                    print(f"Message bus poll failed: {e}")
+                sleep(self.poll_seconds)
+
+        if start_task is None:
+            threading.Thread(target=run, daemon=True).start()
+        else:
+            start_task(run)
+
+    def close(self) -> None:
+        self._running = False
+        super().close()
+        self._execute('DELETE FROM bus_workers WHERE worker_id = ?', (self.worker_id,))
+
+    def add_session(self, session_id: str, user_id: str, rooms: Iterable[str] = ()) -> None:
+        super().add_session(session_id, user_id, rooms)
+        self._execute('INSERT OR REPLACE INTO bus_sessions (session_id, worker_id, user_id) VALUES (?, ?, ?)',
+                      (session_id, self.worker_id, user_id))
+
+    def remove_session(self, session_id: str) -> Optional[str]:
+        user_id = super().remove_session(session_id)
+        self._execute('DELETE FROM bus_sessions WHERE session_id = ?', (session_id,))
+        return user_id
+
+    def connected_users(self) -> Dict[str, Set[str]]:
+        """user_id -> session ids on workers that have heartbeated within the TTL"""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                'SELECT s.user_id, s.session_id FROM bus_sessions s JOIN bus_workers w ON s.worker_id = w.worker_id '
+                'WHERE w.heartbeat >= ?', (time.time() - self.presence_ttl_seconds,)
+            ).fetchall()
+        finally:
+            conn.close()
+        users: Dict[str, Set[str]] = {}
+        for user_id, session_id in rows:
+            users.setdefault(user_id, set()).add(session_id)
+        return users
+
+    def get_status(self) -> Dict[str, Any]:
+        status = super().get_status()
+        status['backend'] = 'sqlite'
+        return status
+
+
+def get_message_bus(backend: str = None, **kwargs) -> MessageBus:
+    """Create the bus for this worker process"""
+    backend = backend or Config.MESSAGE_BUS_BACKEND
+    if backend == 'sqlite':
+        return SQLiteMessageBus(**kwargs)
+    return MessageBus(**kwargs)
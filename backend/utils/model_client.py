@@ -0,0 +1,232 @@
+"""
+Shared Gemini Model Clients
+Process-wide registry of model clients, created lazily on first use, over a
+pluggable transport: the google-generativeai SDK or pooled keep-alive HTTP
+sessions against the REST API (which a local fake server can stand in for)
+"""
+
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from dotenv import load_dotenv
+from config import Config
+
+# Load environment variables
+load_dotenv()
+
+DEFAULT_MODEL_NAME = "gemini-2.5-flash-lite"
+
+
+class ModelResponseError(Exception):
+    """The model returned no usable candidate (e.g. the prompt was blocked)"""
+
+
+class ModelTransport:
+    """How prompts reach the model; one transport is shared by all clients for an API key"""
+
+    def generate(self, model_name: str, prompt: str,
+                 generation_config: Optional[Dict[str, Any]] = None) -> str:
+        """Full response text"""
+        raise NotImplementedError
+
+    def stream(self, model_name: str, prompt: str,
+               generation_config: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Response text chunk by chunk"""
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release pooled connections"""
+
+
+class SDKTransport(ModelTransport):
+    """google-generativeai SDK, with one GenerativeModel per model name"""
+
+    def __init__(self, api_key: str):
+        # Imported here: the SDK is slow to import and only needed once a call is made
+        import google.generativeai as genai
+        # Note: the SDK configures one key per process
+        genai.configure(api_key=api_key)
+        self._genai = genai
+        self._models: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _model(self, model_name: str):
+        with self._lock:
+            model = self._models.get(model_name)
+            if model is None:
+                model = self._models[model_name] = self._genai.GenerativeModel(model_name)
+            return model
+
+    def generate(self, model_name: str, prompt: str,
+                 generation_config: Optional[Dict[str, Any]] = None) -> str:
+        response = self._model(model_name).generate_content(prompt, generation_config=generation_config)
+        if not response.candidates:
+            raise ModelResponseError(f"No candidates returned: {response.prompt_feedback}")
+        return response.text
+
+    def stream(self, model_name: str, prompt: str,
+               generation_config: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        chunks = self._model(model_name).generate_content(prompt, generation_config=generation_config, stream=True)
+        for chunk in chunks:
+            if chunk.candidates and chunk.text:
+                yield chunk.text
+
+
+class HTTPTransport(ModelTransport):
+    """Gemini REST API over one keep-alive requests.Session with a bounded connection pool"""
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None, pool_size: Optional[int] = None,
+                 timeout_seconds: Optional[float] = None):
+        """
+        Args:
+            api_key: Sent as the x-goog-api-key header
+            base_url: API root (GEMINI_API_BASE_URL); point at a local server in tests
+            pool_size: Connections kept open per host (GEMINI_HTTP_POOL_SIZE)
+            timeout_seconds: Per-request timeout (GEMINI_HTTP_TIMEOUT_SECONDS)
+        """
+        # Imported here: only the HTTP transport needs requests, so startup skips it
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.base_url = (base_url or Config.GEMINI_API_BASE_URL).rstrip('/')
+        self.timeout_seconds = timeout_seconds or Config.GEMINI_HTTP_TIMEOUT_SECONDS
+        pool_size = pool_size or Config.GEMINI_HTTP_POOL_SIZE
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'x-goog-api-key': api_key, 'Content-Type': 'application/json'})
+
+    @staticmethod
+    def _request_body(prompt: str, generation_config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        body = {'contents': [{'role': 'user', 'parts': [{'text': prompt}]}]}
+        if generation_config:
+            # REST field names are lowerCamelCase (max_output_tokens -> maxOutputTokens)
+            body['generationConfig'] = {
+                key.split('_')[0] + ''.join(word.title() for word in key.split('_')[1:]): value
+                for key, value in generation_config.items()
+            }
+        return body
+
+    @staticmethod
+    def _candidate_text(payload: Dict[str, Any]) -> str:
+        candidates = payload.get('candidates') or []
+        if not candidates:
+            raise ModelResponseError(f"No candidates returned: {payload.get('promptFeedback')}")
+        parts = (candidates[0].get('content') or {}).get('parts') or []
+        return ''.join(part.get('text', '') for part in parts)
+
+    def generate(self, model_name: str, prompt: str,
+                 generation_config: Optional[Dict[str, Any]] = None) -> str:
+        response = self.session.post(
+            f"{self.base_url}/models/{model_name}:generateContent",
+            json=self._request_body(prompt, generation_config),
+            timeout=self.timeout_seconds,
+        )
+        response.raise_for_status()
+        return self._candidate_text(response.json())
+
+    def stream(self, model_name: str, prompt: str,
+               generation_config: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        with self.session.post(
+            f"{self.base_url}/models/{model_name}:streamGenerateContent",
+            params={'alt': 'sse'},
+            json=self._request_body(prompt, generation_config),
+            timeout=self.timeout_seconds,
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                payload = json.loads(line[len('data:'):].strip())
+                if payload.get('candidates'):
+                    text = self._candidate_text(payload)
+                    if text:
+                        yield text
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def default_transport_factory(api_key: str) -> ModelTransport:
+    """Transport selected by GEMINI_TRANSPORT ('sdk' or 'http')"""
+    if Config.GEMINI_TRANSPORT == 'http':
+        return HTTPTransport(api_key)
+    return SDKTransport(api_key)
+
+
+class ModelClient:
+    """One model on a shared transport"""
+
+    def __init__(self, transport: ModelTransport, model_name: str = DEFAULT_MODEL_NAME):
+        self.transport = transport
+        self.model_name = model_name
+
+    def generate(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        """Full response text; raises ModelResponseError or transport errors"""
+        return self.transport.generate(self.model_name, prompt, generation_config)
+
+    def stream(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Response text chunk by chunk"""
+        return self.transport.stream(self.model_name, prompt, generation_config)
+
+
+class ModelClientRegistry:
+    """Lazily created, process-wide model clients keyed by model name and API key"""
+
+    def __init__(self, transport_factory: Optional[Callable[[str], ModelTransport]] = None):
+        self._transport_factory = transport_factory or default_transport_factory
+        self._transports: Dict[str, ModelTransport] = {}
+        self._clients: Dict[Tuple[str, str], ModelClient] = {}
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str = DEFAULT_MODEL_NAME, api_key: Optional[str] = None) -> ModelClient:
+        """
+        Shared client for a model, creating it (and its transport) on first use
+
+        Raises:
+            ValueError: No API key given and GEMINI_API_KEY is not set
+        """
+        api_key = api_key or os.environ.get('GEMINI_API_KEY')
+        if not api_key:
+            raise ValueError("Gemini API key not provided. Set GEMINI_API_KEY environment variable.")
+
+        with self._lock:
+            client = self._clients.get((model_name, api_key))
+            if client is None:
+                transport = self._transports.get(api_key)
+                if transport is None:
+                    transport = self._transports[api_key] = self._transport_factory(api_key)
+                client = self._clients[(model_name, api_key)] = ModelClient(transport, model_name)
+            return client
+
+    def set_transport_factory(self, transport_factory: Optional[Callable[[str], ModelTransport]]) -> None:
+        """Swap the transport (None restores the default); existing clients are dropped"""
+        self.reset()
+        with self._lock:
+            self._transport_factory = transport_factory or default_transport_factory
+
+    def reset(self) -> None:
+        """Close every transport and forget all clients"""
+        with self._lock:
+            transports = list(self._transports.values())
+            self._transports.clear()
+            self._clients.clear()
+        for transport in transports:
+            transport.close()
+
+    def get_status(self) -> Dict[str, int]:
+        """Number of live clients and transports"""
+        with self._lock:
+            return {'clients': len(self._clients), 'transports': len(self._transports)}
+
+
+# Global registry shared by the scheduler and the script analysis routes
+model_clients = ModelClientRegistry()
+
+
+def get_model_client(model_name: str = DEFAULT_MODEL_NAME, api_key: Optional[str] = None) -> ModelClient:
+    """Shared client for a model from the global registry"""
+    return model_clients.get(model_name, api_key)
@@ -0,0 +1,138 @@
+"""
+Parallel Multi-Start Schedule Search
+Runs independent LocalScheduleSolver searches with different seeds (and,
+when budgeted, different time budgets) on a process pool, keeps the best
+schedule and reports how the runs converged
+"""
+
+import os
+import statistics
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+from config import Config
+from utils.local_scheduler import LocalScheduleSolver
+
+# Iteration cap for time-budgeted runs; the budget ends them first
+BUDGETED_MAX_ITERATIONS = 10 ** 9
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_search_pool() -> ProcessPoolExecutor:
+    """Process pool shared by all searches, sized by SCHEDULE_SEARCH_MAX_WORKERS"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=Config.SCHEDULE_SEARCH_MAX_WORKERS)
+        return _pool
+
+
+def _run_search(raw_scenes: List[Dict[str, Any]], seed: int,
+                solver_options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one seeded search (executed in a worker process)"""
+    result = LocalScheduleSolver(seed=seed, **solver_options).search(raw_scenes)
+    return {'days': result['days'], 'solver_stats': result['solver_stats'], 'worker_pid': os.getpid()}
+
+
+class MultiStartSearch:
+    """Launch K seeded solver runs in parallel and keep the cheapest schedule"""
+
+    def __init__(self, workers: int = 4, time_budget_ms: Optional[int] = None,
+                 base_seed: int = 42, **solver_options):
+        """
+        Args:
+            workers: Number of independent searches (run concurrently up to the pool size)
+            time_budget_ms: Budget of the longest run; run k of K gets (k + 1) / K
+                of it, so short and long searches are compared. Without it runs
+                use the solver's default iteration count
+            base_seed: Run k uses seed base_seed + k
+            solver_options: Extra LocalScheduleSolver arguments
+        """
+        self.workers = max(1, workers)
+        self.time_budget_ms = time_budget_ms
+        self.base_seed = base_seed
+        self.solver_options = dict(solver_options)
+        if time_budget_ms is not None:
+            self.solver_options.setdefault('max_iterations', BUDGETED_MAX_ITERATIONS)
+
+    def run_budgets_ms(self) -> List[Optional[int]]:
+        """Time budget of each run (None for iteration-capped runs)"""
+        if self.time_budget_ms is None:
+            return [None] * self.workers
+        return [max(1, round(self.time_budget_ms * (k + 1) / self.workers)) for k in range(self.workers)]
+
+    def _run_options(self, budget_ms: Optional[int]) -> Dict[str, Any]:
+        if budget_ms is None:
+            return self.solver_options
+        return {**self.solver_options, 'time_limit_seconds': budget_ms / 1000}
+
+    def run(self, raw_scenes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Search and render the best schedule
+
+        Returns:
+            schedule: Best schedule in LocalScheduleSolver.solve format
+            ordering: Input scene indexes in shooting order (days in order, order_day within each)
+            search_stats: Convergence statistics across runs
+        """
+        started = time.time()
+        seeds = [self.base_seed + k for k in range(self.workers)]
+        budgets = self.run_budgets_ms()
+
+        if self.workers == 1:
+            runs = [_run_search(raw_scenes, seeds[0], self._run_options(budgets[0]))]
+        else:
+            pool = get_search_pool()
+            futures = [pool.submit(_run_search, raw_scenes, seed, self._run_options(budget))
+                       for seed, budget in zip(seeds, budgets)]
+            runs = [future.result() for future in futures]
+        for run, budget in zip(runs, budgets):
+            run['time_budget_ms'] = budget
+
+        # Lowest cost wins; ties go to the lowest seed so results are reproducible
+        best = min(runs, key=lambda run: (run['solver_stats']['final_cost']['total_cost'],
+                                          run['solver_stats']['seed']))
+        solver = LocalScheduleSolver(seed=best['solver_stats']['seed'], **self.solver_options)
+        scenes = solver.prepare_scenes(raw_scenes)
+        schedule = solver.build_schedule(scenes, best['days'])
+        schedule['solver_stats'] = best['solver_stats']
+
+        return {
+            'schedule': schedule,
+            'ordering': [i for day in best['days'] for i in solver.order_day(scenes, day)],
+            'search_stats': self._summarize(runs, best, time.time() - started),
+        }
+
+    def _summarize(self, runs: List[Dict[str, Any]], best: Dict[str, Any], elapsed: float) -> Dict[str, Any]:
+        """Convergence statistics across runs"""
+        finals = [run['solver_stats']['final_cost']['total_cost'] for run in runs]
+        best_cost = best['solver_stats']['final_cost']['total_cost']
+        initial_cost = best['solver_stats']['initial_cost']['total_cost']
+
+        return {
+            'runs': len(runs),
+            'processes': len({run['worker_pid'] for run in runs}),
+            'time_budget_ms': self.time_budget_ms,
+            'wall_time_ms': round(elapsed * 1000, 2),
+            'best_seed': best['solver_stats']['seed'],
+            'best_cost': best_cost,
+            'worst_cost': max(finals),
+            'mean_cost': round(statistics.mean(finals), 2),
+            'cost_stdev': round(statistics.pstdev(finals), 2),
+            'runs_at_best': finals.count(best_cost),
+            'improvement_over_initial': round(1 - best_cost / initial_cost, 4) if initial_cost else 0.0,
+            'per_run': [
+                {
+                    'seed': run['solver_stats']['seed'],
+                    'time_budget_ms': run['time_budget_ms'],
+                    'final_cost': run['solver_stats']['final_cost']['total_cost'],
+                    'iterations': run['solver_stats']['iterations'],
+                    'search_runtime_ms': run['solver_stats']['search_runtime_ms'],
+                    'convergence': run['solver_stats']['convergence'],
+                }
+                for run in runs
+            ],
+        }
@@ -4,7 +4,6 @@ Extracts text content from PDF files for script processing
 """
 
 import io
-import PyPDF2
 from typing import Optional
 
 class PDFExtractor:
@@ -28,7 +27,8 @@ class PDFExtractor:
             if isinstance(pdf_file, bytes):
                 pdf_file = io.BytesIO(pdf_file)
             
-            # Create PDF reader
+            # Create PDF reader (PyPDF2 is imported on first use to keep startup fast)
+            import PyPDF2
             pdf_reader = PyPDF2.PdfReader(pdf_file)
             
             # Extract text from all pages
@@ -124,6 +124,7 @@ class PDFExtractor:
                 pdf_file = io.BytesIO(pdf_file)
             
             # Try to create a PDF reader
+            import PyPDF2
             PyPDF2.PdfReader(pdf_file)
             return True
             
@@ -0,0 +1,235 @@
+"""
+Compact Prompt Builder for Gemini Scheduling
+Encodes scenes as dictionary-coded table rows, estimates prompt and response
+token counts, and splits large projects into location-clustered sub-prompts
+whose compact day lists are merged back into one schedule
+"""
+
+import math
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+from utils.local_scheduler import LocalScheduleSolver
+
+# Rough average for English text and JSON with the Gemini tokenizer
+CHARS_PER_TOKEN = 4
+
+# Response size model for the compact output format
+RESPONSE_BASE_TOKENS = 400
+RESPONSE_TOKENS_PER_SCENE = 6
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a prompt or response"""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _cell(value: Any) -> str:
+    """Table cell text without the column separator or line breaks"""
+    return str(value).replace('|', '/').replace('\n', ' ').strip()
+
+
+def _actor_names(scene: Dict[str, Any]) -> List[str]:
+    names = []
+    for actor in scene.get('actors', []):
+        name = (actor.get('name') or actor.get('actor_name')) if isinstance(actor, dict) else actor
+        if name:
+            names.append(name)
+    return names
+
+
+def _extra_names(scene: Dict[str, Any]) -> List[str]:
+    return [
+        extra.get('role', '') if isinstance(extra, dict) else str(extra)
+        for extra in scene.get('extras', [])
+    ]
+
+
+class SchedulingPromptBuilder:
+    """Builds compact scheduling prompts within a token budget"""
+
+    def __init__(self, max_prompt_tokens: int = 8000, max_output_tokens: int = 4096):
+        """
+        Args:
+            max_prompt_tokens: Estimated prompt size above which scenes are split into parts
+            max_output_tokens: Model output limit the compact response must fit in
+        """
+        self.max_prompt_tokens = max_prompt_tokens
+        self.max_output_tokens = max_output_tokens
+
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+
+    def encode_scenes(self, scenes: List[Dict[str, Any]]) -> str:
+        """One row per scene with locations and actors replaced by short ids"""
+        location_ids: Dict[str, str] = {}
+        actor_ids: Dict[str, str] = {}
+        rows = []
+
+        for scene in scenes:
+            location = scene.get('location') or 'Unknown Location'
+            if location not in location_ids:
+                location_ids[location] = f"L{len(location_ids) + 1}"
+            scene_actors = []
+            for name in _actor_names(scene):
+                if name not in actor_ids:
+                    actor_ids[name] = f"A{len(actor_ids) + 1}"
+                scene_actors.append(actor_ids[name])
+            duration = scene.get('estimated_duration_minutes', scene.get('estimated_duration', ''))
+            rows.append('|'.join([
+                _cell(scene.get('scene_number', '')),
+                _cell(scene.get('scene_title', '')),
+                location_ids[location],
+                _cell(scene.get('time_of_day', '')),
+                _cell(duration),
+                ' '.join(scene_actors),
+                ', '.join(_cell(extra) for extra in _extra_names(scene) if extra),
+            ]))
+
+        lines = ['LOCATIONS (id|name)']
+        lines += [f"{location_id}|{_cell(name)}" for name, location_id in location_ids.items()]
+        lines += ['', 'ACTORS (id|name)']
+        lines += [f"{actor_id}|{_cell(name)}" for name, actor_id in actor_ids.items()]
+        lines += ['', 'SCENES (scene|title|location|time|minutes|actors|extras)']
+        lines += rows
+        return '\n'.join(lines)
+
+    def project_notes(self, scenes: List[Dict[str, Any]]) -> List[str]:
+        """Scheduling hints derived from the scenes themselves"""
+        notes = []
+        actor_scenes = Counter(name for scene in scenes for name in set(_actor_names(scene)))
+        recurring = [(name, count) for name, count in actor_scenes.most_common(5) if count > 1]
+        if recurring:
+            notes.append('Recurring actors (minimize their working days): '
+                         + ', '.join(f"{name} ({count} scenes)" for name, count in recurring))
+
+        location_scenes = Counter(scene.get('location') or 'Unknown Location' for scene in scenes)
+        shared = [(name, count) for name, count in location_scenes.most_common(5) if count > 1]
+        if shared:
+            notes.append('Locations with several scenes: '
+                         + ', '.join(f"{name} ({count})" for name, count in shared))
+
+        night_scenes = sum(1 for scene in scenes if (scene.get('time_of_day') or '').upper() == 'NIGHT')
+        if night_scenes:
+            notes.append(f"{night_scenes} NIGHT scene(s): avoid mixing with DAY work on the same day")
+        return notes
+
+    def build_prompt(self, scenes: List[Dict[str, Any]], project_title: str = 'Film Project',
+                     part: Optional[int] = None, parts: Optional[int] = None) -> str:
+        """Compact scheduling prompt asking for scene numbers per day"""
+        scope = f" (part {part} of {parts}, scheduled independently)" if parts and parts > 1 else ''
+        notes = self.project_notes(scenes)
+        notes_block = '\n'.join(f"- {note}" for note in notes) if notes else '- None'
+
+        return f"""You are an expert film production scheduler. Schedule "{_cell(project_title)}"{scope}: {len(scenes)} scenes.
+
+{self.encode_scenes(scenes)}
+
+RULES: group scenes by location; keep each actor's working days few and contiguous; within a location shoot DAY, then DUSK, then NIGHT; keep days balanced to limit overtime; group weather-dependent exterior scenes.
+NOTES:
+{notes_block}
+
+Return only JSON, listing every scene number exactly once:
+{{"scheduling_strategy": "one sentence", "days": [[scene numbers for day 1], [day 2], ...], "optimization_benefits": ["..."], "potential_risks": ["..."]}}
+"""
+
+    # ------------------------------------------------------------------
+    # Budgeting
+    # ------------------------------------------------------------------
+
+    def estimate_output_tokens(self, scene_count: int) -> int:
+        """Estimated size of the compact response for scene_count scenes"""
+        return RESPONSE_BASE_TOKENS + RESPONSE_TOKENS_PER_SCENE * scene_count
+
+    def fits(self, scenes: List[Dict[str, Any]], project_title: str = 'Film Project') -> bool:
+        """Whether one prompt for these scenes stays within both token budgets"""
+        return (estimate_tokens(self.build_prompt(scenes, project_title)) <= self.max_prompt_tokens
+                and self.estimate_output_tokens(len(scenes)) <= self.max_output_tokens)
+
+    def chunk_scenes(self, scenes: List[Dict[str, Any]],
+                     project_title: str = 'Film Project') -> List[List[Dict[str, Any]]]:
+        """
+        Split scenes into parts that each fit the budgets
+
+        Whole locations are kept together and parts are filled in location-name
+        order, so related sets ("Radio Station ...") tend to share a part. A
+        single location too large for one part is split by scene order.
+        """
+        if not scenes or self.fits(scenes, project_title):
+            return [scenes]
+
+        # Per-scene prompt cost, measured on the encoded rows
+        row_tokens = estimate_tokens(self.encode_scenes(scenes)) / len(scenes)
+        base_tokens = estimate_tokens(self.build_prompt([], project_title))
+        by_prompt = (self.max_prompt_tokens - base_tokens) / max(row_tokens, 1)
+        by_output = (self.max_output_tokens - RESPONSE_BASE_TOKENS) / RESPONSE_TOKENS_PER_SCENE
+        capacity = max(1, int(min(by_prompt, by_output)))
+
+        groups = defaultdict(list)
+        for scene in scenes:
+            groups[scene.get('location') or 'Unknown Location'].append(scene)
+
+        parts: List[List[Dict[str, Any]]] = []
+        current: List[Dict[str, Any]] = []
+        for location in sorted(groups):
+            group = groups[location]
+            if current and len(current) + len(group) > capacity:
+                parts.append(current)
+                current = []
+            while len(group) > capacity:
+                parts.append(group[:capacity])
+                group = group[capacity:]
+            current.extend(group)
+        if current:
+            parts.append(current)
+        return parts
+
+    # ------------------------------------------------------------------
+    # Results
+    # ------------------------------------------------------------------
+
+    def merge_results(self, scenes: List[Dict[str, Any]],
+                      results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Expand compact responses into one optimized_schedule
+
+        Days from each part are appended in part order. Scenes a response left
+        out (or unknown scene numbers) are packed into extra days by the local
+        solver, so every scene is scheduled exactly once.
+        """
+        solver = LocalScheduleSolver()
+        prepared = solver.prepare_scenes(scenes)
+        index_by_number = {}
+        for index, scene in enumerate(prepared):
+            index_by_number.setdefault(str(scene['scene_number']), index)
+
+        days: List[List[int]] = []
+        placed = set()
+        for result in results:
+            for day in result.get('days') or []:
+                indexes = []
+                for number in day if isinstance(day, list) else []:
+                    index = index_by_number.get(str(number))
+                    if index is not None and index not in placed:
+                        placed.add(index)
+                        indexes.append(index)
+                if indexes:
+                    days.append(indexes)
+
+        missing = [index for index in range(len(prepared)) if index not in placed]
+        if missing:
+            location_groups = defaultdict(list)
+            for index in missing:
+                location_groups[prepared[index]['location']].append(index)
+            days.extend(solver.pack_days(prepared, [location_groups[loc] for loc in sorted(location_groups)]))
+
+        schedule = solver.build_schedule(prepared, days)
+        strategies = [result.get('scheduling_strategy') for result in results if result.get('scheduling_strategy')]
+        if strategies:
+            schedule['scheduling_strategy'] = ' '.join(strategies)
+        for field in ('optimization_benefits', 'potential_risks'):
+            merged = [item for result in results for item in result.get(field) or []]
+            if merged:
+                schedule[field] = list(dict.fromkeys(merged))
+        schedule['unscheduled_by_model'] = [prepared[index]['scene_number'] for index in missing]
+        return schedule
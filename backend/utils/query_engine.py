@@ -0,0 +1,469 @@
+"""
+Query engine shared by the list endpoints
+A Collection declares where its items live and which fields are indexed.
+Each version of the data file is loaded once into a CollectionIndex that
+answers filtered, sorted, projected and cursor-paginated queries, using the
+declared indexes where it can and scanning only the remaining candidates.
+
+Filter values use a small expression language:
+    field=a          equal
+    field=a,b        in
+    field=lo..hi     inclusive range (either end may be left out)
+    field=~text      contains (case-insensitive; any element for lists)
+
+Parameters that are neither reserved nor fields of the collection are
+ignored (e.g. a cache buster like _=1700000000), so only malformed values of
+known parameters are rejected.
+"""
+
+import base64
+import binascii
+import json
+import os
+import threading
+from bisect import bisect_left, bisect_right
+from functools import total_ordering
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from utils.derived_cache import derived_cache
+from utils.json_handler import json_handler
+from utils.validators import ValidationError
+
+# Query parameters that are not filters
+RESERVED_PARAMS = ['sort', 'fields', 'limit', 'cursor', 'explain']
+
+FILTER_OPERATIONS = ['eq', 'in', 'range', 'contains']
+
+
+class Collection:
+    """Declaration of a queryable list stored in a JSON data file"""
+
+    def __init__(self, name: str, filename: str, items_key: str = None, fields: Iterable[str] = None,
+                 indexes: Iterable[str] = (), range_indexes: Iterable[str] = (),
+                 ranked: Dict[str, List[str]] = None, default_sort: str = None,
+                 public: Callable[[Dict], Dict] = None):
+        """
+        Args:
+            name: Collection name used in errors, plans and cache entries
+            filename: JSON file in the data directory
+            items_key: Key of the list when the file holds an object (e.g. 'scenes')
+            fields: Fields that may be filtered, sorted and projected; None allows any
+            indexes: Fields with an equality index (list values index every element)
+            range_indexes: Fields with a sorted index for range filters
+            ranked: Fields whose values sort in a declared order instead of alphabetically
+            default_sort: Sort used when the request gives none; None keeps file order
+            public: Turns a stored item into what clients may see (e.g. drops passwords)
+        """
+        self.name = name
+        self.filename = filename
+        self.items_key = items_key
+        self.fields = list(fields) if fields is not None else None
+        self.indexes = list(indexes)
+        self.range_indexes = list(range_indexes)
+        self.ranked = ranked or {}
+        self.default_sort = default_sort
+        self.public = public
+
+    def check_field(self, field: str, param: str = None) -> str:
+        """Raise ValidationError unless field may be queried"""
+        if field in RESERVED_PARAMS or (self.fields is not None and field not in self.fields):
+            allowed = f': {", ".join(self.fields)}' if self.fields is not None else ''
+            raise ValidationError(f'Unknown {self.name} field "{field}"{allowed}', param or field)
+        return field
+
+    def is_field(self, name: str) -> bool:
+        """Whether a query parameter names a field (any field seen in the data when none are declared)"""
+        if name in RESERVED_PARAMS:
+            return False
+        if self.fields is not None:
+            return name in self.fields
+        return name in self.load().field_names
+
+    def load(self) -> 'CollectionIndex':
+        """Shared index for the current contents of the data file"""
+        file_path = os.path.join(json_handler.data_dir, self.filename)
+
+        def build():
+            data = json_handler.read_json(self.filename, None)
+            items = data.get(self.items_key, []) if isinstance(data, dict) and self.items_key else data
+            return CollectionIndex(self, items if isinstance(items, list) else [], found=bool(data))
+
+        return derived_cache.get_or_compute(f'collection:{self.name}', [file_path], build)
+
+    def query(self, query: 'Query' = None) -> Dict[str, Any]:
+        return self.load().query(query or Query())
+
+
+class Query:
+    """Parsed list query: filters, sort, projection and page"""
+
+    def __init__(self, filters: List[Tuple[str, str, Any]] = None, sort: str = None,
+                 fields: List[str] = None, limit: int = None, cursor: str = None, explain: bool = False):
+        self.filters = filters or []
+        self.sort = sort
+        self.fields = fields
+        self.limit = limit
+        self.cursor = cursor
+        self.explain = explain
+
+
+def normalize(value: Any) -> Optional[str]:
+    """Index key for a value, comparable with the strings in a query"""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, (str, int, float)):
+        return str(value)
+    if value is None:
+        return 'null'
+    return None
+
+
+def _range_value(value: Any) -> Optional[Tuple[int, Any]]:
+    """(kind, value) for range comparisons: numbers and numeric strings compare as numbers"""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return (0, float(value))
+    if isinstance(value, str):
+        try:
+            return (0, float(value))
+        except ValueError:
+            return (1, value)
+    return None
+
+
+def _sort_value(field: str, value: Any, ranked: Dict[str, List[str]]) -> Tuple:
+    """Comparable key for one field value; missing values sort last"""
+    if value is None:
+        return (1, 0, 0, '')
+    if field in ranked and value in ranked[field]:
+        return (0, 0, ranked[field].index(value), '')
+    if isinstance(value, (bool, int, float)):
+        return (0, 0, value, '')
+    if isinstance(value, str):
+        return (0, 0, int(value), '') if value.isdigit() else (0, 1, 0, value)
+    return (0, 2, 0, json.dumps(value, sort_keys=True, default=str))
+
+
+@total_ordering
+class _Descending:
+    """Sort key wrapper that inverts the order of the wrapped key"""
+    __slots__ = ('key',)
+
+    def __init__(self, key):
+        self.key = key
+
+    def __eq__(self, other):
+        return self.key == other.key
+
+    def __lt__(self, other):
+        return other.key < self.key
+
+
+def _contains(value: Any, needle: str) -> bool:
+    if isinstance(value, list):
+        return any(_contains(element, needle) for element in value)
+    return value is not None and not isinstance(value, dict) and needle in str(value).casefold()
+
+
+def _predicate(field: str, operation: str, value: Any) -> Callable[[Dict], bool]:
+    """Scan test for one filter"""
+    if operation in ('eq', 'in'):
+        wanted = set(value) if operation == 'in' else {value}
+
+        def matches(item):
+            current = item.get(field)
+            values = current if isinstance(current, list) else [current]
+            return any(normalize(element) in wanted for element in values)
+        return matches
+    if operation == 'range':
+        low, high = value
+
+        def matches(item):
+            current = _range_value(item.get(field))
+            kind = (low or high)[0]
+            return current is not None and current[0] == kind \
+                and (low is None or current >= low) and (high is None or current <= high)
+        return matches
+    needle = value.casefold()
+    return lambda item: _contains(item.get(field), needle)
+
+
+class CollectionIndex:
+    """Immutable snapshot of a collection with its declared indexes"""
+
+    def __init__(self, collection: Collection, items: List[Any], found: bool = True):
+        self.collection = collection
+        self.found = found
+        self.items = [collection.public(item) if collection.public else item
+                      for item in items if isinstance(item, dict)]
+        self.field_names = {field for item in self.items for field in item}
+        self.equality: Dict[str, Dict[str, List[int]]] = {field: {} for field in collection.indexes}
+        self.ranges: Dict[str, Dict[int, Tuple[List[Any], List[int]]]] = {}
+
+        for position, item in enumerate(self.items):
+            for field, index in self.equality.items():
+                value = item.get(field)
+                for element in (set(value) if isinstance(value, list) and all(
+                        normalize(v) is not None for v in value) else [value]):
+                    key = normalize(element)
+                    if key is not None:
+                        index.setdefault(key, []).append(position)
+
+        for field in collection.range_indexes:
+            by_kind = {0: [], 1: []}
+            for position, item in enumerate(self.items):
+                value = _range_value(item.get(field))
+                if value is not None:
+                    by_kind[value[0]].append((value, position))
+            self.ranges[field] = {}
+            for kind, entries in by_kind.items():
+                entries.sort()
+                self.ranges[field][kind] = ([value for value, _ in entries], [position for _, position in entries])
+
+        self._orders: Dict[Tuple, Tuple[List[int], List[Tuple], List[int]]] = {}
+        self._lock = threading.Lock()
+
+    # Sorting
+
+    def parse_sort(self, sort: Optional[str]) -> Tuple[Tuple[str, bool], ...]:
+        """Parse 'dueDate,-priority' into ((field, descending), ...)"""
+        spec = []
+        for part in (sort or self.collection.default_sort or '').split(','):
+            part = part.strip()
+            if not part:
+                continue
+            field = self.collection.check_field(part.lstrip('-'), 'sort')
+            if all(field != existing for existing, _ in spec):
+                spec.append((field, part.startswith('-')))
+        return tuple(spec)
+
+    def sort_key(self, item: Dict, spec: Tuple[Tuple[str, bool], ...], position: int) -> Tuple:
+        """Full sort key; the item's position breaks ties so the order is total"""
+        ranked = self.collection.ranked
+        key = []
+        for field, descending in spec:
+            value = _sort_value(field, item.get(field), ranked)
+            key.append(_Descending(value) if descending else value)
+        key.append(position)
+        return tuple(key)
+
+    def order(self, spec: Tuple[Tuple[str, bool], ...]) -> Tuple[List[int], List[Tuple], List[int]]:
+        """(positions in sort order, their sort keys, rank of each position), built once per sort"""
+        with self._lock:
+            cached = self._orders.get(spec)
+        if cached is not None:
+            return cached
+        keys = sorted(self.sort_key(item, spec, position) for position, item in enumerate(self.items))
+        positions = [key[-1] for key in keys]
+        ranks = [0] * len(positions)
+        for rank, position in enumerate(positions):
+            ranks[position] = rank
+        with self._lock:
+            return self._orders.setdefault(spec, (positions, keys, ranks))
+
+    def encode_cursor(self, position: int, spec: Tuple[Tuple[str, bool], ...]) -> str:
+        """Opaque cursor holding the sort values of the last item on a page"""
+        item = self.items[position]
+        payload = {'sort': _format_sort(spec), 'after': [item.get(field) for field, _ in spec] + [position]}
+        raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, cursor: str, spec: Tuple[Tuple[str, bool], ...]) -> Tuple:
+        """Sort key a page starts after; the cursor must come from the same sort"""
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8'))
+            values = payload['after']
+            if payload['sort'] != _format_sort(spec) or len(values) != len(spec) + 1:
+                raise ValidationError('cursor does not match sort', 'cursor')
+            position = int(values[-1])
+        except (binascii.Error, ValueError, KeyError, TypeError):
+            raise ValidationError('Invalid cursor', 'cursor')
+        return self.sort_key({field: value for (field, _), value in zip(spec, values)}, spec, position)
+
+    # Filtering
+
+    def _index_lookup(self, field: str, operation: str, value: Any) -> Optional[List[int]]:
+        """Candidate positions from a declared index, or None if the filter needs a scan"""
+        if operation in ('eq', 'in') and field in self.equality:
+            index = self.equality[field]
+            values = value if operation == 'in' else [value]
+            if len(values) == 1:
+                return index.get(values[0], [])
+            return sorted({position for v in values for position in index.get(v, ())})
+        if operation == 'range' and field in self.ranges:
+            low, high = value
+            keys, positions = self.ranges[field][(low or high)[0]]
+            start = bisect_left(keys, low) if low is not None else 0
+            end = bisect_right(keys, high) if high is not None else len(keys)
+            return positions[start:end]
+        return None
+
+    def matching(self, filters: List[Tuple[str, str, Any]], plan: List[Dict]) -> Optional[List[int]]:
+        """
+        Positions matching every filter: indexed filters are intersected smallest
+        first, the rest are checked only against those candidates. None means all items
+        """
+        indexed, scanned = [], []
+        for field, operation, value in filters:
+            positions = self._index_lookup(field, operation, value)
+            if positions is None:
+                scanned.append((field, operation, value))
+            else:
+                indexed.append((len(positions), field, operation, positions))
+
+        candidates = None
+        for size, field, operation, positions in sorted(indexed, key=lambda entry: entry[0]):
+            candidates = set(positions) if candidates is None else candidates.intersection(positions)
+            plan.append({'field': field, 'op': operation, 'access': 'index',
+                         'indexed': size, 'remaining': len(candidates)})
+
+        for field, operation, value in scanned:
+            test = _predicate(field, operation, value)
+            examined = range(len(self.items)) if candidates is None else candidates
+            checked = len(examined)
+            candidates = {position for position in examined if test(self.items[position])}
+            plan.append({'field': field, 'op': operation, 'access': 'scan',
+                         'examined': checked, 'remaining': len(candidates)})
+        return candidates
+
+    # Queries
+
+    def query(self, query: Query) -> Dict[str, Any]:
+        """
+        Run a query against the snapshot
+
+        Returns:
+            {'items': page, 'total': matching count, 'nextCursor': cursor or None,
+             'plan': query plan (only when query.explain)}
+        """
+        spec = self.parse_sort(query.sort)
+        plan_filters = []
+        candidates = self.matching(query.filters, plan_filters)
+        cached_order = spec in self._orders
+        positions, keys, ranks = self.order(spec)
+        start_rank = bisect_right(keys, self.decode_cursor(query.cursor, spec)) if query.cursor else 0
+
+        if candidates is None:
+            total = len(positions)
+            ordered = range(start_rank, total)
+        else:
+            total = len(candidates)
+            ranked = sorted(ranks[position] for position in candidates)
+            ordered = ranked[bisect_left(ranked, start_rank):]
+
+        limit = query.limit
+        page = [positions[rank] for rank in (ordered if limit is None else ordered[:limit])]
+        has_more = limit is not None and len(ordered) > limit
+        # Copies, so callers can change what they get back without altering the shared snapshot
+        if query.fields:
+            items = [{field: _detached(self.items[p][field]) for field in query.fields if field in self.items[p]}
+                     for p in page]
+        else:
+            items = [_detached(self.items[p]) for p in page]
+
+        result = {
+            'items': items,
+            'total': total,
+            'nextCursor': self.encode_cursor(page[-1], spec) if has_more and page else None,
+        }
+        if query.explain:
+            result['plan'] = {
+                'collection': self.collection.name,
+                'items': len(self.items),
+                'filters': plan_filters,
+                'sort': {'by': _format_sort(spec), 'order': 'cached' if cached_order else 'built',
+                         'cursorSeek': 'bisect' if query.cursor else None},
+                'indexes': {'equality': self.collection.indexes, 'range': self.collection.range_indexes},
+                'returned': len(items),
+                'projection': query.fields,
+            }
+        return result
+
+
+def _detached(value: Any) -> Any:
+    """Copy of a JSON value sharing no dicts or lists with the original"""
+    if isinstance(value, dict):
+        return {key: _detached(element) for key, element in value.items()}
+    if isinstance(value, list):
+        return [_detached(element) for element in value]
+    return value
+
+
+def _format_sort(spec: Tuple[Tuple[str, bool], ...]) -> str:
+    return ','.join(('-' if descending else '') + field for field, descending in spec)
+
+
+def parse_filter(collection: Collection, field: str, raw: str) -> Tuple[str, str, Any]:
+    """Parse one 'field=expression' query parameter into (field, operation, value)"""
+    collection.check_field(field)
+    if raw.startswith('~'):
+        if not raw[1:]:
+            raise ValidationError(f'{field} contains filter needs text', field)
+        return (field, 'contains', raw[1:])
+    if '..' in raw:
+        low_text, _, high_text = raw.partition('..')
+        low = _range_value(low_text) if low_text else None
+        high = _range_value(high_text) if high_text else None
+        if low is None and high is None:
+            raise ValidationError(f'{field} range needs a lower or upper bound', field)
+        if low is not None and high is not None and low[0] != high[0]:
+            raise ValidationError(f'{field} range bounds must both be numbers or both be text', field)
+        return (field, 'range', (low, high))
+    if ',' in raw:
+        return (field, 'in', [value.strip() for value in raw.split(',') if value.strip()])
+    return (field, 'eq', raw)
+
+
+def parse_query(args, collection: Collection, max_limit: int, ignore: Iterable[str] = ()) -> Query:
+    """
+    Build a Query from request arguments
+
+    Args:
+        args: request.args (or any mapping of parameter -> string)
+        collection: Collection the query runs against
+        max_limit: Largest page size accepted
+        ignore: Parameters the route handles itself
+
+    Parameters that are not fields of the collection are ignored.
+
+    Raises:
+        ValidationError: For unknown sort or projection fields, bad expressions, limits or cursors
+    """
+    ignore = set(ignore)
+    filters = [parse_filter(collection, field, raw) for field, raw in args.items()
+               if field not in ignore and raw != '' and collection.is_field(field)]
+
+    fields = None
+    if args.get('fields'):
+        fields = [collection.check_field(field.strip(), 'fields') for field in args['fields'].split(',') if field.strip()]
+
+    limit = args.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= max_limit:
+            raise ValidationError(f'limit must be between 1 and {max_limit}', 'limit')
+
+    return Query(filters=filters, sort=args.get('sort') or None, fields=fields, limit=limit,
+                 cursor=args.get('cursor') or None,
+                 explain=args.get('explain', '').lower() in ('1', 'true', 'yes'))
+
+
+def page_response(page: Dict[str, Any], query: Query) -> Dict[str, Any]:
+    """Standard JSON body for a list endpoint"""
+    body = {
+        'success': True,
+        'data': page['items'],
+        'pagination': {
+            'total': page['total'],
+            'limit': query.limit,
+            'nextCursor': page['nextCursor']
+        }
+    }
+    if 'plan' in page:
+        body['plan'] = page['plan']
+    return body
@@ -0,0 +1,147 @@
+"""
+Shared rate limiting for external API calls
+Limiters never sleep: callers over quota get the number of seconds to wait so
+routes can answer with HTTP 429 instead of parking a worker thread
+"""
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Dict
+from config import Config
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a call would exceed the configured quota"""
+    def __init__(self, retry_after: float, limiter_name: str = None):
+        self.retry_after = retry_after
+        self.limiter_name = limiter_name
+        super().__init__(f"Rate limit exceeded, retry after {retry_after:.1f} seconds")
+
+    @property
+    def retry_after_header(self) -> str:
+        """Retry-After header value (whole seconds, at least 1)"""
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class RateLimiter:
+    """Thread-safe sliding-window limiter shared by every request in the process"""
+
+    def __init__(self, name: str, max_calls: int, period_seconds: float):
+        self.name = name
+        self.max_calls = max_calls
+        self.period_seconds = period_seconds
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """
+        Reserve a call slot if one is free
+
+        Returns:
+            0 if the slot was reserved, otherwise seconds until one frees up
+        """
+        with self._lock:
+            now = time.time()
+            window_start = now - self.period_seconds
+            while self._calls and self._calls[0] <= window_start:
+                self._calls.popleft()
+
+            if len(self._calls) < self.max_calls:
+                self._calls.append(now)
+                return 0.0
+
+            return self._calls[0] + self.period_seconds - now
+
+    def acquire(self) -> None:
+        """Reserve a call slot or raise RateLimitExceeded"""
+        retry_after = self.try_acquire()
+        if retry_after > 0:
+            raise RateLimitExceeded(retry_after, self.name)
+
+    def get_status(self) -> Dict[str, float]:
+        """Get current window usage"""
+        with self._lock:
+            window_start = time.time() - self.period_seconds
+            used = sum(1 for call_time in self._calls if call_time > window_start)
+        return {'name': self.name, 'used': used, 'max_calls': self.max_calls, 'period_seconds': self.period_seconds}
+
+
+class SQLiteRateLimiter(RateLimiter):
+    """Sliding-window limiter shared across worker processes through a SQLite file"""
+
+    def __init__(self, name: str, max_calls: int, period_seconds: float, db_path: str = None):
+        super().__init__(name, max_calls, period_seconds)
+        self.db_path = db_path or Config.RATE_LIMIT_DB
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute('CREATE TABLE IF NOT EXISTS rate_limit_calls (name TEXT NOT NULL, called_at REAL NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_rate_limit_calls ON rate_limit_calls (name, called_at)')
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection that waits briefly on other processes' write locks"""
+        return sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+
+    def try_acquire(self) -> float:
+        """Reserve a call slot atomically across processes"""
+        conn = self._connect()
+        try:
+            # BEGIN IMMEDIATE takes the write lock up front so check-and-insert is atomic
+            conn.execute('BEGIN IMMEDIATE')
+            now = time.time()
+            window_start = now - self.period_seconds
+            conn.execute('DELETE FROM rate_limit_calls WHERE name = ? AND called_at <= ?', (self.name, window_start))
+            used, oldest = conn.execute(
+                'SELECT COUNT(*), MIN(called_at) FROM rate_limit_calls WHERE name = ?', (self.name,)
+            ).fetchone()
+
+            if used < self.max_calls:
+                conn.execute('INSERT INTO rate_limit_calls (name, called_at) VALUES (?, ?)', (self.name, now))
+                conn.execute('COMMIT')
+                return 0.0
+
+            conn.execute('COMMIT')
+            return oldest + self.period_seconds - now
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def get_status(self) -> Dict[str, float]:
+        """Get current window usage across processes"""
+        conn = self._connect()
+        try:
+            used = conn.execute(
+                'SELECT COUNT(*) FROM rate_limit_calls WHERE name = ? AND called_at > ?',
+                (self.name, time.time() - self.period_seconds)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+        return {'name': self.name, 'used': used, 'max_calls': self.max_calls, 'period_seconds': self.period_seconds}
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(name: str, max_calls: int, period_seconds: float, backend: str = None) -> RateLimiter:
+    """Get or create the process-wide limiter for a name"""
+    with _limiters_lock:
+        if name not in _limiters:
+            backend = backend or Config.RATE_LIMIT_BACKEND
+            if backend == 'sqlite':
+                _limiters[name] = SQLiteRateLimiter(name, max_calls, period_seconds)
+            else:
+                _limiters[name] = RateLimiter(name, max_calls, period_seconds)
+        return _limiters[name]
+
+def get_gemini_rate_limiter() -> RateLimiter:
+    """Get the limiter shared by all Gemini API calls"""
+    return get_rate_limiter('gemini', Config.GEMINI_RATE_LIMIT_MAX_CALLS, Config.GEMINI_RATE_LIMIT_PERIOD_SECONDS)
@@ -0,0 +1,228 @@
+"""
+Vectorized Schedule Cost Model
+Encodes scenes as NumPy incidence matrices (scenes × actors, scenes × locations,
+scenes × time of day) so many candidate schedules can be scored in one pass
+"""
+
+from typing import Any, Dict, List, Sequence
+import numpy as np
+
+# Time-of-day categories, indexed by the solver's time_priority
+TIME_CATEGORIES = ['DAWN', 'DAY', 'DUSK', 'NIGHT']
+
+COST_FIELDS = [
+    'shooting_days', 'company_moves', 'location_changes', 'actor_days',
+    'hold_days', 'overtime_minutes', 'split_days'
+]
+
+
+class ScheduleModel:
+    """Array encoding of a scene list with batch cost functions matching LocalScheduleSolver.evaluate"""
+
+    def __init__(self, scenes: List[Dict[str, Any]], weights: Dict[str, float],
+                 standard_day_minutes: int = 600, company_move_minutes: int = 60):
+        """
+        Args:
+            scenes: Scenes normalised by LocalScheduleSolver.prepare_scenes
+            weights: Cost weights (see local_scheduler.DEFAULT_WEIGHTS)
+            standard_day_minutes: Day length after which overtime accrues
+            company_move_minutes: Travel time per location change within a day
+        """
+        self.weights = weights
+        self.standard_day_minutes = standard_day_minutes
+        self.company_move_minutes = company_move_minutes
+        self.scene_count = len(scenes)
+
+        # Location ids follow name order so id comparisons match the solver's name tie-break
+        self.location_names = sorted({scene['location'] for scene in scenes})
+        location_ids = {name: i for i, name in enumerate(self.location_names)}
+        self.actor_names = sorted({actor for scene in scenes for actor in scene['actors_needed']})
+        actor_ids = {name: i for i, name in enumerate(self.actor_names)}
+
+        self.scene_location = np.array([location_ids[s['location']] for s in scenes], dtype=np.int64)
+        self.scene_time = np.array([s['time_priority'] for s in scenes], dtype=np.int64)
+        self.work_minutes = np.array([s['work_minutes'] for s in scenes], dtype=np.int64)
+
+        n, actors, locations = self.scene_count, len(self.actor_names), len(self.location_names)
+        self.scene_actors = np.zeros((n, actors), dtype=bool)
+        for i, scene in enumerate(scenes):
+            for actor in scene['actors_needed']:
+                self.scene_actors[i, actor_ids[actor]] = True
+        self.scene_locations = np.zeros((n, locations), dtype=bool)
+        self.scene_locations[np.arange(n), self.scene_location] = True
+        self.scene_times = np.zeros((n, len(TIME_CATEGORIES)), dtype=bool)
+        self.scene_times[np.arange(n), self.scene_time] = True
+
+        # Sparse (scene, actor) pairs drive the per-actor span computations
+        self._pair_scene, self._pair_actor = np.nonzero(self.scene_actors)
+        self._is_day = self.scene_time <= 1
+        self._is_night = self.scene_time == 3
+
+    # ------------------------------------------------------------------
+    # Conversions
+    # ------------------------------------------------------------------
+
+    def assignment_from_days(self, days: Sequence[Sequence[int]]) -> np.ndarray:
+        """Day index per scene for a solver day list"""
+        assignment = np.zeros(self.scene_count, dtype=np.int64)
+        for d, day in enumerate(days):
+            assignment[list(day)] = d
+        return assignment
+
+    def assignments_from_orderings(self, orders: np.ndarray) -> np.ndarray:
+        """
+        Cut scene orderings into shooting days
+
+        Each scene goes on the day in which its call time falls, with days of
+        standard_day_minutes and a company move wherever consecutive scenes change
+        location. This is a fixed-length stripboard approximation, not a packing.
+
+        Args:
+            orders: (k, n) array, each row a permutation of scene indices
+
+        Returns:
+            (k, n) array of day indices per scene
+        """
+        orders = np.atleast_2d(np.asarray(orders, dtype=np.int64))
+        if orders.shape[1] == 0:
+            return orders.copy()
+        locations = self.scene_location[orders]
+        moves = np.zeros(orders.shape, dtype=np.int64)
+        moves[:, 1:] = locations[:, 1:] != locations[:, :-1]
+        lengths = self.work_minutes[orders] + self.company_move_minutes * moves
+        starts = np.cumsum(lengths, axis=1) - lengths + self.company_move_minutes * moves
+        position_day = starts // max(1, self.standard_day_minutes)
+
+        assignments = np.empty_like(orders)
+        np.put_along_axis(assignments, orders, position_day, axis=1)
+        return assignments
+
+    # ------------------------------------------------------------------
+    # Cost functions
+    # ------------------------------------------------------------------
+
+    def evaluate_assignments(self, assignments: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Score many day assignments at once
+
+        Args:
+            assignments: (k, n) array of day indices per scene (empty days allowed)
+
+        Returns:
+            Dict of (k,) arrays with total_cost and each COST_FIELDS component
+        """
+        assignments = np.atleast_2d(np.asarray(assignments, dtype=np.int64))
+        k, n = assignments.shape
+        if n == 0:
+            zeros = np.zeros(k, dtype=np.int64)
+            return {'total_cost': zeros.astype(float), **{field: zeros for field in COST_FIELDS}}
+
+        location_count = len(self.location_names)
+        actor_count = len(self.actor_names)
+        day_count = int(assignments.max()) + 1
+        slot_count = k * day_count
+
+        # Each (candidate, day) pair is one "slot"; flatten everything onto slots
+        slots = (assignments + (np.arange(k) * day_count)[:, None]).ravel()
+        scene_counts = np.bincount(slots, minlength=slot_count)
+        nonempty = scene_counts > 0
+        shooting_days = nonempty.reshape(k, day_count).sum(axis=1)
+        # Shooting-day index of each slot, so spans skip empty days like the solver does
+        shooting_index = np.cumsum(nonempty.reshape(k, day_count), axis=1).ravel() - 1
+
+        # Distinct (slot, location) blocks and the earliest time of day in each
+        locations = np.tile(self.scene_location, k)
+        times = np.tile(self.scene_time, k)
+        block_keys = slots * location_count + locations
+        order = np.lexsort((times, block_keys))
+        sorted_keys = block_keys[order]
+        is_first = np.ones(len(order), dtype=bool)
+        is_first[1:] = sorted_keys[1:] != sorted_keys[:-1]
+        blocks = sorted_keys[is_first]
+        block_time = times[order][is_first]
+        block_slot = blocks // location_count
+        block_location = blocks % location_count
+
+        locations_per_slot = np.bincount(block_slot, minlength=slot_count)
+        moves_per_slot = np.maximum(locations_per_slot - 1, 0)
+        company_moves = moves_per_slot.reshape(k, day_count).sum(axis=1)
+
+        minutes = (np.bincount(slots, weights=np.tile(self.work_minutes, k), minlength=slot_count)
+                   + self.company_move_minutes * moves_per_slot)
+        overtime = np.where(nonempty, np.maximum(minutes - self.standard_day_minutes, 0), 0)
+        overtime_minutes = overtime.reshape(k, day_count).sum(axis=1).astype(np.int64)
+
+        has_day = np.bincount(slots, weights=np.tile(self._is_day, k), minlength=slot_count) > 0
+        has_night = np.bincount(slots, weights=np.tile(self._is_night, k), minlength=slot_count) > 0
+        split_days = (has_day & has_night).reshape(k, day_count).sum(axis=1)
+
+        # Location blocks run in (earliest time, name) order; compare each day's
+        # first block with the previous shooting day's last block
+        block_rank = block_time * location_count + block_location
+        first_rank = np.full(slot_count, np.iinfo(np.int64).max)
+        np.minimum.at(first_rank, block_slot, block_rank)
+        last_rank = np.full(slot_count, -1)
+        np.maximum.at(last_rank, block_slot, block_rank)
+        shot_slots = np.flatnonzero(nonempty)
+        same_candidate = shot_slots[1:] // day_count == shot_slots[:-1] // day_count
+        changed = (first_rank[shot_slots[1:]] % location_count) != (last_rank[shot_slots[:-1]] % location_count)
+        location_changes = np.bincount(
+            shot_slots[1:][same_candidate & changed] // day_count, minlength=k
+        )
+
+        # Actor spans: first and last shooting day per (candidate, actor)
+        if actor_count and len(self._pair_scene):
+            pair_slots = (assignments[:, self._pair_scene] + (np.arange(k) * day_count)[:, None]).ravel()
+            pair_index = shooting_index[pair_slots]
+            actor_keys = (np.repeat(np.arange(k), len(self._pair_actor)) * actor_count
+                          + np.tile(self._pair_actor, k))
+            first_day = np.full(k * actor_count, np.iinfo(np.int64).max)
+            np.minimum.at(first_day, actor_keys, pair_index)
+            last_day = np.full(k * actor_count, -1)
+            np.maximum.at(last_day, actor_keys, pair_index)
+            cast = last_day >= 0
+            spans = np.where(cast, last_day - first_day + 1, 0)
+            actor_days = spans.reshape(k, actor_count).sum(axis=1)
+
+            worked = np.sort(pair_slots * actor_count + np.tile(self._pair_actor, k))
+            worked = worked[np.concatenate(([True], worked[1:] != worked[:-1]))]
+            actor_work = np.bincount(worked // actor_count // day_count, minlength=k)
+        else:
+            actor_days = np.zeros(k, dtype=np.int64)
+            actor_work = np.zeros(k, dtype=np.int64)
+
+        result = {
+            'shooting_days': shooting_days,
+            'company_moves': company_moves,
+            'location_changes': location_changes,
+            'actor_days': actor_days,
+            'hold_days': actor_days - actor_work,
+            'overtime_minutes': overtime_minutes,
+            'split_days': split_days,
+        }
+        result['total_cost'] = (
+            self.weights['shooting_day'] * shooting_days
+            + self.weights['company_move'] * company_moves
+            + self.weights['location_change'] * location_changes
+            + self.weights['actor_day'] * actor_days
+            + self.weights['overtime_minute'] * overtime_minutes
+            + self.weights['split_day'] * split_days
+        )
+        return result
+
+    def evaluate_orderings(self, orders: np.ndarray) -> Dict[str, np.ndarray]:
+        """Score many scene orderings, cut into days by assignments_from_orderings"""
+        return self.evaluate_assignments(self.assignments_from_orderings(orders))
+
+    @staticmethod
+    def breakdowns(scores: Dict[str, np.ndarray]) -> List[Dict[str, float]]:
+        """Split batch scores into one plain-Python breakdown dict per candidate"""
+        fields = ['total_cost'] + COST_FIELDS
+        return [
+            {field: scores[field][i].item() for field in fields}
+            for i in range(len(scores['total_cost']))
+        ]
+
+    def evaluate(self, days: Sequence[Sequence[int]]) -> Dict[str, float]:
+        """Score a single solver day list; same breakdown as LocalScheduleSolver.evaluate"""
+        return self.breakdowns(self.evaluate_assignments(self.assignment_from_days(days)[None, :]))[0]
@@ -0,0 +1,380 @@
+"""
+Incremental Schedule State
+Keeps the cost terms of a day-by-day schedule current as scenes are moved,
+so the cost change of a move can be read without re-scoring the whole board
+"""
+
+from bisect import bisect_left, insort
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+
+class _DayState:
+    """Running totals for one shooting day"""
+
+    __slots__ = ('scenes', 'minutes', 'location_times', 'actor_counts', 'day_scenes',
+                 'night_scenes', 'moves', 'overtime', 'split', 'change', 'bounds')
+
+    def __init__(self):
+        self.scenes = {}            # scene index -> None, insertion ordered
+        self.minutes = 0            # setup + shooting minutes, without company moves
+        self.location_times = {}    # location -> scene count per time priority (0-3)
+        self.actor_counts = {}      # actor -> scenes needing them this day
+        self.day_scenes = 0
+        self.night_scenes = 0
+        # Cached cost contributions
+        self.moves = 0
+        self.overtime = 0
+        self.split = False
+        self.change = 0             # location change from the previous shooting day
+        self.bounds = None          # (first, last) location, computed on demand
+
+
+class ScheduleState:
+    """
+    Mutable schedule with O(k) move/undo and constant-time cost reads
+
+    k is the number of actors and locations touched by a move. Relocating or
+    swapping scenes only updates the days involved and the moved scenes' actors;
+    shifting a day also renumbers the days it jumps over. Costs match
+    LocalScheduleSolver.evaluate for the same day list.
+    """
+
+    def __init__(self, scenes: List[Dict[str, Any]], days: Sequence[Sequence[int]],
+                 weights: Dict[str, float], standard_day_minutes: int = 600,
+                 company_move_minutes: int = 60, max_day_minutes: int = 720):
+        """
+        Args:
+            scenes: Scenes normalised by LocalScheduleSolver.prepare_scenes
+            days: Initial day list of scene indexes (empty days allowed)
+            weights: Cost weights (see local_scheduler.DEFAULT_WEIGHTS)
+            standard_day_minutes: Day length after which overtime accrues
+            company_move_minutes: Travel time per location change within a day
+            max_day_minutes: Hard limit checked by fits()
+        """
+        self.scenes = scenes
+        self.weights = weights
+        self.standard_day_minutes = standard_day_minutes
+        self.company_move_minutes = company_move_minutes
+        self.max_day_minutes = max_day_minutes
+
+        self._days: List[_DayState] = []     # indexed by day id
+        self.order: List[int] = []           # day ids in calendar order
+        self.position: List[int] = []        # day id -> calendar position
+        self.scene_day: List[int] = [0] * len(scenes)
+
+        # Per-actor working day ids and calendar span
+        self._actor_days: Dict[str, Set[int]] = {}
+        self._actor_span: Dict[str, Tuple[int, int]] = {}
+        self._span_starts: List[int] = []    # sorted first positions of all actors
+        self._span_ends: List[int] = []      # sorted last positions of all actors
+        self._empty = set()                  # ids of days with no scenes
+
+        self.shooting_days = 0
+        self.company_moves = 0
+        self.location_changes = 0
+        self.overtime_minutes = 0
+        self.split_days = 0
+        self.actor_work = 0
+        self._span_total = 0
+        self._cost = None                    # memoized cost(), cleared by every mutation
+
+        for day in days:
+            day_id = self.add_day()
+            for scene in day:
+                self._insert(scene, day_id)
+        for day_id in self.order:
+            self._refresh_day(day_id)
+        for actor in self._actor_days:
+            self._refresh_actor(actor)
+        for day_id in self.order:
+            self._refresh_change(day_id)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    @property
+    def actor_days(self) -> int:
+        """Actor payroll days, counting shooting days only"""
+        # Empty days inside an actor's span are not shooting days and do not count
+        covered = 0
+        for day_id in self._empty:
+            position = self.position[day_id]
+            covered += bisect_left(self._span_starts, position) - bisect_left(self._span_ends, position)
+        return self._span_total - covered
+
+    def cost(self) -> float:
+        """Weighted total cost of the current schedule"""
+        if self._cost is None:
+            self._cost = (
+                self.weights['shooting_day'] * self.shooting_days
+                + self.weights['company_move'] * self.company_moves
+                + self.weights['location_change'] * self.location_changes
+                + self.weights['actor_day'] * self.actor_days
+                + self.weights['overtime_minute'] * self.overtime_minutes
+                + self.weights['split_day'] * self.split_days
+            )
+        return self._cost
+
+    def breakdown(self) -> Dict[str, float]:
+        """Cost breakdown in the LocalScheduleSolver.evaluate format"""
+        actor_days = self.actor_days
+        return {
+            'total_cost': self.cost(),
+            'shooting_days': self.shooting_days,
+            'company_moves': self.company_moves,
+            'location_changes': self.location_changes,
+            'actor_days': actor_days,
+            'hold_days': actor_days - self.actor_work,
+            'overtime_minutes': self.overtime_minutes,
+            'split_days': self.split_days,
+        }
+
+    def is_empty(self, day_id: int) -> bool:
+        """Whether a day has no scenes"""
+        return day_id in self._empty
+
+    def day_minutes(self, day_id: int) -> int:
+        """Total minutes of a day including company moves"""
+        day = self._days[day_id]
+        return day.minutes + self.company_move_minutes * day.moves
+
+    def fits(self, day_id: int) -> bool:
+        """Check the hard day-length limit (a lone over-long scene is always allowed)"""
+        return len(self._days[day_id].scenes) <= 1 or self.day_minutes(day_id) <= self.max_day_minutes
+
+    def days(self, include_empty: bool = True) -> List[List[int]]:
+        """Scene indexes per day in calendar order"""
+        return [
+            list(self._days[day_id].scenes) for day_id in self.order
+            if include_empty or self._days[day_id].scenes
+        ]
+
+    # ------------------------------------------------------------------
+    # Moves (each returns the cost change and can be undone by its inverse)
+    # ------------------------------------------------------------------
+
+    def add_day(self) -> int:
+        """Append an empty day to the calendar and return its id"""
+        day_id = len(self._days)
+        self._days.append(_DayState())
+        self.position.append(len(self.order))
+        self.order.append(day_id)
+        self._empty.add(day_id)
+        self._cost = None
+        return day_id
+
+    def remove_day(self) -> None:
+        """Undo add_day: drop the last added day, which must be empty and still last in the calendar"""
+        day_id = len(self._days) - 1
+        if day_id < 0 or self.order[-1] != day_id or day_id not in self._empty:
+            raise ValueError('Only an empty day at the end of the calendar can be removed')
+        self._days.pop()
+        self.position.pop()
+        self.order.pop()
+        self._empty.discard(day_id)
+        self._cost = None
+
+    def relocate(self, scene: int, target_day: int) -> float:
+        """Move a scene to another day (by id); undo with relocate(scene, old_day)"""
+        before = self.cost()
+        source_day = self.scene_day[scene]
+        if source_day == target_day:
+            return 0.0
+        self._remove(scene)
+        self._insert(scene, target_day)
+        self._after_content_change([source_day, target_day], self._moved_actors([scene]))
+        return self.cost() - before
+
+    def swap(self, first: int, second: int) -> float:
+        """Exchange the days of two scenes; undo by swapping again"""
+        before = self.cost()
+        day_a, day_b = self.scene_day[first], self.scene_day[second]
+        if day_a == day_b:
+            return 0.0
+        self._remove(first)
+        self._remove(second)
+        self._insert(first, day_b)
+        self._insert(second, day_a)
+        self._after_content_change([day_a, day_b], self._moved_actors([first, second]))
+        return self.cost() - before
+
+    def shift_day(self, source: int, target: int) -> float:
+        """Move the day at calendar position source to position target; undo with shift_day(target, source)"""
+        before = self.cost()
+        if source == target:
+            return 0.0
+        low, high = min(source, target), max(source, target)
+        shifted = self.order[low:high + 1]
+        affected_actors = {actor for day_id in shifted for actor in self._days[day_id].actor_counts}
+
+        self._cost = None
+        self.order.insert(target, self.order.pop(source))
+        for position in range(low, high + 1):
+            self.position[self.order[position]] = position
+
+        for actor in affected_actors:
+            self._refresh_actor(actor)
+        for position in (source, target):
+            self._refresh_around(position)
+        return self.cost() - before
+
+    # ------------------------------------------------------------------
+    # Internal bookkeeping
+    # ------------------------------------------------------------------
+
+    def _moved_actors(self, moved: List[int]) -> set:
+        return {actor for scene in moved for actor in self.scenes[scene]['actors_needed']}
+
+    def _insert(self, scene_index: int, day_id: int) -> None:
+        scene = self.scenes[scene_index]
+        day = self._days[day_id]
+        self._cost = None
+        if not day.scenes:
+            self._empty.discard(day_id)
+            self.shooting_days += 1
+        day.scenes[scene_index] = None
+        day.minutes += scene['work_minutes']
+        times = day.location_times.setdefault(scene['location'], [0, 0, 0, 0])
+        times[scene['time_priority']] += 1
+        if scene['time_priority'] <= 1:
+            day.day_scenes += 1
+        elif scene['time_priority'] == 3:
+            day.night_scenes += 1
+        for actor in scene['actors_needed']:
+            count = day.actor_counts.get(actor, 0)
+            day.actor_counts[actor] = count + 1
+            if count == 0:
+                self.actor_work += 1
+                self._actor_days.setdefault(actor, set()).add(day_id)
+        self.scene_day[scene_index] = day_id
+
+    def _remove(self, scene_index: int) -> None:
+        scene = self.scenes[scene_index]
+        day_id = self.scene_day[scene_index]
+        day = self._days[day_id]
+        self._cost = None
+        del day.scenes[scene_index]
+        day.minutes -= scene['work_minutes']
+        times = day.location_times[scene['location']]
+        times[scene['time_priority']] -= 1
+        if not any(times):
+            del day.location_times[scene['location']]
+        if scene['time_priority'] <= 1:
+            day.day_scenes -= 1
+        elif scene['time_priority'] == 3:
+            day.night_scenes -= 1
+        for actor in scene['actors_needed']:
+            day.actor_counts[actor] -= 1
+            if day.actor_counts[actor] == 0:
+                del day.actor_counts[actor]
+                self._actor_days[actor].discard(day_id)
+                self.actor_work -= 1
+        if not day.scenes:
+            self._empty.add(day_id)
+            self.shooting_days -= 1
+
+    def _after_content_change(self, day_ids: List[int], actors: set) -> None:
+        for day_id in day_ids:
+            self._refresh_day(day_id)
+        for actor in actors:
+            self._refresh_actor(actor, day_ids)
+        for day_id in day_ids:
+            self._refresh_around(self.position[day_id])
+
+    def _refresh_day(self, day_id: int) -> None:
+        """Recompute a day's moves, overtime and split contributions"""
+        day = self._days[day_id]
+        day.bounds = None
+        self.company_moves -= day.moves
+        self.overtime_minutes -= day.overtime
+        self.split_days -= day.split
+
+        if day.scenes:
+            day.moves = len(day.location_times) - 1
+            minutes = day.minutes + self.company_move_minutes * day.moves
+            day.overtime = max(0, minutes - self.standard_day_minutes)
+            day.split = day.day_scenes > 0 and day.night_scenes > 0
+        else:
+            day.moves, day.overtime, day.split = 0, 0, False
+
+        self.company_moves += day.moves
+        self.overtime_minutes += day.overtime
+        self.split_days += day.split
+
+    def _refresh_actor(self, actor: str, touched: Optional[List[int]] = None) -> None:
+        """
+        Update one actor's calendar span after their working days changed
+
+        When only the days in touched changed and the old end days are still
+        worked, the span can only grow to cover touched days; otherwise it is
+        recomputed from all of the actor's days.
+        """
+        worked = self._actor_days.get(actor)
+        old = self._actor_span.get(actor)
+        if not worked:
+            span = None
+        elif touched is not None and old is not None and \
+                self.order[old[0]] in worked and self.order[old[1]] in worked:
+            first, last = old
+            for day_id in touched:
+                if day_id in worked:
+                    position = self.position[day_id]
+                    first, last = min(first, position), max(last, position)
+            span = (first, last)
+        else:
+            positions = [self.position[day_id] for day_id in worked]
+            span = (min(positions), max(positions))
+        if span == old:
+            return
+
+        if old is not None:
+            del self._actor_span[actor]
+            self._span_total -= old[1] - old[0] + 1
+            del self._span_starts[bisect_left(self._span_starts, old[0])]
+            del self._span_ends[bisect_left(self._span_ends, old[1])]
+        if span is None:
+            return
+        self._actor_span[actor] = span
+        self._span_total += span[1] - span[0] + 1
+        insort(self._span_starts, span[0])
+        insort(self._span_ends, span[1])
+
+    def _block_bounds(self, day_id: int) -> Tuple[str, str]:
+        """First and last location of a day in order_day order (earliest time, then name)"""
+        day = self._days[day_id]
+        if day.bounds is None:
+            blocks = [
+                (next(t for t, count in enumerate(times) if count), location)
+                for location, times in day.location_times.items()
+            ]
+            day.bounds = (min(blocks)[1], max(blocks)[1])
+        return day.bounds
+
+    def _shooting_day_near(self, position: int, step: int) -> Optional[int]:
+        """Id of the nearest non-empty day from position in direction step, if any"""
+        while 0 <= position < len(self.order):
+            day_id = self.order[position]
+            if self._days[day_id].scenes:
+                return day_id
+            position += step
+        return None
+
+    def _refresh_change(self, day_id: int) -> None:
+        """Recompute whether a day starts at a different location than the previous shooting day ended"""
+        day = self._days[day_id]
+        self.location_changes -= day.change
+        day.change = 0
+        if day.scenes:
+            previous = self._shooting_day_near(self.position[day_id] - 1, -1)
+            if previous is not None:
+                day.change = int(self._block_bounds(day_id)[0] != self._block_bounds(previous)[1])
+        self.location_changes += day.change
+
+    def _refresh_around(self, position: int) -> None:
+        """Refresh location changes for the day at position and the next shooting day after it"""
+        if position < len(self.order):
+            self._refresh_change(self.order[position])
+        following = self._shooting_day_near(position + 1, 1)
+        if following is not None:
+            self._refresh_change(following)
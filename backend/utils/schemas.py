@@ -0,0 +1,427 @@
+"""
+Request Payload Schemas
+JSON schemas for tasks, VFX shots, scenes, budget entries and users. Each
+schema is compiled once when the module loads into a plain-Python check that
+accepts valid payloads quickly; the jsonschema validator is built on the first
+invalid payload and explains what is wrong.
+"""
+
+import re
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from utils.validators import ValidationError
+
+DATE_PATTERN = r'^\d{4}-\d{2}-\d{2}'
+DATE_ERROR = 'Invalid date format. Use YYYY-MM-DD'
+
+TEXT = {'type': 'string', 'minLength': 1}
+IDENTIFIER = {'type': ['string', 'integer'], 'minLength': 1, 'minimum': 0}
+HOURS = {'type': ['number', 'null'], 'minimum': 0, 'maximum': 1000}
+STRING_LIST = {'type': 'array', 'items': {'type': 'string'}}
+
+SCHEMAS: Dict[str, Dict[str, Any]] = {
+    'task': {
+        'type': 'object',
+        'required': ['title', 'description', 'assigneeId', 'dueDate', 'priority', 'category'],
+        'properties': {
+            'title': {**TEXT, 'maxLength': 200},
+            'description': {**TEXT, 'maxLength': 1000},
+            'assigneeId': IDENTIFIER,
+            'dueDate': {**TEXT, 'pattern': DATE_PATTERN, 'errorMessage': DATE_ERROR},
+            'priority': {'enum': ['low', 'medium', 'high']},
+            'status': {'enum': ['todo', 'in_progress', 'done']},
+            'category': TEXT,
+            'estimatedHours': HOURS,
+        },
+    },
+    'vfx_shot': {
+        'type': 'object',
+        'required': ['shotName', 'sceneId', 'description', 'assignee', 'dueDate'],
+        'properties': {
+            'shotName': {**TEXT, 'maxLength': 100},
+            'sceneId': IDENTIFIER,
+            'description': {**TEXT, 'maxLength': 1000},
+            'assignee': IDENTIFIER,
+            'dueDate': {**TEXT, 'pattern': DATE_PATTERN, 'errorMessage': DATE_ERROR},
+            'status': {'enum': ['todo', 'in_progress', 'in_review', 'done']},
+            'priority': {'enum': ['low', 'medium', 'high']},
+            'complexity': {'enum': ['low', 'medium', 'high']},
+            'estimatedHours': HOURS,
+            'versions': {'type': 'array'},
+        },
+    },
+    'vfx_version': {
+        'type': 'object',
+        'required': ['version', 'status', 'notes', 'fileSize'],
+        'properties': {
+            'version': {'type': ['string', 'number'], 'minLength': 1},
+            'status': {'enum': ['draft', 'review', 'approved', 'rejected']},
+            'notes': TEXT,
+            'fileSize': {'type': ['string', 'number'], 'minLength': 1},
+            'date': {'type': 'string'},
+        },
+    },
+    'scene': {
+        'type': 'object',
+        'required': ['scene_number', 'title', 'location', 'day_night', 'estimated_runtime_minutes'],
+        'properties': {
+            'scene_number': {'type': ['string', 'integer'], 'minLength': 1, 'minimum': 1},
+            'title': {**TEXT, 'maxLength': 2000},
+            'int_ext': {'type': 'string'},
+            'day_night': TEXT,
+            'location': {**TEXT, 'maxLength': 200},
+            'estimated_runtime_minutes': {
+                'type': ['number', 'string'], 'exclusiveMinimum': 0, 'pattern': r'^\d+$',
+                'errorMessage': 'estimated_runtime_minutes must be a positive whole number of minutes',
+            },
+            'scene_description': {'type': 'string'},
+            'characters': STRING_LIST,
+            'extras': STRING_LIST,
+            'props': STRING_LIST,
+            'wardrobe': STRING_LIST,
+            'makeup_hair': STRING_LIST,
+            'vehicles_animals_fx': STRING_LIST,
+            'set_dressing': STRING_LIST,
+            'special_equipment': STRING_LIST,
+            'stunts_vfx': STRING_LIST,
+            'sound_requirements': STRING_LIST,
+            'mood_tone': {'type': 'string'},
+            'vfx_required': {'type': 'boolean'},
+            'estimatedDuration': {'type': ['number', 'string', 'null']},
+        },
+    },
+    'budget_entry': {
+        'type': 'object',
+        'required': ['amount', 'category', 'description'],
+        'properties': {
+            'amount': {
+                'type': ['number', 'string'], 'exclusiveMinimum': 0, 'maximum': 10000000,
+                'pattern': r'^\d+(\.\d+)?$', 'errorMessage': 'amount must be a positive number',
+            },
+            'category': TEXT,
+            'description': {**TEXT, 'maxLength': 500},
+            'date': {'type': 'string', 'pattern': DATE_PATTERN, 'errorMessage': DATE_ERROR},
+        },
+    },
+    'budget_category': {
+        'type': 'object',
+        'properties': {
+            'name': TEXT,
+            'budgeted': {'type': 'number', 'minimum': 0},
+            'spent': {'type': 'number', 'minimum': 0},
+            'remaining': {'type': 'number'},
+        },
+    },
+    'user': {
+        'type': 'object',
+        'required': ['name', 'role', 'email', 'username', 'password'],
+        'properties': {
+            'name': TEXT,
+            'role': {'enum': ['Producer', 'Director', 'Crew', 'VFX', 'Distribution Manager', 'Production Manager']},
+            'email': {
+                'type': 'string', 'pattern': r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$',
+                'errorMessage': 'Invalid email format',
+            },
+            'username': {
+                'type': 'string', 'pattern': r'^[a-zA-Z0-9_]{3,20}$',
+                'errorMessage': 'Username must be 3-20 characters, alphanumeric and underscores only',
+            },
+            'password': {
+                'type': 'string', 'minLength': 8,
+                'errorMessage': 'Password must be at least 8 characters',
+            },
+            'avatar': {'type': 'string'},
+            'permissions': STRING_LIST,
+        },
+    },
+}
+
+_FAST_KEYWORDS = {
+    'type', 'required', 'properties', 'items', 'enum', 'minLength', 'maxLength',
+    'minimum', 'maximum', 'exclusiveMinimum', 'pattern', 'errorMessage',
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    'string': lambda value: isinstance(value, str),
+    'integer': lambda value: _is_number(value) and (isinstance(value, int) or value.is_integer()),
+    'number': _is_number,
+    'array': lambda value: isinstance(value, list),
+    'object': lambda value: isinstance(value, dict),
+    'boolean': lambda value: isinstance(value, bool),
+    'null': lambda value: value is None,
+}
+
+
+# Types a bare isinstance check gets right (numbers must also exclude bool)
+_PLAIN_TYPES = {'string': str, 'array': list, 'object': dict, 'boolean': bool, 'null': type(None)}
+
+
+def _compile_check(schema: Dict[str, Any]) -> Optional[Callable[[Any], bool]]:
+    """
+    Generate a plain-Python predicate equivalent to a schema
+
+    Returns:
+        check(value) -> bool, or None when the schema uses keywords it does not cover
+    """
+    if set(schema) - _FAST_KEYWORDS:
+        return None
+    checks: List[Callable[[Any], bool]] = []
+
+    if 'type' in schema:
+        types = schema['type'] if isinstance(schema['type'], list) else [schema['type']]
+        plain_types = tuple(_PLAIN_TYPES[name] for name in types if name in _PLAIN_TYPES)
+        if len(plain_types) == len(types):
+            checks.append(lambda value: isinstance(value, plain_types))
+        else:
+            type_checks = [_TYPE_CHECKS[name] for name in types]
+            checks.append(lambda value: any(check(value) for check in type_checks))
+    if 'enum' in schema:
+        allowed = schema['enum']
+        if all(isinstance(option, str) for option in allowed):
+            allowed_set = frozenset(allowed)
+            checks.append(lambda value: isinstance(value, str) and value in allowed_set)
+        else:
+            checks.append(lambda value: any(value == option and type(value) is type(option) for option in allowed))
+    if 'minLength' in schema:
+        min_length = schema['minLength']
+        checks.append(lambda value: not isinstance(value, str) or len(value) >= min_length)
+    if 'maxLength' in schema:
+        max_length = schema['maxLength']
+        checks.append(lambda value: not isinstance(value, str) or len(value) <= max_length)
+    if 'pattern' in schema:
+        regex = re.compile(schema['pattern'])
+        checks.append(lambda value: not isinstance(value, str) or regex.search(value) is not None)
+    if 'minimum' in schema:
+        minimum = schema['minimum']
+        checks.append(lambda value: not _is_number(value) or value >= minimum)
+    if 'exclusiveMinimum' in schema:
+        exclusive_minimum = schema['exclusiveMinimum']
+        checks.append(lambda value: not _is_number(value) or value > exclusive_minimum)
+    if 'maximum' in schema:
+        maximum = schema['maximum']
+        checks.append(lambda value: not _is_number(value) or value <= maximum)
+    if 'required' in schema:
+        required = schema['required']
+        checks.append(lambda value: not isinstance(value, dict) or all(name in value for name in required))
+    if 'properties' in schema:
+        property_checks = []
+        for name, subschema in schema['properties'].items():
+            check = _compile_check(subschema)
+            if check is None:
+                return None
+            property_checks.append((name, check))
+
+        def check_properties(value):
+            if isinstance(value, dict):
+                for name, check in property_checks:
+                    if name in value and not check(value[name]):
+                        return False
+            return True
+        checks.append(check_properties)
+    if 'items' in schema:
+        item_check = _compile_check(schema['items'])
+        if item_check is None:
+            return None
+        checks.append(lambda value: not isinstance(value, list) or all(item_check(item) for item in value))
+
+    def check_all(value):
+        for check in checks:
+            if not check(value):
+                return False
+        return True
+    return check_all
+
+
+class CompiledSchema:
+    """
+    One schema variant: a generated fast check for the common (valid) case and
+    the jsonschema validator, built on first failure, to explain what is wrong
+    """
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.schema = schema
+        self.check = _compile_check(schema)
+        self._validator = None
+        self._lock = threading.Lock()
+
+    @property
+    def validator(self):
+        """jsonschema validator for this schema (the reference implementation)"""
+        if self._validator is None:
+            with self._lock:
+                if self._validator is None:
+                    # Imported here so the blueprints do not load jsonschema at startup
+                    from jsonschema.validators import validator_for
+                    validator_class = validator_for(self.schema)
+                    validator_class.check_schema(self.schema)
+                    self._validator = validator_class(self.schema)
+        return self._validator
+
+    def iter_errors(self, data: Any) -> list:
+        """All schema errors; empty without touching jsonschema when the fast check passes"""
+        if self.check is not None and self.check(data):
+            return []
+        return list(self.validator.iter_errors(data))
+
+
+def _build_schema(name: str, partial: bool, many: bool) -> Dict[str, Any]:
+    schema = dict(SCHEMAS[name])
+    if partial:
+        schema.pop('required', None)
+    if many:
+        schema = {'type': 'array', 'items': schema}
+    return schema
+
+
+# Every variant is compiled once when the module loads: single or array, full or partial
+_compiled: Dict[Tuple[str, bool, bool], CompiledSchema] = {
+    (name, partial, many): CompiledSchema(_build_schema(name, partial, many))
+    for name in SCHEMAS
+    for partial in (False, True)
+    for many in (False, True)
+}
+
+
+def get_schema(name: str, partial: bool = False, many: bool = False) -> CompiledSchema:
+    """
+    Compiled schema variant
+
+    Args:
+        name: Key in SCHEMAS (e.g. 'task')
+        partial: Drop required fields, for updates that send only changed fields
+        many: Validate a JSON array of such objects in one pass
+    """
+    return _compiled[(name, partial, many)]
+
+
+def get_validator(name: str, partial: bool = False, many: bool = False):
+    """jsonschema validator for a schema variant, built once and cached"""
+    return get_schema(name, partial, many).validator
+
+
+def compile_schemas() -> int:
+    """Build the jsonschema validators up front too (e.g. before benchmarking); returns the count"""
+    for compiled in _compiled.values():
+        compiled.validator
+    return len(_compiled)
+
+
+def _field_name(path) -> Optional[str]:
+    """'characters[2]' style name for an error path, or None for the object itself"""
+    field = None
+    for part in path:
+        if isinstance(part, int):
+            field = f"{field or ''}[{part}]"
+        else:
+            field = part if field is None else f"{field}.{part}"
+    return field
+
+
+def _is_blank(value: Any) -> bool:
+    """Values the routes have always treated as a missing required field"""
+    return value is not False and value in (None, '', 0, [], {})
+
+
+def _to_validation_error(error, required: List[str], root: str = 'Request body') -> ValidationError:
+    """Turn a jsonschema error into a ValidationError with the routes' wording"""
+    path = list(error.path)
+    field = _field_name(path)
+
+    if error.validator == 'required':
+        missing = next(name for name in error.validator_value if name not in error.instance)
+        return ValidationError(f'{missing} is required', missing)
+
+    if field is None:
+        return ValidationError(f'{root} must be a JSON object')
+
+    if len(path) == 1 and path[0] in required and _is_blank(error.instance):
+        return ValidationError(f'{field} is required', field)
+
+    if 'errorMessage' in error.schema and error.validator not in ('type', 'enum'):
+        return ValidationError(error.schema['errorMessage'], field)
+
+    value = error.validator_value
+    if error.validator == 'enum':
+        label = field[0].upper() + field[1:]
+        return ValidationError(f'{label} must be one of: {", ".join(map(str, value))}', field)
+    if error.validator == 'type':
+        types = value if isinstance(value, list) else [value]
+        return ValidationError(f'{field} must be of type {" or ".join(types)}', field)
+    if error.validator == 'minLength':
+        return ValidationError(f'{field} must not be empty' if value == 1
+                               else f'{field} must be at least {value} characters', field)
+    if error.validator == 'maxLength':
+        return ValidationError(f'{field} must be at most {value} characters', field)
+    if error.validator == 'minimum':
+        return ValidationError(f'{field} must be at least {value}', field)
+    if error.validator == 'exclusiveMinimum':
+        return ValidationError(f'{field} must be greater than {value}', field)
+    if error.validator == 'maximum':
+        return ValidationError(f'{field} must be at most {value}', field)
+    return ValidationError(f'{field}: {error.message}', field)
+
+
+def _error_order(error, required: List[str], properties: List[str]):
+    """Missing fields first in required order, then other fields in schema order"""
+    if error.validator == 'required':
+        missing = next(name for name in error.validator_value if name not in error.instance)
+        return (0, required.index(missing))
+    field = error.path[0] if error.path else None
+    if field is None:
+        return (-1, 0)
+    if field in required and _is_blank(error.instance):
+        return (0, required.index(field))
+    return (1, properties.index(field) if field in properties else len(properties))
+
+
+def _first_error(errors, required: List[str], properties: List[str], root: str = 'Request body') -> ValidationError:
+    error = min(errors, key=lambda e: _error_order(e, required, properties))
+    return _to_validation_error(error, required, root)
+
+
+def validate_payload(name: str, data: Any, partial: bool = False) -> None:
+    """
+    Validate one request object
+
+    Args:
+        name: Key in SCHEMAS
+        data: Parsed JSON body
+        partial: Only check the fields that are present (updates)
+
+    Raises:
+        ValidationError: With the first problem, in the order the routes used to check them
+    """
+    errors = get_schema(name, partial).iter_errors(data)
+    if errors:
+        required = [] if partial else SCHEMAS[name].get('required', [])
+        raise _first_error(errors, required, list(SCHEMAS[name]['properties']))
+
+
+def validate_many(name: str, items: List[Any], partial: bool = False) -> Dict[int, ValidationError]:
+    """
+    Validate an array of request objects in one pass
+
+    Returns:
+        {index: ValidationError} for every invalid item (empty when all are valid)
+
+    Raises:
+        ValidationError: items is not a JSON array
+    """
+    errors_by_item: Dict[int, list] = {}
+    for error in get_schema(name, partial, many=True).iter_errors(items):
+        if not error.path:
+            raise ValidationError('Expected a JSON array')
+        index = error.path.popleft()
+        errors_by_item.setdefault(index, []).append(error)
+
+    required = [] if partial else SCHEMAS[name].get('required', [])
+    properties = list(SCHEMAS[name]['properties'])
+    return {
+        index: _first_error(errors, required, properties, root='Item')
+        for index, errors in sorted(errors_by_item.items())
+    }
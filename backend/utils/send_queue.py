@@ -0,0 +1,151 @@
+"""
+Per-session outbound queues for websocket clients
+Each session may have a few messages awaiting the client's acknowledgement;
+anything beyond that waits in a queue bounded by number of changes. When the
+queue fills up it is collapsed to the latest change per entity, and a client
+that is still too far behind is told to resync over HTTP and disconnected,
+so one slow client costs a bounded amount of memory and never holds up
+delivery to the others.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+from config import Config
+from utils.broadcast import build_payload
+
+
+class SessionQueue:
+    """Outbound state of one session"""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.messages: deque = deque()   # (event, payload) not yet sent
+        self.queued_changes = 0
+        self.collapses = 0
+        self.closed = False
+
+
+class SendQueues:
+    """Bounded, acknowledgement-paced delivery to every session of this worker"""
+
+    def __init__(self, transmit: Callable[[str, Dict, str, Callable[..., None]], None],
+                 disconnect: Callable[[str, Dict], None],
+                 max_in_flight: int = None, max_queued_changes: int = None):
+        """
+        Args:
+            transmit: Sends (event, payload) to a session; calls the given
+                callback when the client acknowledges it
+            disconnect: Drops a session that cannot keep up, after sending it
+                the resync hint
+            max_in_flight: Messages sent but not yet acknowledged per session
+            max_queued_changes: Changes held per session before collapsing
+                and, if still too many, disconnecting
+        """
+        self.transmit = transmit
+        self.disconnect = disconnect
+        self.max_in_flight = max_in_flight or Config.WEBSOCKET_MAX_IN_FLIGHT
+        self.max_queued_changes = max_queued_changes or Config.WEBSOCKET_SEND_QUEUE_MAX_CHANGES
+        self._sessions: Dict[str, SessionQueue] = {}
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.collapses = 0
+        self.disconnects = 0
+
+    def send(self, event: str, payload: Dict[str, Any], session_id: str) -> None:
+        """Send now if the session has room in flight, otherwise queue"""
+        resync = None
+        with self._lock:
+            queue = self._sessions.setdefault(session_id, SessionQueue())
+            if queue.closed:
+                return
+            queue.messages.append((event, payload))
+            queue.queued_changes += len(payload.get('changes', ()))
+            if queue.queued_changes > self.max_queued_changes:
+                resync = self._collapse_unlocked(session_id, queue)
+            ready = self._take_ready_unlocked(queue)
+        if resync is not None:
+            self.disconnect(session_id, resync)
+            return
+        self._transmit(session_id, ready)
+
+    def _collapse_unlocked(self, session_id: str, queue: SessionQueue) -> Optional[Dict]:
+        """Keep the latest change per entity; returns a resync hint if still over the limit"""
+        changes, events = [], []
+        for event, payload in queue.messages:
+            if 'changes' in payload:
+                changes.extend(payload['changes'])
+            else:
+                events.append((event, payload))
+        collapsed = build_payload(changes)
+        queue.collapses += 1
+        self.collapses += 1
+        if len(collapsed['changes']) > self.max_queued_changes:
+            queue.messages.clear()
+            queue.queued_changes = 0
+            queue.closed = True
+            self.disconnects += 1
+            return {'reason': 'slow_consumer', 'latestSeq': collapsed['latestSeq']}
+        queue.messages = deque(events + ([('changes', collapsed)] if collapsed['changes'] else []))
+        queue.queued_changes = len(collapsed['changes'])
+        return None
+
+    def _take_ready_unlocked(self, queue: SessionQueue):
+        ready = []
+        while queue.messages and queue.in_flight < self.max_in_flight:
+            event, payload = queue.messages.popleft()
+            queue.queued_changes -= len(payload.get('changes', ()))
+            queue.in_flight += 1
+            ready.append((event, payload))
+        return ready
+
+    def _transmit(self, session_id: str, ready) -> None:
+        for event, payload in ready:
+            try:
+                self.transmit(event, payload, session_id, lambda *args: self.acknowledge(session_id))
+                with self._lock:
+                    self.sent += 1
+            except Exception as e:
+                print(f"Send to {session_id} failed: {e}")
+                self.acknowledge(session_id)
+
+    def acknowledge(self, session_id: str) -> None:
+        """The client processed one message: send the next queued ones"""
+        with self._lock:
+            queue = self._sessions.get(session_id)
+            if queue is None or queue.closed:
+                return
+            queue.in_flight = max(queue.in_flight - 1, 0)
+            ready = self._take_ready_unlocked(queue)
+        self._transmit(session_id, ready)
+
+    def remove(self, session_id: str) -> None:
+        """Drop a disconnected session's queue"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def depth(self, session_id: str) -> int:
+        """Changes waiting to be sent to a session"""
+        with self._lock:
+            queue = self._sessions.get(session_id)
+            return queue.queued_changes if queue else 0
+
+    def get_status(self) -> Dict[str, Any]:
+        """Queue depth metrics for this worker"""
+        with self._lock:
+            depths = sorted(queue.queued_changes for queue in self._sessions.values())
+            in_flight = sum(queue.in_flight for queue in self._sessions.values())
+            backlogged = sum(1 for queue in self._sessions.values() if queue.messages)
+            return {
+                'sessions': len(depths),
+                'backloggedSessions': backlogged,
+                'queuedChanges': sum(depths),
+                'maxDepth': depths[-1] if depths else 0,
+                'p95Depth': depths[int(len(depths) * 0.95)] if depths else 0,
+                'inFlight': in_flight,
+                'sent': self.sent,
+                'collapses': self.collapses,
+                'disconnects': self.disconnects,
+                'maxQueuedChanges': self.max_queued_changes,
+                'maxInFlight': self.max_in_flight,
+            }
@@ -4,18 +4,73 @@ Handles real-time communication between frontend and backend
 """
 import json
 import asyncio
+import time
 from typing import Dict, Set, Any, Optional
 from flask_socketio import SocketIO, emit, join_room, leave_room, disconnect
 from flask import request
 from utils.auth import decode_jwt_token
+from utils.broadcast import ACTION_OPS, BroadcastPipeline, change_rooms
+from utils.change_feed import change_feed
+from utils.message_bus import MessageBus, get_message_bus
+from utils.send_queue import SendQueues
+
+# Bus channels: change feed batches, and emits addressed to rooms
+CHANGES_CHANNEL = 'changes'
+EMIT_CHANNEL = 'emit'
 
 class WebSocketManager:
-    def __init__(self, socketio: SocketIO):
+    def __init__(self, socketio: SocketIO, bus: MessageBus = None):
         self.socketio = socketio
-        self.connected_users: Dict[str, Set[str]] = {}  # user_id -> set of session_ids
-        self.user_sessions: Dict[str, str] = {}  # session_id -> user_id
+        # Sessions, rooms and presence live on the bus so they are visible to every worker
+        self.bus = bus or get_message_bus()
+        # Each session gets bounded, acknowledgement-paced delivery
+        self.send_queues = SendQueues(
+            transmit=lambda event, payload, session_id, ack: self.socketio.emit(
+                event, payload, room=session_id, callback=ack),
+            disconnect=self._disconnect_slow_client
+        )
+        self.broadcasts = BroadcastPipeline(
+            emit=self.send_queues.send,
+            recipients=self.bus.local_session_ids,
+            start_task=socketio.start_background_task,
+            sleep=socketio.sleep
+        )
+        self.bus.subscribe(CHANGES_CHANNEL, self.broadcast_changes)
+        self.bus.subscribe(EMIT_CHANNEL, self._emit_local)
         self.setup_event_handlers()
     
+    @property
+    def connected_users(self) -> Dict[str, Set[str]]:
+        """user_id -> set of session_ids, across all workers"""
+        return self.bus.connected_users()
+    
+    def _join(self, session_id: str, room: str):
+        """Join a room and record the membership for broadcast fan-out"""
+        join_room(room)
+        self.bus.join(session_id, room)
+    
+    def _leave(self, session_id: str, room: str):
+        """Leave a room and forget the membership"""
+        leave_room(room)
+        self.bus.leave(session_id, room)
+    
+    def _disconnect_slow_client(self, session_id: str, hint: Dict[str, Any]):
+        """Tell a client that fell too far behind to reload over HTTP, then drop it"""
+        print(f"Disconnecting slow websocket client {session_id}")
+        self.socketio.emit('resync', hint, room=session_id)
+        self.socketio.server.disconnect(session_id, namespace='/')
+    
+    def _emit_local(self, message: Dict[str, Any]):
+        """Emit a bus message to this worker's clients in its room (all of them for None)"""
+        if message.get('room') is None:
+            self.socketio.emit(message['event'], message['data'])
+        else:
+            self.socketio.emit(message['event'], message['data'], room=message['room'])
+    
+    def _emit_everywhere(self, event: str, data: Any, room: Optional[str] = None):
+        """Emit through every worker, each reaching its own clients"""
+        self.bus.publish(EMIT_CHANNEL, {'event': event, 'data': data, 'room': room})
+    
     def setup_event_handlers(self):
         """Setup WebSocket event handlers"""
         
@@ -45,21 +100,16 @@ class WebSocketManager:
                 user_id = user_data['user_id']
                 session_id = request.sid
                 
-                # Store user session mapping
-                self.user_sessions[session_id] = user_id
-                
-                # Add user to connected users
-                if user_id not in self.connected_users:
-                    self.connected_users[user_id] = set()
-                self.connected_users[user_id].add(session_id)
+                # Register the session with the bus (presence across workers)
+                self.bus.add_session(session_id, user_id)
                 
                 # Join user-specific room
-                join_room(f"user_{user_id}")
+                self._join(session_id, f"user_{user_id}")
                 
                 # Join role-specific room
                 user_role = user_data.get('role', '').lower()
                 if user_role:
-                    join_room(f"role_{user_role}")
+                    self._join(session_id, f"role_{user_role}")
                 
                 print(f"User {user_id} connected with session {session_id}")
                 
@@ -82,20 +132,10 @@ class WebSocketManager:
             """Handle client disconnection"""
             session_id = request.sid
             
-            if session_id in self.user_sessions:
-                user_id = self.user_sessions[session_id]
-                
-                # Remove session from user's sessions
-                if user_id in self.connected_users:
-                    self.connected_users[user_id].discard(session_id)
-                    
-                    # If no more sessions for this user, remove from connected users
-                    if not self.connected_users[user_id]:
-                        del self.connected_users[user_id]
-                
-                # Remove session mapping
-                del self.user_sessions[session_id]
-                
+            # Socket.IO drops the session's rooms itself; the bus forgets them here
+            user_id = self.bus.remove_session(session_id)
+            self.send_queues.remove(session_id)
+            if user_id is not None:
                 print(f"User {user_id} disconnected (session {session_id})")
         
         @self.socketio.on('ping')
@@ -108,7 +148,7 @@ class WebSocketManager:
             """Join a project-specific room for updates"""
             project_id = data.get('project_id')
             if project_id:
-                join_room(f"project_{project_id}")
+                self._join(request.sid, f"project_{project_id}")
                 emit('room_joined', {'room': f"project_{project_id}"})
         
         @self.socketio.on('leave_project_room')
@@ -116,93 +156,77 @@ class WebSocketManager:
             """Leave a project-specific room"""
             project_id = data.get('project_id')
             if project_id:
-                leave_room(f"project_{project_id}")
+                self._leave(request.sid, f"project_{project_id}")
                 emit('room_left', {'room': f"project_{project_id}"})
     
     def emit_to_user(self, user_id: str, event: str, data: Any):
         """Emit event to a specific user"""
-        if user_id in self.connected_users:
-            self.socketio.emit(event, data, room=f"user_{user_id}")
+        if self.bus.is_user_connected(user_id):
+            self._emit_everywhere(event, data, f"user_{user_id}")
     
     def emit_to_role(self, role: str, event: str, data: Any):
         """Emit event to all users with a specific role"""
-        self.socketio.emit(event, data, room=f"role_{role.lower()}")
+        self._emit_everywhere(event, data, f"role_{role.lower()}")
     
     def emit_to_project(self, project_id: str, event: str, data: Any):
         """Emit event to all users in a project room"""
-        self.socketio.emit(event, data, room=f"project_{project_id}")
+        self._emit_everywhere(event, data, f"project_{project_id}")
     
     def emit_to_all(self, event: str, data: Any):
         """Emit event to all connected users"""
-        self.socketio.emit(event, data)
+        self._emit_everywhere(event, data)
+    
+    def publish(self, change: Dict[str, Any]):
+        """Queue a change for coalesced delivery to its audience"""
+        rooms = change_rooms(change)
+        if rooms == []:
+            return
+        self.broadcasts.publish(change, rooms)
+    
+    def broadcast_changes(self, changes):
+        """Forward change feed entries (field-level deltas) to connected clients"""
+        for change in changes:
+            self.publish(change)
+    
+    def broadcast_object(self, collection: str, data: Dict[str, Any], action: str = 'updated'):
+        """Broadcast a whole object for code paths that do not write through the change feed"""
+        self.publish({
+            'seq': None,
+            'collection': collection,
+            'id': data.get('id'),
+            'op': ACTION_OPS.get(action, action),
+            'fields': sorted(data),
+            'data': data,
+            'timestamp': time.time()
+        })
     
     def broadcast_task_update(self, task_data: Dict[str, Any], action: str = 'updated'):
         """Broadcast task updates to relevant users"""
-        event_data = {
-            'action': action,
-            'task': task_data,
-            'timestamp': asyncio.get_event_loop().time()
-        }
-        
-        # Emit to task assignee
-        if task_data.get('assigneeId'):
-            self.emit_to_user(task_data['assigneeId'], 'task_update', event_data)
-        
-        # Emit to producers and directors (they can see all tasks)
-        self.emit_to_role('producer', 'task_update', event_data)
-        self.emit_to_role('director', 'task_update', event_data)
-        self.emit_to_role('production manager', 'task_update', event_data)
+        self.broadcast_object('tasks', task_data, action)
     
     def broadcast_budget_update(self, budget_data: Dict[str, Any], action: str = 'updated'):
         """Broadcast budget updates to relevant users"""
-        event_data = {
-            'action': action,
-            'budget': budget_data,
-            'timestamp': asyncio.get_event_loop().time()
-        }
-        
-        # Budget updates go to producers and production managers
-        self.emit_to_role('producer', 'budget_update', event_data)
-        self.emit_to_role('production manager', 'budget_update', event_data)
+        self.broadcast_object('budget', budget_data, action)
     
     def broadcast_script_update(self, script_data: Dict[str, Any], action: str = 'updated'):
         """Broadcast script updates to relevant users"""
-        event_data = {
-            'action': action,
-            'script': script_data,
-            'timestamp': asyncio.get_event_loop().time()
-        }
-        
-        # Script updates go to all roles except distribution manager
-        self.emit_to_role('producer', 'script_update', event_data)
-        self.emit_to_role('director', 'script_update', event_data)
-        self.emit_to_role('production manager', 'script_update', event_data)
-        self.emit_to_role('crew', 'script_update', event_data)
-        self.emit_to_role('vfx', 'script_update', event_data)
+        self.broadcast_object('script', script_data, action)
     
     def broadcast_vfx_update(self, vfx_data: Dict[str, Any], action: str = 'updated'):
         """Broadcast VFX updates to relevant users"""
-        event_data = {
-            'action': action,
-            'vfx': vfx_data,
-            'timestamp': asyncio.get_event_loop().time()
-        }
-        
-        # VFX updates go to VFX team, directors, and producers
-        self.emit_to_role('vfx', 'vfx_update', event_data)
-        self.emit_to_role('director', 'vfx_update', event_data)
-        self.emit_to_role('producer', 'vfx_update', event_data)
+        self.broadcast_object('vfx', vfx_data, action)
     
     def broadcast_asset_update(self, asset_data: Dict[str, Any], action: str = 'updated'):
         """Broadcast asset updates to relevant users"""
-        event_data = {
-            'action': action,
-            'asset': asset_data,
-            'timestamp': asyncio.get_event_loop().time()
+        self.broadcast_object('assets', asset_data, action)
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Bus, broadcast and send queue depth metrics for this worker"""
+        return {
+            'bus': self.bus.get_status(),
+            'broadcasts': self.broadcasts.get_status(),
+            'sendQueues': self.send_queues.get_status()
         }
-        
-        # Asset updates go to all users
-        self.emit_to_all('asset_update', event_data)
     
     def get_connected_users_count(self) -> int:
         """Get count of connected users"""
@@ -214,7 +238,7 @@ class WebSocketManager:
     
     def is_user_connected(self, user_id: str) -> bool:
         """Check if a user is connected"""
-        return user_id in self.connected_users and len(self.connected_users[user_id]) > 0
+        return self.bus.is_user_connected(user_id)
 
 # Global WebSocket manager instance
 websocket_manager: Optional[WebSocketManager] = None
@@ -223,6 +247,9 @@ def init_websocket_manager(socketio: SocketIO) -> WebSocketManager:
     """Initialize the global WebSocket manager"""
     global websocket_manager
     websocket_manager = WebSocketManager(socketio)
+    # Changes recorded by this worker reach the clients of every worker
+    change_feed.subscribe(lambda changes: websocket_manager.bus.publish(CHANGES_CHANNEL, changes))
+    websocket_manager.bus.start(socketio.start_background_task, socketio.sleep)
     return websocket_manager
 
 def get_websocket_manager() -> Optional[WebSocketManager]:
@@ -91,6 +91,57 @@ class ApiClient {
     return this.request(endpoint, { method: 'DELETE' });
   }
 
+  // POST and read a text/event-stream response, calling onEvent for each event as it arrives
+  async stream(
+    endpoint: string,
+    data: unknown,
+    onEvent: (event: string, data: any) => void
+  ): Promise<void> {
+    let response: Response;
+    try {
+      response = await fetch(`${this.baseURL}${endpoint}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+        body: JSON.stringify(data),
+      });
+    } catch (error) {
+      throw {
+        message: 'Network error: Unable to connect to server',
+        status: 0,
+      } as ApiError;
+    }
+
+    if (!response.ok || !response.body) {
+      const body = await response.json().catch(() => ({}));
+      throw {
+        message: body.message || 'Request failed',
+        status: response.status,
+      } as ApiError;
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+      const { done, value } = await reader.read();
+      buffer += decoder.decode(value, { stream: !done });
+      let boundary = buffer.indexOf('\n\n');
+      while (boundary !== -1) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        let event = 'message';
+        const dataLines: string[] = [];
+        block.split('\n').forEach(line => {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) dataLines.push(line.slice(6));
+        });
+        if (dataLines.length) onEvent(event, JSON.parse(dataLines.join('\n')));
+        boundary = buffer.indexOf('\n\n');
+      }
+      if (done) break;
+    }
+  }
+
   // Authentication
   async authenticate(username: string, password: string): Promise<ApiResponse<any>> {
     return this.request('/auth/login', {
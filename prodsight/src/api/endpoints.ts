@@ -1,4 +1,4 @@
-import { apiClient } from './client';
+import { apiClient, ApiResponse } from './client';
 
 // Type definitions
 export interface User {
@@ -24,6 +24,61 @@ export interface Task {
   estimatedHours: number;
 }
 
+// List query for any collection endpoint: field filters use
+// 'a' (equal), ['a', 'b'] (in), 'lo..hi' (range) or '~text' (contains)
+export interface ListQuery {
+  sort?: string;
+  fields?: string[];
+  limit?: number;
+  cursor?: string;
+  [field: string]: string | number | string[] | undefined;
+}
+
+export interface TaskQuery extends ListQuery {
+  status?: Task['status'][];
+  priority?: Task['priority'][];
+  category?: string[];
+  assigneeId?: string[];
+  dueDate?: string;
+}
+
+export interface Pagination {
+  total: number;
+  limit: number | null;
+  nextCursor: string | null;
+}
+
+const listQueryString = (query: ListQuery | ScriptQuery | ChangesQuery = {}) => {
+  const params = new URLSearchParams();
+  Object.entries(query).forEach(([key, value]) => {
+    if (value === undefined || value === null || value === '') return;
+    params.set(key, Array.isArray(value) ? value.join(',') : String(value));
+  });
+  const qs = params.toString();
+  return qs ? `?${qs}` : '';
+};
+
+export type TaskBulkOperation =
+  | { op: 'create'; data: Omit<Task, 'id' | 'assignee'> }
+  | { op: 'update'; id: string; data: Partial<Task> }
+  | { op: 'delete'; id: string };
+
+export interface TaskBulkResult {
+  index: number;
+  op: TaskBulkOperation['op'] | null;
+  id: string | null;
+  status: number;
+  success: boolean;
+  message?: string;
+  data?: Task;
+}
+
+export interface TaskBulkResponse {
+  results: TaskBulkResult[];
+  applied: number;
+  failed: number;
+}
+
 export interface BudgetCategory {
   name: string;
   budgeted: number;
@@ -126,16 +181,20 @@ export const authApi = {
 };
 
 export const usersApi = {
-  getUsers: () => apiClient.get<User[]>('/users'),
+  getUsers: (query?: ListQuery) => apiClient.get<User[]>(`/users${listQueryString(query)}`),
   getUserById: (id: string) => apiClient.get<User>(`/users/${id}`),
 };
 
 export const tasksApi = {
-  getTasks: () => apiClient.get<Task[]>('/tasks'),
+  getTasks: (query?: TaskQuery) =>
+    apiClient.get<Task[]>(`/tasks${listQueryString(query)}`) as Promise<ApiResponse<Task[]> & { pagination?: Pagination }>,
   createTask: (task: Omit<Task, 'id'>) => apiClient.post('/tasks', task),
   updateTask: (id: string, task: Partial<Task>) => apiClient.put(`/tasks/${id}`, task),
   deleteTask: (id: string) => apiClient.delete(`/tasks/${id}`),
   getTasksByAssignee: (assigneeId: string) => apiClient.get<Task[]>(`/tasks/assignee/${assigneeId}`),
+  // One request and one write for many changes; the response has a result per operation
+  bulkTasks: (operations: TaskBulkOperation[], atomic = false) =>
+    apiClient.post('/tasks/bulk', { operations, atomic }) as Promise<ApiResponse<TaskBulkResponse>>,
 };
 
 export const budgetApi = {
@@ -146,19 +205,26 @@ export const budgetApi = {
     apiClient.post('/budget/history', { ...entry, date: new Date().toISOString() }),
 };
 
+// Scene projection for GET /script: 'summary' returns scene headers only
+export interface ScriptQuery {
+  view?: 'full' | 'summary';
+  fields?: (keyof Scene)[];
+  exclude?: (keyof Scene)[];
+}
+
 export const scriptApi = {
-  getScript: () => apiClient.get<Script>('/script'),
+  getScript: (query?: ScriptQuery) => apiClient.get<Script>(`/script${listQueryString(query)}`),
   updateScript: (script: Partial<Script>) => apiClient.put('/script', script),
   updateScene: (sceneId: string, scene: Partial<Scene>) => apiClient.put(`/script/scene/${sceneId}`, scene),
   addScene: (scene: Omit<Scene, 'id'>) => apiClient.post('/script/scenes', scene),
-  getScenes: () => apiClient.get<Scene[]>('/script/scenes'),
+  getScenes: (query?: ListQuery) => apiClient.get<Scene[]>(`/script/scenes${listQueryString(query)}`),
   getScene: (sceneId: string) => apiClient.get<Scene>(`/script/scene/${sceneId}`),
   getScriptText: () => apiClient.get<{content: string}>('/script/text'),
   updateScriptText: (content: string) => apiClient.put('/script/text', { content }),
 };
 
 export const vfxApi = {
-  getVFXShots: () => apiClient.get<VFXShot[]>('/vfx'),
+  getVFXShots: (query?: ListQuery) => apiClient.get<VFXShot[]>(`/vfx${listQueryString(query)}`),
   createVFXShot: (shot: Omit<VFXShot, 'id' | 'versions'>) =>
     apiClient.post('/vfx', { ...shot, versions: [] }),
   updateVFXShot: (id: string, shot: Partial<VFXShot>) => apiClient.put(`/vfx/${id}`, shot),
@@ -169,6 +235,43 @@ export const vfxApi = {
     }),
 };
 
+export type ChangeCollection = 'tasks' | 'vfx' | 'users' | 'assets' | 'budget' | 'script' | 'scenes';
+
+export interface Change {
+  seq: number;
+  collection: ChangeCollection;
+  id: string | null;
+  op: 'create' | 'update' | 'delete';
+  fields: string[];
+  // New values of the changed fields (the whole item for creates)
+  data: Record<string, any> | null;
+  timestamp: number;
+}
+
+export interface ChangesQuery {
+  since?: number;
+  // Seconds to long-poll when nothing is new yet
+  wait?: number;
+  limit?: number;
+  collections?: ChangeCollection[];
+  epoch?: string;
+}
+
+export interface ChangesPage {
+  changes: Change[];
+  latestSeq: number;
+  // Pass as since on the next call
+  nextSince: number;
+  hasMore: boolean;
+  // Changes were missed (log trimmed or server restarted): reload with full reads
+  resync: boolean;
+  epoch: string;
+}
+
+export const changesApi = {
+  getChanges: (query?: ChangesQuery) => apiClient.get<ChangesPage>(`/changes${listQueryString(query)}`),
+};
+
 export const analysisApi = {
   analyzeScript: (file: File) => {
     const formData = new FormData();
@@ -234,6 +337,9 @@ export interface ScheduleConstraints {
       equipment_requirements?: string[];
     };
   };
+  bypass_cache?: boolean;
+  // Schedule location blocks concurrently and stitch them (defaults on for large projects)
+  hierarchical?: boolean;
 }
 
 export interface OptimizedSchedule {
@@ -290,12 +396,37 @@ export interface ScheduleGenerationResponse {
     ai_model: string;
     input_scenes: number;
     prompt_length?: number;
+    cache_hit?: boolean;
+    cache_bypassed?: boolean;
+    cached_at?: string | null;
+    mode?: 'hierarchical';
+    blocks?: Array<{
+      block: string;
+      scenes: number;
+      source: 'gemini' | 'cache' | 'local';
+      elapsed_ms: number;
+      fallback_reason?: string;
+    }>;
+    blocks_wall_ms?: number;
+    blocks_total_ms?: number;
+    stitch_ms?: number;
+    streamed?: boolean;
   };
   saved_file?: string;
   total_shooting_days?: number;
   is_mock?: boolean;
 }
 
+export type DailySchedule = OptimizedSchedule['daily_schedules'][number];
+
+export interface ScheduleStreamHandlers {
+  onStart?: (info: { input_scenes: number; prompt_parts: number }) => void;
+  // Called once per day, in day order, as soon as the model has finished it
+  onDay: (day: DailySchedule) => void;
+  // Days received so far are void; the fallback schedule's days follow
+  onReset?: (reason: string) => void;
+}
+
 export interface ScheduleAnalysis {
   total_scenes: number;
   unique_locations: number;
@@ -320,6 +451,26 @@ export const aiSchedulingApi = {
   generateGeminiSchedule: (constraints?: ScheduleConstraints) => 
     apiClient.post<ScheduleGenerationResponse>('/ai/generate_gemini_schedule', constraints || {}),
   
+  // Stream an AI schedule day by day (server-sent events); resolves with the final response
+  streamGeminiSchedule: (constraints: ScheduleConstraints | undefined, handlers: ScheduleStreamHandlers) =>
+    new Promise<ScheduleGenerationResponse>((resolve, reject) => {
+      let finished = false;
+      apiClient.stream('/ai/generate_gemini_schedule/stream', constraints || {}, (event, data) => {
+        if (event === 'start') handlers.onStart?.(data);
+        else if (event === 'day') handlers.onDay(data);
+        else if (event === 'reset') handlers.onReset?.(data.reason);
+        else if (event === 'complete') {
+          finished = true;
+          resolve(data);
+        } else if (event === 'error') {
+          finished = true;
+          reject({ message: data.message, status: 500 });
+        }
+      }).then(() => {
+        if (!finished) reject({ message: 'Schedule stream ended early', status: 0 });
+      }, reject);
+    }),
+
   // Get schedule preview (top 5 scenes)
   getSchedulePreview: () => 
     apiClient.get<{ status: string; preview_scenes: any[]; total_scenes_available: number }>('/ai/preview_schedule'),
@@ -329,6 +480,6 @@ export const aiSchedulingApi = {
     apiClient.get<{ status: string; analysis: ScheduleAnalysis }>('/ai/schedule_analysis'),
   
   // Legacy endpoint for backward compatibility
-  sortSchedule: () => 
-    apiClient.post<any>('/ai/sort_schedule', {}),
+  sortSchedule: (options?: { workers?: number; time_budget_ms?: number }) => 
+    apiClient.post<any>('/ai/sort_schedule', options || {}),
 };
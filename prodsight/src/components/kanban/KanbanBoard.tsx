@@ -17,11 +17,14 @@ import { Button } from '../ui/Button';
 import { Modal } from '../ui/Modal';
 import { TaskForm } from './TaskForm';
 import { Task } from '../../api/endpoints';
-import { useTasks } from '../../hooks/useTasks';
+import { TaskChange } from '../../hooks/useTasks';
 
 interface KanbanBoardProps {
   tasks: Task[];
+  onTaskCreate: (task: Omit<Task, 'id'>) => Promise<void>;
   onTaskUpdate: (taskId: string, updates: Partial<Task>) => void;
+  // Moves of several selected cards, sent as one bulk request
+  onTasksUpdate: (changes: TaskChange[]) => void;
 }
 
 const columns = [
@@ -30,10 +33,10 @@ const columns = [
   { id: 'done', title: 'Done', status: 'done' as const },
 ];
 
-export const KanbanBoard: React.FC<KanbanBoardProps> = ({ tasks, onTaskUpdate }) => {
+export const KanbanBoard: React.FC<KanbanBoardProps> = ({ tasks, onTaskCreate, onTaskUpdate, onTasksUpdate }) => {
   const [activeTask, setActiveTask] = useState<Task | null>(null);
+  const [selectedIds, setSelectedIds] = useState<Set<string>>(new Set());
   const [isTaskModalOpen, setIsTaskModalOpen] = useState(false);
-  const { createTask } = useTasks();
 
   const sensors = useSensors(
     useSensor(PointerSensor, {
@@ -58,19 +61,43 @@ export const KanbanBoard: React.FC<KanbanBoardProps> = ({ tasks, onTaskUpdate })
     const taskId = active.id as string;
     const newStatus = over.id as Task['status'];
 
-    const task = tasks.find(t => t.id === taskId);
-    if (task && task.status !== newStatus) {
-      onTaskUpdate(taskId, { status: newStatus });
+    // Dragging a selected card moves the whole selection
+    const moving = selectedIds.has(taskId)
+      ? tasks.filter(t => selectedIds.has(t.id))
+      : tasks.filter(t => t.id === taskId);
+    const changes = moving
+      .filter(t => t.status !== newStatus)
+      .map(t => ({ id: t.id, updates: { status: newStatus } }));
+
+    if (changes.length === 1) {
+      onTaskUpdate(changes[0].id, changes[0].updates);
+    } else if (changes.length > 1) {
+      onTasksUpdate(changes);
+    }
+    if (selectedIds.has(taskId)) {
+      setSelectedIds(new Set());
     }
   };
 
+  const toggleSelected = (taskId: string) => {
+    setSelectedIds(current => {
+      const next = new Set(current);
+      if (next.has(taskId)) {
+        next.delete(taskId);
+      } else {
+        next.add(taskId);
+      }
+      return next;
+    });
+  };
+
   const getTasksByStatus = (status: Task['status']) => {
     return tasks.filter(task => task.status === status);
   };
 
   const handleCreateTask = async (taskData: Omit<Task, 'id'>) => {
     try {
-      await createTask(taskData);
+      await onTaskCreate(taskData);
       setIsTaskModalOpen(false);
     } catch (error) {
       console.error('Failed to create task:', error);
@@ -86,13 +113,20 @@ export const KanbanBoard: React.FC<KanbanBoardProps> = ({ tasks, onTaskUpdate })
             Task Board
           </h1>
           <p className="text-gray-600 dark:text-gray-400">
-            Drag and drop tasks to update their status
+            Drag and drop tasks to update their status; click cards to select several and move them together
           </p>
         </div>
-        <Button onClick={() => setIsTaskModalOpen(true)}>
-          <Plus className="h-4 w-4 mr-2" />
-          New Task
-        </Button>
+        <div className="flex items-center gap-3">
+          {selectedIds.size > 0 && (
+            <Button variant="ghost" onClick={() => setSelectedIds(new Set())}>
+              Clear selection ({selectedIds.size})
+            </Button>
+          )}
+          <Button onClick={() => setIsTaskModalOpen(true)}>
+            <Plus className="h-4 w-4 mr-2" />
+            New Task
+          </Button>
+        </div>
       </div>
 
       {/* Kanban Board */}
@@ -118,6 +152,8 @@ export const KanbanBoard: React.FC<KanbanBoardProps> = ({ tasks, onTaskUpdate })
                     title={column.title}
                     tasks={columnTasks}
                     taskCount={columnTasks.length}
+                    selectedIds={selectedIds}
+                    onToggleSelect={toggleSelected}
                   />
                 </motion.div>
               );
@@ -126,8 +162,13 @@ export const KanbanBoard: React.FC<KanbanBoardProps> = ({ tasks, onTaskUpdate })
 
           <DragOverlay>
             {activeTask ? (
-              <div className="rotate-3 opacity-90">
-                <KanbanCard task={activeTask} />
+              <div className="relative rotate-3 opacity-90">
+                <KanbanCard task={activeTask} selected={selectedIds.has(activeTask.id)} />
+                {selectedIds.has(activeTask.id) && selectedIds.size > 1 && (
+                  <span className="absolute -top-2 -right-2 bg-primary-600 text-white text-xs font-medium px-2 py-1 rounded-full">
+                    {selectedIds.size}
+                  </span>
+                )}
               </div>
             ) : null}
           </DragOverlay>
@@ -8,9 +8,11 @@ import { formatDate, getPriorityColor } from '../../utils/formatters';
 
 interface KanbanCardProps {
   task: Task;
+  selected?: boolean;
+  onToggleSelect?: (taskId: string) => void;
 }
 
-export const KanbanCard: React.FC<KanbanCardProps> = ({ task }) => {
+export const KanbanCard: React.FC<KanbanCardProps> = ({ task, selected = false, onToggleSelect }) => {
   const {
     attributes,
     listeners,
@@ -33,10 +35,13 @@ export const KanbanCard: React.FC<KanbanCardProps> = ({ task }) => {
       style={style}
       {...attributes}
       {...listeners}
+      onClick={() => onToggleSelect?.(task.id)}
       whileHover={{ scale: 1.02 }}
       className={`p-4 bg-white dark:bg-gray-700 rounded-lg shadow-sm border border-gray-200 dark:border-gray-600 cursor-grab active:cursor-grabbing transition-shadow hover:shadow-md ${
         isDragging ? 'opacity-50' : ''
-      } ${isOverdue ? 'border-l-4 border-l-red-500' : ''}`}
+      } ${isOverdue ? 'border-l-4 border-l-red-500' : ''} ${
+        selected ? 'ring-2 ring-primary-500' : ''
+      }`}
     >
       {/* Task Header */}
       <div className="flex items-start justify-between mb-2">
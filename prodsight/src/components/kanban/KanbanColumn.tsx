@@ -10,6 +10,8 @@ interface KanbanColumnProps {
   title: string;
   tasks: Task[];
   taskCount: number;
+  selectedIds?: Set<string>;
+  onToggleSelect?: (taskId: string) => void;
 }
 
 export const KanbanColumn: React.FC<KanbanColumnProps> = ({
@@ -17,6 +19,8 @@ export const KanbanColumn: React.FC<KanbanColumnProps> = ({
   title,
   tasks,
   taskCount,
+  selectedIds,
+  onToggleSelect,
 }) => {
   const { setNodeRef, isOver } = useDroppable({
     id,
@@ -78,7 +82,11 @@ export const KanbanColumn: React.FC<KanbanColumnProps> = ({
                 animate={{ opacity: 1, y: 0 }}
                 transition={{ delay: index * 0.05 }}
               >
-                <KanbanCard task={task} />
+                <KanbanCard
+                  task={task}
+                  selected={selectedIds?.has(task.id) ?? false}
+                  onToggleSelect={onToggleSelect}
+                />
               </motion.div>
             ))}
             {tasks.length === 0 && (
@@ -1,5 +1,5 @@
 import { useState, useEffect } from 'react';
-import { scriptApi, Script, Scene } from '../api/endpoints';
+import { scriptApi, Script, Scene, ScriptQuery } from '../api/endpoints';
 import { useNotification } from '../providers/NotificationProvider';
 
 interface UseScriptReturn {
@@ -15,7 +15,8 @@ interface UseScriptReturn {
   getTotalDuration: () => number;
 }
 
-export const useScript = (): UseScriptReturn => {
+// Pass a projection so polling downloads only the scene fields a view renders
+export const useScript = (query?: ScriptQuery): UseScriptReturn => {
   const [script, setScript] = useState<Script | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
@@ -26,7 +27,7 @@ export const useScript = (): UseScriptReturn => {
       setLoading(true);
       setError(null);
       
-      const response = await scriptApi.getScript();
+      const response = await scriptApi.getScript(query);
       if (response.success) {
         setScript(response.data);
       } else {
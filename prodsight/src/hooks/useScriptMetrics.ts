@@ -2,7 +2,7 @@ import { useState, useEffect } from 'react';
 import { scriptApi, ScriptMetrics } from '../api/endpoints';
 import { useNotification } from '../providers/NotificationProvider';
 import { useWebSocket } from '../providers/WebSocketProvider';
-import { ScriptUpdateEvent } from '../services/websocketService';
+import { ChangesEvent } from '../services/websocketService';
 
 interface UseScriptMetricsReturn {
   metrics: ScriptMetrics | null;
@@ -45,23 +45,22 @@ export const useScriptMetrics = (): UseScriptMetricsReturn => {
     fetchMetrics();
   }, []);
 
-  // Subscribe to WebSocket script updates to refresh metrics
+  // Metrics are derived from the script, so refresh them when the script or its scenes change
   useEffect(() => {
-    const unsubscribe = subscribe<ScriptUpdateEvent>('script_update', (event) => {
-      console.log('Received script update, refreshing metrics:', event);
-      
-      // Handle different types of script updates
-      switch (event.action) {
-        case 'updated':
-          // Refresh metrics when script is updated
-          fetchMetrics();
-          break;
-        default:
-          console.log('Unknown script update action:', event.action);
+    const unsubscribeChanges = subscribe<ChangesEvent>('changes', (event) => {
+      if (event.changes.some(change => change.collection === 'script' || change.collection === 'scenes')) {
+        fetchMetrics();
       }
     });
+    // Deltas were dropped for this client: reload rather than miss an edit
+    const unsubscribeResync = subscribe('resync', () => {
+      fetchMetrics();
+    });
 
-    return unsubscribe;
+    return () => {
+      unsubscribeChanges();
+      unsubscribeResync();
+    };
   }, [subscribe]);
 
   return {
@@ -1,7 +1,13 @@
-import { useState, useEffect } from 'react';
-import { tasksApi, Task } from '../api/endpoints';
+import { useState, useEffect, useRef } from 'react';
+import { changesApi, tasksApi, Task, TaskBulkResult, TaskQuery } from '../api/endpoints';
 import { useNotification } from '../providers/NotificationProvider';
 import { useAuth } from './useAuth';
+import { ChangesEvent, websocketService } from '../services/websocketService';
+
+export interface TaskChange {
+  id: string;
+  updates: Partial<Task>;
+}
 
 interface UseTasksReturn {
   tasks: Task[];
@@ -9,31 +15,42 @@ interface UseTasksReturn {
   error: string | null;
   createTask: (task: Omit<Task, 'id'>) => Promise<void>;
   updateTask: (id: string, updates: Partial<Task>) => Promise<void>;
+  updateTasks: (changes: TaskChange[]) => Promise<TaskBulkResult[]>;
   deleteTask: (id: string) => Promise<void>;
   refreshTasks: () => Promise<void>;
   getTasksByStatus: (status: Task['status']) => Task[];
   getTasksByAssignee: (assigneeId: string) => Task[];
 }
 
-export const useTasks = (): UseTasksReturn => {
+// Pass a query to fetch only the tasks a view renders (filters, sort, limit)
+export const useTasks = (query?: TaskQuery): UseTasksReturn => {
   const [tasks, setTasks] = useState<Task[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const { showSuccess, showError } = useNotification();
   const { user } = useAuth();
+  // Change feed position of the last fetch, so polls only refetch when tasks changed
+  const feedPosition = useRef<{ since: number; epoch: string } | null>(null);
 
-  const fetchTasks = async () => {
+  // In the background (polls and pushed changes) the current list stays on screen while refetching
+  const fetchTasks = async (background = false) => {
     try {
-      setLoading(true);
+      if (!background) {
+        setLoading(true);
+      }
       setError(null);
       
+      // Taken before the fetch so a change made during it is still picked up by the next poll
+      feedPosition.current = await changesApi.getChanges({ since: 0, limit: 1, collections: ['tasks'] })
+        .then(page => ({ since: page.data.latestSeq, epoch: page.data.epoch }), () => null);
+      
       let response;
       
       // If user is crew or VFX, only fetch their assigned tasks
       if (user?.role === 'Crew' || user?.role === 'VFX') {
-        response = await tasksApi.getTasksByAssignee(user.id);
+        response = await tasksApi.getTasks({ ...query, assigneeId: [user.id] });
       } else {
-        response = await tasksApi.getTasks();
+        response = await tasksApi.getTasks(query);
       }
       
       if (response.success) {
@@ -79,6 +96,32 @@ export const useTasks = (): UseTasksReturn => {
     }
   };
 
+  // Several changes in one bulk request; tasks that were updated are merged in, failures reported
+  const updateTasks = async (changes: TaskChange[]) => {
+    try {
+      const response = await tasksApi.bulkTasks(
+        changes.map(({ id, updates }) => ({ op: 'update' as const, id, data: updates }))
+      );
+      const { results, applied, failed } = response.data;
+      const updated = new Map<string, Task>();
+      results.forEach(result => {
+        if (result.success && result.id && result.data) {
+          updated.set(result.id, result.data);
+        }
+      });
+      setTasks(current => current.map(task => updated.get(task.id) ?? task));
+      if (failed) {
+        showError(`${failed} of ${results.length} tasks could not be updated`);
+      } else {
+        showSuccess(`${applied} tasks updated successfully`);
+      }
+      return results;
+    } catch (err: any) {
+      showError(err.message || 'Failed to update tasks');
+      throw err;
+    }
+  };
+
   const deleteTask = async (id: string) => {
     try {
       const response = await tasksApi.deleteTask(id);
@@ -98,6 +141,26 @@ export const useTasks = (): UseTasksReturn => {
     await fetchTasks();
   };
 
+  // Cheap change feed check; the task list is only fetched again when a task changed
+  const pollTasks = async () => {
+    const position = feedPosition.current;
+    if (!position) {
+      await fetchTasks(true);
+      return;
+    }
+    try {
+      const response = await changesApi.getChanges({ ...position, collections: ['tasks'] });
+      const { changes, resync, latestSeq, epoch } = response.data;
+      if (resync || changes.length > 0) {
+        await fetchTasks(true);
+      } else {
+        feedPosition.current = { since: latestSeq, epoch };
+      }
+    } catch {
+      await fetchTasks(true);
+    }
+  };
+
   const getTasksByStatus = (status: Task['status']): Task[] => {
     return tasks.filter(task => task.status === status);
   };
@@ -110,14 +173,28 @@ export const useTasks = (): UseTasksReturn => {
     if (user) {
       fetchTasks();
       
-      // Set up polling for updates every 30 seconds
+      // Check for task changes every 30 seconds
       const interval = setInterval(() => {
-        fetchTasks();
+        pollTasks();
       }, 30000);
       
-      return () => clearInterval(interval);
+      // Pushed task deltas refetch at once; the poll covers a missing or dropped connection
+      const unsubscribeChanges = websocketService.on<ChangesEvent>('changes', (event) => {
+        if (event.changes.some(change => change.collection === 'tasks')) {
+          fetchTasks(true);
+        }
+      });
+      const unsubscribeResync = websocketService.on('resync', () => {
+        fetchTasks(true);
+      });
+      
+      return () => {
+        clearInterval(interval);
+        unsubscribeChanges();
+        unsubscribeResync();
+      };
     }
-  }, [user]);
+  }, [user, JSON.stringify(query ?? {})]);
 
   return {
     tasks,
@@ -125,6 +202,7 @@ export const useTasks = (): UseTasksReturn => {
     error,
     createTask,
     updateTask,
+    updateTasks,
     deleteTask,
     refreshTasks,
     getTasksByStatus,
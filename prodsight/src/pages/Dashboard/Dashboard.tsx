@@ -1,5 +1,6 @@
 import React from 'react';
 import { motion } from 'framer-motion';
+import { Task, TaskQuery } from '../../api/endpoints';
 import { useAuth } from '../../hooks/useAuth';
 import { useTasks } from '../../hooks/useTasks';
 import { useBudget } from '../../hooks/useBudget';
@@ -11,9 +12,28 @@ import { CrewDashboard } from './CrewDashboard';
 import { VFXDashboard } from './VFXDashboard';
 import { DistributionManagerDashboard } from './DistributionManagerDashboard';
 
+// Task fields each role's dashboard reads (Crew and VFX only get their own tasks, see useTasks)
+const TASK_FIELDS_READ: Record<string, (keyof Task)[]> = {
+  'Producer': ['id', 'title', 'status', 'priority', 'category', 'assignee', 'dueDate'],
+  'Director': ['id', 'status', 'category', 'assignee'],
+  'Production Manager': ['id', 'title', 'status', 'assignee', 'dueDate'],
+  'Crew': ['id', 'title', 'description', 'status', 'priority', 'category', 'assigneeId', 'dueDate'],
+  'VFX': ['id', 'title', 'status', 'category', 'assigneeId'],
+  // Shows no tasks
+  'Distribution Manager': ['id'],
+};
+
+const dashboardTaskQuery = (role: string): TaskQuery => {
+  if (role === 'Distribution Manager') {
+    return { fields: TASK_FIELDS_READ[role], limit: 1 };
+  }
+  // Counts cover every task, so only the fields are narrowed
+  return { fields: TASK_FIELDS_READ[role] ?? TASK_FIELDS_READ['Producer'] };
+};
+
 export const Dashboard: React.FC = () => {
   const { user } = useAuth();
-  const { tasks, loading: tasksLoading } = useTasks();
+  const { tasks, loading: tasksLoading } = useTasks(dashboardTaskQuery(user?.role ?? ''));
   const { budget, loading: budgetLoading } = useBudget();
   const { script, loading: scriptLoading } = useScript();
 
@@ -14,14 +14,19 @@ import { Button } from '../../components/ui/Button';
 import { Modal } from '../../components/ui/Modal';
 import { RoleGuard } from '../../components/auth/RoleGuard';
 import { BudgetChart } from '../../components/charts/BudgetChart';
+import { Task, TaskQuery } from '../../api/endpoints';
 import { useTasks } from '../../hooks/useTasks';
 import { useBudget } from '../../hooks/useBudget';
 import { useScript } from '../../hooks/useScript';
 import { useAI } from '../../hooks/useAI';
 import { formatCurrency, formatDate } from '../../utils/formatters';
 
+// Task fields the report counts and the recent activity list read
+const TASK_FIELDS_READ: (keyof Task)[] = ['id', 'title', 'status', 'priority', 'category', 'assignee', 'dueDate'];
+const REPORT_TASK_QUERY: TaskQuery = { fields: TASK_FIELDS_READ };
+
 export const Reports: React.FC = () => {
-  const { tasks } = useTasks();
+  const { tasks } = useTasks(REPORT_TASK_QUERY);
   const { budget } = useBudget();
   const { script } = useScript();
   const { generateReport, loading: aiLoading } = useAI();
@@ -18,7 +18,7 @@ import {
 } from 'lucide-react';
 import { Button } from '../../components/ui/Button';
 import { Modal } from '../../components/ui/Modal';
-import { type ScheduleConstraints, type OptimizedSchedule } from '../../api/endpoints';
+import { aiSchedulingApi, type ScheduleConstraints, type OptimizedSchedule } from '../../api/endpoints';
 
 interface Scene {
   id: string;
@@ -53,6 +53,38 @@ interface LocationCluster {
   priority: number;
 }
 
+// Calendar event for one AI-scheduled shooting day
+const toScheduleEvent = (daySchedule: any, dayIndex: number, firstShootDate: Date): ScheduleEvent => {
+  const dayScenes = (daySchedule.scenes || []).map((scene: any) => ({
+    id: (scene.scene_number || dayIndex).toString(),
+    number: scene.scene_number || dayIndex,
+    title: scene.scene_name || scene.scene_title || `Scene ${scene.scene_number || dayIndex}`,
+    description: `${scene.location || 'Unknown Location'} - ${scene.time_of_day || 'Unknown Time'}`,
+    location: scene.location || 'Unknown Location',
+    estimatedDuration: Math.ceil((scene.duration || scene.estimated_duration_minutes || 60) / 60), // Convert to hours
+    characters: scene.actors || scene.actors_needed || [],
+    props: [],
+    vfx: false,
+    status: 'scheduled' as const
+  }));
+
+  const date = new Date(firstShootDate);
+  date.setDate(date.getDate() + dayIndex);
+
+  return {
+    id: `ai-event-${dayIndex}`,
+    date,
+    startTime: (daySchedule.scenes && daySchedule.scenes[0]?.call_time) || '09:00',
+    endTime: (daySchedule.scenes && daySchedule.scenes[daySchedule.scenes.length - 1]?.estimated_wrap) || '18:00',
+    location: daySchedule.location_focus || 'Unknown Location',
+    scenes: dayScenes,
+    cast: daySchedule.daily_summary?.primary_actors || [],
+    crew: ['Director', 'DOP', 'Sound Engineer', 'Assistant Director'],
+    status: 'scheduled',
+    notes: `AI-optimized schedule: ${(daySchedule.scenes || []).length} scenes, ${daySchedule.daily_summary?.total_duration_minutes || 'Unknown'} minutes total`
+  };
+};
+
 export const Scheduling: React.FC = () => {
   const [currentDate, setCurrentDate] = useState(new Date());
   const [, setSelectedDate] = useState<Date | null>(null);
@@ -101,75 +133,37 @@ export const Scheduling: React.FC = () => {
         }
       };
 
-      // Call the Gemini AI scheduling API directly for debugging
-      console.log('🚀 Calling Gemini API with constraints:', constraints);
+      // Stream the schedule so each day lands on the calendar as soon as it is generated
+      console.log('🚀 Streaming Gemini schedule with constraints:', constraints);
+      const firstShootDate = new Date();
+      firstShootDate.setDate(firstShootDate.getDate() + 1); // Start tomorrow
+      const streamedEvents: ScheduleEvent[] = [];
+      setScheduleEvents([]);
       
-      const response = await fetch('http://localhost:5000/api/ai/generate_gemini_schedule', {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json'
+      const responseData = await aiSchedulingApi.streamGeminiSchedule(constraints, {
+        onDay: (daySchedule) => {
+          streamedEvents.push(toScheduleEvent(daySchedule, streamedEvents.length, firstShootDate));
+          setScheduleEvents([...streamedEvents]);
+          setShowAIScheduleModal(false);
+        },
+        onReset: (reason) => {
+          console.warn('Discarding streamed days, fallback follows:', reason);
+          streamedEvents.length = 0;
+          setScheduleEvents([]);
         },
-        body: JSON.stringify(constraints)
       });
-      
-      console.log('📡 Response status:', response.status);
-      console.log('📡 Response headers:', Object.fromEntries(response.headers.entries()));
-      
-      if (!response.ok) {
-        throw new Error(`HTTP ${response.status}: ${response.statusText}`);
-      }
-      
-      const responseData = await response.json();
       console.log('📊 Full API Response:', responseData);
       
-      // Check if response has the expected structure
-      if (!responseData || typeof responseData !== 'object') {
-        throw new Error('Invalid response format from server');
-      }
-      
       if (responseData.status === 'success' || responseData.status === 'warning') {
         const scheduleData = responseData.schedule_data;
         
         if (scheduleData && scheduleData.daily_schedules) {
           setOptimizedSchedule(scheduleData);
           
-          // Convert the optimized schedule to calendar events
-          const events: ScheduleEvent[] = [];
-          let currentScheduleDate = new Date();
-          currentScheduleDate.setDate(currentScheduleDate.getDate() + 1); // Start tomorrow
-
-          scheduleData.daily_schedules.forEach((daySchedule: any, dayIndex: number) => {
-            const dayScenes = (daySchedule.scenes || []).map((scene: any) => ({
-              id: (scene.scene_number || dayIndex).toString(),
-              number: scene.scene_number || dayIndex,
-              title: scene.scene_name || scene.scene_title || `Scene ${scene.scene_number || dayIndex}`,
-              description: `${scene.location || 'Unknown Location'} - ${scene.time_of_day || 'Unknown Time'}`,
-              location: scene.location || 'Unknown Location',
-              estimatedDuration: Math.ceil((scene.duration || scene.estimated_duration_minutes || 60) / 60), // Convert to hours
-              characters: scene.actors || scene.actors_needed || [],
-              props: [],
-              vfx: false,
-              status: 'scheduled' as const
-            }));
-
-            const event: ScheduleEvent = {
-              id: `ai-event-${dayIndex}`,
-              date: new Date(currentScheduleDate),
-              startTime: (daySchedule.scenes && daySchedule.scenes[0]?.call_time) || '09:00',
-              endTime: (daySchedule.scenes && daySchedule.scenes[daySchedule.scenes.length - 1]?.estimated_wrap) || '18:00',
-              location: daySchedule.location_focus || 'Unknown Location',
-              scenes: dayScenes,
-              cast: daySchedule.daily_summary?.primary_actors || [],
-              crew: ['Director', 'DOP', 'Sound Engineer', 'Assistant Director'],
-              status: 'scheduled',
-              notes: `AI-optimized schedule: ${(daySchedule.scenes || []).length} scenes, ${daySchedule.daily_summary?.total_duration_minutes || 'Unknown'} minutes total`
-            };
-
-            events.push(event);
-            currentScheduleDate.setDate(currentScheduleDate.getDate() + 1);
-          });
-
-          setScheduleEvents(events);
+          // The final schedule is authoritative; replace the streamed days with it
+          setScheduleEvents(scheduleData.daily_schedules.map((daySchedule, dayIndex) =>
+            toScheduleEvent(daySchedule, dayIndex, firstShootDate)
+          ));
           
           // Show success message
           if (responseData.status === 'warning') {
@@ -24,7 +24,7 @@ import { RoleGuard } from '../../components/auth/RoleGuard';
 import { useScript } from '../../hooks/useScript';
 import { useAI } from '../../hooks/useAI';
 import { getStatusColor } from '../../utils/formatters';
-import { scriptApi, analysisApi } from '../../api/endpoints';
+import { scriptApi, analysisApi, Scene, ScriptQuery } from '../../api/endpoints';
 import { useNotification } from '../../providers/NotificationProvider';
 
 interface ChatMessage {
@@ -34,8 +34,16 @@ interface ChatMessage {
   timestamp: Date;
 }
 
+// Every scene field this page reads (scene tables and scene breakdown list);
+// the server returns only these, so a field read below must be listed here
+const SCENE_FIELDS_READ: (keyof Scene)[] = [
+  'id', 'number', 'description', 'location', 'timeOfDay', 'characters', 'estimatedDuration', 'vfx', 'status',
+];
+
+const SCRIPT_LIST_QUERY: ScriptQuery = { fields: SCENE_FIELDS_READ };
+
 export const Script: React.FC = () => {
-  const { script, loading, updateScene, updateScript } = useScript();
+  const { script, loading, updateScene, updateScript } = useScript(SCRIPT_LIST_QUERY);
   const { breakdownScript, loading: aiLoading } = useAI();
   const { showSuccess, showError } = useNotification();
   const [activeTab, setActiveTab] = useState('overview');
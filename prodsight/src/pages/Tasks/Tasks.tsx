@@ -3,9 +3,16 @@ import { motion } from 'framer-motion';
 import { KanbanBoard } from '../../components/kanban/KanbanBoard';
 import { useTasks } from '../../hooks/useTasks';
 import { RoleGuard } from '../../components/auth/RoleGuard';
+import { Task, TaskQuery } from '../../api/endpoints';
+
+// Task fields the board's cards and columns render
+const TASK_FIELDS_READ: (keyof Task)[] = [
+  'id', 'title', 'description', 'status', 'priority', 'category', 'assignee', 'dueDate', 'estimatedHours',
+];
+const TASK_BOARD_QUERY: TaskQuery = { fields: TASK_FIELDS_READ };
 
 export const Tasks: React.FC = () => {
-  const { tasks, loading, updateTask } = useTasks();
+  const { tasks, loading, createTask, updateTask, updateTasks } = useTasks(TASK_BOARD_QUERY);
 
   if (loading) {
     return (
@@ -23,7 +30,12 @@ export const Tasks: React.FC = () => {
         transition={{ duration: 0.5 }}
         className="h-full"
       >
-        <KanbanBoard tasks={tasks} onTaskUpdate={updateTask} />
+        <KanbanBoard
+          tasks={tasks}
+          onTaskCreate={createTask}
+          onTaskUpdate={updateTask}
+          onTasksUpdate={updateTasks}
+        />
       </motion.div>
     </RoleGuard>
   );
@@ -5,29 +5,25 @@
 
 import { io, Socket } from 'socket.io-client';
 
-export interface WebSocketEventData {
-  action: 'created' | 'updated' | 'deleted';
-  timestamp: number;
+// Field-level deltas batched per debounce window (same shape as GET /api/changes entries)
+export interface ChangesEvent {
+  changes: Array<{
+    seq: number | null;
+    collection: string;
+    id: string | null;
+    op: 'create' | 'update' | 'delete';
+    fields: string[];
+    data: Record<string, any> | null;
+    timestamp: number;
+  }>;
+  latestSeq: number;
 }
 
-export interface TaskUpdateEvent extends WebSocketEventData {
-  task: any;
-}
-
-export interface BudgetUpdateEvent extends WebSocketEventData {
-  budget: any;
-}
-
-export interface ScriptUpdateEvent extends WebSocketEventData {
-  script: any;
-}
-
-export interface VFXUpdateEvent extends WebSocketEventData {
-  vfx: any;
-}
-
-export interface AssetUpdateEvent extends WebSocketEventData {
-  asset: any;
+// Sent before the server drops a client that fell too far behind; reload over HTTP
+// (or GET /api/changes from latestSeq) and reconnect
+export interface ResyncEvent {
+  reason: 'slow_consumer';
+  latestSeq: number;
 }
 
 export type WebSocketEventHandler<T = any> = (data: T) => void;
@@ -172,30 +168,16 @@ class WebSocketService {
       this.emit('pong', data);
     });
 
-    // Business logic events
-    this.socket.on('task_update', (data: TaskUpdateEvent) => {
-      console.log('Task update received:', data);
-      this.emit('task_update', data);
-    });
-
-    this.socket.on('budget_update', (data: BudgetUpdateEvent) => {
-      console.log('Budget update received:', data);
-      this.emit('budget_update', data);
-    });
-
-    this.socket.on('script_update', (data: ScriptUpdateEvent) => {
-      console.log('Script update received:', data);
-      this.emit('script_update', data);
-    });
-
-    this.socket.on('vfx_update', (data: VFXUpdateEvent) => {
-      console.log('VFX update received:', data);
-      this.emit('vfx_update', data);
+    // Data changes: the server sends field-level deltas only (no per-collection update events)
+    this.socket.on('changes', (data: ChangesEvent, ack?: () => void) => {
+      this.emit('changes', data);
+      // The server paces delivery on these acknowledgements
+      ack?.();
     });
 
-    this.socket.on('asset_update', (data: AssetUpdateEvent) => {
-      console.log('Asset update received:', data);
-      this.emit('asset_update', data);
+    this.socket.on('resync', (data: ResyncEvent) => {
+      console.warn('WebSocket resync requested:', data);
+      this.emit('resync', data);
     });
 
     // Room management events
@@ -305,10 +287,6 @@ export const websocketService = new WebSocketService();
 // Export types for external use
 export type {
   WebSocketEventHandler,
-  TaskUpdateEvent,
-  BudgetUpdateEvent,
-  ScriptUpdateEvent,
-  VFXUpdateEvent,
-  AssetUpdateEvent,
-  WebSocketEventData,
+  ChangesEvent,
+  ResyncEvent,
 };